@@ -0,0 +1,235 @@
+"""Benchmark of the route generation of announce_routes, compared with the generation before the route plans.
+
+Usage, from the ansible directory so that the topology files are found:
+    python devutil/announce_routes_benchmark.py [--topo t1-64-lag --topo t2] [--iterations 3]
+
+The routes of all the VMs of each topology are generated without being announced, with the previous and the current
+generate_routes() and generate_t1_to_t0_routes(), and the generated routes are compared.
+"""
+import argparse
+import copy
+import math
+import os
+import random
+import sys
+import time
+
+import ansible.module_utils
+
+ANSIBLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+# announce_routes imports the module_utils of this repository from ansible.module_utils, as when ansible runs it
+ansible.module_utils.__path__.append(os.path.join(ANSIBLE_DIR, "module_utils"))
+sys.path.insert(0, os.path.join(ANSIBLE_DIR, "library"))
+
+import announce_routes     # noqa: E402
+
+
+# The generation done before the podsets, tors and subnets to skip were precomputed by podset_route_plan()
+def legacy_generate_routes(family, podset_number, tor_number, tor_subnet_number,
+                           spine_asn, leaf_asn_start, tor_asn_start, nexthop,
+                           nexthop_v6, tor_subnet_size, max_tor_subnet_number, topo,
+                           router_type="leaf", tor_index=None, set_num=None,
+                           no_default_route=False, core_ra_asn=announce_routes.CORE_RA_ASN,
+                           ipv6_address_pattern=announce_routes.IPV6_ADDRESS_PATTERN_DEFAULT_VALUE,
+                           tor_default_route=False, offset=0):
+    routes = []
+    if not no_default_route and (router_type != "tor" or tor_default_route):
+        default_route_as_path = announce_routes.get_uplink_router_as_path(
+            router_type, spine_asn)
+
+        if topo != "t2" or (topo == "t2" and router_type == "core"):
+            if family in ["v4", "both"]:
+                routes.append(("0.0.0.0/0", nexthop, default_route_as_path))
+            if family in ["v6", "both"]:
+                routes.append(("::/0", nexthop_v6, default_route_as_path))
+
+    # NOTE: Using large enough values (e.g., podset_number = 200,
+    # us to overflow the 192.168.0.0/16 private address space here.
+    # This should be fine for internal use, but may pose an issue if used otherwise
+    suffix = 0
+    for podset in range(0, podset_number):
+        for tor in range(0, tor_number):
+            for subnet in range(0, tor_subnet_number):
+                if router_type == "core":
+                    # Advertise podset 3+ to T2 DUT
+                    if podset < 3:
+                        continue
+
+                    # First 3 pods are advertised from T1 - so remove 3 from the total pods being advertised by T3
+                    first_third_podset_number = int(
+                        math.ceil((podset_number - 3) / 3.0))
+                    second_third_podset_number = int(
+                        math.ceil(((podset_number - 3) * 2) / 3.0))
+
+                    if set_num is not None:
+                        # For T2, we have 3 sets - 1 set advertises first 1/3 podsets,
+                        # second set advertises second 1/3 podsets, and all VM's advertises the last 1/3 podsets
+                        if podset <= first_third_podset_number and set_num != 0:
+                            continue
+                        elif podset > first_third_podset_number and \
+                                podset < second_third_podset_number and set_num != 1:
+                            continue
+                if router_type == "spine" or router_type == "mgmtleaf":
+                    # Skip podset 0 for T2
+                    if podset == 0:
+                        continue
+                elif router_type == "leaf":
+                    if topo == 't2':
+                        # Send routes for podset 0-2 (first 3 pods) to the T2 DUT
+                        if podset > 2:
+                            continue
+
+                        if set_num is not None:
+                            # For T2, we have 3 sets - 1 set advertises podset 1,
+                            # second set advertises podset 2, and all VM's advertises podset3
+                            if podset == 0 and set_num != 0:
+                                continue
+                            elif podset == 1 and set_num != 1:
+                                continue
+                    elif topo == 't0-mclag':
+                        if podset > 1:
+                            continue
+                        if set_num is not None:
+                            if podset == 0 and set_num != 0:
+                                continue
+                            elif podset == 1 and set_num != 1:
+                                continue
+                    else:
+                        # Skip tor 0 podset 0 for T1
+                        if podset == 0 and tor == 0:
+                            continue
+                elif router_type == "tor":
+                    # Skip non podset 0 for T0
+                    if podset != 0:
+                        continue
+                    # Skip subnet 0 (vlan ip) for M0
+                    elif topo == "m0" and subnet == 0:
+                        continue
+                    elif tor != tor_index:
+                        continue
+
+                suffix = ((podset * tor_number * max_tor_subnet_number * tor_subnet_size) +
+                          (tor * max_tor_subnet_number * tor_subnet_size) +
+                          (subnet * tor_subnet_size) + offset)
+                octet2 = (168 + int(suffix / (256 ** 2)))
+                octet1 = (192 + int(octet2 / 256))
+                octet2 = (octet2 % 256)
+                octet3 = (int(suffix / 256) % 256)
+                octet4 = (suffix % 256)
+                prefixlen_v4 = (32 - int(math.log(tor_subnet_size, 2)))
+
+                prefix = "{}.{}.{}.{}/{}".format(octet1,
+                                                 octet2, octet3, octet4, prefixlen_v4)
+                prefix_v6 = ipv6_address_pattern % (
+                    octet1, octet2, octet3, octet4)
+
+                leaf_asn = leaf_asn_start + podset
+                tor_asn = tor_asn_start + tor
+
+                aspath = None
+                if router_type == "core":
+                    aspath = "{} {}".format(leaf_asn, core_ra_asn)
+                elif router_type == "spine" or router_type == "mgmtleaf":
+                    aspath = "{} {}".format(leaf_asn, tor_asn)
+                elif router_type == "leaf":
+                    if topo == "t2":
+                        aspath = "{}".format(tor_asn)
+                    elif topo == "t0-mclag":
+                        aspath = "{}".format(tor_asn)
+                    else:
+                        if podset == 0:
+                            aspath = "{}".format(tor_asn)
+                        else:
+                            aspath = "{} {} {}".format(
+                                spine_asn, leaf_asn, tor_asn)
+
+                if family in ["v4", "both"]:
+                    routes.append((prefix, nexthop, aspath))
+                if family in ["v6", "both"]:
+                    routes.append((prefix_v6, nexthop_v6, aspath))
+
+    return routes, suffix
+
+
+def legacy_generate_t1_to_t0_routes(family, offset, leaf_number, subnet_size, tor_asn, leaf_asn_start, nexthop,
+                                    nexthop_v6, podset_num=1,
+                                    ipv6_address_pattern=announce_routes.IPV6_ADDRESS_PATTERN_DEFAULT_VALUE):
+    routes = []
+    for podset in range(0, podset_num):
+        for leaf in range(0, leaf_number):
+            suffix = offset + leaf
+            octet2 = (168 + int(suffix / (256 ** 2)))
+            octet1 = (192 + int(octet2 / 256))
+            octet2 = (octet2 % 256)
+            octet3 = (int(suffix / 256) % 256)
+            octet4 = (suffix % 256)
+            prefixlen_v4 = (32 - int(math.log(subnet_size, 2)))
+            prefix = "{}.{}.{}.{}/{}".format(octet1, octet2, octet3, octet4, prefixlen_v4)
+            prefix_v6 = ipv6_address_pattern % (
+                octet1, octet2, octet3, octet4)
+            leaf_asn = leaf_asn_start + podset
+            aspath = "{} {}".format(leaf_asn, tor_asn)
+            if family in ["v4", "both"]:
+                routes.append((prefix, nexthop, aspath))
+            if family in ["v6", "both"]:
+                routes.append((prefix_v6, nexthop_v6, aspath))
+    return routes, suffix
+
+
+FIB_FUNCTIONS = {
+    "t1": lambda topo, topo_name, topo_routes: announce_routes.fib_t1_lag(
+        topo, None, topo_name, action=announce_routes.GENERATE_WITHOUT_APPLY, topo_routes=topo_routes),
+    "t2": lambda topo, topo_name, topo_routes: announce_routes.fib_t2_lag(
+        topo, None, action=announce_routes.GENERATE_WITHOUT_APPLY, topo_routes=topo_routes),
+    "t0": lambda topo, topo_name, topo_routes: announce_routes.fib_t0(
+        topo, None, action=announce_routes.GENERATE_WITHOUT_APPLY, topo_routes=topo_routes),
+    "t0-mclag": lambda topo, topo_name, topo_routes: announce_routes.fib_t0_mclag(
+        topo, None, action=announce_routes.GENERATE_WITHOUT_APPLY, topo_routes=topo_routes),
+}
+
+
+def _generate(topo_name, topo, iterations):
+    fib = FIB_FUNCTIONS[announce_routes.get_topo_type(topo_name)]
+    topos = [copy.deepcopy(topo) for _ in range(iterations)]
+    start = time.perf_counter()
+    for topo in topos:
+        # The module generates the routes once per run
+        announce_routes.generated_routes.clear()
+        # The routes of t2 are shuffled
+        random.seed(0)
+        topo_routes = {}
+        fib(topo, topo_name, topo_routes)
+    return (time.perf_counter() - start) / iterations, topo_routes
+
+
+def run(topo_name, path, iterations):
+    topo = announce_routes.read_topo(topo_name, path)
+    if not topo:
+        raise SystemExit("Unable to load topology {}".format(topo_name))
+
+    generate_routes = announce_routes.generate_routes
+    generate_t1_to_t0_routes = announce_routes.generate_t1_to_t0_routes
+    announce_routes.generate_routes = legacy_generate_routes
+    announce_routes.generate_t1_to_t0_routes = legacy_generate_t1_to_t0_routes
+    try:
+        legacy_time, legacy_routes = _generate(topo_name, topo, iterations)
+    finally:
+        announce_routes.generate_routes = generate_routes
+        announce_routes.generate_t1_to_t0_routes = generate_t1_to_t0_routes
+    plan_time, plan_routes = _generate(topo_name, topo, iterations)
+
+    assert plan_routes == legacy_routes, "Different routes generated for {}".format(topo_name)
+    count = sum(len(routes) for vm_routes in plan_routes.values() for routes in vm_routes.values())
+    print("{} ({} VMs, {} routes)".format(topo_name, len(plan_routes), count))
+    print("  {:<8} {:.3f}s".format("legacy", legacy_time))
+    print("  {:<8} {:.3f}s".format("plan", plan_time))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the route generation of announce_routes.")
+    parser.add_argument("--topo", action="append", help="Topology name, t1-64-lag and t2 by default.")
+    parser.add_argument("--path", default=".", help="Directory of the vars/topo_*.yml files.")
+    parser.add_argument("--iterations", type=int, default=3, help="Number of generations of each topology.")
+    args = parser.parse_args()
+    for topo_name in args.topo or ["t1-64-lag", "t2"]:
+        run(topo_name, args.path, args.iterations)
@@ -0,0 +1,92 @@
+"""Benchmark of the lookup of the connection graph of DUTs by conn_graph_facts, with and without graph snapshots.
+
+Usage, from the ansible directory:
+    python devutil/conn_graph_facts_benchmark.py [--groups 20] [--duts 100] [--ports 32] [--iterations 5]
+    python devutil/conn_graph_facts_benchmark.py --path files/ --host str-msn2700-01
+
+Without --path, a lab of --groups groups is generated, each with --duts DUTs of --ports ports linked to fanouts,
+and the graph of a DUT of the last group is looked up. Each iteration runs find_graph() and build_results() like
+conn_graph_facts does at the start of a test session.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ANSIBLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+# conn_graph_facts imports module_utils from the ansible directory when it is not run by ansible
+sys.path[:0] = [os.path.join(ANSIBLE_DIR, "library"), ANSIBLE_DIR]
+
+import conn_graph_facts     # noqa: E402
+
+DEVICES_HEADER = "Hostname,ManagementIp,HwSku,Type,Protocol,Os,AuthType\n"
+LINKS_HEADER = "StartDevice,StartPort,EndDevice,EndPort,BandWidth,VlanID,VlanMode,AutoNeg\n"
+
+
+def generate_lab(path, groups, duts, ports):
+    fanout_ports = 64
+    with open(os.path.join(path, "graph_groups.yml"), "w") as f:
+        f.write("---\n")
+        f.writelines("- group{}\n".format(group) for group in range(groups))
+    for group in range(groups):
+        with open(os.path.join(path, "sonic_group{}_devices.csv".format(group)), "w") as devices, \
+                open(os.path.join(path, "sonic_group{}_links.csv".format(group)), "w") as links:
+            devices.write(DEVICES_HEADER)
+            links.write(LINKS_HEADER)
+            for fanout in range((duts * ports + fanout_ports - 1) // fanout_ports):
+                devices.write("g{}-fanout-{},10.{}.{}.1/23,Arista-7260CX3-C64,FanoutLeaf,,sonic,\n".format(
+                    group, fanout, group, fanout))
+            for dut in range(duts):
+                devices.write("g{}-dut-{},10.{}.{}.{}/23,Force10-S6000,DevSonic,,sonic,\n".format(
+                    group, dut, 100 + group, dut // 200, dut % 200 + 2))
+                for port in range(ports):
+                    index = dut * ports + port
+                    links.write("g{}-dut-{},Ethernet{},g{}-fanout-{},Ethernet{},100000,{},Access,on\n".format(
+                        group, dut, port * 4, group, index // fanout_ports, (index % fanout_ports) * 4,
+                        100 + port))
+    return "g{}-dut-0".format(groups - 1)
+
+
+def _measure(name, hostname, iterations, snapshot_dir):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        lab_graph = conn_graph_facts.find_graph([hostname], snapshot_dir=snapshot_dir)
+        succeed, _ = lab_graph.build_results([hostname])
+        samples.append(time.perf_counter() - start)
+        assert succeed
+    print("  {:<22} first={:.3f}s min={:.3f}s".format(name, samples[0], min(samples)))
+
+
+def run(path, hostname, iterations):
+    conn_graph_facts.LAB_GRAPHFILE_PATH = path
+    snapshot_dir = tempfile.mkdtemp()
+    try:
+        _measure("without snapshot", hostname, iterations, None)
+        _measure("with snapshot", hostname, iterations, snapshot_dir)
+    finally:
+        shutil.rmtree(snapshot_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark conn_graph_facts with and without graph snapshots.")
+    parser.add_argument("--path", help="Directory of existing graph files, a lab is generated if not set.")
+    parser.add_argument("--host", help="Host to look up in the existing graph files.")
+    parser.add_argument("--groups", type=int, default=20, help="Number of groups of the generated lab.")
+    parser.add_argument("--duts", type=int, default=100, help="Number of DUTs per group of the generated lab.")
+    parser.add_argument("--ports", type=int, default=32, help="Number of linked ports per DUT of the generated lab.")
+    parser.add_argument("--iterations", type=int, default=5, help="Number of lookups with and without snapshot.")
+    args = parser.parse_args()
+
+    if args.path:
+        run(args.path, args.host, args.iterations)
+    else:
+        lab_path = tempfile.mkdtemp()
+        try:
+            host = generate_lab(lab_path, args.groups, args.duts, args.ports)
+            print("{} groups of {} DUTs with {} ports".format(args.groups, args.duts, args.ports))
+            run(lab_path, host, args.iterations)
+        finally:
+            shutil.rmtree(lab_path)
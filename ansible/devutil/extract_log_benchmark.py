@@ -0,0 +1,99 @@
+"""Benchmark of the extract_log module, scanning the rotated logs compared with seeking to the marker index offset.
+
+Usage, from the ansible directory:
+    python devutil/extract_log_benchmark.py [--size-mb 2048] [--files 8] [--dir /tmp/extract_log_benchmark]
+
+A rotated syslog set (syslog, syslog.1, syslog.2.gz, ...) of --size-mb megabytes in total is generated, with a
+marker in the last megabytes of 'syslog' and another one in 'syslog.1', as if logrotate ran during the test.
+Both markers are extracted by scanning the files and with the marker index, and the outputs are compared.
+"""
+import argparse
+import filecmp
+import gzip
+import json
+import os
+import shutil
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "library"))
+
+import extract_log     # noqa: E402
+
+LINE = "Oct 18 19:21:{:02d}.{:06d} vlab-01 INFO swss#orchagent: :- doTask: Processing entry {} of the table\n"
+
+
+def _write_lines(file, size, first_line):
+    chunk = "".join(LINE.format(i % 60, i, first_line + i) for i in range(10000)).encode()
+    written = 0
+    while written < size:
+        file.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def _write_log(path, size, marker=None):
+    """Write a log file of about @size bytes, with @marker before the last tenth of it.
+    Returns (inode, offset) of the marker as recorded by the loganalyzer tool"""
+    with open(path, "wb") as file:
+        _write_lines(file, size * 9 // 10, 0)
+        offset = file.tell()
+        if marker:
+            file.write("Oct 18 19:22:00.000000 vlab-01 INFO python3: {}\n".format(marker).encode())
+        _write_lines(file, size // 10, 1)
+        return os.fstat(file.fileno()).st_ino, offset
+
+
+def generate(directory, size, files):
+    if os.path.exists(directory):
+        shutil.rmtree(directory)
+    os.makedirs(directory)
+    file_size = size // files
+    index = {}
+    for number in range(files - 1, 1, -1):
+        path = os.path.join(directory, "syslog.{}".format(number))
+        _write_log(path, file_size)
+        with open(path, "rb") as src, gzip.open(path + ".gz", "wb", compresslevel=1) as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(path)
+    rotated = _write_log(os.path.join(directory, "syslog.1"), file_size, "start-LogAnalyzer-rotated")
+    active = _write_log(os.path.join(directory, "syslog"), file_size, "start-LogAnalyzer-active")
+    # The markers were placed into the active file, syslog.1 was renamed afterwards and kept its inode
+    path = os.path.normpath(os.path.join(directory, "syslog"))
+    index[path] = {"start-LogAnalyzer-rotated": list(rotated), "start-LogAnalyzer-active": list(active)}
+    with open(extract_log.MARKER_INDEX_FILE, "w") as f:
+        json.dump(index, f)
+
+
+def _measure(name, func):
+    start = time.perf_counter()
+    func()
+    print("  {:<8} {:.2f}s".format(name, time.perf_counter() - start))
+
+
+def run(directory, marker):
+    scanned = os.path.join(directory, "extracted.scan")
+    indexed = os.path.join(directory, "extracted.index")
+    print("{}".format(marker))
+    _measure("scan", lambda: extract_log.extract_log(directory, "syslog", marker, scanned, use_marker_index=False))
+    _measure("index", lambda: extract_log.extract_log(directory, "syslog", marker, indexed))
+    assert filecmp.cmp(scanned, indexed, shallow=False), "Different outputs for {}".format(marker)
+    print("  {} bytes extracted".format(os.path.getsize(indexed)))
+    os.remove(scanned)
+    os.remove(indexed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark extract_log on a rotated syslog set.")
+    parser.add_argument("--size-mb", type=int, default=2048, help="Total size of the uncompressed logs.")
+    parser.add_argument("--files", type=int, default=8, help="Number of log files, including syslog and syslog.1.")
+    parser.add_argument("--dir", default="/tmp/extract_log_benchmark", help="Directory of the generated logs.")
+    args = parser.parse_args()
+
+    extract_log.MARKER_INDEX_FILE = os.path.join(args.dir, "extract_log_index.json")
+    generate(args.dir, args.size_mb * 1024 * 1024, max(args.files, 2))
+    try:
+        run(args.dir, "start-LogAnalyzer-active")
+        run(args.dir, "start-LogAnalyzer-rotated")
+    finally:
+        shutil.rmtree(args.dir)
@@ -1,5 +1,6 @@
 #!/usr/bin/python
 
+import collections
 import itertools
 import math
 import os
@@ -12,8 +13,9 @@ import sys
 import socket
 import random
 import logging
+import threading
 import time
-from multiprocessing.pool import ThreadPool
+from concurrent.futures import ThreadPoolExecutor
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.debug_utils import config_module_logging
 from ansible.module_utils.multi_servers_utils import MultiServersUtils
@@ -45,6 +47,10 @@ Options:
     - option-name: path
       description: to figure out the path of topo_{}.yml
       required: False
+
+    - option-name: concurrency
+      description: maximum number of exabgp processes routes are sent to at the same time
+      required: False
 '''
 
 EXAMPLES = '''
@@ -84,6 +90,8 @@ BGP_SCALE_T1S = [
     't1-isolated-d510u2', 't1-isolated-d510u2s2'
 ]
 ROUTES_BATCH_SIZE = 200
+# Maximum number of exabgp processes routes are sent to at the same time
+ROUTES_CONCURRENCY = 16
 
 # Describe default number of COLOs
 COLO_NUMBER = 30
@@ -175,27 +183,140 @@ def read_topo(topo_name, path):
         return {}
 
 
-def change_routes(action, ptf_ip, port, routes, routes_batch_size=ROUTES_BATCH_SIZE):
-    logging.debug("action = {}, ptf_ip = {}, port = {}, routes_batch_size = {}, routes = {}"
-                  .format(action, ptf_ip, port, routes_batch_size, routes))
-    messages = []
+def route_messages(action, routes):
+    """Generates the exabgp command of each route"""
     for prefix, nexthop, aspath in routes:
         if aspath:
-            messages.append(
-                "{} route {} next-hop {} as-path [ {} ]".format(action, prefix, nexthop, aspath))
+            yield "{} route {} next-hop {} as-path [ {} ]".format(action, prefix, nexthop, aspath)
         else:
-            messages.append(
-                "{} route {} next-hop {}".format(action, prefix, nexthop))
-    wait_for_http(ptf_ip, port, timeout=60)
-    url = "http://%s:%d" % (ptf_ip, port)
-    for i in range(0, len(messages), routes_batch_size):
-        batch_messages = messages[i:i+routes_batch_size]
-        data = {"commands": ";".join(batch_messages)}
-        logging.debug("Posting to url={} data={}".format(url, json.dumps(data)))
-        post_data_to_url(url, data)
-
-
-def post_data_to_url(url, data):
+            yield "{} route {} next-hop {}".format(action, prefix, nexthop)
+
+
+def batches(iterable, batch_size):
+    """Generates lists of up to @batch_size items of @iterable"""
+    iterator = iter(iterable)
+    batch = list(itertools.islice(iterator, batch_size))
+    while batch:
+        yield batch
+        batch = list(itertools.islice(iterator, batch_size))
+
+
+class RouteInjector(object):
+    """
+    Sends route changes to the exabgp processes running in the PTF container.
+
+    Each exabgp HTTP endpoint has one keep-alive session, and its route changes are sent in the order they were
+    submitted. Up to 'concurrency' endpoints are sent to at the same time. While the injector is used as a
+    context manager, change_routes() submits the route changes to it and returns without waiting.
+    """
+
+    def __init__(self, concurrency=ROUTES_CONCURRENCY):
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._lock = threading.Lock()
+        # Route changes waiting to be sent, and endpoints having a worker sending them
+        self._queues = collections.defaultdict(collections.deque)
+        self._draining = set()
+        self._futures = []
+        self._sessions = {}
+        # Number of routes sent and time spent sending them, per endpoint
+        self.stats = collections.defaultdict(lambda: [0, 0.0])
+
+    def __enter__(self):
+        global route_injector
+        route_injector = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        global route_injector
+        route_injector = None
+        try:
+            self.wait()
+        except Exception:
+            # Don't hide the exception raised while submitting the route changes
+            if exc_type is None:
+                raise
+
+    def submit(self, action, ptf_ip, port, routes, routes_batch_size=ROUTES_BATCH_SIZE):
+        endpoint = (ptf_ip, port)
+        with self._lock:
+            self._queues[endpoint].append((action, routes, routes_batch_size))
+            if endpoint not in self._draining:
+                self._draining.add(endpoint)
+                self._futures.append(self._executor.submit(self._drain, endpoint))
+
+    def _drain(self, endpoint):
+        try:
+            while True:
+                with self._lock:
+                    if not self._queues[endpoint]:
+                        self._draining.discard(endpoint)
+                        return
+                    action, routes, routes_batch_size = self._queues[endpoint].popleft()
+                self._send(endpoint, action, routes, routes_batch_size)
+        except Exception:
+            with self._lock:
+                self._queues[endpoint].clear()
+                self._draining.discard(endpoint)
+            raise
+
+    def _session(self, endpoint):
+        session = self._sessions.get(endpoint)
+        if session is None:
+            wait_for_http(endpoint[0], endpoint[1], timeout=60)
+            session = requests.Session()
+            self._sessions[endpoint] = session
+        return session
+
+    def _send(self, endpoint, action, routes, routes_batch_size):
+        session = self._session(endpoint)
+        url = "http://%s:%d" % endpoint
+        start = time.time()
+        count = 0
+        for batch in batches(route_messages(action, routes), routes_batch_size):
+            logging.debug("Posting {} routes to url={}".format(len(batch), url))
+            post_data_to_url(url, {"commands": ";".join(batch)}, session=session)
+            count += len(batch)
+        with self._lock:
+            self.stats[endpoint][0] += count
+            self.stats[endpoint][1] += time.time() - start
+
+    def wait(self):
+        """Waits for all the submitted route changes to be sent, raises the first error"""
+        try:
+            while self._futures:
+                self._futures.pop(0).result()
+        finally:
+            self._executor.shutdown(wait=True)
+            for session in self._sessions.values():
+                session.close()
+
+    def report(self):
+        """Returns the routes sent per endpoint, and the rate they were sent at"""
+        report = {}
+        for (ptf_ip, port), (count, seconds) in sorted(self.stats.items()):
+            rate = count / seconds if seconds else 0.0
+            logging.info("Sent {} routes to {}:{} in {:.2f}s, {:.0f} routes/sec".format(
+                count, ptf_ip, port, seconds, rate))
+            report["{}:{}".format(ptf_ip, port)] = {
+                "routes": count, "seconds": round(seconds, 3), "routes_per_sec": round(rate, 1)}
+        return report
+
+
+# RouteInjector the route changes are submitted to, None to send them before change_routes() returns
+route_injector = None
+
+
+def change_routes(action, ptf_ip, port, routes, routes_batch_size=ROUTES_BATCH_SIZE):
+    logging.debug("action = {}, ptf_ip = {}, port = {}, routes_batch_size = {}, {} routes"
+                  .format(action, ptf_ip, port, routes_batch_size, len(routes)))
+    if route_injector is not None:
+        route_injector.submit(action, ptf_ip, port, routes, routes_batch_size)
+        return
+    with RouteInjector(concurrency=1) as injector:
+        injector.submit(action, ptf_ip, port, routes, routes_batch_size)
+
+
+def post_data_to_url(url, data, session=None):
     # nosemgrep-next-line
     # Flaky error `ConnectionResetError(104, 'Connection reset by peer')` may happen while using `requests.post`
     # To avoid this error, we add sleep time before sending request.
@@ -203,7 +324,7 @@ def post_data_to_url(url, data):
     # If one retry fails, we increase the waiting time.
     for i in range(0, 5):
         try:
-            r = requests.post(url, data=data, timeout=360, proxies={"http": None, "https": None})
+            r = (session or requests).post(url, data=data, timeout=360, proxies={"http": None, "https": None})
             break
         except Exception as e:
             logging.debug("Got exception {}, will try to connect again".format(e))
@@ -224,35 +345,23 @@ def post_data_to_url(url, data):
         )
 
 
-def send_routes_for_each_set(args):
-    routes, port, action, ptf_ip = args
-    change_routes(action, ptf_ip, port, routes)
-
-
 def send_routes_in_parallel(route_set):
     """
-    Sends the given set of routes in parallel using a thread pool.
+    Sends the given set of routes, in parallel when a RouteInjector is active.
 
     Args:
-        route_set (list): A list of route sets to send.
+        route_set (list): A list of (routes, port, action, ptf_ip) route sets to send.
 
     Returns:
         None
     """
-    # Create a pool of worker processes
-    pool = ThreadPool(processes=len(route_set))
-
-    # Use the ThreadPool.map function to apply the function to each set of routes
-    results = pool.map(send_routes_for_each_set, route_set)
-
-    # Optionally, process the results
-    for result in results:
-        # Process individual results here
-        pass
-
-    # Close the pool and wait for all processes to complete
-    pool.close()
-    pool.join()
+    if route_injector is not None:
+        for routes, port, action, ptf_ip in route_set:
+            route_injector.submit(action, ptf_ip, port, routes)
+        return
+    with RouteInjector() as injector:
+        for routes, port, action, ptf_ip in route_set:
+            injector.submit(action, ptf_ip, port, routes)
 
 
 # AS path from Leaf router for T0 topology
@@ -386,6 +495,68 @@ def generate_m0_routes(nexthop, colo_number, m0_number, m0_subnet_number, m0_asn
     return []
 
 
+# Base address of the generated prefixes, 192.168.0.0
+ROUTES_IP_BASE = 0xC0A80000
+
+
+def podset_route_plan(podset_number, tor_number, tor_subnet_number, router_type, topo, tor_index=None, set_num=None):
+    """
+    Returns the (podset, tors, subnets) advertised by a router of @router_type.
+
+    The podsets, tors and subnets to skip only depend on the router type and topology, so they are computed once
+    for a route set instead of being checked for every route.
+    """
+    all_tors = list(range(tor_number))
+    all_subnets = list(range(tor_subnet_number))
+    first_third_podset_number = int(math.ceil((podset_number - 3) / 3.0))
+    second_third_podset_number = int(math.ceil(((podset_number - 3) * 2) / 3.0))
+
+    plan = []
+    for podset in range(podset_number):
+        tors = all_tors
+        subnets = all_subnets
+        if router_type == "core":
+            # Advertise podset 3+ to T2 DUT
+            if podset < 3:
+                continue
+            if set_num is not None:
+                # For T2, we have 3 sets - 1 set advertises first 1/3 podsets,
+                # second set advertises second 1/3 podsets, and all VM's advertises the last 1/3 podsets
+                if podset <= first_third_podset_number and set_num != 0:
+                    continue
+                elif first_third_podset_number < podset < second_third_podset_number and set_num != 1:
+                    continue
+        elif router_type == "spine" or router_type == "mgmtleaf":
+            # Skip podset 0 for T2
+            if podset == 0:
+                continue
+        elif router_type == "leaf":
+            if topo == 't2' or topo == 't0-mclag':
+                # T2: Send routes for podset 0-2 (first 3 pods) to the T2 DUT, T0-MCLAG: podset 0-1
+                if podset > (2 if topo == 't2' else 1):
+                    continue
+                if set_num is not None:
+                    # We have 3 sets - 1 set advertises podset 1,
+                    # second set advertises podset 2, and all VM's advertises podset3
+                    if podset == 0 and set_num != 0:
+                        continue
+                    elif podset == 1 and set_num != 1:
+                        continue
+            elif podset == 0:
+                # Skip tor 0 podset 0 for T1
+                tors = all_tors[1:]
+        elif router_type == "tor":
+            # Skip non podset 0 for T0
+            if podset != 0:
+                continue
+            tors = [tor_index] if tor_index in all_tors else []
+            # Skip subnet 0 (vlan ip) for M0
+            if topo == "m0":
+                subnets = all_subnets[1:]
+        plan.append((podset, tors, subnets))
+    return plan
+
+
 def generate_routes(family, podset_number, tor_number, tor_subnet_number,
                     spine_asn, leaf_asn_start, tor_asn_start, nexthop,
                     nexthop_v6, tor_subnet_size, max_tor_subnet_number, topo,
@@ -393,6 +564,26 @@ def generate_routes(family, podset_number, tor_number, tor_subnet_number,
                     no_default_route=False, core_ra_asn=CORE_RA_ASN,
                     ipv6_address_pattern=IPV6_ADDRESS_PATTERN_DEFAULT_VALUE,
                     tor_default_route=False, offset=0):
+    # Route sets advertised by several VMs, e.g. all the T1 or T3 VMs of a set in T2, are generated once
+    key = (family, podset_number, tor_number, tor_subnet_number, spine_asn, leaf_asn_start, tor_asn_start, nexthop,
+           nexthop_v6, tor_subnet_size, max_tor_subnet_number, topo, router_type, tor_index, set_num,
+           no_default_route, core_ra_asn, ipv6_address_pattern, tor_default_route, offset)
+    if key not in generated_routes:
+        generated_routes[key] = _generate_routes(*key)
+    routes, suffix = generated_routes[key]
+    # The caller may extend or shuffle the routes
+    return list(routes), suffix
+
+
+# Routes generated by generate_routes(), by arguments
+generated_routes = {}
+
+
+def _generate_routes(family, podset_number, tor_number, tor_subnet_number,
+                     spine_asn, leaf_asn_start, tor_asn_start, nexthop,
+                     nexthop_v6, tor_subnet_size, max_tor_subnet_number, topo,
+                     router_type, tor_index, set_num, no_default_route, core_ra_asn,
+                     ipv6_address_pattern, tor_default_route, offset):
     routes = []
     if not no_default_route and (router_type != "tor" or tor_default_route):
         default_route_as_path = get_uplink_router_as_path(
@@ -404,110 +595,47 @@ def generate_routes(family, podset_number, tor_number, tor_subnet_number,
             if family in ["v6", "both"]:
                 routes.append(("::/0", nexthop_v6, default_route_as_path))
 
+    with_v4 = family in ["v4", "both"]
+    with_v6 = family in ["v6", "both"]
+    prefixlen_v4 = 32 - int(math.log(tor_subnet_size, 2))
+    podset_size = tor_number * max_tor_subnet_number * tor_subnet_size
+    tor_size = max_tor_subnet_number * tor_subnet_size
+
+    # AS path of the routes of a podset and tor, None if the routes have no AS path
+    if router_type == "core":
+        aspath_format = "{leaf_asn} {core_ra_asn}"
+    elif router_type == "spine" or router_type == "mgmtleaf":
+        aspath_format = "{leaf_asn} {tor_asn}"
+    elif router_type == "leaf" and topo not in ("t2", "t0-mclag"):
+        aspath_format = "{spine_asn} {leaf_asn} {tor_asn}"
+    elif router_type == "leaf":
+        aspath_format = "{tor_asn}"
+    else:
+        aspath_format = None
+
     # NOTE: Using large enough values (e.g., podset_number = 200,
     # us to overflow the 192.168.0.0/16 private address space here.
     # This should be fine for internal use, but may pose an issue if used otherwise
     suffix = 0
-    for podset in range(0, podset_number):
-        for tor in range(0, tor_number):
-            for subnet in range(0, tor_subnet_number):
-                if router_type == "core":
-                    # Advertise podset 3+ to T2 DUT
-                    if podset < 3:
-                        continue
-
-                    # First 3 pods are advertised from T1 - so remove 3 from the total pods being advertised by T3
-                    first_third_podset_number = int(
-                        math.ceil((podset_number - 3) / 3.0))
-                    second_third_podset_number = int(
-                        math.ceil(((podset_number - 3) * 2) / 3.0))
-
-                    if set_num is not None:
-                        # For T2, we have 3 sets - 1 set advertises first 1/3 podsets,
-                        # second set advertises second 1/3 podsets, and all VM's advertises the last 1/3 podsets
-                        if podset <= first_third_podset_number and set_num != 0:
-                            continue
-                        elif podset > first_third_podset_number and \
-                                podset < second_third_podset_number and set_num != 1:
-                            continue
-                if router_type == "spine" or router_type == "mgmtleaf":
-                    # Skip podset 0 for T2
-                    if podset == 0:
-                        continue
-                elif router_type == "leaf":
-                    if topo == 't2':
-                        # Send routes for podset 0-2 (first 3 pods) to the T2 DUT
-                        if podset > 2:
-                            continue
-
-                        if set_num is not None:
-                            # For T2, we have 3 sets - 1 set advertises podset 1,
-                            # second set advertises podset 2, and all VM's advertises podset3
-                            if podset == 0 and set_num != 0:
-                                continue
-                            elif podset == 1 and set_num != 1:
-                                continue
-                    elif topo == 't0-mclag':
-                        if podset > 1:
-                            continue
-                        if set_num is not None:
-                            if podset == 0 and set_num != 0:
-                                continue
-                            elif podset == 1 and set_num != 1:
-                                continue
-                    else:
-                        # Skip tor 0 podset 0 for T1
-                        if podset == 0 and tor == 0:
-                            continue
-                elif router_type == "tor":
-                    # Skip non podset 0 for T0
-                    if podset != 0:
-                        continue
-                    # Skip subnet 0 (vlan ip) for M0
-                    elif topo == "m0" and subnet == 0:
-                        continue
-                    elif tor != tor_index:
-                        continue
-
-                suffix = ((podset * tor_number * max_tor_subnet_number * tor_subnet_size) +
-                          (tor * max_tor_subnet_number * tor_subnet_size) +
-                          (subnet * tor_subnet_size) + offset)
-                octet2 = (168 + int(suffix / (256 ** 2)))
-                octet1 = (192 + int(octet2 / 256))
-                octet2 = (octet2 % 256)
-                octet3 = (int(suffix / 256) % 256)
-                octet4 = (suffix % 256)
-                prefixlen_v4 = (32 - int(math.log(tor_subnet_size, 2)))
-
-                prefix = "{}.{}.{}.{}/{}".format(octet1,
-                                                 octet2, octet3, octet4, prefixlen_v4)
-                prefix_v6 = ipv6_address_pattern % (
-                    octet1, octet2, octet3, octet4)
-
-                leaf_asn = leaf_asn_start + podset
-                tor_asn = tor_asn_start + tor
-
-                aspath = None
-                if router_type == "core":
-                    aspath = "{} {}".format(leaf_asn, core_ra_asn)
-                elif router_type == "spine" or router_type == "mgmtleaf":
-                    aspath = "{} {}".format(leaf_asn, tor_asn)
-                elif router_type == "leaf":
-                    if topo == "t2":
-                        aspath = "{}".format(tor_asn)
-                    elif topo == "t0-mclag":
-                        aspath = "{}".format(tor_asn)
-                    else:
-                        if podset == 0:
-                            aspath = "{}".format(tor_asn)
-                        else:
-                            aspath = "{} {} {}".format(
-                                spine_asn, leaf_asn, tor_asn)
-
-                if family in ["v4", "both"]:
-                    routes.append((prefix, nexthop, aspath))
-                if family in ["v6", "both"]:
-                    routes.append((prefix_v6, nexthop_v6, aspath))
+    for podset, tors, subnets in podset_route_plan(podset_number, tor_number, tor_subnet_number,
+                                                   router_type, topo, tor_index, set_num):
+        leaf_asn = leaf_asn_start + podset
+        podset_format = aspath_format
+        if router_type == "leaf" and podset == 0:
+            podset_format = "{tor_asn}"
+        for tor in tors:
+            tor_asn = tor_asn_start + tor
+            aspath = podset_format.format(leaf_asn=leaf_asn, tor_asn=tor_asn, spine_asn=spine_asn,
+                                          core_ra_asn=core_ra_asn) if podset_format else None
+            tor_suffix = podset * podset_size + tor * tor_size + offset
+            for subnet in subnets:
+                suffix = tor_suffix + subnet * tor_subnet_size
+                address = ROUTES_IP_BASE + suffix
+                octets = (address >> 24, (address >> 16) & 0xFF, (address >> 8) & 0xFF, address & 0xFF)
+                if with_v4:
+                    routes.append(("%d.%d.%d.%d/%d" % (octets + (prefixlen_v4,)), nexthop, aspath))
+                if with_v6:
+                    routes.append((ipv6_address_pattern % octets, nexthop_v6, aspath))
 
     return routes, suffix
 
@@ -515,24 +643,18 @@ def generate_routes(family, podset_number, tor_number, tor_subnet_number,
 def generate_t1_to_t0_routes(family, offset, leaf_number, subnet_size, tor_asn, leaf_asn_start, nexthop, nexthop_v6,
                              podset_num=1, ipv6_address_pattern=IPV6_ADDRESS_PATTERN_DEFAULT_VALUE):
     routes = []
+    with_v4 = family in ["v4", "both"]
+    with_v6 = family in ["v6", "both"]
+    prefixlen_v4 = 32 - int(math.log(subnet_size, 2))
     for podset in range(0, podset_num):
-        for leaf in range(0, leaf_number):
-            suffix = offset + leaf
-            octet2 = (168 + int(suffix / (256 ** 2)))
-            octet1 = (192 + int(octet2 / 256))
-            octet2 = (octet2 % 256)
-            octet3 = (int(suffix / 256) % 256)
-            octet4 = (suffix % 256)
-            prefixlen_v4 = (32 - int(math.log(subnet_size, 2)))
-            prefix = "{}.{}.{}.{}/{}".format(octet1, octet2, octet3, octet4, prefixlen_v4)
-            prefix_v6 = ipv6_address_pattern % (
-                octet1, octet2, octet3, octet4)
-            leaf_asn = leaf_asn_start + podset
-            aspath = "{} {}".format(leaf_asn, tor_asn)
-            if family in ["v4", "both"]:
-                routes.append((prefix, nexthop, aspath))
-            if family in ["v6", "both"]:
-                routes.append((prefix_v6, nexthop_v6, aspath))
+        aspath = "{} {}".format(leaf_asn_start + podset, tor_asn)
+        for suffix in range(offset, offset + leaf_number):
+            address = ROUTES_IP_BASE + suffix
+            octets = (address >> 24, (address >> 16) & 0xFF, (address >> 8) & 0xFF, address & 0xFF)
+            if with_v4:
+                routes.append(("%d.%d.%d.%d/%d" % (octets + (prefixlen_v4,)), nexthop, aspath))
+            if with_v6:
+                routes.append((ipv6_address_pattern % octets, nexthop_v6, aspath))
     return routes, suffix
 
 
@@ -1785,7 +1907,8 @@ def main():
             peers_routes_to_change=dict(required=False, type='dict', default={}),
             log_path=dict(required=False, type='str', default='/tmp'),
             upstream_neighbor_groups=dict(required=False, type='int', default=0),
-            downstream_neighbor_groups=dict(required=False, type='int', default=0)
+            downstream_neighbor_groups=dict(required=False, type='int', default=0),
+            concurrency=dict(required=False, type='int', default=ROUTES_CONCURRENCY)
         ),
         supports_check_mode=False)
 
@@ -1801,6 +1924,7 @@ def main():
     peers_routes_to_change = module.params['peers_routes_to_change']
     upstream_neighbor_groups = module.params['upstream_neighbor_groups']
     downstream_neighbor_groups = module.params['downstream_neighbor_groups']
+    concurrency = module.params['concurrency']
 
     topo = read_topo(topo_name, path)
     if not topo:
@@ -1822,54 +1946,53 @@ def main():
 
     topo_type = get_topo_type(topo_name)
     topo_routes = {}
+    result = dict(changed=True)
     try:
-        if adhoc:
-            adhoc_routes(topo, ptf_ip, peers_routes_to_change, action)
-            module.exit_json(change=True)
-        elif topo_type == "t0":
-            fib_t0(topo, ptf_ip, no_default_route=is_storage_backend, action=action,
-                   upstream_neighbor_groups=upstream_neighbor_groups, topo_routes=topo_routes)
-            module.exit_json(changed=True, topo_routes=convert_routes_to_str(topo_routes))
-        elif topo_type == "t1" or topo_type == "smartswitch-t1":
-            fib_t1_lag(
-                topo, ptf_ip, topo_name, no_default_route=is_storage_backend, action=action,
-                tor_default_route=tor_default_route, downstream_neighbor_groups=downstream_neighbor_groups,
-                topo_routes=topo_routes)
-            module.exit_json(changed=True, topo_routes=convert_routes_to_str(topo_routes))
-        elif topo_type == "t2":
-            fib_t2_lag(topo, ptf_ip, action=action, topo_routes=topo_routes)
-            module.exit_json(changed=True, topo_routes=convert_routes_to_str(topo_routes))
-        elif topo_type == "t0-mclag":
-            fib_t0_mclag(topo, ptf_ip, action=action, topo_routes=topo_routes)
-            module.exit_json(changed=True, topo_routes=convert_routes_to_str(topo_routes))
-        elif topo_type == "m1":
-            fib_m1(topo, ptf_ip, action=action, topo_routes=topo_routes)
-            module.exit_json(changed=True, topo_routes=convert_routes_to_str(topo_routes))
-        elif topo_type == "m0":
-            fib_m0(topo, ptf_ip, action=action, topo_routes=topo_routes)
-            module.exit_json(changed=True, topo_routes=convert_routes_to_str(topo_routes))
-        elif topo_type == "mx":
-            fib_mx(topo, ptf_ip, action=action, topo_routes=topo_routes)
-            module.exit_json(changed=True, topo_routes=convert_routes_to_str(topo_routes))
-        elif topo_type == "c0":
-            fib_c0(topo, ptf_ip, action=action, topo_routes=topo_routes)
-            module.exit_json(changed=True, topo_routes=convert_routes_to_str(topo_routes))
-        elif topo_type == "dpu":
-            fib_dpu(topo, ptf_ip, action=action, topo_routes=topo_routes)
-            module.exit_json(change=True, topo_routes=convert_routes_to_str(topo_routes))
-        elif topo_type == "lt2":
-            fib_lt2_routes(topo, ptf_ip, action=action, topo_routes=topo_routes)
-            module.exit_json(change=True, topo_routes=convert_routes_to_str(topo_routes))
-        elif topo_type == "ft2":
-            fib_ft2_routes(topo, ptf_ip, action=action, topo_routes=topo_routes)
-            module.exit_json(change=True, topo_routes=convert_routes_to_str(topo_routes))
-        else:
-            module.exit_json(
-                msg='Unsupported topology "{}" - skipping announcing routes'.format(topo_name))
+        with RouteInjector(concurrency=concurrency) as injector:
+            if adhoc:
+                adhoc_routes(topo, ptf_ip, peers_routes_to_change, action)
+                result = dict(change=True)
+            elif topo_type == "t0":
+                fib_t0(topo, ptf_ip, no_default_route=is_storage_backend, action=action,
+                       upstream_neighbor_groups=upstream_neighbor_groups, topo_routes=topo_routes)
+            elif topo_type == "t1" or topo_type == "smartswitch-t1":
+                fib_t1_lag(
+                    topo, ptf_ip, topo_name, no_default_route=is_storage_backend, action=action,
+                    tor_default_route=tor_default_route, downstream_neighbor_groups=downstream_neighbor_groups,
+                    topo_routes=topo_routes)
+            elif topo_type == "t2":
+                fib_t2_lag(topo, ptf_ip, action=action, topo_routes=topo_routes)
+            elif topo_type == "t0-mclag":
+                fib_t0_mclag(topo, ptf_ip, action=action, topo_routes=topo_routes)
+            elif topo_type == "m1":
+                fib_m1(topo, ptf_ip, action=action, topo_routes=topo_routes)
+            elif topo_type == "m0":
+                fib_m0(topo, ptf_ip, action=action, topo_routes=topo_routes)
+            elif topo_type == "mx":
+                fib_mx(topo, ptf_ip, action=action, topo_routes=topo_routes)
+            elif topo_type == "c0":
+                fib_c0(topo, ptf_ip, action=action, topo_routes=topo_routes)
+            elif topo_type == "dpu":
+                fib_dpu(topo, ptf_ip, action=action, topo_routes=topo_routes)
+                result = dict(change=True)
+            elif topo_type == "lt2":
+                fib_lt2_routes(topo, ptf_ip, action=action, topo_routes=topo_routes)
+                result = dict(change=True)
+            elif topo_type == "ft2":
+                fib_ft2_routes(topo, ptf_ip, action=action, topo_routes=topo_routes)
+                result = dict(change=True)
+            else:
+                result = dict(msg='Unsupported topology "{}" - skipping announcing routes'.format(topo_name))
     except Exception as e:
         module.fail_json(msg='Announcing routes failed, topo_name={}, topo_type={}, exception={}'
                          .format(topo_name, topo_type, repr(e)))
 
+    if not adhoc and 'msg' not in result:
+        result['topo_routes'] = convert_routes_to_str(topo_routes)
+    if injector.stats:
+        result['route_stats'] = injector.report()
+    module.exit_json(**result)
+
 
 if __name__ == '__main__':
     main()
@@ -8,13 +8,13 @@ import traceback
 
 try:
     from ansible.module_utils.debug_utils import config_module_logging
-    from ansible.module_utils.graph_utils import LabGraph
+    from ansible.module_utils.graph_utils import LabGraph, SNAPSHOT_DIR
 except ImportError:
     # Add parent dir for using outside Ansible
     import sys
     sys.path.append('..')
     from module_utils.debug_utils import config_module_logging
-    from module_utils.graph_utils import LabGraph
+    from module_utils.graph_utils import LabGraph, SNAPSHOT_DIR
 
 config_module_logging('conn_graph_facts')
 
@@ -55,6 +55,12 @@ options:
         device entry in graph facts.
         required: False
 
+    snapshot:
+        Load the graph facts from a snapshot saved by a previous run, as long as the csv graph files did not change
+        since then. The snapshots are saved in ~/.cache/sonic-mgmt/conn_graph.
+        required: False
+        default: True
+
     Mutually exclusive options: host, hosts, anchor
 
 Ansible_facts:
@@ -116,13 +122,14 @@ LAB_GRAPHFILE_PATH = "files/"
 LAB_GRAPH_GROUPS_FILE = "graph_groups.yml"
 
 
-def find_graph(hostnames, part=False, forced_mgmt_routes=None):
+def find_graph(hostnames, part=False, forced_mgmt_routes=None, snapshot_dir=None):
     """Find the graph file for the target device
 
     Args:
         hostnames (list): List of hostnames
         part (bool, optional): Select the graph file if over 80% of hosts are found in conn_graph when part is True.
                                Defaults to False.
+        snapshot_dir (str, optional): Directory of the snapshots of the graph facts, see LabGraph.
 
     Returns:
         obj: Instance of LabGraph or None if no graph file is found.
@@ -135,24 +142,24 @@ def find_graph(hostnames, part=False, forced_mgmt_routes=None):
     target_group = None
     for group in graph_groups:
         logging.debug("Looking at graph files of group {} for hosts {}".format(group, hostnames))
-        lab_graph = LabGraph(LAB_GRAPHFILE_PATH, group, forced_mgmt_routes=forced_mgmt_routes)
-        graph_hostnames = set(lab_graph.graph_facts["devices"].keys())
+        # Only the devices file is read to match the hosts, the graph is built for the matching group only
+        graph_hostnames = LabGraph.read_hostnames(LAB_GRAPHFILE_PATH, group)
         logging.debug("For graph group {}, got hostnames {}".format(group, graph_hostnames))
 
         if not part:
             if set(hostnames) <= graph_hostnames:
-                target_graph = lab_graph
                 target_group = group
                 break
         else:
             THRESHOLD = 0.8
             in_graph_hostnames = set(hostnames).intersection(graph_hostnames)
             if len(in_graph_hostnames) * 1.0 / len(hostnames) >= THRESHOLD:
-                target_graph = lab_graph
                 target_group = group
                 break
 
-    if target_graph is not None:
+    if target_group is not None:
+        target_graph = LabGraph(LAB_GRAPHFILE_PATH, target_group, forced_mgmt_routes=forced_mgmt_routes,
+                                snapshot_dir=snapshot_dir)
         logging.debug("Returning lab graph of group {} for hosts {}".format(target_group, hostnames))
 
     return target_graph
@@ -168,6 +175,7 @@ def main():
             anchor=dict(required=False, type='list'),
             ignore_errors=dict(required=False, type='bool', default=False),
             forced_mgmt_routes=dict(required=False, type='list'),
+            snapshot=dict(required=False, type='bool', default=True),
         ),
         mutually_exclusive=[['host', 'hosts', 'anchor']],
         supports_check_mode=True
@@ -190,11 +198,13 @@ def main():
             global LAB_GRAPHFILE_PATH
             LAB_GRAPHFILE_PATH = m_args['filepath']
 
+        snapshot_dir = SNAPSHOT_DIR if m_args["snapshot"] else None
         if m_args["group"]:
             lab_graph = LabGraph(
                 LAB_GRAPHFILE_PATH,
                 m_args["group"],
-                forced_mgmt_routes=m_args.get("forced_mgmt_routes")
+                forced_mgmt_routes=m_args.get("forced_mgmt_routes"),
+                snapshot_dir=snapshot_dir
             )
         else:
             # When calling passed in anchor instead of hostnames,
@@ -203,7 +213,8 @@ def main():
             target = anchor if anchor else hostnames
             lab_graph = find_graph(
                 target,
-                forced_mgmt_routes=m_args.get("forced_mgmt_routes")
+                forced_mgmt_routes=m_args.get("forced_mgmt_routes"),
+                snapshot_dir=snapshot_dir
             )
 
         if not lab_graph:
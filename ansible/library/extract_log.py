@@ -3,6 +3,9 @@
 from ansible.module_utils.basic import AnsibleModule
 from functools import cmp_to_key
 import datetime
+import json
+import shutil
+import time
 import traceback
 import logging.handlers
 import logging
@@ -11,7 +14,6 @@ import sys
 import re
 import gzip
 import os
-import locale
 DOCUMENTATION = '''
 module:  extract_log
 version_added:  "1.0"
@@ -20,6 +22,9 @@ description: The module scans the 'directory' in search of files which filenames
 The found files are ungzipped and combined together in the rotation order. After that all lines after
 'start_string' are copied into a file with name 'target_filename'. All input strings with 'nsible' in it
 aren't considered as 'start_string' to avoid clashing with ansible output.
+When the loganalyzer tool placed 'start_string' as a marker, it recorded the inode of the log file and its size
+before the marker in a marker index. The lines are then copied from the marker found after this offset, without
+scanning or ungzipping the rotated files, unless the file with the marker was compressed since.
 
 Options:
     - option-name: directory
@@ -88,6 +93,14 @@ EXAMPLES = '''
 
 logger = logging.getLogger('ExtractLog')
 
+# Index of the markers placed by the loganalyzer tool (ansible/roles/test/files/tools/loganalyzer/loganalyzer.py),
+# {log file path: {marker: [inode, byte offset]}}
+MARKER_INDEX_FILE = '/tmp/extract_log_index.json'
+COPY_BUFFER_SIZE = 1024 * 1024
+# Month abbreviations of the log timestamps, strptime('%b') would depend on the locale
+MONTHS = {name: number for number, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), 1)}
+
 
 def extract_lines(directory, filename, target_string):
     path = os.path.join(directory, filename)
@@ -119,6 +132,15 @@ def extract_number(s):
         return int(ns[0])
 
 
+def strptime_month_name(str_date, fmt):
+    """strptime() of a date starting with '%Y %b', whatever the locale is"""
+    year, month, rest = str_date.split(None, 2)
+    if month.lower() not in MONTHS:
+        raise ValueError("unknown month in date '{}'".format(str_date))
+    str_date = '{} {:02d} {}'.format(year, MONTHS[month.lower()], rest)
+    return datetime.datetime.strptime(str_date, fmt.replace('%b', '%m'))
+
+
 def convert_date(fct, s):
     dt = None
     re_result = re.findall(r'^\S{3}\s{1,2}\d{1,2} \d{2}:\d{2}:\d{2}\.?\d*', s)
@@ -126,16 +148,13 @@ def convert_date(fct, s):
         re_result_with_year = re.findall(r'^\d{4}\s{1}\S{3}\s{1,2}\d{1,2} \d{2}:\d{2}:\d{2}\.?\d*', s)
     else:
         re_result_with_year = list()
-    # Workaround for pytest-ansible
-    loc = locale.getlocale()
-    locale.setlocale(locale.LC_ALL, (None, None))
 
     if len(re_result) > 0:
         str_date = '{:04d} '.format(fct.year) + re_result[0]
         try:
-            dt = datetime.datetime.strptime(str_date, '%Y %b %d %X.%f')
+            dt = strptime_month_name(str_date, '%Y %b %d %H:%M:%S.%f')
         except ValueError:
-            dt = datetime.datetime.strptime(str_date, '%Y %b %d %X')
+            dt = strptime_month_name(str_date, '%Y %b %d %H:%M:%S')
         # Handle the wrap around of year (Dec 31 to Jan 1)
         # Generally, last metadata change time should be larger than generated log message timestamp
         # but we still perform some wrap around test to avoid the race condition
@@ -144,29 +163,27 @@ def convert_date(fct, s):
             dt.replace(year=dt.year - 1)
     elif len(re_result_with_year) > 0:
         str_date = re_result_with_year[0]
-        dt = datetime.datetime.strptime(str_date, '%Y %b %d %X.%f')
+        dt = strptime_month_name(str_date, '%Y %b %d %H:%M:%S.%f')
     else:
         re_result = re.findall(
             r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{6}', s)
         if len(re_result) > 0:
             str_date = re_result[0]
             str_date = str_date.replace("T", " ")
-            dt = datetime.datetime.strptime(str_date, '%Y-%m-%d %X.%f')
+            dt = datetime.datetime.strptime(str_date, '%Y-%m-%d %H:%M:%S.%f')
         else:
             re_result = re.findall(
                 r'^\d{4}-\d{2}-\d{2}\.\d{2}:\d{2}:\d{2}\.\d{6}', s)
             if len(re_result) > 0:
                 str_date = re_result[0]
-                dt = datetime.datetime.strptime(str_date, '%Y-%m-%d.%X.%f')
+                dt = datetime.datetime.strptime(str_date, '%Y-%m-%d.%H:%M:%S.%f')
 
             else:
                 re_result = re.findall(
                     r'^\d{4} \w{3} \d{2} \d{2}:\d{2}:\d{2}\.\d{6}', s)
                 if len(re_result) > 0:
                     str_date = re_result[0]
-                    dt = datetime.datetime.strptime(str_date, '%Y %b %d %H:%M:%S.%f')
-
-    locale.setlocale(locale.LC_ALL, loc)
+                    dt = strptime_month_name(str_date, '%Y %b %d %H:%M:%S.%f')
 
     if dt is None:
         dt = datetime.datetime.min
@@ -285,11 +302,88 @@ def combine_logs_and_save(directory, filenames, start_string, target_string, tar
                 path, line_processed, line_copied))
 
 
-def extract_log(directory, prefixname, target_string, target_filename):
+def load_marker_index(path, marker):
+    """Returns the (inode, offset) recorded for @marker in the log file @path,
+    None if the marker is not in the marker index"""
+    try:
+        with open(MARKER_INDEX_FILE) as f:
+            entry = json.load(f).get(os.path.normpath(path), {}).get(marker)
+    except (IOError, OSError, ValueError, AttributeError):
+        return None
+    return tuple(entry) if entry else None
+
+
+def find_line_offset(path, offset, target_string):
+    """Returns the offset of the first line with @target_string at or after @offset
+    in the file @path, None if there is no such line"""
+    target = target_string.encode('utf-8')
+    with open(path, 'rb') as file:
+        file.seek(offset)
+        for line in file:
+            if target in line and b'extract_log' not in line:
+                return offset
+            offset += len(line)
+    return None
+
+
+def open_log(path):
+    if 'gz' in path:
+        return gzip.open(path, mode='rb')
+    return open(path, 'rb')
+
+
+def extract_log_with_index(directory, prefixname, filenames, target_string, target_filename):
+    """Copies the lines from @target_string to the end of the logs, starting at the position
+    recorded in the marker index.
+    Returns False if the marker can't be found this way, e.g. not indexed or its file was compressed"""
+    entry = load_marker_index(os.path.join(directory, prefixname), target_string)
+    if entry is None:
+        logger.debug("extract_log no marker index entry for {}".format(target_string.replace("start-", "")))
+        return False
+    inode, offset = entry
+
+    # The file keeps its inode when it is renamed by logrotate, but not when it is compressed
+    for index, filename in enumerate(filenames):
+        path = os.path.join(directory, filename)
+        if 'gz' in filename:
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if stat.st_ino == inode:
+            break
+    else:
+        logger.debug("extract_log marker file with inode {} was rotated out".format(inode))
+        return False
+
+    start = find_line_offset(path, offset, target_string) if stat.st_size >= offset else None
+    if start is None:
+        logger.debug("extract_log marker not found in {} after offset {}".format(path, offset))
+        return False
+    logger.debug("extract_log start file {} offset {}, subsequent files {}".format(
+        filename, start, filenames[:index]))
+
+    with open(target_filename, 'wb') as fp:
+        with open(path, 'rb') as file:
+            file.seek(start)
+            shutil.copyfileobj(file, fp, COPY_BUFFER_SIZE)
+        for filename in reversed(filenames[:index]):
+            with open_log(os.path.join(directory, filename)) as file:
+                shutil.copyfileobj(file, fp, COPY_BUFFER_SIZE)
+    return True
+
+
+def extract_log(directory, prefixname, target_string, target_filename, use_marker_index=True):
     logger.debug("extract_log for start string {}".format(
         target_string.replace("start-", "")))
+    start_time = time.time()
     filenames = list_files(directory, prefixname)
     logger.debug("extract_log from files {}".format(filenames))
+    if use_marker_index and extract_log_with_index(directory, prefixname, filenames, target_string,
+                                                   target_filename):
+        logger.debug("extract_log with marker index done in {:.3f}s".format(time.time() - start_time))
+        return
     file_with_latest_line, file_create_time, latest_line, file_size = extract_latest_line_with_string(
         directory, filenames, target_string)
     m = hashlib.md5()
@@ -302,6 +396,7 @@ def extract_log(directory, prefixname, target_string, target_filename):
                           latest_line, target_string, target_filename)
     filenames = list_files(directory, prefixname)
     logger.debug("extract_log check logs files {}".format(filenames))
+    logger.debug("extract_log by scanning files done in {:.3f}s".format(time.time() - start_time))
 
 
 def main():
@@ -2,17 +2,27 @@
 from __future__ import print_function
 from ansible.module_utils.basic import AnsibleModule
 import calendar
+import hashlib
+import inspect
 import os
+import re
 import sys
+import tempfile
 import traceback
 import json
 import time
 import ipaddr as ipaddress
 from collections import defaultdict
 from natsort import natsorted
-from ansible.module_utils.port_utils import get_port_alias_to_name_map, get_port_indices_for_asic
+try:
+    from ansible.module_utils.port_utils import get_port_alias_to_name_map, get_port_indices_for_asic
+    from ansible.module_utils.misc_utils import code_fingerprint
+except ImportError:
+    # Add parent dir for using outside Ansible
+    sys.path.append('..')
+    from module_utils.port_utils import get_port_alias_to_name_map, get_port_indices_for_asic
+    from module_utils.misc_utils import code_fingerprint
 from lxml import etree as ET
-from lxml.etree import QName
 
 
 DOCUMENTATION = '''
@@ -29,6 +39,15 @@ options:
         description:
             - Set to target snmp server (normally {{inventory_hostname}})
         required: true
+    namespace:
+        description:
+            - Namespace of the asic to retrieve the facts of, the facts of the host if not set
+        required: false
+    cache:
+        description:
+            - Reuse the facts cached for the minigraph file and namespace while they are up to date
+        required: false
+        default: true
 '''
 
 EXAMPLES = '''
@@ -42,9 +61,36 @@ ns1 = "http://schemas.datacontract.org/2004/07/Microsoft.Search.Autopilot.Evolut
 ns2 = "Microsoft.Search.Autopilot.NetMux"
 ns3 = "http://www.w3.org/2001/XMLSchema-instance"
 
+
+class TagMap(dict):
+    """Tags of a namespace in the '{namespace}name' form of lxml, built once per name."""
+
+    def __init__(self, namespace):
+        super(TagMap, self).__init__()
+        self.namespace = namespace
+
+    def __missing__(self, name):
+        tag = self[name] = "{%s}%s" % (self.namespace, name)
+        return tag
+
+
+TAG = TagMap(ns)
+TAG1 = TagMap(ns1)
+TAG2 = TagMap(ns2)
+XSI_TYPE = TagMap(ns3)["type"]
+
+# Top level elements of the minigraph used by parse_xml()
+MINIGRAPH_SECTIONS = frozenset(TAG[name] for name in (
+    "CpgDec", "DpgDec", "PngDec", "UngDec", "MetadataDeclaration", "LinkMetadataDeclaration", "Hostname", "HwSku"))
+
 ANSIBLE_USER_MINIGRAPH_PATH = os.path.expanduser('~/.ansible/minigraph')
 ANSIBLE_LOCAL_MINIGRAPH_PATH = '{}.xml'
 ANSIBLE_USER_MINIGRAPH_MAX_AGE = 86400  # 24-hours (in seconds)
+# Cache of the facts parsed from a minigraph, per minigraph file and namespace
+MINIGRAPH_FACTS_CACHE_PATH = os.path.join(ANSIBLE_USER_MINIGRAPH_PATH, 'facts')
+# Version of the format of the cached facts, the cached facts of other versions are parsed again
+MINIGRAPH_FACTS_CACHE_VERSION = 1
+ASIC_NAME_RE = re.compile(r'^asic\d+$')
 backend_device_types = ['BackEndToRRouter', 'BackEndLeafRouter']
 VLAN_SUB_INTERFACE_VLAN_ID = '10'
 VLAN_SUB_INTERFACE_SEPARATOR = '.'
@@ -61,11 +107,11 @@ class minigraph_encoder(json.JSONEncoder):
 def parse_asic_internal_link(link, asic_name, hostname):
     neighbors = {}
     port_speeds = {}
-    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-    endport = link.find(str(QName(ns, "EndPort"))).text
-    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-    startport = link.find(str(QName(ns, "StartPort"))).text
-    bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+    enddevice = link.find(TAG["EndDevice"]).text
+    endport = link.find(TAG["EndPort"]).text
+    startdevice = link.find(TAG["StartDevice"]).text
+    startport = link.find(TAG["StartPort"]).text
+    bandwidth_node = link.find(TAG["Bandwidth"])
     bandwidth = bandwidth_node.text if bandwidth_node is not None else None
     if ((enddevice.lower() == asic_name.lower()) and
             (startdevice.lower() != hostname.lower())):
@@ -88,11 +134,11 @@ def parse_asic_internal_link(link, asic_name, hostname):
 def parse_asic_external_link(link, asic_name, hostname):
     neighbors = {}
     port_speeds = {}
-    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-    endport = link.find(str(QName(ns, "EndPort"))).text
-    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-    startport = link.find(str(QName(ns, "StartPort"))).text
-    bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+    enddevice = link.find(TAG["EndDevice"]).text
+    endport = link.find(TAG["EndPort"]).text
+    startdevice = link.find(TAG["StartDevice"]).text
+    startport = link.find(TAG["StartPort"]).text
+    bandwidth_node = link.find(TAG["Bandwidth"])
     bandwidth = bandwidth_node.text if bandwidth_node is not None else None
     # if chassis internal is false, the interface name will be
     # interface alias which should be converted to asic port name
@@ -119,14 +165,14 @@ def parse_asic_png(png, asic_name, hostname):
     devices = {}
     port_speeds = {}
     for child in png:
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, "DeviceLinkBase"))):
+        if child.tag == TAG["DeviceInterfaceLinks"]:
+            for link in child.findall(TAG["DeviceLinkBase"]):
                 # Chassis internal node is used in multi-asic device or chassis minigraph
                 # where the minigraph will contain the internal asic connectivity and
                 # external neighbor information. The ChassisInternal node will be used to
                 # determine if the link is internal to the device or chassis.
                 chassis_internal_node = link.find(
-                    str(QName(ns, "ChassisInternal")))
+                    TAG["ChassisInternal"])
                 chassis_internal = chassis_internal_node.text if chassis_internal_node is not None else "false"
 
                 # If the link is an external link include the external neighbor
@@ -142,26 +188,26 @@ def parse_asic_png(png, asic_name, hostname):
                     neighbors.update(int_neighbors)
                     port_speeds.update(int_port_speeds)
 
-        if child.tag == str(QName(ns, "Devices")):
-            for device in child.findall(str(QName(ns, "Device"))):
+        if child.tag == TAG["Devices"]:
+            for device in child.findall(TAG["Device"]):
                 lo_addr = None
                 # don't shadow type()
                 d_type = None
                 mgmt_addr = None
                 hwsku = None
-                if str(QName(ns3, "type")) in device.attrib:
-                    d_type = device.attrib[str(QName(ns3, "type"))]
+                if XSI_TYPE in device.attrib:
+                    d_type = device.attrib[XSI_TYPE]
 
                 for node in device:
-                    if node.tag == str(QName(ns, "Address")):
+                    if node.tag == TAG["Address"]:
                         lo_addr = node.find(
-                            str(QName(ns2, "IPPrefix"))).text.split('/')[0]
-                    elif node.tag == str(QName(ns, "ManagementAddress")):
+                            TAG2["IPPrefix"]).text.split('/')[0]
+                    elif node.tag == TAG["ManagementAddress"]:
                         mgmt_addr = node.find(
-                            str(QName(ns2, "IPPrefix"))).text.split('/')[0]
-                    elif node.tag == str(QName(ns, "Hostname")):
+                            TAG2["IPPrefix"]).text.split('/')[0]
+                    elif node.tag == TAG["Hostname"]:
                         name = node.text
-                    elif node.tag == str(QName(ns, "HwSku")):
+                    elif node.tag == TAG["HwSku"]:
                         hwsku = node.text
 
                 devices[name] = {'lo_addr': lo_addr, 'type': d_type,
@@ -188,16 +234,16 @@ def parse_png(png, hname):
         namespace_list = ['']
 
     for child in png:
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, "DeviceLinkBase"))):
-                linktype = link.find(str(QName(ns, "ElementType"))).text
+        if child.tag == TAG["DeviceInterfaceLinks"]:
+            for link in child.findall(TAG["DeviceLinkBase"]):
+                linktype = link.find(TAG["ElementType"]).text
                 if linktype != "DeviceInterfaceLink" and linktype != "UnderlayInterfaceLink":
                     continue
 
-                enddevice = link.find(str(QName(ns, "EndDevice"))).text
-                endport = link.find(str(QName(ns, "EndPort"))).text
-                startdevice = link.find(str(QName(ns, "StartDevice"))).text
-                startport = link.find(str(QName(ns, "StartPort"))).text
+                enddevice = link.find(TAG["EndDevice"]).text
+                endport = link.find(TAG["EndPort"]).text
+                startdevice = link.find(TAG["StartDevice"]).text
+                startport = link.find(TAG["StartPort"]).text
 
                 if enddevice == hname:
                     if endport in port_alias_to_name_map:
@@ -216,8 +262,8 @@ def parse_png(png, hname):
                         neighbors[startport] = {
                             'name': enddevice, 'port': endport, 'namespace': ''}
 
-        if child.tag == str(QName(ns, "Devices")):
-            for device in child.findall(str(QName(ns, "Device"))):
+        if child.tag == TAG["Devices"]:
+            for device in child.findall(TAG["Device"]):
                 lo_addr = None
                 # don't shadow type()
                 d_type = None
@@ -225,43 +271,43 @@ def parse_png(png, hname):
                 hwsku = None
 
                 for node in device:
-                    if node.tag == str(QName(ns, "Address")):
+                    if node.tag == TAG["Address"]:
                         lo_addr = node.find(
-                            str(QName(ns2, "IPPrefix"))).text.split('/')[0]
-                    elif node.tag == str(QName(ns, "ManagementAddress")):
+                            TAG2["IPPrefix"]).text.split('/')[0]
+                    elif node.tag == TAG["ManagementAddress"]:
                         mgmt_addr = node.find(
-                            str(QName(ns2, "IPPrefix"))).text.split('/')[0]
-                    elif node.tag == str(QName(ns, "Hostname")):
+                            TAG2["IPPrefix"]).text.split('/')[0]
+                    elif node.tag == TAG["Hostname"]:
                         name = node.text
-                    elif node.tag == str(QName(ns, "HwSku")):
+                    elif node.tag == TAG["HwSku"]:
                         hwsku = node.text
-                    elif node.tag == str(QName(ns, "ElementType")):
+                    elif node.tag == TAG["ElementType"]:
                         d_type = node.text
 
                 if name.lower() in namespace_list:
                     continue
 
-                if d_type is None and str(QName(ns3, "type")) in device.attrib:
-                    d_type = device.attrib[str(QName(ns3, "type"))]
+                if d_type is None and XSI_TYPE in device.attrib:
+                    d_type = device.attrib[XSI_TYPE]
 
                 devices[name] = {'lo_addr': lo_addr, 'type': d_type,
                                  'mgmt_addr': mgmt_addr, 'hwsku': hwsku}
 
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for if_link in child.findall(str(QName(ns, 'DeviceLinkBase'))):
-                if str(QName(ns3, "type")) in if_link.attrib:
-                    link_type = if_link.attrib[str(QName(ns3, "type"))]
+        if child.tag == TAG["DeviceInterfaceLinks"]:
+            for if_link in child.findall(TAG["DeviceLinkBase"]):
+                if XSI_TYPE in if_link.attrib:
+                    link_type = if_link.attrib[XSI_TYPE]
                     if link_type == 'DeviceSerialLink':
                         for node in if_link:
-                            if node.tag == str(QName(ns, "EndPort")):
+                            if node.tag == TAG["EndPort"]:
                                 console_port = node.text.split()[-1]
-                            elif node.tag == str(QName(ns, "EndDevice")):
+                            elif node.tag == TAG["EndDevice"]:
                                 console_dev = node.text
                     elif link_type == 'DeviceMgmtLink':
                         for node in if_link:
-                            if node.tag == str(QName(ns, "EndPort")):
+                            if node.tag == TAG["EndPort"]:
                                 mgmt_port = node.text.split()[-1]
-                            elif node.tag == str(QName(ns, "EndDevice")):
+                            elif node.tag == TAG["EndDevice"]:
                                 mgmt_dev = node.text
 
     for k, v in neighbors.items():
@@ -271,11 +317,11 @@ def parse_png(png, hname):
 
 
 def parse_loopback_intf(child):
-    lointfs = child.find(str(QName(ns, "LoopbackIPInterfaces")))
+    lointfs = child.find(TAG["LoopbackIPInterfaces"])
     lo_intfs = []
-    for lointf in lointfs.findall(str(QName(ns1, "LoopbackIPInterface"))):
-        intfname = lointf.find(str(QName(ns, "AttachTo"))).text
-        ipprefix = lointf.find(str(QName(ns1, "PrefixStr"))).text
+    for lointf in lointfs.findall(TAG1["LoopbackIPInterface"]):
+        intfname = lointf.find(TAG["AttachTo"]).text
+        ipprefix = lointf.find(TAG1["PrefixStr"]).text
         ipn = ipaddress.IPNetwork(ipprefix)
         ipaddr = ipn.ip
         prefix_len = ipn.prefixlen
@@ -291,7 +337,7 @@ def parse_loopback_intf(child):
 
 def parse_host_loopback(dpg, hname):
     for child in dpg:
-        hostname = child.find(str(QName(ns, "Hostname")))
+        hostname = child.find(TAG["Hostname"])
         if hostname.text.lower() != hname.lower():
             continue
         lo_intfs = parse_loopback_intf(child)
@@ -334,41 +380,41 @@ def parse_dpg(dpg, hname):
         return intf
 
     for child in dpg:
-        hostname = child.find(str(QName(ns, "Hostname")))
+        hostname = child.find(TAG["Hostname"])
         if hostname.text.lower() != hname.lower():
             continue
 
-        ipintfs = child.find(str(QName(ns, "IPInterfaces")))
+        ipintfs = child.find(TAG["IPInterfaces"])
         intfs = []
-        for ipintf in ipintfs.findall(str(QName(ns, "IPInterface"))):
-            intfalias = ipintf.find(str(QName(ns, "AttachTo"))).text
+        for ipintf in ipintfs.findall(TAG["IPInterface"]):
+            intfalias = ipintf.find(TAG["AttachTo"]).text
             if intfalias in port_alias_to_name_map:
                 intfname = port_alias_to_name_map[intfalias]
             elif intfalias in port_alias_asic_map:
                 intfname = port_alias_asic_map[intfalias]
             else:
                 intfname = intfalias
-            ipprefix = ipintf.find(str(QName(ns, "Prefix"))).text
+            ipprefix = ipintf.find(TAG["Prefix"]).text
             intfs.append(_parse_intf(intfname, ipprefix))
             ports[intfname] = {'name': intfname, 'alias': intfalias}
 
         lo_intfs = parse_loopback_intf(child)
 
-        subintfs = child.find(str(QName(ns, "SubInterfaces")))
+        subintfs = child.find(TAG["SubInterfaces"])
         if subintfs is not None:
-            for subintf in subintfs.findall(str(QName(ns, "SubInterface"))):
-                intfalias = subintf.find(str(QName(ns, "AttachTo"))).text
+            for subintf in subintfs.findall(TAG["SubInterface"]):
+                intfalias = subintf.find(TAG["AttachTo"]).text
                 intfname = port_alias_to_name_map.get(intfalias, intfalias)
-                ipprefix = subintf.find(str(QName(ns, "Prefix"))).text
-                subintfvlan = subintf.find(str(QName(ns, "Vlan"))).text
+                ipprefix = subintf.find(TAG["Prefix"]).text
+                subintfvlan = subintf.find(TAG["Vlan"]).text
                 subintfname = intfname + VLAN_SUB_INTERFACE_SEPARATOR + subintfvlan
                 intfs.append(_parse_intf(subintfname, ipprefix))
 
-        mgmtintfs = child.find(str(QName(ns, "ManagementIPInterfaces")))
+        mgmtintfs = child.find(TAG["ManagementIPInterfaces"])
         mgmt_intf = None
-        for mgmtintf in mgmtintfs.findall(str(QName(ns1, "ManagementIPInterface"))):
-            intfname = mgmtintf.find(str(QName(ns, "AttachTo"))).text
-            ipprefix = mgmtintf.find(str(QName(ns1, "PrefixStr"))).text
+        for mgmtintf in mgmtintfs.findall(TAG1["ManagementIPInterface"]):
+            intfname = mgmtintf.find(TAG["AttachTo"]).text
+            ipprefix = mgmtintf.find(TAG1["PrefixStr"]).text
             mgmtipn = ipaddress.IPNetwork(ipprefix)
             gwaddr = ipaddress.IPAddress(int(mgmtipn.network) + 1)
             # Prefer IPv4 if present; otherwise fall back to IPv6 so that
@@ -400,11 +446,11 @@ def parse_dpg(dpg, hname):
                         'gwaddr': gwaddr
                     }
 
-        pcintfs = child.find(str(QName(ns, "PortChannelInterfaces")))
+        pcintfs = child.find(TAG["PortChannelInterfaces"])
         pcs = {}
-        for pcintf in pcintfs.findall(str(QName(ns, "PortChannel"))):
-            pcintfname = pcintf.find(str(QName(ns, "Name"))).text
-            pcintfmbr = pcintf.find(str(QName(ns, "AttachTo"))).text
+        for pcintf in pcintfs.findall(TAG["PortChannel"]):
+            pcintfname = pcintf.find(TAG["Name"]).text
+            pcintfmbr = pcintf.find(TAG["AttachTo"]).text
             pcmbr_list = pcintfmbr.split(';')
             for i, member in enumerate(pcmbr_list):
                 if member in port_alias_to_name_map:
@@ -420,28 +466,28 @@ def parse_dpg(dpg, hname):
             pcs[pcintfname] = {'name': pcintfname, 'members': pcmbr_list}
             pcs[pcintfname] = {'name': pcintfname,
                                'members': pcmbr_list, 'namespace': ''}
-            fallback_node = pcintf.find(str(QName(ns, "Fallback")))
+            fallback_node = pcintf.find(TAG["Fallback"])
             if fallback_node is not None:
                 pcs[pcintfname]['fallback'] = fallback_node.text
             ports.pop(pcintfname, None)
 
-        vlanintfs = child.find(str(QName(ns, "VlanInterfaces")))
+        vlanintfs = child.find(TAG["VlanInterfaces"])
         dhcp_servers = []
         dhcpv6_servers = []
         vlans = {}
-        for vintf in vlanintfs.findall(str(QName(ns, "VlanInterface"))):
-            vintfname = vintf.find(str(QName(ns, "Name"))).text
-            vlanid = vintf.find(str(QName(ns, "VlanID"))).text
-            vintfmbr = vintf.find(str(QName(ns, "AttachTo"))).text
-            vintftype = vintf.find(str(QName(ns, "Type")))
+        for vintf in vlanintfs.findall(TAG["VlanInterface"]):
+            vintfname = vintf.find(TAG["Name"]).text
+            vlanid = vintf.find(TAG["VlanID"]).text
+            vintfmbr = vintf.find(TAG["AttachTo"]).text
+            vintftype = vintf.find(TAG["Type"])
             vmbr_list = vintfmbr.split(';')
-            vintf_node = vintf.find(str(QName(ns, "DhcpRelays")))
+            vintf_node = vintf.find(TAG["DhcpRelays"])
             if vintf_node is not None and vintf_node.text is not None:
                 vlandhcpservers = vintf_node.text
             else:
                 vlandhcpservers = ""
             dhcp_servers = vlandhcpservers.split(";")
-            vintf_node = vintf.find(str(QName(ns, "Dhcpv6Relays")))
+            vintf_node = vintf.find(TAG["Dhcpv6Relays"])
             if vintf_node is not None and vintf_node.text is not None:
                 vlandhcpservers = vintf_node.text
             else:
@@ -461,12 +507,12 @@ def parse_dpg(dpg, hname):
             vlans[vintfname] = vlan_attributes
             ports.pop(vintfname, None)
 
-        aclintfs = child.find(str(QName(ns, "AclInterfaces")))
+        aclintfs = child.find(TAG["AclInterfaces"])
         acls = {}
-        for aclintf in aclintfs.findall(str(QName(ns, "AclInterface"))):
-            aclname = aclintf.find(str(QName(ns, "InAcl"))).text
+        for aclintf in aclintfs.findall(TAG["AclInterface"]):
+            aclname = aclintf.find(TAG["InAcl"]).text
             aclattach = aclintf.find(
-                str(QName(ns, "AttachTo"))).text.split(';')
+                TAG["AttachTo"]).text.split(';')
             acl_intfs = []
             for member in aclattach:
                 member = member.strip()
@@ -489,38 +535,42 @@ def parse_cpg(cpg, hname):
     bgp_sessions = []
     myasn = None
     bgp_peers_with_range = []
+    # BGP sessions by peer name, to set the ASN of the peers in a single pass over the routers
+    peer_sessions = defaultdict(list)
     for child in cpg:
         tag = child.tag
-        if tag == str(QName(ns, "PeeringSessions")):
-            for session in child.findall(str(QName(ns, "BGPSession"))):
-                start_router = session.find(str(QName(ns, "StartRouter"))).text
-                start_peer = session.find(str(QName(ns, "StartPeer"))).text
-                end_router = session.find(str(QName(ns, "EndRouter"))).text
-                end_peer = session.find(str(QName(ns, "EndPeer"))).text
+        if tag == TAG["PeeringSessions"]:
+            for session in child.findall(TAG["BGPSession"]):
+                start_router = session.find(TAG["StartRouter"]).text
+                start_peer = session.find(TAG["StartPeer"]).text
+                end_router = session.find(TAG["EndRouter"]).text
+                end_peer = session.find(TAG["EndPeer"]).text
                 if end_router == hname:
-                    bgp_sessions.append({
+                    bgp_session = {
                         'name': start_router,
                         'addr': start_peer,
                         'peer_addr': end_peer
-                    })
+                    }
                 else:
-                    bgp_sessions.append({
+                    bgp_session = {
                         'name': end_router,
                         'addr': end_peer,
                         'peer_addr': start_peer
-                    })
-        elif child.tag == str(QName(ns, "Routers")):
-            for router in child.findall(str(QName(ns1, "BGPRouterDeclaration"))):
-                asn = router.find(str(QName(ns1, "ASN"))).text
-                hostname = router.find(str(QName(ns1, "Hostname"))).text
+                    }
+                bgp_sessions.append(bgp_session)
+                peer_sessions[bgp_session['name']].append(bgp_session)
+        elif child.tag == TAG["Routers"]:
+            for router in child.findall(TAG1["BGPRouterDeclaration"]):
+                asn = router.find(TAG1["ASN"]).text
+                hostname = router.find(TAG1["Hostname"]).text
                 if hostname == hname:
                     myasn = int(asn)
-                    peers = router.find(str(QName(ns1, "Peers")))
-                    for bgpPeer in peers.findall(str(QName(ns, "BGPPeer"))):
-                        if bgpPeer.find(str(QName(ns1, "PeersRange"))) is not None:
-                            name = bgpPeer.find(str(QName(ns1, "Name"))).text
+                    peers = router.find(TAG1["Peers"])
+                    for bgpPeer in peers.findall(TAG["BGPPeer"]):
+                        if bgpPeer.find(TAG1["PeersRange"]) is not None:
+                            name = bgpPeer.find(TAG1["Name"]).text
                             ip_range = bgpPeer.find(
-                                str(QName(ns1, "PeersRange"))).text
+                                TAG1["PeersRange"]).text
                             ip_range_group = ip_range.split(
                                 ';') if ip_range and ip_range != "" else []
                             bgp_peers_with_range.append({
@@ -529,9 +579,8 @@ def parse_cpg(cpg, hname):
                             })
 
                 else:
-                    for bgp_session in bgp_sessions:
-                        if hostname == bgp_session['name']:
-                            bgp_session['asn'] = int(asn)
+                    for bgp_session in peer_sessions.get(hostname, []):
+                        bgp_session['asn'] = int(asn)
 
     return bgp_sessions, myasn, bgp_peers_with_range
 
@@ -543,13 +592,13 @@ def parse_meta(meta, hname):
     deployment_id = None
     resource_type = None
     zebra_nexthop = None
-    device_metas = meta.find(str(QName(ns, "Devices")))
-    for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-        if device.find(str(QName(ns1, "Name"))).text == hname:
-            properties = device.find(str(QName(ns1, "Properties")))
-            for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                name = device_property.find(str(QName(ns1, "Name"))).text
-                value = device_property.find(str(QName(ns1, "Value"))).text
+    device_metas = meta.find(TAG["Devices"])
+    for device in device_metas.findall(TAG1["DeviceMetadata"]):
+        if device.find(TAG1["Name"]).text == hname:
+            properties = device.find(TAG1["Properties"])
+            for device_property in properties.findall(TAG1["DeviceProperty"]):
+                name = device_property.find(TAG1["Name"]).text
+                value = device_property.find(TAG1["Value"]).text
                 value_group = value.split(';') if value and value != "" else []
                 if name == "NtpResources":
                     ntp_servers = value_group
@@ -619,7 +668,7 @@ def reconcile_mini_graph_locations(filename, hostname):
 
     :param filename: the filename to load (may be None)
     :param hostname: the hostname to load (required)
-    :return: tuple(the absolute filepath of the {cached,loaded} mini-graph, the root node of the loaded graph)
+    :return: the absolute filepath of the {cached,loaded} mini-graph
     """
     if filename is not None:
         # literal filename specified. read directly from the file.
@@ -628,8 +677,24 @@ def reconcile_mini_graph_locations(filename, hostname):
         # only the hostname was specified, determine the output path
         mini_graph_path = '/etc/sonic/minigraph.xml'
 
-    root = ET.parse(mini_graph_path).getroot()
-    return mini_graph_path, root
+    return mini_graph_path
+
+
+def read_minigraph_sections(mini_graph_path):
+    """
+    Read the minigraph, keeping only the top level elements used by parse_minigraph_sections().
+
+    The tree is built by lxml in C and its top level is walked once. lxml.etree.iterparse() only keeps the top
+    level elements as well, but it runs Python code for every element and is 2-3 times slower on large minigraphs.
+
+    :param mini_graph_path: the path of the minigraph
+    :return: dict of the top level elements by tag, the last one for a tag appearing several times
+    """
+    sections = {}
+    for child in ET.parse(mini_graph_path).getroot():
+        if child.tag in MINIGRAPH_SECTIONS:
+            sections[child.tag] = child
+    return sections
 
 
 def port_alias_to_name_map_50G(all_ports, s100G_ports):
@@ -650,19 +715,19 @@ def port_alias_to_name_map_50G(all_ports, s100G_ports):
 
 
 def parse_linkmeta(meta, hname):
-    link = meta.find(str(QName(ns, "Link")))
+    link = meta.find(TAG["Link"])
     macsec_neighbors = []
     macsec_enabled_ports = []
-    for linkmeta in link.findall(str(QName(ns1, "LinkMetadata"))):
-        linkprop = linkmeta.find(str(QName(ns1, "Properties")))
-        linkdevprop = linkprop.find(str(QName(ns1, "DeviceProperty")))
-        macsec_en_name = linkdevprop.find(str(QName(ns1, "Name"))).text
+    for linkmeta in link.findall(TAG1["LinkMetadata"]):
+        linkprop = linkmeta.find(TAG1["Properties"])
+        linkdevprop = linkprop.find(TAG1["DeviceProperty"])
+        macsec_en_name = linkdevprop.find(TAG1["Name"]).text
         if macsec_en_name == "MacSecEnabled":
-            macsec_en_lnk = linkdevprop.find(str(QName(ns1, "Value"))).text
+            macsec_en_lnk = linkdevprop.find(TAG1["Value"]).text
             if macsec_en_lnk:
                 local_port = None
                 # Sample: ARISTA05T1:Ethernet1/33;switch-t0:fortyGigE0/4
-                key = linkmeta.find(str(QName(ns1, "Key"))).text
+                key = linkmeta.find(TAG1["Key"]).text
                 endpoints = key.split(';')
                 local_endpoint = endpoints[1]
                 remote_endpoint = endpoints[0]
@@ -679,8 +744,11 @@ def parse_linkmeta(meta, hname):
 
 
 def parse_xml(filename, hostname, asic_name=None):
-    mini_graph_path, root = reconcile_mini_graph_locations(filename, hostname)
+    mini_graph_path = reconcile_mini_graph_locations(filename, hostname)
+    return parse_minigraph_sections(read_minigraph_sections(mini_graph_path), mini_graph_path, asic_name)
 
+
+def parse_minigraph_sections(sections, mini_graph_path, asic_name=None):
     u_neighbors = None
     u_devices = None
     hwsku = None
@@ -715,61 +783,70 @@ def parse_xml(filename, hostname, asic_name=None):
     else:
         asic_id = None
 
-    hwsku_qn = QName(ns, "HwSku")
-    hostname_qn = QName(ns, "Hostname")
-    for child in root:
-        if child.tag == str(hwsku_qn):
-            hwsku = child.text
-        if child.tag == str(hostname_qn):
-            hostname = child.text
+    hwsku_node = sections.get(TAG["HwSku"])
+    if hwsku_node is not None:
+        hwsku = hwsku_node.text
+    hostname_node = sections.get(TAG["Hostname"])
+    if hostname_node is not None:
+        hostname = hostname_node.text
 
+    global ports
     global port_alias_to_name_map
     global port_name_to_alias_map
     global port_alias_asic_map
     global port_alias_to_port_asic_alias_map
     global port_name_to_index_map
 
+    # The sections of a minigraph may be parsed for several namespaces in the same process
+    ports = {}
     port_alias_to_name_map, port_alias_asic_map, port_name_to_index_map = get_port_alias_to_name_map(
         hwsku, asic_name)
 
     # Create inverse mapping between port name and alias
     port_name_to_alias_map = {v: k for k, v in port_alias_to_name_map.items()}
 
+    # Map the port alias to the asic port name of the same port
+    port_name_to_asic_alias_map = {v: k for k, v in port_alias_asic_map.items()}
+    port_alias_to_port_asic_alias_map = {}
     for k, v in port_alias_to_name_map.items():
-        for i, j in port_alias_asic_map.items():
-            if v == j:
-                port_alias_to_port_asic_alias_map[k] = i
-
-    for child in root:
-        if asic_name is None:
-            if child.tag == str(QName(ns, "DpgDec")):
-                (intfs, lo_intfs, mgmt_intf, vlans, pcs, acls,
-                 dhcp_servers, dhcpv6_servers) = parse_dpg(child, hostname)
-            elif child.tag == str(QName(ns, "CpgDec")):
-                (bgp_sessions, bgp_asn, bgp_peers_with_range) = parse_cpg(
-                    child, hostname)
-            elif child.tag == str(QName(ns, "PngDec")):
-                (neighbors, devices, console_dev, console_port,
-                 mgmt_dev, mgmt_port) = parse_png(child, hostname)
-            elif child.tag == str(QName(ns, "UngDec")):
-                (u_neighbors, u_devices, _, _, _, _) = parse_png(child, hostname)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
-                (syslog_servers, ntp_servers, mgmt_routes, deployment_id,
-                 resource_type, zebra_nexthop) = parse_meta(child, hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
-                macsec_enabled_ports, macsec_neighbors = parse_linkmeta(child, hostname)
-        else:
-            if child.tag == str(QName(ns, "DpgDec")):
-                (intfs, lo_intfs, mgmt_intf, vlans, pcs, acls,
-                 dhcp_servers, dhcpv6_servers) = parse_dpg(child, asic_name)
-                host_lo_intfs = parse_host_loopback(child, hostname)
-            elif child.tag == str(QName(ns, "CpgDec")):
-                (bgp_sessions, bgp_asn, bgp_peers_with_range) = parse_cpg(
-                    child, asic_name)
-            elif child.tag == str(QName(ns, "PngDec")):
-                (neighbors, devices, _) = parse_asic_png(child, asic_name, hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
-                macsec_enabled_ports, macsec_neighbors = parse_linkmeta(child, hostname)
+        if v in port_name_to_asic_alias_map:
+            port_alias_to_port_asic_alias_map[k] = port_name_to_asic_alias_map[v]
+
+    dpg = sections.get(TAG["DpgDec"])
+    cpg = sections.get(TAG["CpgDec"])
+    png = sections.get(TAG["PngDec"])
+    linkmeta = sections.get(TAG["LinkMetadataDeclaration"])
+    if asic_name is None:
+        if dpg is not None:
+            (intfs, lo_intfs, mgmt_intf, vlans, pcs, acls,
+             dhcp_servers, dhcpv6_servers) = parse_dpg(dpg, hostname)
+        if cpg is not None:
+            (bgp_sessions, bgp_asn, bgp_peers_with_range) = parse_cpg(
+                cpg, hostname)
+        if png is not None:
+            (neighbors, devices, console_dev, console_port,
+             mgmt_dev, mgmt_port) = parse_png(png, hostname)
+        ung = sections.get(TAG["UngDec"])
+        if ung is not None:
+            (u_neighbors, u_devices, _, _, _, _) = parse_png(ung, hostname)
+        meta = sections.get(TAG["MetadataDeclaration"])
+        if meta is not None:
+            (syslog_servers, ntp_servers, mgmt_routes, deployment_id,
+             resource_type, zebra_nexthop) = parse_meta(meta, hostname)
+        if linkmeta is not None:
+            macsec_enabled_ports, macsec_neighbors = parse_linkmeta(linkmeta, hostname)
+    else:
+        if dpg is not None:
+            (intfs, lo_intfs, mgmt_intf, vlans, pcs, acls,
+             dhcp_servers, dhcpv6_servers) = parse_dpg(dpg, asic_name)
+            host_lo_intfs = parse_host_loopback(dpg, hostname)
+        if cpg is not None:
+            (bgp_sessions, bgp_asn, bgp_peers_with_range) = parse_cpg(
+                cpg, asic_name)
+        if png is not None:
+            (neighbors, devices, _) = parse_asic_png(png, asic_name, hostname)
+        if linkmeta is not None:
+            macsec_enabled_ports, macsec_neighbors = parse_linkmeta(linkmeta, hostname)
 
     current_device = [devices[key]
                       for key in devices if key.lower() == hostname.lower()][0]
@@ -918,6 +995,145 @@ port_name_to_alias_map = {}
 port_alias_asic_map = {}
 port_name_to_index_map = {}
 port_alias_to_port_asic_alias_map = {}
+_code_fingerprints = []
+
+
+def minigraph_asic_names(sections):
+    """
+    :param sections: the top level elements of the minigraph, from read_minigraph_sections()
+    :return: the sorted names of the asics having a data plane in the minigraph, like 'asic0'
+    """
+    asic_names = set()
+    dpg = sections.get(TAG["DpgDec"])
+    if dpg is not None:
+        for child in dpg:
+            hostname = child.find(TAG["Hostname"])
+            if hostname is not None and hostname.text and ASIC_NAME_RE.match(hostname.text.lower()):
+                asic_names.add(hostname.text.lower())
+    return natsorted(asic_names)
+
+
+def _file_hash(path):
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def _module_constants():
+    """
+    :return: the sorted names and values of the constants of this module, the sets sorted so that their repr is the
+             same in every run
+    """
+    constants = []
+    for name, value in sorted(globals().items()):
+        if name.startswith('_'):
+            continue
+        if isinstance(value, (set, frozenset)):
+            value = sorted(value)
+        elif isinstance(value, type(ASIC_NAME_RE)):
+            value = value.pattern
+        elif not isinstance(value, (str, int, float, list, tuple)):
+            continue
+        constants.append((name, value))
+    return constants
+
+
+def _facts_inputs(hwsku, asic_name):
+    """
+    Hash of what the facts depend on besides the minigraph: the port maps of the hwsku on this host, the code of
+    this module and of port_utils, and the values of the constants of this module.
+    """
+    if not _code_fingerprints:
+        port_utils = inspect.getmodule(get_port_indices_for_asic)
+        functions = [f for _, f in sorted(globals().items())
+                     if inspect.isfunction(f) and f.__module__ == __name__]
+        functions += [f for _, f in sorted(vars(port_utils).items())
+                      if inspect.isfunction(f) and f.__module__ == port_utils.__name__]
+        _code_fingerprints.append(code_fingerprint(functions, _module_constants()))
+    md5 = hashlib.md5(_code_fingerprints[0].encode('utf-8'))
+    for port_map in get_port_alias_to_name_map(hwsku, asic_name):
+        md5.update(repr(sorted(port_map.items())).encode('utf-8'))
+    return md5.hexdigest()
+
+
+def _facts_cache_file(cache_dir, mini_graph_path, asic_name):
+    key = "{}|{}".format(os.path.realpath(mini_graph_path), asic_name)
+    return os.path.join(cache_dir, "{}.json".format(hashlib.md5(key.encode('utf-8')).hexdigest()))
+
+
+def _load_cached_facts(cache_dir, mini_graph_path, asic_name, file_hash):
+    try:
+        with open(_facts_cache_file(cache_dir, mini_graph_path, asic_name)) as f:
+            entry = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if entry.get('version') != MINIGRAPH_FACTS_CACHE_VERSION or entry.get('file_hash') != file_hash:
+        return None
+    if entry.get('inputs') != _facts_inputs(entry.get('hwsku'), asic_name):
+        return None
+    return entry['facts']
+
+
+def _save_cached_facts(cache_dir, mini_graph_path, asic_name, file_hash, facts):
+    hwsku = facts['minigraph_hwsku']
+    entry = {
+        'version': MINIGRAPH_FACTS_CACHE_VERSION,
+        'file_hash': file_hash,
+        'hwsku': hwsku,
+        'inputs': _facts_inputs(hwsku, asic_name),
+        'facts': facts,
+    }
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        # Write to a temporary file and rename it, so that concurrent runs never read a partial entry
+        fd, tmp_file = tempfile.mkstemp(dir=cache_dir, prefix='.facts.')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entry, f)
+        os.rename(tmp_file, _facts_cache_file(cache_dir, mini_graph_path, asic_name))
+    except (IOError, OSError) as e:
+        print("Warning: failed to cache the minigraph facts: " + repr(e), file=sys.stderr)
+
+
+def get_minigraph_facts(filename, hostname, asic_name=None, cache_dir=MINIGRAPH_FACTS_CACHE_PATH):
+    """
+    Get the facts of the minigraph for a namespace, as returned by parse_xml() once encoded to JSON.
+
+    The facts are cached in cache_dir per minigraph file and namespace, and reused while the content of the file,
+    the port maps of its hwsku, the code of this module and of port_utils and the constants of this module are the
+    same. When the facts are not cached, the minigraph is read once and the facts of the host and of all its asics
+    are cached, so that the calls for the other namespaces of a multi-asic DUT do not parse the minigraph again.
+
+    :param cache_dir: the directory of the cached facts, the facts are not cached if None
+    """
+    mini_graph_path = reconcile_mini_graph_locations(filename, hostname)
+    if cache_dir is None:
+        results = parse_minigraph_sections(read_minigraph_sections(mini_graph_path), mini_graph_path, asic_name)
+        return json.loads(json.dumps(results, cls=minigraph_encoder))
+
+    file_hash = _file_hash(mini_graph_path)
+    facts = _load_cached_facts(cache_dir, mini_graph_path, asic_name, file_hash)
+    if facts is not None:
+        return facts
+
+    sections = read_minigraph_sections(mini_graph_path)
+    results = parse_minigraph_sections(sections, mini_graph_path, asic_name)
+    facts = json.loads(json.dumps(results, cls=minigraph_encoder))
+    _save_cached_facts(cache_dir, mini_graph_path, asic_name, file_hash, facts)
+
+    for other_asic_name in [None] + minigraph_asic_names(sections):
+        if other_asic_name == asic_name:
+            continue
+        try:
+            results = parse_minigraph_sections(sections, mini_graph_path, other_asic_name)
+        except Exception:
+            # Only prefetched, the namespace may not be parsable on this host
+            continue
+        _save_cached_facts(cache_dir, mini_graph_path, other_asic_name, file_hash,
+                           json.loads(json.dumps(results, cls=minigraph_encoder)))
+    return facts
 
 
 def main():
@@ -926,6 +1142,7 @@ def main():
             host=dict(required=True),
             filename=dict(),
             namespace=dict(required=False, default=None),
+            cache=dict(required=False, default=True, type='bool'),
         ),
         supports_check_mode=True
     )
@@ -954,8 +1171,8 @@ def main():
     namespace = m_args['namespace']
 
     try:
-        results = parse_xml(filename, m_args['host'], namespace)
-        results_clean = json.loads(json.dumps(results, cls=minigraph_encoder))
+        cache_dir = MINIGRAPH_FACTS_CACHE_PATH if m_args['cache'] else None
+        results_clean = get_minigraph_facts(filename, m_args['host'], namespace, cache_dir)
         module.exit_json(ansible_facts=results_clean)
     except Exception as e:
         tb = traceback.format_exc()
@@ -4,7 +4,8 @@
 # The ansible builtin module "command" and "shell" can run a single command on the remote device and get its output.
 # This module is to support running multiple commands in sequential and return the results of these commands. This
 # enhancement can reduce some overhead of establishing connection with the remote host when we want to run multiple
-# commands.
+# commands. With option "concurrency", up to that number of commands run at the same time, the results are still
+# returned in the order of the commands.
 #
 # Example of module output:
 # {
@@ -58,6 +59,8 @@
 # }
 
 import datetime
+import shlex
+from multiprocessing.pool import ThreadPool
 
 from ansible.module_utils.basic import AnsibleModule
 
@@ -73,6 +76,8 @@ options:
     cmds: List of commands. Each command should be a string.
     continue_on_fail: Bool. Specify whether to continue running rest of the commands if any of the command failed.
     timeout: Integer. Specify time limit (in second) for each command. 0 means no limit. Default value is 0.
+    concurrency: Integer. Maximum number of commands running at the same time. Default value is 1. Only used when
+        continue_on_fail is True, otherwise the commands run one after another.
 '''
 
 EXAMPLES = r'''
@@ -84,6 +89,14 @@ EXAMPLES = r'''
         - pwd
     continue_on_fail: False
     timeout: 30
+
+# Run commands 8 at a time
+- name: Run multiple commands concurrently on remote host
+  shell_cmds:
+    cmds:
+        - show interfaces counters -i Ethernet0
+        - show interfaces counters -i Ethernet4
+    concurrency: 8
 '''
 
 
@@ -91,16 +104,14 @@ def run_cmd(module, cmd, timeout):
     cmd_with_timeout = ''
     err_msg = ''
 
-    if int(timeout) != 0 and "'" in cmd:
-        err_msg = "[WARNING] timeout is not supported for command contains single quote, ran without time limit"
-        timeout = 0
-
     start = datetime.datetime.now()
     if int(timeout) == 0:
         rc, out, err = module.run_command(cmd, use_unsafe_shell=True)
     else:
-        cmd_with_timeout = "echo '{}' | timeout --preserve-status {} bash".format(cmd, timeout)
-        rc, out, err = module.run_command(cmd_with_timeout, use_unsafe_shell=True)
+        # The command is passed as an argument of bash, not through a shell, so it doesn't need quoting
+        cmd_with_timeout = ['timeout', '--preserve-status', str(timeout), 'bash', '-c', cmd]
+        rc, out, err = module.run_command(cmd_with_timeout)
+        cmd_with_timeout = ' '.join(shlex.quote(arg) for arg in cmd_with_timeout)
     end = datetime.datetime.now()
 
     result = dict(
@@ -125,25 +136,39 @@ def main():
         argument_spec=dict(
             cmds=dict(type='list', required=True),
             continue_on_fail=dict(type='bool', default=True),
-            timeout=dict(type='int', default=0)
+            timeout=dict(type='int', default=0),
+            concurrency=dict(type='int', default=1)
         )
     )
 
     cmds = module.params['cmds']
     continue_on_fail = module.params['continue_on_fail']
     timeout = module.params['timeout']
+    concurrency = module.params['concurrency']
 
     startd = datetime.datetime.now()
 
     results = []
     failed_cmds = []
-    for cmd in cmds:
-        result = run_cmd(module, cmd, timeout)
-        results.append(result)
-        if result['rc'] != 0:
-            failed_cmds.append(cmd)
-            if not continue_on_fail:
-                break
+    if continue_on_fail and concurrency > 1 and len(cmds) > 1:
+        pool = ThreadPool(min(concurrency, len(cmds)))
+        try:
+            # imap keeps the order of the commands
+            for result in pool.imap(lambda cmd: run_cmd(module, cmd, timeout), cmds):
+                results.append(result)
+                if result['rc'] != 0:
+                    failed_cmds.append(result['cmd'])
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for cmd in cmds:
+            result = run_cmd(module, cmd, timeout)
+            results.append(result)
+            if result['rc'] != 0:
+                failed_cmds.append(cmd)
+                if not continue_on_fail:
+                    break
 
     endd = datetime.datetime.now()
     delta = endd - startd
@@ -1,16 +1,59 @@
 import csv
+import glob
+import hashlib
+import inspect
 import os
 import logging
 import ipaddress
+import pickle
+import tempfile
 import six
 from operator import itemgetter
 from itertools import groupby
 from natsort import natsorted
 
 try:
-    from ansible.module_utils.port_utils import get_port_alias_to_name_map
+    from ansible.module_utils import port_utils
+    from ansible.module_utils.port_utils import get_port_maps
+    from ansible.module_utils.misc_utils import code_fingerprint
 except ImportError:
-    from module_utils.port_utils import get_port_alias_to_name_map
+    from module_utils import port_utils
+    from module_utils.port_utils import get_port_maps
+    from module_utils.misc_utils import code_fingerprint
+
+# Default directory of the snapshots of the graph facts
+SNAPSHOT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "sonic-mgmt", "conn_graph")
+
+_code_fingerprints = []
+
+
+def _code_fingerprint():
+    """Hash of the bytecode of the functions of LabGraph and port_utils, and of the port tables of port_utils."""
+    if not _code_fingerprints:
+        functions = [f for _, f in sorted(vars(port_utils).items()) if inspect.isfunction(f)]
+        functions += [f for _, f in sorted(vars(LabGraph).items()) if inspect.isfunction(f)]
+        port_tables = (port_utils.HWSKU_PORT_RANGES, port_utils.HWSKU_PATTERN_PORT_RANGES,
+                       port_utils.DEFAULT_PORT_RANGES, port_utils.PORT_CONFIG_DIRS)
+        _code_fingerprints.append(code_fingerprint(functions, port_tables))
+    return _code_fingerprints[0]
+
+
+def _port_config_sources():
+    """Modification time and size of the port_config.ini files of the hwsku directories, read by port_utils.
+
+    Like port_utils._find_port_config(), <hwsku>/port_config.ini and <hwsku>/<asic index>/port_config.ini of
+    each directory of port_utils.PORT_CONFIG_DIRS are considered.
+    """
+    sources = {}
+    for hwsku_dir in port_utils.PORT_CONFIG_DIRS:
+        for pattern in ("*", os.path.join("*", "*")):
+            for path in glob.glob(os.path.join(hwsku_dir, pattern, "port_config.ini")):
+                try:
+                    stat = os.stat(path)
+                    sources[path] = (stat.st_mtime, stat.st_size)
+                except OSError:
+                    pass
+    return sorted(sources.items())
 
 
 class LabGraph(object):
@@ -25,7 +68,19 @@ class LabGraph(object):
         "serial_links": "sonic_{}_serial_links.csv",
     }
 
-    def __init__(self, path, group, forced_mgmt_routes=None):
+    # Version of the snapshot format, snapshots of other versions are rebuilt
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self, path, group, forced_mgmt_routes=None, snapshot_dir=None):
+        """
+        Args:
+            path (str): Directory of the graph files.
+            group (str): Group name.
+            forced_mgmt_routes (list or str, optional): Management routes added to all the devices.
+            snapshot_dir (str, optional): Directory of the snapshots of the graph facts. When set, the graph facts are
+                loaded from the snapshot of the group if the graph files did not change since it was saved, and
+                csv_facts is left empty. Otherwise the graph files are parsed and a new snapshot is saved.
+        """
         self.path = path
         self.group = group
         self.csv_files = {k: os.path.join(self.path, v.format(group)) for k, v in self.SUPPORTED_CSV_FILES.items()}
@@ -37,12 +92,77 @@ class LabGraph(object):
 
         self._cache_port_alias_to_name = {}
         self._cache_port_name_to_alias = {}
+        self._cache_port_alias_set = {}
+        self._cache_port_name_set = {}
+        self._cache_port_name_index = {}
 
         self.csv_facts = {}
-        self.read_csv_files()
-
         self.graph_facts = {}
+        if snapshot_dir and self._load_snapshot(snapshot_dir):
+            return
+
+        self.read_csv_files()
         self.csv_to_graph_facts()
+        if snapshot_dir:
+            self._save_snapshot(snapshot_dir)
+
+    def _snapshot_file(self, snapshot_dir):
+        key = "{}|{}".format(os.path.realpath(self.path),
+                             sorted(self.forced_mgmt_routes_v4 + self.forced_mgmt_routes_v6))
+        return os.path.join(snapshot_dir, "{}.{}.pickle".format(
+            self.group, hashlib.md5(key.encode("utf-8")).hexdigest()))
+
+    def _snapshot_sources(self):
+        """Modification time and size of the files the graph facts are built from, None for a missing file.
+
+        The graph facts also depend on the code of LabGraph and on the hwsku port maps of port_utils. The modules
+        are not regular files when ansible runs conn_graph_facts, so their code is fingerprinted instead. The port
+        maps may also be read from the port_config.ini files of the hwsku directories.
+        """
+        sources = {"code": _code_fingerprint(), "port_config": _port_config_sources()}
+        for path in sorted(self.csv_files.values()):
+            try:
+                stat = os.stat(path)
+                sources[path] = (stat.st_mtime, stat.st_size)
+            except OSError:
+                sources[path] = None
+        return sources
+
+    def _load_snapshot(self, snapshot_dir):
+        snapshot_file = self._snapshot_file(snapshot_dir)
+        try:
+            with open(snapshot_file, "rb") as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            # A truncated or foreign pickle may raise about anything (AttributeError, ImportError, ValueError...),
+            # the snapshot is then rebuilt
+            logging.debug("Failed to load snapshot {} of group {}: {}".format(snapshot_file, self.group, repr(e)))
+            return False
+        if not isinstance(snapshot, dict):
+            return False
+        if snapshot.get("version") != self.SNAPSHOT_VERSION or snapshot.get("sources") != self._snapshot_sources():
+            logging.debug("Snapshot {} of group {} is outdated".format(snapshot_file, self.group))
+            return False
+        logging.debug("Loaded graph facts of group {} from snapshot {}".format(self.group, snapshot_file))
+        self.graph_facts = snapshot["graph_facts"]
+        return True
+
+    def _save_snapshot(self, snapshot_dir):
+        snapshot = {
+            "version": self.SNAPSHOT_VERSION,
+            "sources": self._snapshot_sources(),
+            "graph_facts": self.graph_facts,
+        }
+        try:
+            if not os.path.isdir(snapshot_dir):
+                os.makedirs(snapshot_dir)
+            # Write to a temporary file and rename it, so that concurrent sessions never read a partial snapshot
+            fd, tmp_file = tempfile.mkstemp(dir=snapshot_dir, prefix=".{}.".format(self.group))
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.rename(tmp_file, self._snapshot_file(snapshot_dir))
+        except (IOError, OSError) as e:
+            logging.warning("Failed to save snapshot of group {}: {}".format(self.group, repr(e)))
 
     def read_csv_files(self):
         for k, v in self.csv_files.items():
@@ -57,6 +177,28 @@ class LabGraph(object):
             reader = csv.DictReader(csvfile)
             return [row for row in reader]
 
+    @classmethod
+    def read_hostnames(cls, path, group):
+        """Read the hostnames of the devices of a group, without reading the other files of its graph.
+
+        Args:
+            path (str): Directory of the graph files.
+            group (str): Group name.
+
+        Returns:
+            set: Hostnames of the devices, empty if the group has no devices file.
+        """
+        devices_file = os.path.join(path, cls.SUPPORTED_CSV_FILES["devices"].format(group))
+        if not os.path.exists(devices_file):
+            return set()
+        with open(devices_file) as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
+            if "Hostname" not in header:
+                return set()
+            column = header.index("Hostname")
+            return set(row[column] for row in reader if len(row) > column)
+
     def _parse_forced_mgmt_routes(self, forced_mgmt_routes):
         routes_v4 = []
         routes_v6 = []
@@ -143,7 +285,7 @@ class LabGraph(object):
     def _get_port_alias_to_name_map(self, hwsku):
         if hwsku in self._cache_port_alias_to_name:
             return self._cache_port_alias_to_name[hwsku]
-        port_alias_to_name_map, _, _ = get_port_alias_to_name_map(hwsku)
+        port_alias_to_name_map, _, _ = get_port_maps(hwsku)
         self._cache_port_alias_to_name[hwsku] = port_alias_to_name_map
         return port_alias_to_name_map
 
@@ -156,6 +298,16 @@ class LabGraph(object):
     def _get_sorted_port_name_list(self, hwsku):
         return natsorted(self._get_port_alias_to_name_map(hwsku).values())
 
+    def _get_port_name_index(self, hwsku):
+        """
+        Retrieve the index of each port name in the sorted port name list of specific hwsku.
+        """
+        if hwsku not in self._cache_port_name_index:
+            self._cache_port_name_index[hwsku] = {
+                name: index for index, name in reversed(list(enumerate(self._get_sorted_port_name_list(hwsku))))
+            }
+        return self._cache_port_name_index[hwsku]
+
     def _get_port_name_to_alias_map(self, hwsku):
         """
         Retrive port name to alias map for specific hwsku.
@@ -172,14 +324,18 @@ class LabGraph(object):
         Retrive port name set of a specific hwsku.
         """
         hwsku = self.graph_facts["devices"][device_hostname]['HwSku']
-        return set(self._get_port_name_to_alias_map(hwsku).keys())
+        if hwsku not in self._cache_port_name_set:
+            self._cache_port_name_set[hwsku] = frozenset(self._get_port_name_to_alias_map(hwsku))
+        return self._cache_port_name_set[hwsku]
 
     def _get_port_alias_set(self, device_hostname):
         """
         Retrive port alias set of a specific hwsku.
         """
         hwsku = self.graph_facts["devices"][device_hostname]['HwSku']
-        return set(self._get_port_alias_to_name_map(hwsku).keys())
+        if hwsku not in self._cache_port_alias_set:
+            self._cache_port_alias_set[hwsku] = frozenset(self._get_port_alias_to_name_map(hwsku))
+        return self._cache_port_alias_set[hwsku]
 
     def csv_to_graph_facts(self):
         devices = {}
@@ -223,14 +379,18 @@ class LabGraph(object):
             ports_group_by_devices[entry['StartDevice']].append(entry['StartPort'])
             ports_group_by_devices[entry['EndDevice']].append(entry['EndPort'])
 
-        convert_alias_to_name = []
+        convert_alias_to_name = set()
         for device, start_ports in links_group_by_devices.items():
             if self.graph_facts["devices"][device].get("Os", "").lower() == "sonic":
-                if any([port not in self._get_port_alias_set(device) and port not in self._get_port_name_set(device) for port in ports_group_by_devices[device]]):  # noqa: E501
+                # The sets are built once per hwsku, not for every port
+                port_alias_set = self._get_port_alias_set(device)
+                port_name_set = self._get_port_name_set(device)
+                device_ports = ports_group_by_devices[device]
+                if any(port not in port_alias_set and port not in port_name_set for port in device_ports):
                     continue
-                elif all([port in self._get_port_alias_set(device) for port in ports_group_by_devices[device]]):
-                    convert_alias_to_name.append(device)
-                elif not all([port in self._get_port_name_set(device) for port in ports_group_by_devices[device]]):
+                elif all(port in port_alias_set for port in device_ports):
+                    convert_alias_to_name.add(device)
+                elif not all(port in port_name_set for port in device_ports):
                     raise Exception(
                         "[Failed] For device {}, please check {} and ensure all ports use "
                         "port name, or ensure all ports use port alias.".format(
@@ -498,20 +658,21 @@ class LabGraph(object):
             else:
                 device_vlan_map_list[hostname] = {}
 
-                sorted_port_name_list = self._get_sorted_port_name_list(device["HwSku"])
+                port_name_index = self._get_port_name_index(device["HwSku"])
 
                 for host_vlan in vlan_list:
                     found_port_for_vlan = False
                     for port_name, port_info in device_port_vlans[hostname].items():
                         if host_vlan in port_info["vlanlist"]:
-                            if port_name in sorted_port_name_list:
-                                port_index = sorted_port_name_list.index(port_name)
+                            if port_name in port_name_index:
+                                port_index = port_name_index[port_name]
                                 device_vlan_map_list[hostname][port_index] = host_vlan
                                 found_port_for_vlan = True
                             elif not ignore_error:
                                 msg = (f"Did not find port for '{port_name}' in the ports based on "
                                        f"hwsku '{device['HwSku']}' for host '{hostname}'")
-                                logging.error("Sorted port name list: {}".format(sorted_port_name_list))
+                                logging.error("Sorted port name list: {}".format(
+                                    self._get_sorted_port_name_list(device["HwSku"])))
                                 logging.error("port_vlans of host {}: {}".format(hostname, device_port_vlans[hostname]))
                                 return (False, msg)
                     if not found_port_for_vlan and not ignore_error:
@@ -1,3 +1,5 @@
+import hashlib
+import inspect
 import time
 
 
@@ -16,3 +18,30 @@ def wait_for_path(ssh, host_ip, path_to_check, empty_ok=False, tries=1, delay=5)
             "" if empty_ok else "not empty ", path_to_check, host_ip, tries
         )
     )
+
+
+def _hash_code(md5, code):
+    # Not the whole marshalled code object, its file name changes every time ansible runs the module
+    md5.update(code.co_code)
+    md5.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            _hash_code(md5, const)
+        elif isinstance(const, frozenset):
+            md5.update(repr(sorted(const, key=repr)).encode("utf-8"))
+        else:
+            md5.update(repr(const).encode("utf-8"))
+
+
+def code_fingerprint(functions, data=None):
+    """Hash of the bytecode of the functions, and of the repr of the data they depend on.
+
+    Used to invalidate results cached on disk by ansible modules when their code changes. The modules are not
+    regular files when ansible runs them, so their code is fingerprinted instead of their files.
+    """
+    md5 = hashlib.md5()
+    for function in functions:
+        _hash_code(md5, function.__code__)
+    if data is not None:
+        md5.update(repr(data).encode("utf-8"))
+    return md5.hexdigest()
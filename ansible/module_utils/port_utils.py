@@ -1,792 +1,645 @@
-def _port_alias_to_name_map_50G(all_ports, s100G_ports,):
-    new_map = {}
-    # 50G ports
-    s50G_ports = list(set(all_ports) - set(s100G_ports))
+import os
+import re
+from collections import namedtuple
+from types import MappingProxyType
 
-    for i in s50G_ports:
-        new_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 1) * 4)
-        new_map["Ethernet%d/3" % i] = "Ethernet%d" % ((i - 1) * 4 + 2)
+# Hwskus whose port index is taken from the port config, instead of being computed from the sorted port names
+HWSKU_WITH_PORT_INDEX_FROM_PORT_CONFIG = ["Cisco-88-LC0-36FH-M-O36",
+                                          "Cisco-88-LC0-36FH-O36",
+                                          "Cisco-8800-LC-48H-C48"]
 
-    for i in s100G_ports:
-        new_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 1) * 4)
+# Directories of hwsku definitions, searched for <hwsku>/port_config.ini (or <hwsku>/<asic index>/port_config.ini
+# for an asic of a multi-asic hwsku), like the device directories of sonic-buildimage. A port_config.ini found
+# there takes precedence over the port tables below.
+PORT_CONFIG_DIRS = [d for d in os.environ.get("SONIC_MGMT_HWSKU_DIRS", "").split(os.pathsep) if d]
 
-    return new_map
+# Columns of a port_config.ini without header line
+PORT_CONFIG_DEFAULT_COLUMNS = ["name", "lanes", "alias", "index"]
 
+NO_LANES = (("", 0),)
 
-def get_port_alias_to_name_map(hwsku, asic_name=None):
+
+def _lanes(labels, step=1):
+    """Lanes of a breakout port: the label used in the alias and the offset of the SONiC port name of each lane."""
+    return tuple((label, index * step) for index, label in enumerate(labels))
+
+
+class PortRange(namedtuple("PortRange", ["alias", "ports", "name", "pitch", "lanes"])):
+    """
+    A range of front panel ports with the same naming.
+
+    For each port of 'ports' and each (label, offset) of 'lanes', the alias is 'alias' formatted with the port and
+    the lane label, and the SONiC port name is Ethernet<name + (port - ports[0]) * pitch + offset>.
+    """
+    __slots__ = ()
+
+    def __new__(cls, alias, ports, name, pitch=1, lanes=NO_LANES):
+        return super(PortRange, cls).__new__(cls, alias, ports, name, pitch, lanes)
+
+
+_C224O8_2_LANE_PORTS = (13, 17, 45, 49)
+_C224O8_8_LANE_PORTS = tuple(port for port in range(1, 65, 2) if port not in _C224O8_2_LANE_PORTS)
+_C448O16_2_LANE_PORTS = (13, 14, 17, 18, 45, 46, 49, 50)
+_C448O16_8_LANE_PORTS = tuple(port for port in range(1, 65) if port not in _C448O16_2_LANE_PORTS)
+
+# Port ranges of the hwskus, in the order of the former if/elif chain of get_port_alias_to_name_map()
+_HWSKU_PORT_DEFINITIONS = (
+    (["Force10-S6000"], (
+        PortRange("fortyGigE0/{port}", range(0, 128, 4), 0),
+    )),
+    (["Force10-S6100"], (
+        PortRange("fortyGigE1/{port}/{lane}", range(1, 5), 0, 16, _lanes(range(1, 17))),
+    )),
+    (["Force10-Z9100", "Force10-Z9100-C32", "DellEMC-S5232f-C32"], (
+        PortRange("hundredGigE1/{port}", range(1, 33), 0, 4),
+    )),
+    (["DellEMC-Z9332f-M-O16C64"], (
+        # 100G ports
+        PortRange("etp{port}{lane}", range(1, 13), 0, 8, _lanes("abcd", 2)),
+        PortRange("etp{port}{lane}", range(17, 21), 128, 8, _lanes("abcd", 2)),
+        # 400G ports
+        PortRange("etp{port}", range(13, 17), 96, 8),
+        PortRange("etp{port}", range(21, 33), 160, 8),
+        # 10G ports
+        PortRange("etp{port}", range(33, 35), 256),
+    )),
+    (["DellEMC-Z9332f-O32", "DellEMC-Z9332f-C32"], (
+        PortRange("etp{port}", range(1, 33), 0, 8),
+        PortRange("etp{port}", range(33, 35), 256),
+    )),
+    (["Cisco-C8220TG-48A-O", "Cisco-C8220TG-G1S2"], (
+        PortRange("etp{port}", range(1, 4), 1),
+    )),
+    (["Arista-7050-QX32"], (
+        PortRange("Ethernet{port}/1", range(1, 25), 0, 4),
+        PortRange("Ethernet{port}", range(25, 33), 96, 4),
+    )),
+    (["Arista-7050-QX-32S", "Arista-7050QX-32S-S4Q31"], (
+        PortRange("Ethernet{port}", range(1, 5), 0),
+        PortRange("Ethernet{port}/1", range(6, 29), 4, 4),
+        PortRange("Ethernet{port}", range(29, 37), 96, 4),
+    )),
+    (["Arista-7050QX32S-Q32"], (
+        PortRange("Ethernet{port}/1", range(5, 29), 0, 4),
+        PortRange("Ethernet{port}", range(29, 37), 96, 4),
+    )),
+    (["Arista-7280CR3-C40"], (
+        PortRange("Ethernet{port}/1", range(1, 33), 0, 4),
+        PortRange("Ethernet{port}/{lane}", range(33, 41, 2), 128, 4, _lanes([1, 5], 4)),
+    )),
+    (["Arista-7260CX3-C64", "Arista-7170-64C", "Arista-7260CX3-Q44", "Arista-7260CX3-Q64"], (
+        PortRange("Ethernet{port}/1", range(1, 65), 0, 4),
+    )),
+    (["Arista-7060CX-32S-C32", "Arista-7060CX-32S-Q32", "Arista-7060CX-32S-C32-T1", "Arista-7170-32CD-C32",
+      "Arista-7050CX3-32S-C28S4", "Arista-7050CX3-32C-C28S4", "Arista-7050CX3-32S-C32", "Arista-7050CX3-32C-C32"], (
+        PortRange("Ethernet{port}/1", range(1, 33), 0, 4),
+    )),
+    (["Arista-7060DX5-64S"], (
+        PortRange("Ethernet{port}/1", range(1, 65), 0, 8),
+    )),
+    (["Arista-7060X6-64DE", "Arista-7060X6-64DE-64x400G", "Arista-7060X6-64PE", "Arista-7060X6-64PE-64x400G",
+      "Arista-7060X6-64PE-P64", "Arista-7060X6-64PE-B-P64"], (
+        PortRange("etp{port}", range(1, 65), 0, 8),
+        PortRange("etp{port}", range(65, 67), 512),
+    )),
+    (["Arista-7060X6-64DE-O128S2", "Arista-7060X6-64PE-O128S2", "Arista-7060X6-64PE-B-O128S2"], (
+        PortRange("etp{port}{lane}", range(1, 65), 0, 8, _lanes("ab", 4)),
+        PortRange("etp{port}", range(65, 67), 512),
+    )),
+    (["Arista-7060X6-64PE-B-O128", "Arista-7060X6-64PE-O128"], (
+        PortRange("etp{port}{lane}", range(1, 65), 0, 8, _lanes("ab", 4)),
+    )),
+    (["Arista-7060X6-64PE-B-P32O64", "Arista-7060X6-64PE-P32O64"], (
+        PortRange("etp{port}", range(1, 33), 0, 8),
+        PortRange("etp{port}{lane}", range(33, 65), 256, 8, _lanes("ab", 4)),
+        PortRange("etp{port}", range(65, 67), 512),
+    )),
+    (["Arista-7060X6-64PE-B-P32V128", "Arista-7060X6-64PE-P32V128"], (
+        PortRange("etp{port}", range(1, 33), 0, 8),
+        PortRange("etp{port}{lane}", range(33, 65), 256, 8, _lanes("abcd", 2)),
+    )),
+    (["NH-4210-F-O256"], (
+        PortRange("etp{port}{lane}", range(1, 129), 0, 8, _lanes("ab", 4)),
+        PortRange("etp{port}", (129,), 1024),
+    )),
+    (["Arista-7060X6-64PE-256x200G"], (
+        PortRange("Ethernet{port}/{lane}", range(1, 65), 0, 8, _lanes([1, 3, 5, 7], 2)),
+        PortRange("Ethernet{port}", range(65, 67), 512),
+    )),
+    (["Arista-7060X6-64PE-C256S2"], (
+        # This hwsku uses every second OSFP port.
+        PortRange("Ethernet{port}/{lane}", range(1, 65, 2), 0, 8, _lanes(range(1, 9))),
+        PortRange("Ethernet{port}", range(65, 67), 512),
+    )),
+    (["Arista-7060X6-64PE-C224O8"], (
+        # This hwsku uses every second OSFP port.
+        PortRange("Ethernet{port}/{lane}", _C224O8_8_LANE_PORTS, 0, 8, _lanes(range(1, 9))),
+        PortRange("Ethernet{port}/{lane}", _C224O8_2_LANE_PORTS, 96, 8, _lanes([1, 5], 4)),
+        PortRange("Ethernet{port}", range(65, 67), 512),
+    )),
+    (["Arista-7060X6-64PE-B-C512S2"], (
+        PortRange("etp{port}{lane}", range(1, 65), 0, 8, _lanes("abcdefgh")),
+        PortRange("etp{port}", range(65, 67), 512),
+    )),
+    (["Arista-7060X6-64PE-B-C448O16"], (
+        PortRange("etp{port}{lane}", _C448O16_8_LANE_PORTS, 0, 8, _lanes("abcdefgh")),
+        PortRange("etp{port}{lane}", _C448O16_2_LANE_PORTS, 96, 8, _lanes("ab", 4)),
+    )),
+    (["Arista-7060X6-16PE-384C-O128S2", "Arista-7060X6-16PE-384C-B-O128S2",
+      "Arista-7060X6-16PE-384C-B-O128S2-COPPER-LAB", "Arista-7060X6-16PE-384C-B-O128S2-LAB",
+      "Arista-7060X6-16PE-384C-O128S2-COPPER-LAB", "Arista-7060X6-16PE-384C-O128S2-LAB"], (
+        PortRange("etp{port}{lane}", range(1, 17), 0, 8, _lanes("ab", 4)),
+        PortRange("etp{port}{lane}", range(17, 25), 128, 48, _lanes("abcdefghijkl", 4)),
+        PortRange("etp{port}{lane}", (25,), 512, 1, _lanes("ab")),
+    )),
+    (["M2-W6940-64X1-FR4"], (
+        PortRange("etp{port}", range(1, 65), 0, 8),
+    )),
+    (["Mellanox-SN2700-D40C8S8"], (
+        # 10G ports
+        PortRange("etp{port}{lane}", (1, 3), 0, 4, _lanes("abcd")),
+        # 50G ports
+        PortRange("etp{port}{lane}", range(5, 7), 16, 4, _lanes("ab", 2)),
+        PortRange("etp{port}{lane}", range(11, 23), 40, 4, _lanes("ab", 2)),
+        PortRange("etp{port}{lane}", range(27, 33), 104, 4, _lanes("ab", 2)),
+        # 100G ports
+        PortRange("etp{port}", range(7, 11), 24, 4),
+        PortRange("etp{port}", range(23, 27), 88, 4),
+    )),
+    (["Mellanox-SN2700-D44C10"], (
+        # 50G ports
+        PortRange("etp{port}{lane}", range(3, 7), 8, 4, _lanes("ab", 2)),
+        PortRange("etp{port}{lane}", range(11, 23), 40, 4, _lanes("ab", 2)),
+        PortRange("etp{port}{lane}", range(27, 33), 104, 4, _lanes("ab", 2)),
+        # 100G ports
+        PortRange("etp{port}", range(1, 3), 0, 4),
+        PortRange("etp{port}", range(7, 11), 24, 4),
+        PortRange("etp{port}", range(23, 27), 88, 4),
+    )),
+    (["Mellanox-SN2700-D48C8"], (
+        # 50G ports
+        PortRange("etp{port}{lane}", range(1, 7), 0, 4, _lanes("ab", 2)),
+        PortRange("etp{port}{lane}", range(11, 23), 40, 4, _lanes("ab", 2)),
+        PortRange("etp{port}{lane}", range(27, 33), 104, 4, _lanes("ab", 2)),
+        # 100G ports
+        PortRange("etp{port}", range(7, 11), 24, 4),
+        PortRange("etp{port}", range(23, 27), 88, 4),
+    )),
+    (["Mellanox-SN3800-D112C8"], (
+        PortRange("etp{port}{lane}", range(1, 25), 0, 4, _lanes("ab", 2)),
+        # Pairs of 100G ports alternating with pairs of 2x50G ports
+        PortRange("etp{port}", (25, 26, 29, 30, 33, 34, 37, 38), 96, 4),
+        PortRange("etp{port}{lane}", (27, 28, 31, 32, 35, 36, 39, 40), 104, 4, _lanes("ab", 2)),
+        PortRange("etp{port}{lane}", range(41, 65), 160, 4, _lanes("ab", 2)),
+    )),
+    (["Mellanox-SN2700-C28D8", "Mellanox-SN2700-A1-C28D8"], (
+        # 50G ports
+        PortRange("etp{port}{lane}", range(29, 33), 112, 4, _lanes("ab", 2)),
+        # 100G ports
+        PortRange("etp{port}", range(1, 29), 0, 4),
+    )),
+    (["ACS-MSN3800", "ACS-MSN4600C", "Mellanox-SN4700-V64"], (
+        PortRange("etp{port}", range(1, 65), 0, 4),
+    )),
+    (["Mellanox-SN2700", "ACS-MSN2700"], (
+        PortRange("etp{port}", range(1, 33), 0, 4),
+    )),
+    (["Arista-7060CX-32S-D48C8", "Arista-7050CX3-32S-D48C8"], (
+        # 50G ports
+        PortRange("Ethernet{port}/{lane}", range(1, 7), 0, 4, _lanes([1, 3], 2)),
+        PortRange("Ethernet{port}/{lane}", range(11, 23), 40, 4, _lanes([1, 3], 2)),
+        PortRange("Ethernet{port}/{lane}", range(27, 33), 104, 4, _lanes([1, 3], 2)),
+        # 100G ports
+        PortRange("Ethernet{port}/1", range(7, 11), 24, 4),
+        PortRange("Ethernet{port}/1", range(23, 27), 88, 4),
+    )),
+    (["Arista-7050CX3-32S-S128", "Arista-7050CX3-32C-S128"], (
+        PortRange("Ethernet{port}/{lane}", range(1, 33), 0, 4, _lanes(range(1, 5))),
+        PortRange("Ethernet{port}", (33,), 128),
+    )),
+    (["Arista-7050CX3-32S-C6S104", "Arista-7050CX3-32C-C6S104"], (
+        PortRange("Ethernet{port}/{lane}", range(1, 27), 0, 4, _lanes(range(1, 5))),
+        PortRange("Ethernet{port}/1", range(27, 33), 104, 4),
+        PortRange("Ethernet{port}", range(33, 35), 128, 4),
+    )),
+    (["Arista-7050CX3-32S-C28S16", "Arista-7050CX3-32C-C28S16"], (
+        PortRange("Ethernet{port}/{lane}", range(1, 5), 0, 4, _lanes(range(1, 5))),
+        PortRange("Ethernet{port}/1", range(5, 33), 16, 4),
+        PortRange("Ethernet{port}", (33,), 128),
+    )),
+    (["Arista-7260CX3-D108C8"], (
+        # 50G ports
+        PortRange("Ethernet{port}/{lane}", range(1, 13), 0, 4, _lanes([1, 3], 2)),
+        PortRange("Ethernet{port}/{lane}", range(21, 65), 80, 4, _lanes([1, 3], 2)),
+        # 100G ports
+        PortRange("Ethernet{port}/1", range(13, 21), 48, 4),
+    )),
+    (["Arista-7260CX3-D108C10"], (
+        # 50G ports
+        PortRange("Ethernet{port}/{lane}", range(3, 13), 8, 4, _lanes([1, 3], 2)),
+        PortRange("Ethernet{port}/{lane}", range(21, 65), 80, 4, _lanes([1, 3], 2)),
+        # 100G ports, the first 2 ports are 100G
+        PortRange("Ethernet{port}/1", range(1, 3), 0, 4),
+        PortRange("Ethernet{port}/1", range(13, 21), 48, 4),
+    )),
+    (["Arista-7260CX3-D108C8-AILAB"], (
+        # 50G ports
+        PortRange("Ethernet{port}/{lane}", range(1, 45), 0, 4, _lanes([1, 3], 2)),
+        PortRange("Ethernet{port}/{lane}", range(53, 65), 208, 4, _lanes([1, 3], 2)),
+        # 100G ports
+        PortRange("Ethernet{port}/1", range(45, 53), 176, 4),
+    )),
+    (["Arista-7260CX3-D108C8-CSI"], (
+        # 50G ports
+        PortRange("Ethernet{port}/{lane}", range(1, 45), 0, 4, _lanes([1, 3], 2)),
+        PortRange("Ethernet{port}/{lane}", range(53, 64), 208, 4, _lanes([1, 3], 2)),
+        # 100G ports, the 40G port 64 is treated as a 100G port
+        PortRange("Ethernet{port}/1", range(45, 53), 176, 4),
+        PortRange("Ethernet{port}/1", (64,), 252),
+    )),
+    (["Arista-7800R3-48CQ2-C48", "Arista-7800R3-48CQM2-C48"], (
+        PortRange("Ethernet{port}/1", range(1, 49), 0, 4),
+    )),
+    (["Arista-7280DR3A-36", "Arista-7280DR3AK-36", "Arista-7280DR3AK-36S", "Arista-7280DR3AM-36",
+      "Arista-7800R3A-36DM2-C36", "Arista-7800R3AK-36DM2-C36", "Arista-7800R3A-36DM2-D36"], (
+        PortRange("etp{port}", range(1, 37), 0, 8),
+    )),
+    (["Arista-7280R4-32QF-32DF-64O", "Arista-7280R4K-32QF-32DF-64O"], (
+        PortRange("Ethernet{port}/1", range(1, 65), 0, 4),
+    )),
+    (["Arista-7800R3A-36DM2-C72", "Arista-7800R3A-36D-C72", "Arista-7800R3A-36P-C72", "Arista-7800R3AK-36DM2-C72",
+      "Arista-7800R3AK-36D2-C72", "Arista-7800R3A-36D2-C72"], (
+        PortRange("Ethernet{port}/{lane}", range(1, 37), 0, 8, _lanes([1, 5], 4)),
+    )),
+    (["INGRASYS-S9100-C32", "INGRASYS-S9130-32X", "INGRASYS-S8810-32Q"], (
+        PortRange("Ethernet{port}/1", range(1, 33), 0, 4),
+    )),
+    (["INGRASYS-S8900-54XC"], (
+        PortRange("Ethernet{port}", range(1, 49), 0),
+        PortRange("Ethernet{port}/1", range(49, 55), 48, 4),
+    )),
+    (["INGRASYS-S8900-64XC"], (
+        PortRange("Ethernet{port}", range(1, 49), 0),
+        PortRange("Ethernet{port}/1", range(49, 65), 48, 4),
+    )),
+    (["Accton-AS7712-32X", "Accton-AS7726-32X", "montara"], (
+        PortRange("hundredGigE{port}", range(1, 33), 0, 4),
+    )),
+    (["Celestica-DX010-C32"], (
+        PortRange("etp{port}", range(1, 33), 0, 4),
+    )),
+    (["Celestica-DX010-D48C8"], (
+        PortRange("etp{port}{lane}", range(1, 11), 0, 4, _lanes("ab", 2)),
+        PortRange("etp{port}", range(11, 15), 40, 4),
+        PortRange("etp{port}{lane}", range(15, 19), 56, 4, _lanes("ab", 2)),
+        PortRange("etp{port}", range(19, 23), 72, 4),
+        PortRange("etp{port}{lane}", range(23, 33), 88, 4, _lanes("ab", 2)),
+    )),
+    (["Seastone-DX010"], (
+        PortRange("Eth{port}", range(1, 33), 0, 4),
+    )),
+    (["Celestica-E1031-T48S4", "Nokia-7215", "Nokia-M0-7215"], (
+        PortRange("etp{port}", range(1, 53), 0),
+    )),
+    (["Nokia-7215-C1", "Nokia-7215-C1-G3"], (
+        PortRange("etp{port}", range(1, 4), 0),
+    )),
+    (["et6448m"], (
+        PortRange("Ethernet{port}", range(0, 52), 0),
+    )),
+    (["rd98DX35xx_cn9131", "rd98DX35xx"], (
+        PortRange("oneGigE{port}", range(0, 32), 0),
+        PortRange("twod5GigE{port}", range(32, 48), 32),
+        PortRange("twenty5GigE{port}", range(48, 54), 48),
+    )),
+    (["Nokia-IXR7250E-36x400G", "Nokia-IXR7250E-36x100G", "Nokia-IXR7250-X3B"], (
+        PortRange("Ethernet{port}/1", range(1, 37), 0, 8),
+    )),
+    (["Nokia-IXR7250E-SUP-10"], ()),
+    (["newport"], (
+        PortRange("Ethernet{port}", range(0, 256, 8), 0),
+    )),
+    (["32x100Gb"], (
+        PortRange("Ethernet{port}", range(0, 32), 0),
+    )),
+    (["36x100Gb"], (
+        PortRange("Ethernet{port}", range(0, 36), 0),
+    )),
+    (["Cisco-8102-C64"], (
+        PortRange("etp{port}", range(0, 64), 0, 4),
+    )),
+    (["Cisco-8101-O32", "Cisco-8111-C32", "Cisco-8111-O32"], (
+        PortRange("etp{port}", range(0, 32), 0, 8),
+    )),
+    (["Cisco-8111-O64"], (
+        PortRange("etp{port}", range(0, 64), 0, 4),
+    )),
+    (["Cisco-8101-O8C48", "Cisco-8101-O8V48"], (
+        PortRange("etp{port}{lane}", range(0, 12), 0, 8, _lanes("ab", 4)),
+        PortRange("etp{port}", range(12, 20), 96, 8),
+        PortRange("etp{port}{lane}", range(20, 32), 160, 8, _lanes("ab", 4)),
+    )),
+    (["Cisco-8101-C64", "Cisco-8101-V64"], (
+        PortRange("etp{port}{lane}", range(0, 32), 0, 8, _lanes("ab", 4)),
+    )),
+    (["Cisco-8122-O64", "Cisco-8122-O64S2"], (
+        PortRange("etp{port}", range(0, 64), 0, 8),
+    )),
+    (["Cisco-8122-O128"], (
+        PortRange("etp{port}{lane}", range(0, 64), 0, 8, _lanes("ab", 4)),
+    )),
+    (["Cisco-8800-LC-48H-C48"], (
+        PortRange("Ethernet{port}", range(0, 48), 0, 4),
+    )),
+    (["Cisco-88-LC0-36FH-M-O36", "Cisco-88-LC0-36FH-O36"], (
+        PortRange("Ethernet{port}", range(0, 36), 0, 8),
+    )),
+    (["msft_multi_asic_vs", "Nexus-3164"], (
+        PortRange("Ethernet1/{port}", range(1, 65), 0, 4),
+    )),
+    (["Nexus-3132-GE-Q32", "Nexus-3132-GX-Q32"], (
+        PortRange("Ethernet1/{port}", range(1, 33), 0, 4),
+    )),
+    (["Arista-7260QX-64"], (
+        PortRange("Et{port}", range(1, 67), 1),
+    )),
+    (["msft_four_asic_vs"], (
+        PortRange("Ethernet1/{port}", range(1, 9), 0, 4),
+    )),
+    (["B6510-48VS8CQ", "RA-B6510-48V8C"], (
+        PortRange("twentyfiveGigE0/{port}", range(1, 49), 1),
+        PortRange("hundredGigE0/{port}", range(1, 9), 49),
+    )),
+    (["RA-B6510-32C"], (
+        PortRange("hundredGigE{port}", range(1, 33), 1),
+    )),
+    (["RA-B6910-64C"], (
+        PortRange("hundredGigE{port}", range(1, 65), 1),
+    )),
+    (["RA-B6920-4S"], (
+        PortRange("hundredGigE{port}", range(1, 129), 1),
+    )),
+    (["Wistron_sw_to3200k"], (
+        PortRange("Ethernet{port}", range(0, 256, 8), 0),
+    )),
+    (["Wistron_sw_to3200k_32x100"], (
+        PortRange("Ethernet{port}", range(0, 252, 4), 0),
+    )),
+    (["dbmvtx9180_64x100G"], (
+        PortRange("Ethernet{port}", range(0, 505, 8), 0),
+    )),
+    (["dbmvtx9180_64osfp_128x400G_lab"], (
+        PortRange("Ethernet{port}", range(0, 509, 4), 0),
+    )),
+    (["Arista-720DT-48S", "Arista-720DT-G48S4", "Arista-720DT-48S-MGX", "Arista-720DT-MGX-G48S4"], (
+        PortRange("etp{port}", range(1, 53), 0),
+    )),
+    (["Mellanox-SN4700-O8C48", "Mellanox-SN4700-O8V48"], (
+        PortRange("etp{port}{lane}", range(1, 13), 0, 8, _lanes("ab", 4)),
+        PortRange("etp{port}", range(13, 21), 96, 8),
+        PortRange("etp{port}{lane}", range(21, 33), 160, 8, _lanes("ab", 4)),
+    )),
+    (["Mellanox-SN4700-O28", "Mellanox-SN4700-O32", "ACS-SN4280", "Mellanox-SN4280-O28"], (
+        PortRange("etp{port}", range(1, 33), 0, 8),
+    )),
+    (["Mellanox-SN4280-O8C40", "Mellanox-SN4280-O8V40", "Mellanox-SN4280-C48"], (
+        PortRange("etp{port}{lane}", range(1, 13), 0, 8, _lanes("ab", 4)),
+        PortRange("etp{port}", range(13, 21), 96, 8),
+        PortRange("etp{port}{lane}", range(21, 29), 160, 8, _lanes("ab", 4)),
+        PortRange("etp{port}", range(29, 33), 224, 8),
+    )),
+    (["Mellanox-SN5600-V256"], (
+        PortRange("etp{port}{lane}", range(1, 65), 0, 8, _lanes("abcd", 2)),
+    )),
+    (["Mellanox-SN5600-C256S1"], (
+        PortRange("etp{port}{lane}", range(1, 65, 2), 0, 8, _lanes("abcdefgh")),
+        PortRange("etp{port}", (65,), 512),
+    )),
+    (["Mellanox-SN5610N-C256S2"], (
+        PortRange("etp{port}{lane}", range(1, 65, 2), 0, 8, _lanes("abcdefgh")),
+        PortRange("etp{port}", range(65, 67), 512, 8),
+    )),
+    (["Mellanox-SN5600-C224O8"], (
+        PortRange("etp{port}{lane}", _C224O8_8_LANE_PORTS, 0, 8, _lanes("abcdefgh")),
+        PortRange("etp{port}{lane}", _C224O8_2_LANE_PORTS, 96, 8, _lanes("ab", 4)),
+        PortRange("etp{port}", (65,), 512),
+    )),
+    (["Mellanox-SN5610N-C224O8"], (
+        PortRange("etp{port}{lane}", _C224O8_8_LANE_PORTS, 0, 8, _lanes("abcdefgh")),
+        PortRange("etp{port}{lane}", _C224O8_2_LANE_PORTS, 96, 8, _lanes("ab", 4)),
+        PortRange("etp{port}", range(65, 67), 512, 8),
+    )),
+    (["Mellanox-SN5640-C508O1X2"], (
+        # 63 OSFP x 8x100G; port 64: 4x100G (etp64a-d) + 400G (etp64e -> Ethernet508)
+        PortRange("etp{port}{lane}", range(1, 64), 0, 8, _lanes("abcdefgh")),
+        PortRange("etp{port}{lane}", (64,), 504, 8, _lanes("abcde")),
+        PortRange("etp{port}", range(65, 67), 512, 8),
+    )),
+    (["Mellanox-SN5640-C512S2"], (
+        PortRange("etp{port}{lane}", range(1, 65), 0, 8, _lanes("abcdefgh")),
+        PortRange("etp{port}", range(65, 67), 512, 8),
+    )),
+    (["Mellanox-SN5640-C448O16"], (
+        PortRange("etp{port}{lane}", _C448O16_8_LANE_PORTS, 0, 8, _lanes("abcdefgh")),
+        PortRange("etp{port}{lane}", _C448O16_2_LANE_PORTS, 96, 8, _lanes("ab", 4)),
+        PortRange("etp{port}", range(65, 67), 512, 8),
+    )),
+    (["ACS-SN6600"], (
+        PortRange("etp{port}{lane}", range(1, 65), 0, 8, _lanes("ab", 4)),
+        PortRange("etp{port}{lane}", (65,), 512, 1, _lanes("ab")),
+        PortRange("etp{port}", range(66, 68), 520, 8),
+    )),
+    (["Mellanox-SN6600-C512S4"], (
+        PortRange("etp{port}{lane}", range(1, 65), 0, 8, _lanes("abcdefgh")),
+        PortRange("etp{port}{lane}", (65,), 512, 1, _lanes("ab")),
+        PortRange("etp{port}", range(66, 68), 520, 8),
+    )),
+    (["Mellanox-SN6600_LD-P128C2"], (
+        PortRange("etp{port}{lane}", range(1, 65), 0, 8, _lanes("ab", 4)),
+        PortRange("etp{port}{lane}", (65,), 512, 1, _lanes("ab")),
+    )),
+    (["Mellanox-SN6600_LD-P64O128C2"], (
+        PortRange("etp{port}{lane}", range(1, 65), 0, 8, _lanes("abc", 2)),
+        PortRange("etp{port}{lane}", (65,), 512, 1, _lanes("ab")),
+    )),
+    (["Mellanox-SN6600_LD-V512C2", "Mellanox-SN6600_LD-V448P16C2"], (
+        PortRange("etp{port}{lane}", range(1, 65), 0, 8, _lanes("abcdefgh")),
+        PortRange("etp{port}{lane}", (65,), 512, 1, _lanes("ab")),
+    )),
+    (["Mellanox-SN4280-O8C80"], (
+        PortRange("etp{port}{lane}", range(1, 13), 0, 8, _lanes("abcd", 2)),
+        PortRange("etp{port}", range(13, 21), 96, 8),
+        PortRange("etp{port}{lane}", range(21, 29), 160, 8, _lanes("abcd", 2)),
+        PortRange("etp{port}", range(29, 33), 224, 8),
+    )),
+    (["Arista-7060DX5-32"], (
+        PortRange("Ethernet{port}/1", range(1, 33), 0, 8),
+    )),
+    (["cisco-8101-p4-32x100-vs"], (
+        # this device simulates 32 ports, with 4 as the step for port naming.
+        PortRange("Ethernet{port}", range(0, 32, 4), 0),
+    )),
+    (["Cisco-8102-28FH-DPU-O", "Cisco-8102-28FH-DPU-C28", "Cisco-8102-28FH-DPU-O8C20",
+      "Cisco-8102-28FH-DPU-O12C16"], (
+        PortRange("etp{port}", range(0, 36), 0, 8),
+    )),
+    (["Cisco-8102-28FH-DPU-O8C40", "Cisco-8102-28FH-DPU-O8V40"], (
+        PortRange("etp{port}{lane}", range(0, 12), 0, 8, _lanes("ab", 4)),
+        PortRange("etp{port}", range(12, 20), 96, 8),
+        PortRange("etp{port}{lane}", range(20, 28), 160, 8, _lanes("ab", 4)),
+        PortRange("etp{port}", range(28, 36), 224, 8),
+    )),
+    (["Nokia-IXR7220-H6-O256"], (
+        PortRange("etp{port}{lane}", range(1, 129), 0, 8, _lanes("ab", 4)),
+        PortRange("etp{port}", range(129, 131), 1024),
+    )),
+    (["Nokia-IXR7220-D4-36D"], (
+        PortRange("Ethernet{port}/1", range(1, 9), 0, 2),
+        PortRange("Ethernet{port}/1", range(9, 29), 16, 4),
+        PortRange("Ethernet{port}/1", range(29, 37), 96, 8),
+    )),
+    (["NH-4010"], (
+        PortRange("Port{port}", range(1, 65), 0, 8),
+        # adding 25G ports
+        PortRange("Port{port}", range(65, 67), 512),
+    )),
+)
+
+
+def _index_definitions(definitions):
+    port_ranges = {}
+    for hwskus, ranges in definitions:
+        for hwsku in hwskus:
+            assert hwsku not in port_ranges, "Duplicated port definition of hwsku %s." % hwsku
+            port_ranges[hwsku] = ranges
+    return port_ranges
+
+
+# Port ranges of each hwsku
+HWSKU_PORT_RANGES = _index_definitions(_HWSKU_PORT_DEFINITIONS)
+
+# Port ranges of the hwskus matching a pattern, for the hwskus not in HWSKU_PORT_RANGES
+HWSKU_PATTERN_PORT_RANGES = (
+    (re.compile(r"Nokia-7215-A1"), (
+        PortRange("etp{port}", range(1, 53), 0),
+    )),
+    (re.compile(r".*NH-5010"), (
+        PortRange("Port{port}", range(1, 65), 0, 4),
+        # adding placeholder for 100G ports
+        PortRange("Port{port}", range(65, 67), 256, 4),
+    )),
+)
+
+# Port ranges of the hwskus without port definition
+DEFAULT_PORT_RANGES = (
+    PortRange("Ethernet{port}", range(0, 128, 4), 0),
+)
+
+# Frozen port maps by (hwsku, asic_name)
+_port_maps = {}
+
+
+def get_hwsku_port_ranges(hwsku):
+    if hwsku in HWSKU_PORT_RANGES:
+        return HWSKU_PORT_RANGES[hwsku]
+    for pattern, port_ranges in HWSKU_PATTERN_PORT_RANGES:
+        if pattern.match(hwsku):
+            return port_ranges
+    if "Arista-7800" in hwsku:
+        assert False, "Please add port_alias_to_name_map for new modular SKU %s." % hwsku
+    return DEFAULT_PORT_RANGES
+
+
+def build_port_alias_to_name_map(port_ranges):
+    port_alias_to_name_map = {}
+    for port_range in port_ranges:
+        first_port = port_range.ports[0]
+        for port in port_range.ports:
+            name = port_range.name + (port - first_port) * port_range.pitch
+            for lane, offset in port_range.lanes:
+                port_alias_to_name_map[port_range.alias.format(port=port, lane=lane)] = "Ethernet%d" % (name + offset)
+    return port_alias_to_name_map
+
+
+def _find_port_config(hwsku, asic_name):
+    for hwsku_dir in PORT_CONFIG_DIRS:
+        path = os.path.join(hwsku_dir, hwsku)
+        if asic_name and asic_name.startswith("asic"):
+            path = os.path.join(path, asic_name[len("asic"):])
+        path = os.path.join(path, "port_config.ini")
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def read_port_config(path):
+    """
+    Read the ports of a port_config.ini.
+
+    Returns:
+        dict: Columns of each port, keyed by port name.
+    """
+    ports = {}
+    columns = None
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("#"):
+                if columns is None:
+                    columns = line.lstrip("#").split()
+                continue
+            if columns is None:
+                columns = PORT_CONFIG_DEFAULT_COLUMNS
+            values = line.split()
+            ports[values[0]] = dict(zip(columns[1:], values[1:]))
+    return ports
+
+
+def _ports_to_port_maps(hwsku, ports_info):
     port_alias_to_name_map = {}
     port_alias_asic_map = {}
     port_name_to_index_map = {}
-    HWSKU_WITH_PORT_INDEX_FROM_PORT_CONFIG = ["Cisco-88-LC0-36FH-M-O36",
-                                              "Cisco-88-LC0-36FH-O36",
-                                              "Cisco-8800-LC-48H-C48"]
+    for port, port_data in ports_info.items():
+        if "alias" in port_data:
+            port_alias_to_name_map[port_data["alias"]] = port
+        if "asic_port_name" in port_data:
+            port_alias_asic_map[port_data["asic_port_name"]] = port
+        if "index" in port_data and hwsku in HWSKU_WITH_PORT_INDEX_FROM_PORT_CONFIG:
+            port_name_to_index_map[port] = int(port_data["index"])
+    return port_alias_to_name_map, port_alias_asic_map, port_name_to_index_map
+
+
+def _load_port_maps(hwsku, asic_name):
     try:
         from sonic_py_common import multi_asic
         from ansible.module_utils.multi_asic_utils import load_db_config
         load_db_config()
-        ports_info = multi_asic.get_port_table(namespace=asic_name)
-        for port, port_data in ports_info.items():
-            if "alias" in port_data:
-                port_alias_to_name_map[port_data["alias"]] = port
-            if "asic_port_name" in port_data:
-                port_alias_asic_map[port_data["asic_port_name"]] = port
-            if "index" in port_data and hwsku in HWSKU_WITH_PORT_INDEX_FROM_PORT_CONFIG:
-                port_name_to_index_map[port] = int(port_data["index"])
+        return _ports_to_port_maps(hwsku, multi_asic.get_port_table(namespace=asic_name))
     except ImportError:
-        if hwsku == "Force10-S6000":
-            for i in range(0, 128, 4):
-                port_alias_to_name_map["fortyGigE0/%d" % i] = "Ethernet%d" % i
-        elif hwsku == "Force10-S6100":
-            for i in range(0, 4):
-                for j in range(0, 16):
-                    port_alias_to_name_map["fortyGigE1/%d/%d" % (i + 1, j + 1)] = "Ethernet%d" % (i * 16 + j)
-        elif hwsku in ["Force10-Z9100", "Force10-Z9100-C32", "DellEMC-S5232f-C32"]:
-            for i in range(0, 128, 4):
-                port_alias_to_name_map["hundredGigE1/%d" % (i / 4 + 1)] = "Ethernet%d" % i
-        # TODO: Come up with a generic formula for generating etp style aliases based on number of ports and lanes
-        elif hwsku == "DellEMC-Z9332f-M-O16C64":
-            # 100G ports
-            s100G_ports = [x for x in range(0, 96, 2)] + [x for x in range(128, 160, 2)]
-
-            # 400G ports
-            s400G_ports = [x for x in range(96, 128, 8)] + [x for x in range(160, 256, 8)]
-
-            # 10G ports
-            s10G_ports = [x for x in range(256, 258)]
-
-            for i in s100G_ports:
-                alias = "etp{}{}".format(((i + 8) // 8), chr(ord('a') + (i // 2) % 4))
-                port_alias_to_name_map[alias] = "Ethernet{}".format(i)
-            for i in s400G_ports:
-                alias = "etp{}".format((i // 8) + 1)
-                port_alias_to_name_map[alias] = "Ethernet{}".format(i)
-            for i in s10G_ports:
-                alias = "etp{}".format(33 if i == 256 else 34)
-                port_alias_to_name_map[alias] = "Ethernet{}".format(i)
-        elif hwsku == "DellEMC-Z9332f-O32" or hwsku == "DellEMC-Z9332f-C32":
-            for i in range(0, 256, 8):
-                alias = "etp{}".format((i // 8) + 1)
-                port_alias_to_name_map[alias] = "Ethernet{}".format(i)
-            for i in range(256, 258):
-                alias = "etp{}".format(33 if i == 256 else 34)
-                port_alias_to_name_map[alias] = "Ethernet{}".format(i)
-        elif hwsku == "Cisco-C8220TG-48A-O" or hwsku == "Cisco-C8220TG-G1S2":
-            for i in range(1, 4):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % i
-        elif hwsku == "Arista-7050-QX32":
-            for i in range(1, 25):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 1) * 4)
-            for i in range(25, 33):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku == "Arista-7050-QX-32S" or hwsku == "Arista-7050QX-32S-S4Q31":
-            for i in range(0, 4):
-                port_alias_to_name_map["Ethernet%d" % (i + 1)] = "Ethernet%d" % i
-            for i in range(6, 29):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 5) * 4)
-            for i in range(29, 37):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % ((i - 5) * 4)
-        elif hwsku == "Arista-7050QX32S-Q32":
-            for i in range(5, 29):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 5) * 4)
-            for i in range(29, 37):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % ((i - 5) * 4)
-        elif hwsku == "Arista-7280CR3-C40":
-            for i in range(1, 33):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 1) * 4)
-            for i in range(33, 41, 2):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 1) * 4)
-                port_alias_to_name_map["Ethernet%d/5" % i] = "Ethernet%d" % (i * 4)
-        elif hwsku == "Arista-7260CX3-C64" or hwsku == "Arista-7170-64C" \
-                or hwsku == "Arista-7260CX3-Q44" or hwsku == "Arista-7260CX3-Q64":
-            for i in range(1, 65):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku == "Arista-7060CX-32S-C32" or hwsku == "Arista-7060CX-32S-Q32" \
-                or hwsku == "Arista-7060CX-32S-C32-T1" or hwsku == "Arista-7170-32CD-C32" \
-                or hwsku == "Arista-7050CX3-32S-C28S4" \
-                or hwsku == "Arista-7050CX3-32C-C28S4" \
-                or hwsku == "Arista-7050CX3-32S-C32" \
-                or hwsku == "Arista-7050CX3-32C-C32":
-            for i in range(1, 33):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku in ["Arista-7060DX5-64S"]:
-            for i in range(1, 65):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 1) * 8)
-        elif hwsku in ["Arista-7060X6-64DE", "Arista-7060X6-64DE-64x400G",
-                       "Arista-7060X6-64PE", "Arista-7060X6-64PE-64x400G",
-                       "Arista-7060X6-64PE-P64", "Arista-7060X6-64PE-B-P64"]:
-            for i in range(1, 65):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % ((i - 1) * 8)
-            port_alias_to_name_map["etp65"] = "Ethernet512"
-            port_alias_to_name_map["etp66"] = "Ethernet513"
-        elif hwsku in ["Arista-7060X6-64DE-O128S2", "Arista-7060X6-64PE-O128S2", "Arista-7060X6-64PE-B-O128",
-                       "Arista-7060X6-64PE-B-O128S2", "Arista-7060X6-64PE-O128"]:
-            split_alias_list = ["a", "b"]
-            for i in range(1, 65):
-                for j, split_alias in enumerate(split_alias_list):
-                    alias = "etp{}{}".format(i, split_alias)
-                    port_alias_to_name_map[alias] = "Ethernet%d" % ((i - 1) * 8 + j * 4)
-            if hwsku not in ["Arista-7060X6-64PE-B-O128", "Arista-7060X6-64PE-O128"]:
-                port_alias_to_name_map["etp65"] = "Ethernet512"
-                port_alias_to_name_map["etp66"] = "Ethernet513"
-        elif hwsku in ["Arista-7060X6-64PE-B-P32O64", "Arista-7060X6-64PE-P32O64"]:
-            for i in range(1, 33):
-                port_alias_to_name_map["etp%d" % (i)] = "Ethernet%d" % ((i - 1) * 8)
-            for i in range(33, 65):
-                for x, j in zip([1, 5], ["a", "b"]):
-                    port_alias_to_name_map["etp%d%s" % (i, j)] = "Ethernet%d" % ((i - 1) * 8 + x - 1)
-            port_alias_to_name_map["etp65"] = "Ethernet512"
-            port_alias_to_name_map["etp66"] = "Ethernet513"
-        elif hwsku in ["Arista-7060X6-64PE-B-P32V128", "Arista-7060X6-64PE-P32V128"]:
-            for i in range(1, 33):
-                port_alias_to_name_map["etp%d" % (i)] = "Ethernet%d" % ((i - 1) * 8)
-            for i in range(33, 65):
-                for x, j in zip([1, 3, 5, 7], ["a", "b", "c", "d"]):
-                    port_alias_to_name_map["etp%d%s" % (i, j)] = "Ethernet%d" % ((i - 1) * 8 + x - 1)
-        elif hwsku in ["NH-4210-F-O256"]:
-            for i in range(1, 129):
-                for x, j in zip([1, 5], ["a", "b"]):
-                    port_alias_to_name_map["etp%d%s" % (i, j)] = "Ethernet%d" % ((i - 1) * 8 + x - 1)
-            port_alias_to_name_map["etp129"] = "Ethernet1024"
-        elif hwsku == "Arista-7060X6-64PE-256x200G":
-            for i in range(1, 65):
-                for j in [1, 3, 5, 7]:
-                    port_alias_to_name_map["Ethernet%d/%d" % (i, j)] = "Ethernet%d" % ((i - 1) * 8 + j - 1)
-            port_alias_to_name_map["Ethernet65"] = "Ethernet512"
-            port_alias_to_name_map["Ethernet66"] = "Ethernet513"
-        elif hwsku == "Arista-7060X6-64PE-C256S2":
-            for i in range(1, 65, 2):  # This hwsku uses every second OSFP port.
-                for j in range(1, 9):
-                    port_alias_to_name_map["Ethernet%d/%d" % (i, j)] = "Ethernet%d" % ((i - 1) * 8 + j - 1)
-            port_alias_to_name_map["Ethernet65"] = "Ethernet512"
-            port_alias_to_name_map["Ethernet66"] = "Ethernet513"
-        elif hwsku == "Arista-7060X6-64PE-C224O8":  # This hwsku uses every second OSFP port.
-            for i in range(1, 65, 2):
-                if i in [13, 17, 45, 49]:
-                    for j in [1, 5]:
-                        port_alias_to_name_map["Ethernet%d/%d" % (i, j)] = "Ethernet%d" % ((i - 1) * 8 + j - 1)
-                else:
-                    for j in range(1, 9):
-                        port_alias_to_name_map["Ethernet%d/%d" % (i, j)] = "Ethernet%d" % ((i - 1) * 8 + j - 1)
-            port_alias_to_name_map["Ethernet65"] = "Ethernet512"
-            port_alias_to_name_map["Ethernet66"] = "Ethernet513"
-        elif hwsku == "Arista-7060X6-64PE-B-C512S2":
-            split_alias_list = ["a", "b", "c", "d", "e", "f", "g", "h"]
-            for i in range(1, 65):
-                for idx, split_alias in enumerate(split_alias_list):
-                    alias = "etp{}{}".format(i, split_alias)
-                    eth_name = "Ethernet{}".format((i - 1) * 8 + idx)
-                    port_alias_to_name_map[alias] = eth_name
-            port_alias_to_name_map['etp65'] = "Ethernet512"
-            port_alias_to_name_map['etp66'] = "Ethernet513"
-        elif hwsku == "Arista-7060X6-64PE-B-C448O16":
-            split_alias_list = ["a", "b", "c", "d", "e", "f", "g", "h"]
-            split_alias_list_1 = ["a", "b"]
-            split_2_port_indexs = [13, 14, 17, 18, 45, 46, 49, 50]
-            for i in range(1, 65):
-                if i in split_2_port_indexs:
-                    for idx, split_alias in enumerate(split_alias_list_1):
-                        alias = "etp{}{}".format(i, split_alias)
-                        eth_name = "Ethernet{}".format((i - 1) * 8 + idx * 4)
-                        port_alias_to_name_map[alias] = eth_name
-                else:
-                    for idx, split_alias in enumerate(split_alias_list):
-                        alias = "etp{}{}".format(i, split_alias)
-                        eth_name = "Ethernet{}".format((i - 1) * 8 + idx)
-                        port_alias_to_name_map[alias] = eth_name
-        elif hwsku in ["Arista-7060X6-16PE-384C-O128S2", "Arista-7060X6-16PE-384C-B-O128S2",
-                       "Arista-7060X6-16PE-384C-B-O128S2-COPPER-LAB", "Arista-7060X6-16PE-384C-B-O128S2-LAB",
-                       "Arista-7060X6-16PE-384C-O128S2-COPPER-LAB", "Arista-7060X6-16PE-384C-O128S2-LAB"]:
-            split_alias_list = ["a", "b", "c", "d", "e", "f", "g", "h", "i", "j", "k", "l"]
-            split_alias_list_1 = ["a", "b"]
-            split_2_port_indexs = list(range(1, 17))
-            cur_idx = 0
-            for i in range(1, 25):
-                if i in split_2_port_indexs:
-                    for idx, split_alias in enumerate(split_alias_list_1):
-                        alias = "etp{}{}".format(i, split_alias)
-                        eth_name = "Ethernet{}".format(cur_idx)
-                        port_alias_to_name_map[alias] = eth_name
-                        cur_idx += 4
-                else:
-                    for idx, split_alias in enumerate(split_alias_list):
-                        alias = "etp{}{}".format(i, split_alias)
-                        eth_name = "Ethernet{}".format(cur_idx)
-                        port_alias_to_name_map[alias] = eth_name
-                        cur_idx += 4
-            port_alias_to_name_map['etp25a'] = "Ethernet512"
-            port_alias_to_name_map['etp25b'] = "Ethernet513"
-        elif hwsku == "M2-W6940-64X1-FR4":
-            for i in range(1, 65):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % ((i - 1) * 8)
-        elif hwsku == "Arista-7050QX32S-Q32":
-            for i in range(5, 29):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 5) * 4)
-            for i in range(29, 37):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % ((i - 5) * 4)
-        elif hwsku == "Mellanox-SN2700-D40C8S8":
-            # 10G ports
-            s10G_ports = list(range(0, 4)) + list(range(8, 12))
-
-            # 50G ports
-            s50G_ports = [x for x in range(16, 24, 2)] + [x for x in range(40, 88, 2)] + [x for x in range(104, 128, 2)]
-
-            # 100G ports
-            s100G_ports = [x for x in range(24, 40, 4)] + [x for x in range(88, 104, 4)]
-
-            for i in s10G_ports:
-                alias = "etp%d" % (i / 4 + 1) + chr(ord('a') + i % 4)
-                port_alias_to_name_map[alias] = "Ethernet%d" % i
-            for i in s50G_ports:
-                alias = "etp%d" % (i / 4 + 1) + ("a" if i % 4 == 0 else "b")
-                port_alias_to_name_map[alias] = "Ethernet%d" % i
-            for i in s100G_ports:
-                alias = "etp%d" % (i / 4 + 1)
-                port_alias_to_name_map[alias] = "Ethernet%d" % i
-        elif hwsku == "Mellanox-SN2700-D44C10":
-            # 50G ports
-            s50G_ports = [x for x in range(8, 24, 2)] + [x for x in range(40, 88, 2)] + [x for x in range(104, 128, 2)]
-
-            # 100G ports
-            s100G_ports = [0, 4] + [x for x in range(24, 40, 4)] + [x for x in range(88, 104, 4)]
-
-            for i in s50G_ports:
-                alias = "etp%d" % (i / 4 + 1) + ("a" if i % 4 == 0 else "b")
-                port_alias_to_name_map[alias] = "Ethernet%d" % i
-            for i in s100G_ports:
-                alias = "etp%d" % (i / 4 + 1)
-                port_alias_to_name_map[alias] = "Ethernet%d" % i
-        elif hwsku == "Mellanox-SN2700-D48C8":
-            # 50G ports
-            s50G_ports = [x for x in range(0, 24, 2)] + [x for x in range(40, 88, 2)] + [x for x in range(104, 128, 2)]
-
-            # 100G ports
-            s100G_ports = [x for x in range(24, 40, 4)] + [x for x in range(88, 104, 4)]
-
-            for i in s50G_ports:
-                alias = "etp%d" % (i / 4 + 1) + ("a" if i % 4 == 0 else "b")
-                port_alias_to_name_map[alias] = "Ethernet%d" % i
-            for i in s100G_ports:
-                alias = "etp%d" % (i / 4 + 1)
-                port_alias_to_name_map[alias] = "Ethernet%d" % i
-        elif hwsku == "Mellanox-SN3800-D112C8":
-            x_ports = [x for x in range(0, 95, 2)]
-            for i in x_ports:
-                alias = "etp%d" % (i / 4 + 1) + ("a" if i % 4 == 0 else "b")
-                # print alias, "Ethernet%d" % i
-                port_alias_to_name_map[alias] = "Ethernet%d" % i
-            x_ports = [x for x in range(96, 101, 4)] + [x for x in range(104, 111, 2)] +\
-                [x for x in range(112, 117, 4)] + [x for x in range(120, 127, 2)] + [x for x in range(128, 133, 4)] +\
-                [x for x in range(136, 143, 2)] + [x for x in range(144, 149, 4)] + [x for x in range(152, 159, 2)]
-            i = 0
-            while i < len(x_ports):
-                for j in range(0, 2):
-                    alias = "etp%d" % (x_ports[i] / 4 + 1)
-                    port_alias_to_name_map[alias] = "Ethernet%d" % x_ports[i]
-                    # print alias, "Ethernet%d" % ports[i]
-                    i += 1
-                for j in range(0, 2):
-                    alias = "etp%d" % (x_ports[i] / 4 + 1) + "a"
-                    port_alias_to_name_map[alias] = "Ethernet%d" % x_ports[i]
-                    # print alias, "Ethernet%d" % ports[i]
-                    i += 1
-                    alias = "etp%d" % (x_ports[i] / 4 + 1) + "b"
-                    port_alias_to_name_map[alias] = "Ethernet%d" % x_ports[i]
-                    # print alias, "Ethernet%d" % ports[i]
-                    i += 1
-            x_ports = [x for x in range(160, 255, 2)]
-            for i in x_ports:
-                alias = "etp%d" % (i / 4 + 1) + ("a" if i % 4 == 0 else "b")
-                # print alias, "Ethernet%d" % i
-                port_alias_to_name_map[alias] = "Ethernet%d" % i
-        elif hwsku in ["Mellanox-SN2700-C28D8", "Mellanox-SN2700-A1-C28D8"]:
-            # 50G ports
-            s50G_ports = [x for x in range(112, 127, 2)]
-
-            # 100G ports
-            s100G_ports = [x for x in range(0, 109, 4)]
-
-            for i in s50G_ports:
-                alias = "etp%d" % (i / 4 + 1) + ("a" if i % 4 == 0 else "b")
-                port_alias_to_name_map[alias] = "Ethernet%d" % i
-            for i in s100G_ports:
-                alias = "etp%d" % (i / 4 + 1)
-                port_alias_to_name_map[alias] = "Ethernet%d" % i
-        elif hwsku in ["ACS-MSN3800", "ACS-MSN4600C", 'Mellanox-SN4700-V64']:
-            for i in range(1, 65):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku == "Mellanox-SN2700" or hwsku == "ACS-MSN2700":
-            for i in range(1, 33):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku in ["Arista-7060CX-32S-D48C8", "Arista-7050CX3-32S-D48C8"]:
-            # All possible breakout 50G port numbers:
-            all_ports = [x for x in range(1, 33)]
-
-            # 100G ports
-            s100G_ports = [x for x in range(7, 11)]
-            s100G_ports += [x for x in range(23, 27)]
-
-            port_alias_to_name_map = _port_alias_to_name_map_50G(all_ports, s100G_ports)
-        elif hwsku in ["Arista-7050CX3-32S-S128", "Arista-7050CX3-32C-S128"]:
-            for i in range(1, 33):
-                for j in range(1, 5):
-                    port_alias_to_name_map["Ethernet%d/%d" % (i, j)] = "Ethernet%d" % ((i - 1) * 4 + j - 1)
-            port_alias_to_name_map["Ethernet33"] = "Ethernet128"
-        elif hwsku in ["Arista-7050CX3-32S-C6S104", "Arista-7050CX3-32C-C6S104"]:
-            for i in range(1, 27):
-                for j in range(1, 5):
-                    port_alias_to_name_map["Ethernet%d/%d" % (i, j)] = "Ethernet%d" % ((i - 1) * 4 + j - 1)
-            for i in range(27, 33):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 1) * 4)
-            port_alias_to_name_map["Ethernet33"] = "Ethernet128"
-            port_alias_to_name_map["Ethernet34"] = "Ethernet132"
-        elif hwsku in ["Arista-7050CX3-32S-C28S16", "Arista-7050CX3-32C-C28S16"]:
-            for i in range(1, 5):
-                for j in range(1, 5):
-                    port_alias_to_name_map["Ethernet%d/%d" % (i, j)] = "Ethernet%d" % ((i - 1) * 4 + j - 1)
-            for i in range(5, 33):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 1) * 4)
-            port_alias_to_name_map["Ethernet33"] = "Ethernet128"
-        elif hwsku in ["Arista-7260CX3-D108C8", "Arista-7260CX3-D108C8-AILAB",
-                       "Arista-7260CX3-D108C8-CSI", "Arista-7260CX3-D108C10"]:
-            # All possible breakout 50G port numbers:
-            all_ports = [x for x in range(1, 65)]
-
-            # 100G ports
-            s100G_ports = [x for x in range(13, 21)]
-            if hwsku == "Arista-7260CX3-D108C10":
-                # The first 2 ports are 100G
-                s100G_ports.extend([x for x in range(1, 3)])
-            elif hwsku == "Arista-7260CX3-D108C8-AILAB":
-                s100G_ports = [x for x in range(45, 53)]
-            elif hwsku == "Arista-7260CX3-D108C8-CSI":
-                # Treat 40G port as 100G ports
-                s100G_ports = [x for x in range(45, 53)] + [64]
-
-            port_alias_to_name_map = _port_alias_to_name_map_50G(all_ports, s100G_ports)
-        elif hwsku in ["Arista-7800R3-48CQ2-C48", "Arista-7800R3-48CQM2-C48"]:
-            for i in range(1, 49):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku in ["Arista-7280DR3A-36",
-                       "Arista-7280DR3AK-36",
-                       "Arista-7280DR3AK-36S",
-                       "Arista-7280DR3AM-36",
-                       "Arista-7800R3A-36DM2-C36",
-                       "Arista-7800R3AK-36DM2-C36",
-                       "Arista-7800R3A-36DM2-D36"]:
-            for i in range(1, 37):
-                sonic_name = "Ethernet%d" % ((i - 1) * 8)
-                port_alias_to_name_map["etp{}".format(i)] = sonic_name
-        elif hwsku in ["Arista-7280R4-32QF-32DF-64O",
-                       "Arista-7280R4K-32QF-32DF-64O"]:
-            for i in range(1, 65):
-                port_alias_to_name_map["Ethernet{}/{}".format(i, 1)] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku == "Arista-7800R3A-36DM2-C72" or\
-                hwsku == "Arista-7800R3A-36D-C72" or\
-                hwsku == "Arista-7800R3A-36P-C72" or\
-                hwsku == "Arista-7800R3AK-36DM2-C72" or\
-                hwsku == "Arista-7800R3AK-36D2-C72" or\
-                hwsku == "Arista-7800R3A-36D2-C72":
-
-            intf_idx = 0
-            for i in range(1, 37):
-                for j in [1, 5]:
-                    port_alias_to_name_map["Ethernet%d/%d" % (i, j)] = "Ethernet%d" % intf_idx
-                    intf_idx += 4
-        elif hwsku == "INGRASYS-S9100-C32":
-            for i in range(1, 33):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku == "INGRASYS-S9100-C32" or hwsku == "INGRASYS-S9130-32X" or hwsku == "INGRASYS-S8810-32Q":
-            for i in range(1, 33):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku == "INGRASYS-S8900-54XC":
-            for i in range(1, 49):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % (i - 1)
-            for i in range(49, 55):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 49) * 4 + 48)
-        elif hwsku == "INGRASYS-S8900-64XC":
-            for i in range(1, 49):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % (i - 1)
-            for i in range(49, 65):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 49) * 4 + 48)
-        elif hwsku == "Accton-AS7712-32X":
-            for i in range(1, 33):
-                port_alias_to_name_map["hundredGigE%d" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku == "Accton-AS7726-32X":
-            for i in range(1, 33):
-                port_alias_to_name_map["hundredGigE%d" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku == "montara":
-            for i in range(1, 33):
-                port_alias_to_name_map["hundredGigE%d" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku == "Celestica-DX010-C32":
-            for i in range(1, 33):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku == "Celestica-DX010-D48C8":
-            for i in range(1, 21):
-                port_alias_to_name_map["etp{}{}".format((i + 1)//2, "a" if i % 2 == 1 else "b")] = \
-                    "Ethernet%d" % ((i - 1) * 2)
-            for i in range(21, 25):
-                port_alias_to_name_map["etp{}".format(i - 10)] = "Ethernet%d" % ((i - 10 - 1) * 4)
-            for i in range(25, 33):
-                port_alias_to_name_map["etp{}{}".format((i + 4 + 1)//2, "a" if i % 2 == 1 else "b")] = \
-                    "Ethernet%d" % ((i + 4 - 1) * 2)
-            for i in range(33, 37):
-                port_alias_to_name_map["etp{}".format(i - 14)] = "Ethernet%d" % ((i - 14 - 1) * 4)
-            for i in range(37, 57):
-                port_alias_to_name_map["etp{}{}".format((i + 8 + 1)//2, "a" if i % 2 == 1 else "b")] = \
-                    "Ethernet%d" % ((i + 8 - 1) * 2)
-        elif hwsku == "Seastone-DX010":
-            for i in range(1, 33):
-                port_alias_to_name_map["Eth%d" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku in ["Celestica-E1031-T48S4", "Nokia-7215", "Nokia-M0-7215"] or hwsku.startswith("Nokia-7215-A1"):
-            for i in range(1, 53):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % ((i - 1))
-        elif hwsku in ["Nokia-7215-C1", "Nokia-7215-C1-G3"]:
-            for i in range(1, 4):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % (i - 1)
-        elif hwsku == "et6448m":
-            for i in range(0, 52):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % i
-        elif hwsku in ["rd98DX35xx_cn9131", "rd98DX35xx"]:
-            for i in range(0, 32):
-                port_alias_to_name_map["oneGigE%d" % i] = "Ethernet%d" % i
-            for i in range(32, 48):
-                port_alias_to_name_map["twod5GigE%d" % i] = "Ethernet%d" % i
-            for i in range(48, 54):
-                port_alias_to_name_map["twenty5GigE%d" % i] = "Ethernet%d" % i
-        elif hwsku in ["Nokia-IXR7250E-36x400G", "Nokia-IXR7250E-36x100G", "Nokia-IXR7250-X3B"]:
-            for i in range(1, 37):
-                sonic_name = "Ethernet%d" % ((i - 1) * 8)
-                port_alias_to_name_map["Ethernet{}/{}".format(i, 1)] = sonic_name
-        elif hwsku == 'Nokia-IXR7250E-SUP-10':
-            port_alias_to_name_map = {}
-        elif hwsku == "newport":
-            for i in range(0, 256, 8):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % i
-        elif hwsku == "32x100Gb":
-            for i in range(0, 32):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % i
-        elif hwsku == "36x100Gb":
-            for i in range(0, 36):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % i
-        elif hwsku == "Cisco-8102-C64":
-            for i in range(0, 64):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % (i * 4)
-        elif hwsku in ["Cisco-8101-O32", "Cisco-8111-C32", "Cisco-8111-O32"]:
-            for i in range(0, 32):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % (i * 8)
-        elif hwsku in ["Cisco-8111-O64"]:
-            for i in range(0, 64):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % (i * 4)
-        elif hwsku in ["Cisco-8101-O8C48", "Cisco-8101-O8V48"]:
-            for i in range(0, 12):
-                port_alias_to_name_map["etp%da" % i] = "Ethernet%d" % (i * 4 * 2)
-                port_alias_to_name_map["etp%db" % i] = "Ethernet%d" % ((i * 4 * 2) + 4)
-            for i in range(12, 20):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % (i * 8)
-            for i in range(20, 32):
-                port_alias_to_name_map["etp%da" % i] = "Ethernet%d" % (i * 4 * 2)
-                port_alias_to_name_map["etp%db" % i] = "Ethernet%d" % ((i * 4 * 2) + 4)
-        elif hwsku in ["Cisco-8101-C64", "Cisco-8101-V64"]:
-            for i in range(0, 32):
-                port_alias_to_name_map["etp%da" % i] = "Ethernet%d" % (i * 4 * 2)
-                port_alias_to_name_map["etp%db" % i] = "Ethernet%d" % ((i * 4 * 2) + 4)
-        elif hwsku in ["Cisco-8122-O64", 'Cisco-8122-O64S2']:
-            for i in range(0, 64):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % (i * 8)
-        elif hwsku in ["Cisco-8122-O128"]:
-            for i in range(0, 64):
-                port_alias_to_name_map["etp%da" % i] = "Ethernet%d" % (i * 4 * 2)
-                port_alias_to_name_map["etp%db" % i] = "Ethernet%d" % ((i * 4 * 2) + 4)
-        elif hwsku in ["Cisco-8800-LC-48H-C48"]:
-            for i in range(0, 48, 1):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % (i * 4)
-        elif hwsku in ["Cisco-88-LC0-36FH-M-O36", "Cisco-88-LC0-36FH-O36"]:
-            for i in range(0, 36, 1):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % (i * 8)
-        elif hwsku in ["msft_multi_asic_vs", "Nexus-3164"]:
-            for i in range(1, 65):
-                port_alias_to_name_map["Ethernet1/%d" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku in ["Nexus-3132-GE-Q32", "Nexus-3132-GX-Q32"]:
-            for i in range(1, 33):
-                port_alias_to_name_map["Ethernet1/%d" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku == "Arista-7260QX-64":
-            for i in range(1, 67):
-                port_alias_to_name_map["Et%d" % i] = "Ethernet%d" % i
-        elif hwsku == "msft_four_asic_vs":
-            for i in range(1, 9):
-                port_alias_to_name_map["Ethernet1/%d" % i] = "Ethernet%d" % ((i - 1) * 4)
-        elif hwsku == "B6510-48VS8CQ" or hwsku == "RA-B6510-48V8C":
-            for i in range(1, 49):
-                port_alias_to_name_map["twentyfiveGigE0/%d" % i] = "Ethernet%d" % i
-            for i in range(49, 57):
-                port_alias_to_name_map["hundredGigE0/%d" % (i-48)] = "Ethernet%d" % i
-        elif hwsku == "RA-B6510-32C":
-            for i in range(1, 33):
-                port_alias_to_name_map["hundredGigE%d" % i] = "Ethernet%d" % i
-        elif hwsku == "RA-B6910-64C":
-            for i in range(1, 65):
-                port_alias_to_name_map["hundredGigE%d" % i] = "Ethernet%d" % i
-        elif hwsku == "RA-B6920-4S":
-            for i in range(1, 129):
-                port_alias_to_name_map["hundredGigE%d" % i] = "Ethernet%d" % i
-        elif hwsku in ["Wistron_sw_to3200k"]:
-            for i in range(0, 256, 8):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % i
-        elif hwsku in ["Wistron_sw_to3200k_32x100"]:
-            for i in range(0, 252, 4):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % i
-        elif hwsku in ["dbmvtx9180_64x100G"]:
-            for i in range(0, 505, 8):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % i
-        elif hwsku in ["dbmvtx9180_64osfp_128x400G_lab"]:
-            for i in range(0, 509, 4):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % i
-        elif hwsku in ["Arista-720DT-48S", "Arista-720DT-G48S4", "Arista-720DT-48S-MGX", "Arista-720DT-MGX-G48S4"]:
-            for i in range(1, 53):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % (i - 1)
-        elif hwsku in ["Mellanox-SN4700-O8C48", "Mellanox-SN4700-O8V48"]:
-            idx = 0
-            for i in range(1, 13):
-                port_alias_to_name_map["etp%da" % i] = "Ethernet%d" % idx
-                idx += 4
-                port_alias_to_name_map["etp%db" % i] = "Ethernet%d" % idx
-                idx += 4
-            for i in range(13, 21):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % idx
-                idx += 8
-            for i in range(21, 33):
-                port_alias_to_name_map["etp%da" % i] = "Ethernet%d" % idx
-                idx += 4
-                port_alias_to_name_map["etp%db" % i] = "Ethernet%d" % idx
-                idx += 4
-        elif hwsku in ["Mellanox-SN4700-O28", "Mellanox-SN4700-O32", "ACS-SN4280", "Mellanox-SN4280-O28"]:
-            idx = 0
-            for i in range(1, 33):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % idx
-                idx += 8
-        elif hwsku in ["Mellanox-SN4280-O8C40", "Mellanox-SN4280-O8V40", "Mellanox-SN4280-C48"]:
-            idx = 0
-            for i in range(1, 13):
-                port_alias_to_name_map["etp%da" % i] = "Ethernet%d" % idx
-                idx += 4
-                port_alias_to_name_map["etp%db" % i] = "Ethernet%d" % idx
-                idx += 4
-            for i in range(13, 21):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % idx
-                idx += 8
-            for i in range(21, 29):
-                port_alias_to_name_map["etp%da" % i] = "Ethernet%d" % idx
-                idx += 4
-                port_alias_to_name_map["etp%db" % i] = "Ethernet%d" % idx
-                idx += 4
-            for i in range(29, 33):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % idx
-                idx += 8
-        elif hwsku == "Mellanox-SN5600-V256":
-            split_alias_list = ["a", "b", "c", "d"]
-            for i in range(1, 65):
-                for idx, split_alias in enumerate(split_alias_list):
-                    alias = "etp{}{}".format(i, split_alias)
-                    eth_name = "Ethernet{}".format((i - 1) * 8 + idx * 2)
-                    port_alias_to_name_map[alias] = eth_name
-        elif hwsku in ["Mellanox-SN5600-C256S1", "Mellanox-SN5610N-C256S2"]:
-            split_alias_list = ["a", "b", "c", "d", "e", "f", "g", "h"]
-            for i in range(1, 65, 2):
-                for idx, split_alias in enumerate(split_alias_list):
-                    alias = "etp{}{}".format(i, split_alias)
-                    eth_name = "Ethernet{}".format((i - 1) * 8 + idx)
-                    port_alias_to_name_map[alias] = eth_name
-            port_alias_to_name_map['etp65'] = "Ethernet512"
-            if hwsku == "Mellanox-SN5610N-C256S2":
-                port_alias_to_name_map['etp66'] = "Ethernet520"
-        elif hwsku in ["Mellanox-SN5600-C224O8", "Mellanox-SN5610N-C224O8"]:
-            split_alias_list = ["a", "b", "c", "d", "e", "f", "g", "h"]
-            split_alias_list_1 = ["a", "b"]
-            split_2_port_indexs = [13, 17, 45, 49]
-            for i in range(1, 65, 2):
-                if i in split_2_port_indexs:
-                    for idx, split_alias in enumerate(split_alias_list_1):
-                        alias = "etp{}{}".format(i, split_alias)
-                        eth_name = "Ethernet{}".format((i - 1) * 8 + idx * 4)
-                        port_alias_to_name_map[alias] = eth_name
-                else:
-                    for idx, split_alias in enumerate(split_alias_list):
-                        alias = "etp{}{}".format(i, split_alias)
-                        eth_name = "Ethernet{}".format((i - 1) * 8 + idx)
-                        port_alias_to_name_map[alias] = eth_name
-            port_alias_to_name_map['etp65'] = "Ethernet512"
-            if hwsku == "Mellanox-SN5610N-C224O8":
-                port_alias_to_name_map['etp66'] = "Ethernet520"
-        elif hwsku == "Mellanox-SN5640-C508O1X2":
-            # 63 OSFP x 8x100G; port 64: 4x100G (etp64a-d) + 400G (etp64e -> Ethernet508)
-            split_alias_list = ["a", "b", "c", "d", "e", "f", "g", "h"]
-            for i in range(1, 64):
-                for idx, split_alias in enumerate(split_alias_list):
-                    alias = "etp{}{}".format(i, split_alias)
-                    eth_name = "Ethernet{}".format((i - 1) * 8 + idx)
-                    port_alias_to_name_map[alias] = eth_name
-            for idx, split_alias in enumerate(["a", "b", "c", "d"]):
-                port_alias_to_name_map["etp64{}".format(split_alias)] = "Ethernet{}".format((64 - 1) * 8 + idx)
-            port_alias_to_name_map["etp64e"] = "Ethernet508"
-            port_alias_to_name_map['etp65'] = "Ethernet512"
-            port_alias_to_name_map['etp66'] = "Ethernet520"
-        elif hwsku in ["Mellanox-SN5640-C512S2"]:
-            split_alias_list = ["a", "b", "c", "d", "e", "f", "g", "h"]
-            for i in range(1, 65):
-                for idx, split_alias in enumerate(split_alias_list):
-                    alias = "etp{}{}".format(i, split_alias)
-                    eth_name = "Ethernet{}".format((i - 1) * 8 + idx)
-                    port_alias_to_name_map[alias] = eth_name
-            port_alias_to_name_map['etp65'] = "Ethernet512"
-            port_alias_to_name_map['etp66'] = "Ethernet520"
-        elif hwsku in ["Mellanox-SN5640-C448O16"]:
-            split_alias_list = ["a", "b", "c", "d", "e", "f", "g", "h"]
-            split_alias_list_1 = ["a", "b"]
-            split_2_port_indexs = [13, 14, 17, 18, 45, 46, 49, 50]
-            for i in range(1, 65):
-                if i in split_2_port_indexs:
-                    for idx, split_alias in enumerate(split_alias_list_1):
-                        alias = "etp{}{}".format(i, split_alias)
-                        eth_name = "Ethernet{}".format((i - 1) * 8 + idx * 4)
-                        port_alias_to_name_map[alias] = eth_name
-                else:
-                    for idx, split_alias in enumerate(split_alias_list):
-                        alias = "etp{}{}".format(i, split_alias)
-                        eth_name = "Ethernet{}".format((i - 1) * 8 + idx)
-                        port_alias_to_name_map[alias] = eth_name
-            port_alias_to_name_map['etp65'] = "Ethernet512"
-            port_alias_to_name_map['etp66'] = "Ethernet520"
-        elif hwsku in ["ACS-SN6600", "Mellanox-SN6600-C512S4",
-                       "Mellanox-SN6600_LD-P128C2", "Mellanox-SN6600_LD-P64O128C2"]:
-            if hwsku in ["ACS-SN6600", "Mellanox-SN6600_LD-P128C2"]:
-                split_alias_list = ["a", "b"]
-                lane_offsets = [0, 4]
-            elif hwsku == "Mellanox-SN6600_LD-P64O128C2":
-                split_alias_list = ["a", "b", "c"]
-                lane_offsets = [0, 2, 4]
-            else:
-                split_alias_list = ["a", "b", "c", "d", "e", "f", "g", "h"]
-                lane_offsets = [0, 1, 2, 3, 4, 5, 6, 7]
-            for i in range(1, 65):
-                for idx, split_alias in enumerate(split_alias_list):
-                    alias = "etp{}{}".format(i, split_alias)
-                    eth_name = "Ethernet{}".format((i - 1) * 8 + lane_offsets[idx])
-                    port_alias_to_name_map[alias] = eth_name
-            port_alias_to_name_map['etp65a'] = "Ethernet512"
-            port_alias_to_name_map['etp65b'] = "Ethernet513"
-            if hwsku not in ["Mellanox-SN6600_LD-P128C2", "Mellanox-SN6600_LD-P64O128C2"]:
-                port_alias_to_name_map['etp66'] = "Ethernet520"
-                port_alias_to_name_map['etp67'] = "Ethernet528"
-        elif hwsku in ["Mellanox-SN6600_LD-V512C2", "Mellanox-SN6600_LD-V448P16C2"]:
-            split_alias_list = ["a", "b", "c", "d", "e", "f", "g", "h"]
-            for i in range(1, 65):
-                for idx, split_alias in enumerate(split_alias_list):
-                    alias = "etp{}{}".format(i, split_alias)
-                    eth_name = "Ethernet{}".format((i - 1) * 8 + idx)
-                    port_alias_to_name_map[alias] = eth_name
-            port_alias_to_name_map['etp65a'] = "Ethernet512"
-            port_alias_to_name_map['etp65b'] = "Ethernet513"
-        elif hwsku in ["Mellanox-SN4280-O8C80"]:
-            idx = 0
-            for i in range(1, 13):
-                port_alias_to_name_map["etp%da" % i] = "Ethernet%d" % idx
-                idx += 2
-                port_alias_to_name_map["etp%db" % i] = "Ethernet%d" % idx
-                idx += 2
-                port_alias_to_name_map["etp%dc" % i] = "Ethernet%d" % idx
-                idx += 2
-                port_alias_to_name_map["etp%dd" % i] = "Ethernet%d" % idx
-                idx += 2
-            for i in range(13, 21):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % idx
-                idx += 8
-            for i in range(21, 29):
-                port_alias_to_name_map["etp%da" % i] = "Ethernet%d" % idx
-                idx += 2
-                port_alias_to_name_map["etp%db" % i] = "Ethernet%d" % idx
-                idx += 2
-                port_alias_to_name_map["etp%dc" % i] = "Ethernet%d" % idx
-                idx += 2
-                port_alias_to_name_map["etp%dd" % i] = "Ethernet%d" % idx
-                idx += 2
-            for i in range(29, 33):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % idx
-                idx += 8
-        elif hwsku == "ACS-SN4280":
-            for i in range(0, 256, 8):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % i
-        elif hwsku == "Arista-7060DX5-32":
-            for i in range(1, 33):
-                port_alias_to_name_map["Ethernet%d/1" % i] = "Ethernet%d" % ((i - 1) * 8)
-        elif hwsku == "cisco-8101-p4-32x100-vs":
-            # this device simulates 32 ports, with 4 as the step for port naming.
-            for i in range(0, 32, 4):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % i
-        elif hwsku in ["Cisco-8102-28FH-DPU-O",
-                       "Cisco-8102-28FH-DPU-C28",
-                       "Cisco-8102-28FH-DPU-O8C20",
-                       "Cisco-8102-28FH-DPU-O12C16"]:
-            for i in range(0, 36):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % (i * 8)
-        elif hwsku in ["Cisco-8102-28FH-DPU-O8C40", "Cisco-8102-28FH-DPU-O8V40"]:
-            idx = 0
-            # Range 1: etp0a, etp0b ... etp11a, etp11b
-            for i in range(0, 12):
-                port_alias_to_name_map["etp%da" % i] = "Ethernet%d" % idx
-                idx += 4
-                port_alias_to_name_map["etp%db" % i] = "Ethernet%d" % idx
-                idx += 4
-            # Range 2: etp12 to etp19
-            for i in range(12, 20):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % idx
-                idx += 8
-            # Range 3: etp20a, etp20b ... etp27a, etp27b
-            for i in range(20, 28):
-                port_alias_to_name_map["etp%da" % i] = "Ethernet%d" % idx
-                idx += 4
-                port_alias_to_name_map["etp%db" % i] = "Ethernet%d" % idx
-                idx += 4
-            # Range 4: etp28 to etp35
-            for i in range(28, 36):
-                port_alias_to_name_map["etp%d" % i] = "Ethernet%d" % idx
-                idx += 8
-        elif hwsku == "Nokia-IXR7220-H6-O256":
-            for i in range(1, 129):
-                port_alias_to_name_map["etp%da" % i] = "Ethernet%d" % ((i - 1) * 8)
-                port_alias_to_name_map["etp%db" % i] = "Ethernet%d" % ((i - 1) * 8 + 4)
-            port_alias_to_name_map["etp129"] = "Ethernet1024"
-            port_alias_to_name_map["etp130"] = "Ethernet1025"
-        elif hwsku == "Nokia-IXR7220-D4-36D":
-            for i in range(1, 9):
-                port_alias_to_name_map["Ethernet{}/{}".format(i, 1)] = "Ethernet%d" % ((i - 1) * 2)
-            for i in range(9, 29):
-                port_alias_to_name_map["Ethernet{}/{}".format(i, 1)] = "Ethernet%d" % ((i * 4) - 20)
-            for i in range(29, 37):
-                port_alias_to_name_map["Ethernet{}/{}".format(i, 1)] = "Ethernet%d" % ((i * 8) - 136)
-        elif hwsku == "NH-4010":
-            logical_num = 1
-            for i in range(0, 505, 8):
-                port_alias_to_name_map["Port%d" % logical_num] = "Ethernet%d" % i
-                logical_num += 1
-            # adding 25G ports
-            port_alias_to_name_map["Port65"] = "Ethernet512"
-            port_alias_to_name_map["Port66"] = "Ethernet513"
-
-        elif "NH-5010" in hwsku:
-            logical_num = 1
-            for i in range(0, 256, 4):
-                port_alias_to_name_map["Port%d" % logical_num] = "Ethernet%d" % i
-                logical_num += 1
-            # adding placeholder for 100G ports
-            port_alias_to_name_map["Port65"] = "Ethernet256"
-            port_alias_to_name_map["Port66"] = "Ethernet260"
-        else:
-            if "Arista-7800" in hwsku:
-                assert False, "Please add port_alias_to_name_map for new modular SKU %s." % hwsku
-            for i in range(0, 128, 4):
-                port_alias_to_name_map["Ethernet%d" % i] = "Ethernet%d" % i
+        port_config = _find_port_config(hwsku, asic_name)
+        if port_config:
+            return _ports_to_port_maps(hwsku, read_port_config(port_config))
+        return build_port_alias_to_name_map(get_hwsku_port_ranges(hwsku)), {}, {}
 
-    return port_alias_to_name_map, port_alias_asic_map, port_name_to_index_map
+
+def get_port_maps(hwsku, asic_name=None):
+    """
+    Get the port maps of a hwsku, built once per process.
+
+    Returns:
+        tuple: Read-only (port_alias_to_name_map, port_alias_asic_map, port_name_to_index_map).
+    """
+    key = (hwsku, asic_name)
+    if key not in _port_maps:
+        _port_maps[key] = tuple(MappingProxyType(port_map) for port_map in _load_port_maps(hwsku, asic_name))
+    return _port_maps[key]
+
+
+def get_port_alias_to_name_map(hwsku, asic_name=None):
+    port_alias_to_name_map, port_alias_asic_map, port_name_to_index_map = get_port_maps(hwsku, asic_name)
+    return dict(port_alias_to_name_map), dict(port_alias_asic_map), dict(port_name_to_index_map)
 
 
 def get_port_indices_for_asic(asic_id, port_name_list_sorted):
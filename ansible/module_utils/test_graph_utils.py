@@ -0,0 +1,71 @@
+"""Unit tests of the graph facts snapshots of ansible/module_utils/graph_utils.py.
+
+Run from the repo root with:
+    python -m pytest --noconftest ansible/module_utils/test_graph_utils.py -v
+"""
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+_ANSIBLE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ANSIBLE_DIR not in sys.path:
+    sys.path.insert(0, _ANSIBLE_DIR)
+
+from module_utils import graph_utils, port_utils  # noqa: E402
+
+
+@pytest.fixture
+def graph_dir(tmp_path):
+    path = tmp_path / "graph"
+    path.mkdir()
+    (path / "sonic_lab_devices.csv").write_text(
+        "Hostname,ManagementIp,HwSku,Type\n"
+        "dut1,10.0.0.1/24,Force10-S6000,DevSonic\n")
+    return path
+
+
+def _load(graph_dir, snapshot_dir):
+    """Return the graph facts and whether the graph files were parsed."""
+    with patch.object(graph_utils.LabGraph, "read_csv_files", autospec=True,
+                      side_effect=graph_utils.LabGraph.read_csv_files) as read_mock:
+        graph = graph_utils.LabGraph(str(graph_dir), "lab", snapshot_dir=str(snapshot_dir))
+    return graph.graph_facts, read_mock.called
+
+
+def test_snapshot_is_reused(graph_dir, tmp_path):
+    facts, parsed = _load(graph_dir, tmp_path / "snapshots")
+    assert parsed
+    assert _load(graph_dir, tmp_path / "snapshots") == (facts, False)
+
+
+@pytest.mark.parametrize("content", [b"", b"garbage", b"\x80\x04\x95\x00\x00\x00\x00\x00\x00\x00\x00\x8c\x01x."])
+def test_unreadable_snapshot_is_rebuilt(graph_dir, tmp_path, content):
+    snapshot_dir = tmp_path / "snapshots"
+    facts, _ = _load(graph_dir, snapshot_dir)
+    for snapshot_file in snapshot_dir.iterdir():
+        snapshot_file.write_bytes(content)
+    assert _load(graph_dir, snapshot_dir) == (facts, True)
+    assert _load(graph_dir, snapshot_dir) == (facts, False)
+
+
+def test_snapshot_is_rebuilt_when_port_config_changes(graph_dir, tmp_path, monkeypatch):
+    hwsku_dir = tmp_path / "hwskus" / "Force10-S6000"
+    hwsku_dir.mkdir(parents=True)
+    port_config = hwsku_dir / "port_config.ini"
+    port_config.write_text("Ethernet0 0 fortyGigE0/0 0\n")
+    monkeypatch.setattr(port_utils, "PORT_CONFIG_DIRS", [str(tmp_path / "hwskus")])
+    snapshot_dir = tmp_path / "snapshots"
+
+    assert _load(graph_dir, snapshot_dir)[1]
+    assert not _load(graph_dir, snapshot_dir)[1]
+
+    port_config.write_text("Ethernet0 0 fortyGigE0/0 0\nEthernet4 4 fortyGigE0/4 1\n")
+    assert _load(graph_dir, snapshot_dir)[1]
+
+    # A port_config.ini of an asic of a multi-asic hwsku is considered as well
+    (hwsku_dir / "0").mkdir()
+    (hwsku_dir / "0" / "port_config.ini").write_text("Ethernet0 0 Ethernet1/1 0\n")
+    assert _load(graph_dir, snapshot_dir)[1]
+    assert not _load(graph_dir, snapshot_dir)[1]
@@ -25,6 +25,7 @@ import time
 import json
 import itertools
 import fib
+from probe_pipeline import Probe, ProbePipeline
 
 import ptf
 import ptf.packet as scapy
@@ -153,6 +154,9 @@ class FibTest(BaseTest):
         self.switch_type = self.test_params.get(
             'switch_type', self.DEFAULT_SWITCH_TYPE)
 
+        self.probe_pipeline = self.test_params.get('probe_pipeline', False)
+        self.probe_window = self.test_params.get('probe_window', ProbePipeline.DEFAULT_WINDOW)
+
         self.pkt_action = self.test_params.get('pkt_action', self.ACTION_FWD)
         self.ttl = self.test_params.get('ttl', 64)
 
@@ -190,7 +194,7 @@ class FibTest(BaseTest):
             if len(ip_ranges) > 150:
                 # Limit test execution time
                 covered_ip_ranges = ip_ranges[:100] + \
-                    random.sample(ip_ranges[100:], 50)
+                    [ip_ranges[i] for i in random.sample(range(100, len(ip_ranges)), 50)]
             else:
                 covered_ip_ranges = ip_ranges[:]
 
@@ -297,11 +301,16 @@ class FibTest(BaseTest):
                 # Change balancing_test_times according to number of next hop groups
                 logging.info('Checking ip range balancing {}, src_port={}, exp_ports={}, dst_ip={}, dut_index={}'
                              .format(ip_range, src_port, exp_port_lists, dst_ip, dut_index))
-                for i in range(0, self.balancing_test_times*len(list(itertools.chain(*exp_port_lists)))):
-                    (matched_port, _) = self.check_ip_route(
-                        src_port, dst_ip, exp_port_lists, ipv4)
-                    hit_count_map[matched_port] = hit_count_map.get(
-                        matched_port, 0) + 1
+                probe_count = self.balancing_test_times*len(list(itertools.chain(*exp_port_lists)))
+                if self.probe_pipeline:
+                    hit_count_map = self.check_ip_route_pipelined(
+                        src_port, dst_ip, exp_port_lists, probe_count, ipv4)
+                else:
+                    for i in range(0, probe_count):
+                        (matched_port, _) = self.check_ip_route(
+                            src_port, dst_ip, exp_port_lists, ipv4)
+                        hit_count_map[matched_port] = hit_count_map.get(
+                            matched_port, 0) + 1
                 for next_hop in next_hops:
                     # only check balance on a DUT
                     self.check_hit_count_map(
@@ -328,15 +337,11 @@ class FibTest(BaseTest):
 
         return (matched_port, received)
 
-    def check_ipv4_route(self, src_port, dst_ip_addr, dst_port_lists):
+    def create_ipv4_packets(self, src_port, dst_ip_addr, sport, dport):
         '''
-        @summary: Check IPv4 route works.
-        @param src_port: index of port to use for sending packet to switch
-        @param dest_ip_addr: destination IP to build packet with.
-        @param dst_port_lists: list of ports on which to expect packet to come back from the switch
+        @summary: Build the IPv4 packet to send and the masked packet expected to be received.
+        @return (pkt, masked_exp_pkt, ip_src)
         '''
-        sport = random.randint(0, 65535)
-        dport = random.randint(0, 65535)
         ip_src = "30.0.0.1"
         ip_dst = dst_ip_addr
         src_mac = self.dataplane.get_mac(0, src_port)
@@ -374,6 +379,19 @@ class FibTest(BaseTest):
             masked_exp_pkt.set_do_not_care_scapy(scapy.IP, "ttl")
             masked_exp_pkt.set_do_not_care_scapy(scapy.IP, "chksum")
             masked_exp_pkt.set_do_not_care_scapy(scapy.TCP, "chksum")
+        return pkt, masked_exp_pkt, ip_src
+
+    def check_ipv4_route(self, src_port, dst_ip_addr, dst_port_lists):
+        '''
+        @summary: Check IPv4 route works.
+        @param src_port: index of port to use for sending packet to switch
+        @param dest_ip_addr: destination IP to build packet with.
+        @param dst_port_lists: list of ports on which to expect packet to come back from the switch
+        '''
+        sport = random.randint(0, 65535)
+        dport = random.randint(0, 65535)
+        ip_dst = dst_ip_addr
+        pkt, masked_exp_pkt, ip_src = self.create_ipv4_packets(src_port, dst_ip_addr, sport, dport)
 
         send_packet(self, src_port, pkt)
         logging.info('Sent Ether(src={}, dst={})/IP(src={}, dst={})/TCP(sport={}, dport={}) on port {}'
@@ -414,39 +432,18 @@ class FibTest(BaseTest):
                 rcvd_port, len_rcvd_pkt))
             logging.info(
                 'Recieved packet with length of {}'.format(len_rcvd_pkt))
-            exp_src_mac = None
-            if len(self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"]) > 1:
-                # active-active dualtor, the packet could be received from either ToR, so use the received
-                # port to find the corresponding ToR
-                for dut_index, port_list in enumerate(dst_port_lists):
-                    if rcvd_port in port_list:
-                        exp_src_mac = self.ptf_test_port_map[str(
-                            rcvd_port)]["target_src_mac"][dut_index]
-            else:
-                exp_src_mac = self.ptf_test_port_map[str(
-                    rcvd_port)]["target_src_mac"][0]
-            actual_src_mac = scapy.Ether(rcvd_pkt).src
-            if str(exp_src_mac).lower() != str(actual_src_mac).lower():
-                raise Exception(
-                    "Pkt sent from {} to {} on port {} was rcvd pkt on {} which is one of the expected ports, "
-                    "but the src mac doesn't match, expected {}, got {}".
-                    format(ip_src, ip_dst, src_port, rcvd_port, exp_src_mac, actual_src_mac))
+            self.check_rcvd_src_mac(src_port, rcvd_port, rcvd_pkt, dst_port_lists, ip_src, ip_dst)
             return (rcvd_port, rcvd_pkt)
         elif self.pkt_action == self.ACTION_DROP:
             verify_no_packet_any(self, masked_exp_pkt, dst_ports)
             return (None, None)
     # ---------------------------------------------------------------------
 
-    def check_ipv6_route(self, src_port, dst_ip_addr, dst_port_lists):
+    def create_ipv6_packets(self, src_port, dst_ip_addr, sport, dport):
         '''
-        @summary: Check IPv6 route works.
-        @param source_port_index: index of port to use for sending packet to switch
-        @param dest_ip_addr: destination IP to build packet with.
-        @param dst_port_lists: list of ports on which to expect packet to come back from the switch
-        @return Boolean
+        @summary: Build the IPv6 packet to send and the masked packet expected to be received.
+        @return (pkt, masked_exp_pkt, ip_src)
         '''
-        sport = random.randint(0, 65535)
-        dport = random.randint(0, 65535)
         ip_src = '2000:0030::1'
         ip_dst = dst_ip_addr
         src_mac = self.dataplane.get_mac(0, src_port)
@@ -481,6 +478,20 @@ class FibTest(BaseTest):
         if self.ignore_ttl:
             masked_exp_pkt.set_do_not_care_scapy(scapy.IPv6, "hlim")
             masked_exp_pkt.set_do_not_care_scapy(scapy.TCP, "chksum")
+        return pkt, masked_exp_pkt, ip_src
+
+    def check_ipv6_route(self, src_port, dst_ip_addr, dst_port_lists):
+        '''
+        @summary: Check IPv6 route works.
+        @param source_port_index: index of port to use for sending packet to switch
+        @param dest_ip_addr: destination IP to build packet with.
+        @param dst_port_lists: list of ports on which to expect packet to come back from the switch
+        @return Boolean
+        '''
+        sport = random.randint(0, 65535)
+        dport = random.randint(0, 65535)
+        ip_dst = dst_ip_addr
+        pkt, masked_exp_pkt, ip_src = self.create_ipv6_packets(src_port, dst_ip_addr, sport, dport)
 
         send_packet(self, src_port, pkt)
         logging.info('Sent Ether(src={}, dst={})/IPv6(src={}, dst={})/TCP(sport={}, dport={}) on port {}'
@@ -522,28 +533,58 @@ class FibTest(BaseTest):
                 rcvd_port, len_rcvd_pkt))
             logging.info(
                 'Recieved packet with length of {}'.format(len_rcvd_pkt))
-            exp_src_mac = None
-            if len(self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"]) > 1:
-                # active-active dualtor, the packet could be received from either ToR, so use the received
-                # port to find the corresponding ToR
-                for dut_index, port_list in enumerate(dst_port_lists):
-                    if rcvd_port in port_list:
-                        exp_src_mac = self.ptf_test_port_map[str(
-                            rcvd_port)]["target_src_mac"][dut_index]
-            else:
-                exp_src_mac = self.ptf_test_port_map[str(
-                    rcvd_port)]["target_src_mac"][0]
-            actual_src_mac = scapy.Ether(rcvd_pkt).src
-            if str(exp_src_mac).lower() != str(actual_src_mac).lower():
-                raise Exception(
-                    "Pkt sent from {} to {} on port {} was rcvd pkt on {} which is one of the expected ports, "
-                    "but the src mac doesn't match, expected {}, got {}".
-                    format(ip_src, ip_dst, src_port, rcvd_port, exp_src_mac, actual_src_mac))
+            self.check_rcvd_src_mac(src_port, rcvd_port, rcvd_pkt, dst_port_lists, ip_src, ip_dst)
             return (rcvd_port, rcvd_pkt)
         elif self.pkt_action == self.ACTION_DROP:
             verify_no_packet_any(self, masked_exp_pkt, dst_ports)
             return (None, None)
 
+    def check_rcvd_src_mac(self, src_port, rcvd_port, rcvd_pkt, dst_port_lists, ip_src, ip_dst):
+        '''
+        @summary: Check the src mac of a packet received on one of the expected ports is the mac of the DUT
+        '''
+        exp_src_mac = None
+        if len(self.ptf_test_port_map[str(rcvd_port)]["target_src_mac"]) > 1:
+            # active-active dualtor, the packet could be received from either ToR, so use the received
+            # port to find the corresponding ToR
+            for dut_index, port_list in enumerate(dst_port_lists):
+                if rcvd_port in port_list:
+                    exp_src_mac = self.ptf_test_port_map[str(
+                        rcvd_port)]["target_src_mac"][dut_index]
+        else:
+            exp_src_mac = self.ptf_test_port_map[str(
+                rcvd_port)]["target_src_mac"][0]
+        actual_src_mac = scapy.Ether(rcvd_pkt).src
+        if str(exp_src_mac).lower() != str(actual_src_mac).lower():
+            raise Exception(
+                "Pkt sent from {} to {} on port {} was rcvd pkt on {} which is one of the expected ports, "
+                "but the src mac doesn't match, expected {}, got {}".
+                format(ip_src, ip_dst, src_port, rcvd_port, exp_src_mac, actual_src_mac))
+
+    def check_ip_route_pipelined(self, src_port, dst_ip_addr, dst_port_lists, count, ipv4=True):
+        '''
+        @summary: Send count packets with random L4 ports to dst_ip_addr back-to-back, and count the packets
+                  received on each port.
+        @return the number of packets received by port
+        '''
+        create_packets = self.create_ipv4_packets if ipv4 else self.create_ipv6_packets
+        dst_ports = list(itertools.chain(*dst_port_lists))
+        probes = []
+        for _ in range(count):
+            pkt, masked_exp_pkt, ip_src = create_packets(
+                src_port, dst_ip_addr, random.randint(0, 65535), random.randint(0, 65535))
+            probes.append(Probe(src_port, pkt, masked_exp_pkt, dst_ports, ip_src))
+
+        def validate(probe, rcvd_port, rcvd_pkt):
+            self.check_rcvd_src_mac(src_port, rcvd_port, rcvd_pkt, dst_port_lists, probe.context, dst_ip_addr)
+
+        results = ProbePipeline(self, window=self.probe_window, timeout=self.PTF_TIMEOUT).run(probes, validate)
+        logging.info('Pipelined {} packets to {} from port {}: {:.1f} probes/s'.format(
+            count, dst_ip_addr, src_port, results.probes_per_sec))
+        assert not results.missing, "{} of {} packets to {} were not received: {}".format(
+            len(results.missing), count, dst_ip_addr, results)
+        return results.hit_count_map
+
     def check_within_expected_range(self, actual, expected):
         '''
         @summary: Check if the actual number is within the accepted range of the expected number
@@ -1,9 +1,16 @@
 import random
+import socket
 import six
 
-from ipaddress import ip_address, ip_network
+from binascii import hexlify
+from ipaddress import IPv4Address, IPv6Address, ip_address
 from SubnetTree import SubnetTree
 
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
 '''
 LpmDict is a class used in FIB test for LPM and IP segmentation.
 
@@ -14,101 +21,170 @@ segments from start to end according to the prefixes (networks) it reads.
 
 Initially, the whole IP space contains only one range. After inserting
 prefixes, the IP space is segmented into multiple ranges. The ranges()
-function returns all ranges in the LpmDict with a list of IpIntervals. The
+function returns all ranges in the LpmDict with a sequence of IpIntervals. The
 sub-class IpInterval then could be used to get the first/last/random IP within
 this range. It could also check the length of the range and if an IP is within
 this range.
 
+The boundaries of the ranges are kept as integers, and sorted once after the
+prefixes are inserted. The IpIntervals are only created when the ranges are
+accessed, so a FIB of several hundred thousand prefixes is segmented without
+building an ipaddress object per boundary.
+
 To achieve the LPM functionality, use the LpmDict as a dictionary and use
 [] operator to get the corresponding value using the key (IP).
 
-Please check the test_lpm.py file to see the details of how this class works.
+Please check tests/common/unit_tests/ptftests/unit_test_lpm.py to see the
+details of how this class works.
 '''
 
 
+def parse_prefix(prefix):
+    '''
+    Parse an IPv4 or IPv6 prefix like ip_network() does, into integers.
+
+    Returns a tuple (version, first address, last address, prefix length).
+    Raises ValueError for an invalid prefix or a prefix with host bits set.
+    '''
+    address, _, prefixlen = prefix.partition('/')
+    if ':' in address:
+        version, family, max_prefixlen = 6, socket.AF_INET6, 128
+    else:
+        version, family, max_prefixlen = 4, socket.AF_INET, 32
+    try:
+        first = int(hexlify(socket.inet_pton(family, address)), 16)
+        prefixlen = int(prefixlen) if prefixlen else max_prefixlen
+    except (socket.error, ValueError):
+        raise ValueError('{} does not appear to be an IPv4 or IPv6 network'.format(prefix))
+    if not 0 <= prefixlen <= max_prefixlen:
+        raise ValueError('{} does not appear to be an IPv4 or IPv6 network'.format(prefix))
+    hostmask = (1 << (max_prefixlen - prefixlen)) - 1
+    if first & hostmask:
+        raise ValueError('{} has host bits set'.format(prefix))
+    return version, first, first | hostmask, prefixlen
+
+
 class LpmDict():
     class IpInterval:
-        def __init__(self, s, e):
+        def __init__(self, s, e, address=IPv4Address):
+            # s and e are integers, or ipaddress objects of the same version like before
+            if not isinstance(s, six.integer_types):
+                address = type(s)
+                s, e = int(s), int(e)
             assert s <= e
             self._start = s
             self._end = e
+            self._address = address
 
         # __len__ has hard limit on returning long int
         def length(self):
-            return int(self._end) - int(self._start)
+            return self._end - self._start
 
         def contains(self, ip):
+            if not isinstance(ip, six.integer_types):
+                ip = int(ip_address(six.text_type(ip)))
             return ip >= self._start and ip <= self._end
 
         def get_first_ip(self):
-            return str(self._start)
+            return str(self._address(self._start))
 
         def get_last_ip(self):
-            return str(self._end)
+            return str(self._address(self._end))
 
         def get_random_ip(self):
             diff = self.length()
-            return str(self._start + random.randint(0, diff))
+            return str(self._address(self._start + random.randint(0, diff)))
 
         def __str__(self):
-            return str(self._start) + ' - ' + str(self._end)
+            return self.get_first_ip() + ' - ' + self.get_last_ip()
+
+    class IpIntervals(Sequence):
+        '''
+        The ranges of an LpmDict, from its sorted boundaries.
+
+        The IpIntervals are created on access. A slice is returned as a list of
+        IpIntervals, like the list returned by ranges() before.
+        '''
+
+        def __init__(self, boundaries, max_address, address):
+            self._boundaries = boundaries
+            self._max_address = max_address
+            self._address = address
+
+        def __len__(self):
+            return len(self._boundaries)
+
+        def __getitem__(self, index):
+            if isinstance(index, slice):
+                return [self[i] for i in range(*index.indices(len(self)))]
+            if index < 0:
+                index += len(self._boundaries)
+            if not 0 <= index < len(self._boundaries):
+                raise IndexError('range index out of range')
+            start = self._boundaries[index]
+            end = self._boundaries[index + 1] - 1 if index + 1 < len(self._boundaries) else self._max_address
+            return LpmDict.IpInterval(start, end, self._address)
 
     def __init__(self, ipv4=True):
         self._ipv4 = ipv4
+        self._version = 4 if ipv4 else 6
+        self._max_address = (1 << 32) - 1 if ipv4 else (1 << 128) - 1
         self._prefix_set = set()
         self._subnet_tree = SubnetTree()
         # 0.0.0.0 is a non-routable meta-address that needs to be skipped
-        self._boundaries = {ip_address(u'0.0.0.0'): 1} if ipv4 else {
-            ip_address(u'::'): 1}
+        self._boundaries = {0: 1}
+        self._sorted_boundaries = None
+
+    def _parse_prefix(self, key):
+        version, first, last, prefixlen = parse_prefix(key)
+        if version != self._version:
+            raise ValueError('{} is not an IPv{} prefix'.format(key, self._version))
+        return first, last, prefixlen
 
     def __setitem__(self, key, value):
-        prefix = ip_network(six.text_type(key))
-        # add the current key to self._prefix_set only when it is not the default route and it is not a duplicate key
-        if prefix.prefixlen and key not in self._prefix_set:
-            boundary = prefix[0]
-            self._boundaries[boundary] = self._boundaries.get(boundary, 0) + 1
-            if prefix[-1] != ip_address(u'255.255.255.255') \
-                    and prefix[-1] != ip_address(u'ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff'):
-                next_boundary = prefix[-1] + 1
-                self._boundaries[next_boundary] = self._boundaries.get(
-                    next_boundary, 0) + 1
-            self._prefix_set.add(key)
-        self._subnet_tree.__setitem__(key, value)
+        self.update([(key, value)])
+
+    def update(self, items):
+        '''
+        Insert the (prefix, value) pairs, e.g. all the routes of a FIB file.
+        '''
+        boundaries = self._boundaries
+        prefix_set = self._prefix_set
+        subnet_tree = self._subnet_tree
+        max_address = self._max_address
+        for key, value in items:
+            first, last, prefixlen = self._parse_prefix(key)
+            # add the current key to self._prefix_set only when it is not the default route and it is not a
+            # duplicate key
+            if prefixlen and (first, prefixlen) not in prefix_set:
+                boundaries[first] = boundaries.get(first, 0) + 1
+                if last != max_address:
+                    boundaries[last + 1] = boundaries.get(last + 1, 0) + 1
+                prefix_set.add((first, prefixlen))
+                self._sorted_boundaries = None
+            subnet_tree[key] = value
 
     def __getitem__(self, key):
         return self._subnet_tree[key]
 
     def __delitem__(self, key):
-        if '/0' not in key:
-            prefix = ip_network(six.text_type(key))
-            boundary = prefix[0]
-            next_boundary = prefix[-1] + 1
-            self._boundaries[boundary] = self._boundaries.get(boundary) - 1
-            if not self._boundaries[boundary]:
-                del self._boundaries[boundary]
-            self._boundaries[next_boundary] = self._boundaries.get(
-                next_boundary) - 1
-            if not self._boundaries[next_boundary]:
-                del self._boundaries[next_boundary]
-            self._prefix_set.remove(key)
+        first, last, prefixlen = self._parse_prefix(key)
+        if prefixlen:
+            for boundary in (first, last + 1):
+                if boundary > self._max_address:
+                    continue
+                self._boundaries[boundary] = self._boundaries.get(boundary) - 1
+                if not self._boundaries[boundary]:
+                    del self._boundaries[boundary]
+            self._prefix_set.remove((first, prefixlen))
+            self._sorted_boundaries = None
         self._subnet_tree.__delitem__(key)
 
     def ranges(self):
-        sorted_boundaries = sorted(self._boundaries.keys())
-        ranges = []
-        for index, boundary in enumerate(sorted_boundaries):
-            if index != len(sorted_boundaries) - 1:
-                interval = self.IpInterval(
-                    sorted_boundaries[index], sorted_boundaries[index + 1] - 1)
-            else:
-                if self._ipv4:
-                    interval = self.IpInterval(
-                        sorted_boundaries[index], ip_address(u'255.255.255.255'))
-                else:
-                    interval = self.IpInterval(sorted_boundaries[index], ip_address(
-                        u'ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff'))
-            ranges.append(interval)
-        return ranges
+        if self._sorted_boundaries is None:
+            self._sorted_boundaries = sorted(self._boundaries)
+        return self.IpIntervals(self._sorted_boundaries, self._max_address,
+                                IPv4Address if self._ipv4 else IPv6Address)
 
     def contains(self, key):
         return key in self._subnet_tree
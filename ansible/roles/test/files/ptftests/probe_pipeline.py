@@ -0,0 +1,170 @@
+'''
+Description:    Pipelined send/verify of probe packets, used by the balancing checks of FibTest and HashTest.
+
+                The probes are built before sending, sent back-to-back up to a window of probes in flight, and the
+                received packets are matched to the probes by signature. A signature is made of the bytes that
+                are not masked in the expected packets of all the probes, so it is looked up in a dict instead of
+                comparing every received packet with every expected packet.
+
+                Probes with the same signature, e.g. the probes of a 'src-mac' hash test, only differ by fields
+                rewritten by the DUT. They are hashed to the same egress port, so any of them can be matched by a
+                received packet.
+
+Usage:          probes = [Probe(src_port, pkt, masked_exp_pkt, dst_ports, context) for ...]
+                results = ProbePipeline(self).run(probes, validate=self.check_rcvd_packet)
+                hit_count_map = results.hit_count_map
+'''
+import logging
+import time
+
+from collections import defaultdict, deque, namedtuple
+from operator import itemgetter
+
+from ptf.testutils import dp_poll
+from ptf.testutils import send_packet
+
+# Number of bytes of the expected packets used for the signatures, enough for the L2, L3 and L4 headers
+SIGNATURE_LENGTH = 128
+
+# A probe to send:
+#   src_port:           port to send the packet to
+#   pkt:                packet to send
+#   masked_exp_pkt:     ptf.mask.Mask of the packet expected to be received
+#   dst_ports:          list of ports the packet may be received on
+#   context:            passed to the validate function, e.g. the addresses for the logs
+Probe = namedtuple('Probe', ['src_port', 'pkt', 'masked_exp_pkt', 'dst_ports', 'context'])
+
+
+class ProbeResults(object):
+    def __init__(self):
+        self.hit_count_map = {}
+        self.sent = 0
+        self.received = 0
+        self.missing = []
+        self.unexpected = 0
+        self.elapsed = 0.0
+
+    @property
+    def probes_per_sec(self):
+        return self.received / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return '{} probes sent, {} received, {} missing, {} unexpected packets in {:.2f}s: {:.1f} probes/s'.format(
+            self.sent, self.received, len(self.missing), self.unexpected, self.elapsed, self.probes_per_sec)
+
+
+class _PendingProbe(object):
+    __slots__ = ['probe', 'exp_pkt', 'mask', 'masked_exp_int', 'mask_int', 'ignore_extra_bytes', 'sent_count']
+
+    def __init__(self, probe):
+        masked_exp_pkt = probe.masked_exp_pkt
+        self.probe = probe
+        self.exp_pkt = bytes(masked_exp_pkt.exp_pkt)
+        self.mask = masked_exp_pkt.mask
+        # The packets are compared as big integers, the expected packet and its mask are only converted once
+        self.mask_int = int.from_bytes(bytes(bytearray(self.mask)), 'big')
+        self.masked_exp_int = int.from_bytes(self.exp_pkt, 'big') & self.mask_int
+        self.ignore_extra_bytes = masked_exp_pkt.ignore_extra_bytes
+        self.sent_count = 0
+
+    def match(self, pkt):
+        # Same as Mask.pkt_match()
+        size = len(self.exp_pkt)
+        if len(pkt) < size or (not self.ignore_extra_bytes and len(pkt) != size):
+            return False
+        return int.from_bytes(pkt[:size], 'big') & self.mask_int == self.masked_exp_int
+
+
+class ProbePipeline(object):
+    '''
+    Send probes back-to-back and count the received packets per port.
+
+    @param test:        the ptf test
+    @param window:      maximum number of probes in flight
+    @param timeout:     seconds to wait for a packet when no packet is received, before the probes in flight are
+                        sent again once
+    '''
+    DEFAULT_WINDOW = 64
+    DEFAULT_TIMEOUT = 10
+
+    def __init__(self, test, window=DEFAULT_WINDOW, timeout=DEFAULT_TIMEOUT):
+        self.test = test
+        self.window = max(1, window)
+        self.timeout = timeout
+
+    @staticmethod
+    def _signature(pending):
+        '''
+        @return (function computing the signature of a packet, minimum length of a packet to compute it)
+        '''
+        length = min(SIGNATURE_LENGTH, min(len(p.exp_pkt) for p in pending))
+        positions = [i for i in range(length) if all(p.mask[i] == 0xff for p in pending)]
+        if not positions:
+            return (lambda pkt: ()), 0
+        if len(positions) == 1:
+            return (lambda pkt: (pkt[positions[0]],)), positions[0] + 1
+        return itemgetter(*positions), positions[-1] + 1
+
+    def run(self, probes, validate=None):
+        '''
+        @summary: Send the probes and match the received packets
+        @param probes: list of Probe
+        @param validate: function(probe, rcvd_port, rcvd_pkt) called for every matched packet, raising an
+                         exception for an invalid packet
+        @return ProbeResults, with the probes not received in 'missing'
+        '''
+        results = ProbeResults()
+        if not probes:
+            return results
+        pending = [_PendingProbe(probe) for probe in probes]
+        signature, signature_length = self._signature(pending)
+        in_flight = defaultdict(deque)
+        in_flight_count = 0
+        to_send = deque(pending)
+        hit_count_map = results.hit_count_map
+
+        self.test.dataplane.flush()
+        start = time.time()
+        while to_send or in_flight_count:
+            while to_send and in_flight_count < self.window:
+                item = to_send.popleft()
+                send_packet(self.test, item.probe.src_port, item.probe.pkt)
+                item.sent_count += 1
+                results.sent += 1
+                in_flight[signature(item.exp_pkt)].append(item)
+                in_flight_count += 1
+
+            result = dp_poll(self.test, timeout=self.timeout)
+            if not isinstance(result, self.test.dataplane.PollSuccess):
+                # Nothing received for a while, send the probes in flight again once, then give up on them
+                retries = [item for items in in_flight.values() for item in items if item.sent_count < 2]
+                lost = [item for items in in_flight.values() for item in items if item.sent_count >= 2]
+                results.missing.extend(item.probe for item in lost)
+                in_flight.clear()
+                in_flight_count = 0
+                if retries:
+                    logging.warning("{} probes were not received, sending them again".format(len(retries)))
+                to_send.extendleft(reversed(retries))
+                continue
+
+            rcvd_pkt = result.packet
+            items = in_flight.get(signature(rcvd_pkt)) if len(rcvd_pkt) >= signature_length else None
+            item = None
+            if items:
+                for candidate in items:
+                    if result.port in candidate.probe.dst_ports and candidate.match(rcvd_pkt):
+                        item = candidate
+                        break
+            if item is None:
+                results.unexpected += 1
+                continue
+            items.remove(item)
+            in_flight_count -= 1
+            if validate is not None:
+                validate(item.probe, result.port, rcvd_pkt)
+            results.received += 1
+            hit_count_map[result.port] = hit_count_map.get(result.port, 0) + 1
+
+        results.elapsed = time.time() - start
+        logging.info("Probe pipeline: {}".format(results))
+        return results
@@ -566,7 +566,7 @@ class DecapPacketTest(BaseTest):
                 # compromized. Test execution time can be reduced from over 5000 seconds to around 300 seconds.
                 last_ten_index = ip_ranges_length - 10
                 covered_ip_ranges = ip_ranges[:100] + \
-                    random.sample(ip_ranges[100:last_ten_index], 40) + \
+                    [ip_ranges[i] for i in random.sample(range(100, last_ten_index), 40)] + \
                     ip_ranges[last_ten_index:]
             else:
                 covered_ip_ranges = ip_ranges[:]
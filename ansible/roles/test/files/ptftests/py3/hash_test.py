@@ -31,6 +31,7 @@ from ptf.testutils import simple_vxlanv6_packet
 from ptf.testutils import simple_nvgre_packet
 import fib
 import lpm
+from probe_pipeline import Probe, ProbePipeline
 import macsec  # noqa F401
 
 
@@ -114,6 +115,8 @@ class HashTest(BaseTest):
         self.base_mac = self.dataplane.get_mac(
             *random.choice(list(self.dataplane.ports.keys())))
         self.vxlan_dest_port = int(self.test_params.get('vxlan_dest_port', 0))
+        self.probe_pipeline = self.test_params.get('probe_pipeline', False)
+        self.probe_window = self.test_params.get('probe_window', ProbePipeline.DEFAULT_WINDOW)
 
     def _get_nexthops(self, src_port, dst_ip):
         active_dut_indexes = [0]
@@ -218,18 +221,52 @@ class HashTest(BaseTest):
             assert len(hit_count_map.keys()) == len(
                 self.ptf_test_port_map[str(ingress_port)]["target_dut"])
         else:
-            for _ in range(0, self.balancing_test_times * len(list(itertools.chain(*exp_port_lists)))):
-                logging.info('Checking hash key {}, src_port={}, exp_ports={}, dst_ip={}'
-                             .format(hash_key, src_port, exp_port_lists, dst_ip))
-                (matched_port, _) = self.check_ip_route(
-                    hash_key, src_port, dst_ip, exp_port_lists)
-                hit_count_map[matched_port] = hit_count_map.get(
-                    matched_port, 0) + 1
+            probe_count = self.balancing_test_times * len(list(itertools.chain(*exp_port_lists)))
+            if self.probe_pipeline:
+                logging.info('Checking hash key {} with {} pipelined packets, src_port={}, exp_ports={}, dst_ip={}'
+                             .format(hash_key, probe_count, src_port, exp_port_lists, dst_ip))
+                hit_count_map = self.check_ip_route_pipelined(
+                    hash_key, src_port, dst_ip, exp_port_lists, probe_count)
+            else:
+                for _ in range(0, probe_count):
+                    logging.info('Checking hash key {}, src_port={}, exp_ports={}, dst_ip={}'
+                                 .format(hash_key, src_port, exp_port_lists, dst_ip))
+                    (matched_port, _) = self.check_ip_route(
+                        hash_key, src_port, dst_ip, exp_port_lists)
+                    hit_count_map[matched_port] = hit_count_map.get(
+                        matched_port, 0) + 1
             logging.info("hash_key={}, hit count map: {}".format(
                 hash_key, hit_count_map))
             for next_hop in next_hops:
                 self.check_balancing(next_hop.get_next_hop(), hit_count_map, src_port, hash_key)
 
+    def check_ip_route_pipelined(self, hash_key, src_port, dst_ip, dst_port_lists, count):
+        '''
+        @summary: Send count packets with the fields of hash_key randomized back-to-back, and count the packets
+                  received on each port.
+        @return the number of packets received by port
+        '''
+        if ip_network(six.text_type(dst_ip)).version == 4:
+            create_packets = self.create_ipv4_packets
+        else:
+            create_packets = self.create_ipv6_packets
+        dst_ports = list(itertools.chain(*dst_port_lists))
+        probes = []
+        for _ in range(count):
+            pkt, masked_exp_pkt, _, ip_src, ip_dst = create_packets(hash_key, src_port)
+            probes.append(Probe(src_port, pkt, masked_exp_pkt, dst_ports, (ip_src, ip_dst)))
+
+        def validate(probe, rcvd_port, rcvd_pkt):
+            ip_src, ip_dst = probe.context
+            self.get_validated_packet(rcvd_port, rcvd_pkt, dst_port_lists, ip_src, ip_dst, src_port)
+
+        results = ProbePipeline(self, window=self.probe_window).run(probes, validate)
+        logging.info('hash_key={}, pipelined {} packets from port {}: {:.1f} probes/s'.format(
+            hash_key, count, src_port, results.probes_per_sec))
+        assert not results.missing, "{} of {} packets for hash key {} were not received: {}".format(
+            len(results.missing), count, hash_key, results)
+        return results.hit_count_map
+
     def check_ip_route(self, hash_key, src_port, dst_ip, dst_port_lists):
         if ip_network(six.text_type(dst_ip)).version == 4:
             (matched_port, received) = self.check_ipv4_route(
@@ -397,10 +434,11 @@ class HashTest(BaseTest):
                 pkt['IPv6'].nh = ip_proto
                 exp_pkt['IPv6'].nh = ip_proto
 
-    def check_ipv4_route(self, hash_key, src_port, dst_port_lists, outer_sport=None, outer_dst_ip=None,
-                         outer_src_ip=None):
+    def create_ipv4_packets(self, hash_key, src_port, outer_sport=None, outer_dst_ip=None, outer_src_ip=None):
         '''
-        @summary: Check IPv4 route works.
+        @summary: Build the IPv4 packet to send, with the fields of hash_key randomized, and the masked packet
+                  expected to be received.
+        @return (pkt, masked_exp_pkt, logs, ip_src, ip_dst)
         '''
         ip_src = self.src_ip_interval.get_random_ip(
         ) if hash_key == 'src-ip' else self.src_ip_interval.get_first_ip()
@@ -450,6 +488,15 @@ class HashTest(BaseTest):
             ip_dst=ip_dst,
             ip_proto=ip_proto
         )
+        return pkt, masked_exp_pkt, logs, ip_src, ip_dst
+
+    def check_ipv4_route(self, hash_key, src_port, dst_port_lists, outer_sport=None, outer_dst_ip=None,
+                         outer_src_ip=None):
+        '''
+        @summary: Check IPv4 route works.
+        '''
+        pkt, masked_exp_pkt, logs, ip_src, ip_dst = self.create_ipv4_packets(
+            hash_key, src_port, outer_sport=outer_sport, outer_dst_ip=outer_dst_ip, outer_src_ip=outer_src_ip)
         if isinstance(self, HashTest):
             rcvd_port, rcvd_pkt = retry_call(
                 self.send_and_verify_packets,
@@ -461,9 +508,11 @@ class HashTest(BaseTest):
             rcvd_port, rcvd_pkt = self.send_and_verify_packets(src_port, pkt, masked_exp_pkt, dst_port_lists, logs=logs)
         return self.get_validated_packet(rcvd_port, rcvd_pkt, dst_port_lists, ip_src, ip_dst, src_port)
 
-    def check_ipv6_route(self, hash_key, src_port, dst_port_lists, outer_src_ip=None, outer_dst_ip=None):
+    def create_ipv6_packets(self, hash_key, src_port, outer_src_ip=None, outer_dst_ip=None):
         '''
-        @summary: Check IPv6 route works.
+        @summary: Build the IPv6 packet to send, with the fields of hash_key randomized, and the masked packet
+                  expected to be received.
+        @return (pkt, masked_exp_pkt, logs, ip_src, ip_dst)
         '''
         ip_src = self.src_ip_interval.get_random_ip(
         ) if hash_key == 'src-ip' else self.src_ip_interval.get_first_ip()
@@ -515,6 +564,14 @@ class HashTest(BaseTest):
             ip_proto=ip_proto,
             version='IPv6'
         )
+        return pkt, masked_exp_pkt, logs, ip_src, ip_dst
+
+    def check_ipv6_route(self, hash_key, src_port, dst_port_lists, outer_src_ip=None, outer_dst_ip=None):
+        '''
+        @summary: Check IPv6 route works.
+        '''
+        pkt, masked_exp_pkt, logs, ip_src, ip_dst = self.create_ipv6_packets(
+            hash_key, src_port, outer_src_ip=outer_src_ip, outer_dst_ip=outer_dst_ip)
         if isinstance(self, HashTest):
             rcvd_port, rcvd_pkt = retry_call(
                 self.send_and_verify_packets,
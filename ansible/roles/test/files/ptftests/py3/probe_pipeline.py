@@ -0,0 +1 @@
+../probe_pipeline.py
\ No newline at end of file
@@ -29,11 +29,17 @@ import re
 import os
 import os.path
 import csv
+import json
 import time
 import logging
 import logging.handlers
 from datetime import datetime
 
+try:
+    from re import _parser as sre_parse     # Python 3.11+
+except ImportError:
+    import sre_parse
+
 # ---------------------------------------------------------------------
 # Global variables
 # ---------------------------------------------------------------------
@@ -56,6 +62,172 @@ err_start_ignore_marker = -8
 # will not be picked up by the analyzer.
 MAX_LOG_MESSAGE_LENGTH = 1000
 
+# -- Size of the blocks read by reverse_readlines()
+REVERSE_READ_BLOCK_SIZE = 1024 * 1024
+# -- Line ends recognized by reverse_readlines(), like the universal newlines of text mode
+LINE_END_RE = re.compile(b'(\r\n|\r|\n)')
+
+# -- Index of the markers placed into the log files, read by the extract_log ansible module
+# {log file path: {marker: [inode, byte offset]}}, the offset is the size of the file before the marker was placed.
+MARKER_INDEX_FILE = '/tmp/extract_log_index.json'
+# Number of markers kept in the index for each log file
+MARKER_INDEX_SIZE = 32
+
+
+def reverse_readlines(file_path, block_size=REVERSE_READ_BLOCK_SIZE):
+    '''
+    @summary: Generator yielding lines of a file from the last one to the first one.
+
+    The file is read backwards in fixed-size blocks, so memory usage does not depend on the file size
+    and lines before the point where the caller stops iterating are never read.
+    Yielded lines are the same as the ones returned by readlines() of the file opened in text mode:
+    "\\n", "\\r\\n" and "\\r" all end a line and are returned as "\\n", also when a "\\r\\n" is split
+    between two blocks.
+
+    @param file_path: Path to the file.
+    @param block_size: Number of bytes read at a time.
+    '''
+    with open(file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        # -- Earliest line seen so far with its line end, its start is in the part of the file not read yet.
+        # -- The line end is kept raw so that a LF starting a block is joined with a CR ending the previous one.
+        remainder = b''
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            # -- Lines and line ends alternate: [line, end, line, end, ..., line]
+            parts = LINE_END_RE.split(f.read(read_size) + remainder)
+            if len(parts) == 1:
+                remainder = parts[0]
+                continue
+            # -- The last part is empty unless it is the last line of the file, without line end
+            if parts[-1]:
+                yield parts[-1].decode('utf-8', 'replace')
+            for index in range(len(parts) - 3, 1, -2):
+                yield (parts[index] + b'\n').decode('utf-8', 'replace')
+            remainder = parts[0] + parts[1]
+        if remainder:
+            parts = LINE_END_RE.split(remainder)
+            line = parts[0] + b'\n' if len(parts) > 1 else parts[0]
+            yield line.decode('utf-8', 'replace')
+# ---------------------------------------------------------------------
+
+
+def required_literal(parsed):
+    '''
+    @summary: Get the longest literal substring which must appear in any string matched by a parsed regex.
+
+    Only literals in the top-level sequence and in plain groups are considered, literals in branches,
+    repeats and lookarounds are skipped. An empty string is returned if no such literal is found.
+
+    @param parsed: Regular expression parsed by sre_parse.parse().
+    '''
+    longest = ''
+    run = []
+    for op, av in parsed:
+        if op == sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        longest = max(longest, ''.join(run), key=len)
+        run = []
+        # -- av of SUBPATTERN is (group, add_flags, del_flags, pattern)
+        if op == sre_parse.SUBPATTERN and not av[1] & re.IGNORECASE:
+            longest = max(longest, required_literal(av[-1]), key=len)
+    return max(longest, ''.join(run), key=len)
+# ---------------------------------------------------------------------
+
+
+class RegexSet:
+    '''
+    @summary: A list of regular expressions matched like one alternation, re.compile('|'.join(patterns)),
+              which also records how many lines each individual expression was hit by.
+
+    A required literal substring is extracted from each expression. For a line, only the expressions whose
+    literal is in the line, plus the expressions without literal, are candidates. The candidates are matched
+    individually, so the line is matched and the hit expressions are recorded in a single pass, instead of
+    running the whole alternation and then searching each expression again.
+    Hit counts are used to find expected messages that are missing and ignore expressions that never fire.
+    '''
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.regex = re.compile('|'.join(self.patterns))
+        self.pattern = self.regex.pattern
+        self.hits = [0] * len(self.patterns)
+        self._compiled = []
+        # -- Indexes of expressions without required literal, they are candidates for every line
+        self._always = []
+        # -- Map of required literal to indexes of expressions
+        self._literals = {}
+
+        # -- Literals are case sensitive and parsed without verbose flag. Flags set globally by an inline
+        # -- flag of an expression apply to the whole alternation, so apply them to every expression.
+        use_prefilter = not self.regex.flags & (re.IGNORECASE | re.VERBOSE)
+        for index, pattern in enumerate(self.patterns):
+            try:
+                compiled = re.compile(pattern, self.regex.flags)
+                literal = required_literal(sre_parse.parse(pattern)) if use_prefilter else ''
+            except re.error:
+                compiled, literal = None, ''
+            self._compiled.append(compiled)
+            if literal and not compiled.flags & re.IGNORECASE:
+                self._literals.setdefault(literal, []).append(index)
+            else:
+                self._always.append(index)
+        # -- If an expression can't be compiled alone, the alternation decides whether a line matches
+        self._exact = all(compiled is not None for compiled in self._compiled)
+
+    def _candidates(self, line):
+        candidates = list(self._always)
+        for literal, indexes in self._literals.items():
+            if literal in line:
+                candidates.extend(indexes)
+        return candidates
+
+    def _check(self, line, method):
+        result = None
+        for index in self._candidates(line):
+            compiled = self._compiled[index]
+            if compiled is None:
+                continue
+            index_result = getattr(compiled, method)(line)
+            if index_result:
+                self.hits[index] += 1
+                result = result or index_result
+        if not self._exact:
+            result = getattr(self.regex, method)(line)
+        return result
+
+    def search(self, line):
+        '''
+        @summary: Same as re.search() of the alternation, record hit expressions if the line matches.
+        '''
+        return self._check(line, 'search')
+
+    def match(self, line):
+        '''
+        @summary: Same as re.match() of the alternation, record hit expressions if the line matches.
+        '''
+        return self._check(line, 'match')
+
+    def hit_counts(self):
+        '''
+        @summary: Get map of expression to the number of matched lines it was found in.
+        '''
+        counts = {}
+        for pattern, hits in zip(self.patterns, self.hits):
+            counts[pattern] = counts.get(pattern, 0) + hits
+        return counts
+
+    def unused_patterns(self):
+        '''
+        @summary: Get list of expressions which were not found in any matched line.
+        '''
+        return [pattern for pattern, hits in zip(self.patterns, self.hits) if hits == 0]
+# ---------------------------------------------------------------------
+
 
 class AnsibleLogAnalyzer:
     '''
@@ -167,6 +339,37 @@ class AnsibleLogAnalyzer:
         os.system("sudo systemctl reload rsyslog 2>/dev/null || true")
         time.sleep(0.5)
 
+    def index_marker(self, log_file, marker, inode, offset):
+        '''
+        @summary: Record the position of a marker in the marker index, so that the extract_log module
+                  seeks to the marker instead of scanning all the rotated log files.
+        @param log_file: Path of the log file the marker is placed into.
+        @param marker:   Marker placed into the log file.
+        @param inode:    Inode of the log file.
+        @param offset:   Size of the log file before the marker is placed, the marker is found after it.
+        '''
+        try:
+            with open(MARKER_INDEX_FILE) as f:
+                index = json.load(f)
+        except (IOError, OSError, ValueError):
+            index = {}
+
+        markers = index.setdefault(os.path.normpath(log_file), {})
+        markers.pop(marker, None)
+        markers[marker] = [inode, offset]
+        # Markers are kept in insertion order, drop the oldest ones
+        for old_marker in list(markers)[:-MARKER_INDEX_SIZE]:
+            del markers[old_marker]
+
+        tmp_file = '{}.{}'.format(MARKER_INDEX_FILE, os.getpid())
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(index, f)
+            os.rename(tmp_file, MARKER_INDEX_FILE)
+        except (IOError, OSError) as e:
+            # extract_log falls back to scanning the log files
+            self.print_diagnostic_message('Failed to update marker index {}: {}'.format(MARKER_INDEX_FILE, repr(e)))
+
     def place_marker_to_file(self, log_file, marker):
         '''
         @summary: Place marker into each log file specified.
@@ -179,6 +382,8 @@ class AnsibleLogAnalyzer:
         self.print_diagnostic_message(
             'log file:{}, place marker {}'.format(log_file, marker))
         with open(log_file, 'a') as file:
+            stat = os.fstat(file.fileno())
+            self.index_marker(log_file, marker, stat.st_ino, stat.st_size)
             file.write(datetime.now().strftime("%b %d %H:%M:%S.%f") + ' ')
             file.write(marker)
             file.write('\n')
@@ -200,6 +405,11 @@ class AnsibleLogAnalyzer:
         # does not interfere with the marker we are about to write.
         self.flush_rsyslogd()
 
+        # rsyslog appends the marker after the current end of the syslog file
+        if os.path.exists(system_log_file):
+            stat = os.stat(system_log_file)
+            self.index_marker(system_log_file, marker, stat.st_ino, stat.st_size)
+
         syslogger = self.init_sys_logger()
         syslogger.info(marker)
         syslogger.info('\n')
@@ -308,7 +518,7 @@ class AnsibleLogAnalyzer:
 
         @param file_list : List of file paths, contains search expressions.
 
-        @return: A regex class instance, corresponding to loaded regex expressions.
+        @return: A RegexSet instance, corresponding to loaded regex expressions.
             Will be used for matching operations by callers.
         '''
         messages_regex = []
@@ -361,7 +571,7 @@ class AnsibleLogAnalyzer:
                         sys.exit(err_invalid_string_format)
 
         if (len(messages_regex)):
-            regex = re.compile('|'.join(messages_regex))
+            regex = RegexSet(messages_regex)
         else:
             regex = None
         return regex, messages_regex
@@ -378,21 +588,21 @@ class AnsibleLogAnalyzer:
             'ignore' set - will not be reported (will be ignored)
 
         @param match_messages_regex:
-            regex class instance containing messages to match against.
+            regex class or RegexSet instance containing messages to match against.
 
         @param ignore_messages_regex:
-            regex class instance containing messages to ignore match against.
+            regex class or RegexSet instance containing messages to ignore match against.
 
         @return: True is str matches regex criteria, otherwise False.
         '''
 
         ret_code = False
 
-        if ((match_messages_regex is not None) and (match_messages_regex.findall(str))):
+        if ((match_messages_regex is not None) and (match_messages_regex.search(str))):
             if (ignore_messages_regex is None):
                 ret_code = True
 
-            elif (not ignore_messages_regex.findall(str)):
+            elif (not ignore_messages_regex.search(str)):
                 self.print_diagnostic_message('matching line: %s' % str)
                 ret_code = True
 
@@ -413,16 +623,17 @@ class AnsibleLogAnalyzer:
             if (expect_messages_regex is not None) and (expect_messages_regex.match(str)):
                 ret_code = True
         else:
-            if (expect_messages_regex is not None) and (expect_messages_regex.findall(str)):
+            if (expect_messages_regex is not None) and (expect_messages_regex.search(str)):
                 ret_code = True
 
         return ret_code
 
     def analyze_file(self, log_file_path, match_messages_regex, ignore_messages_regex, expect_messages_regex,
-                     maximum_log_length=None):
+                     maximum_log_length=None, streaming=True):
         '''
         @summary: Analyze input file content for messages matching input regex
                   expressions. See line_matches() for details on matching criteria.
+                  The file is scanned from its end and the scan stops at the start marker.
 
         @param log_file_path: Patch to the log file.
 
@@ -439,6 +650,9 @@ class AnsibleLogAnalyzer:
 
         @param maximum_log_length - The long log message (length > maximum_log_length) will be dropped by LogAnalyzer.
 
+        @param streaming - Read the file backwards block by block with reverse_readlines(), memory usage stays flat
+            regardless of the file size. If False, load the whole file with readlines() before scanning.
+
         @return: List of strings match search criteria.
         '''
 
@@ -454,15 +668,18 @@ class AnsibleLogAnalyzer:
         found_start_marker = False
         found_end_marker = False
         if stdin_as_input:
-            log_file = sys.stdin
+            rev_lines = reversed(sys.stdin.readlines())
+        elif streaming:
+            rev_lines = reverse_readlines(log_file_path)
         else:
-            log_file = open(log_file_path, 'r')
+            with open(log_file_path, 'r') as log_file:
+                rev_lines = reversed(log_file.readlines())
 
         start_marker = self.create_start_marker()
         end_marker = self.create_end_marker()
 
         ignore_marker_run_ids = []
-        for rev_line in reversed(log_file.readlines()):
+        for rev_line in rev_lines:
             if stdin_as_input:
                 in_analysis_range = True
             else:
@@ -591,6 +808,8 @@ def usage():
     print('                                 to all log files specified in --logs parameter.')
     print('                                 analyze - perform log analysis of files specified in --logs parameter.')
     print('                                 add_end_marker - add end marker to all log files specified in --logs parameter.')           # noqa: E501
+    print('                                 filter - analyze files specified in --logs parameter with regular expressions')              # noqa: E501
+    print('                                 in --regex_file, print matching and expected lines as JSON to stdout.')                      # noqa: E501
     print('--out_dir path                   Directory path where to place output files, ')
     print('                                 must be present when --action == analyze')
     print('--logs path{,path}               List of full paths to log files to be analyzed.')
@@ -609,11 +828,15 @@ def usage():
     print('                                 All the strings from these files will be expected to present')
     print('                                 in one of specified log files during the analysis. Must be present')
     print('                                 when action == analyze.')
+    print('--regex_file path                JSON file containing lists of regular expressions with keys')
+    print('                                 "match", "ignore" and "expect". Must be present when action == filter.')
+    print('--maximum_log_length length      Lines longer than this are skipped in files without start/end markers.')
 
 # ---------------------------------------------------------------------
 
 
-def check_action(action, log_files_in, out_dir, match_files_in, ignore_files_in, expect_files_in):
+def check_action(action, log_files_in, out_dir, match_files_in, ignore_files_in, expect_files_in,
+                 regex_file=None):
     '''
     @summary: This function validates command line parameter 'action' and
         other related parameters.
@@ -634,6 +857,15 @@ def check_action(action, log_files_in, out_dir, match_files_in, ignore_files_in,
             print('ERROR: missing required match_files_in for analyze action')
             ret_code = False
 
+    elif action == 'filter':
+        if log_files_in is None or len(log_files_in) == 0:
+            print('ERROR: missing required logs for filter action')
+            ret_code = False
+
+        elif regex_file is None or len(regex_file) == 0:
+            print('ERROR: missing required regex_file for filter action')
+            ret_code = False
+
     else:
         ret_code = False
         print(('ERROR: invalid action:%s specified' % action))
@@ -661,7 +893,8 @@ def check_run_id(run_id):
 # ---------------------------------------------------------------------
 
 
-def write_result_file(run_id, out_dir, analysis_result_per_file, messages_regex_e, unused_regex_messages):
+def write_result_file(run_id, out_dir, analysis_result_per_file, messages_regex_e, unused_regex_messages,
+                      expect_messages_regex=None):
     '''
     @summary: Write results of analysis into a file.
 
@@ -671,6 +904,9 @@ def write_result_file(run_id, out_dir, analysis_result_per_file, messages_regex_
 
     @param analysis_result_per_file: map file_name: [list of found matching strings]
 
+    @param expect_messages_regex: RegexSet of expected messages used in the analysis. Its hit counts are used
+        to find unused expected messages. If None, expected lines are searched again by messages_regex_e.
+
     @return: void
     '''
 
@@ -703,12 +939,15 @@ def write_result_file(run_id, out_dir, analysis_result_per_file, messages_regex_
             "\n-------------------------------------------------\n\n")
         out_file.write('Total matches:%d\n' % match_cnt)
         # Find unused regex matches
-        for regex in messages_regex_e:
-            for line in expected_lines_total:
-                if re.search(regex, line):
-                    break
-            else:
-                unused_regex_messages.append(regex)
+        if isinstance(expect_messages_regex, RegexSet):
+            unused_regex_messages.extend(expect_messages_regex.unused_patterns())
+        else:
+            for regex in messages_regex_e:
+                for line in expected_lines_total:
+                    if re.search(regex, line):
+                        break
+                else:
+                    unused_regex_messages.append(regex)
 
         out_file.write('Total expected and found matches:%d\n' % expected_cnt)
         out_file.write('Total expected but not found matches: %d\n\n' %
@@ -773,13 +1012,16 @@ def main(argv):
     match_files_in = None
     ignore_files_in = None
     expect_files_in = None
+    regex_file = None
+    maximum_log_length = None
     verbose = False
 
     try:
         opts, args = getopt.getopt(argv, "a:r:s:l:o:m:i:e:vh",
                                    ["action=", "run_id=", "start_marker=", "logs=",
                                     "out_dir=", "match_files_in=", "ignore_files_in=",
-                                    "expect_files_in=", "verbose", "help"])
+                                    "expect_files_in=", "regex_file=", "maximum_log_length=",
+                                    "verbose", "help"])
 
     except getopt.GetoptError:
         print("Invalid option specified")
@@ -815,10 +1057,17 @@ def main(argv):
         elif (opt in ("-e", "--expect_files_in")):
             expect_files_in = arg
 
+        elif (opt == "--regex_file"):
+            regex_file = arg
+
+        elif (opt == "--maximum_log_length"):
+            maximum_log_length = int(arg)
+
         elif (opt in ("-v", "--verbose")):
             verbose = True
 
-    if not (check_action(action, log_files_in, out_dir, match_files_in, ignore_files_in, expect_files_in)
+    if not (check_action(action, log_files_in, out_dir, match_files_in, ignore_files_in, expect_files_in,
+                         regex_file)
             and check_run_id(run_id)):
         usage()
         sys.exit(err_invalid_input)
@@ -854,8 +1103,26 @@ def main(argv):
                                             ignore_messages_regex, expect_messages_regex)
         unused_regex_messages = []
         write_result_file(run_id, out_dir, result,
-                          messages_regex_e, unused_regex_messages)
+                          messages_regex_e, unused_regex_messages, expect_messages_regex)
         write_summary_file(run_id, out_dir, result, unused_regex_messages)
+    elif action == "filter":
+        # Markers are already placed and logs are already extracted by the caller.
+        # Only lines matching the regular expressions and hit counts of each regular expression are printed,
+        # so the caller doesn't need to download the logs.
+        with open(regex_file, 'r') as f:
+            regex_lists = json.load(f)
+
+        regex_sets = {}
+        for key in ("match", "ignore", "expect"):
+            regex_list = regex_lists.get(key) or []
+            regex_sets[key] = RegexSet(regex_list) if regex_list else None
+
+        result = analyzer.analyze_file_list(log_file_list, regex_sets["match"], regex_sets["ignore"],
+                                            regex_sets["expect"], maximum_log_length=maximum_log_length)
+        hit_counts = dict((key, regex_set.hit_counts() if regex_set else {})
+                          for key, regex_set in regex_sets.items())
+        print(json.dumps({"result": result, "hit_counts": hit_counts}))
+        return 0
     elif action == "add_end_marker":
         analyzer.place_marker(
             log_file_list, analyzer.create_end_marker(), wait_for_marker=True)
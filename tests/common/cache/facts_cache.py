@@ -1,15 +1,17 @@
 
 
+import fcntl
 import inspect
+import json
 import logging
 import os
 import pickle
-import random
 import shutil
 import sys
-import time
+import tempfile
 
-from collections import defaultdict
+from collections import Counter, defaultdict
+from contextlib import contextmanager
 from pickle import UnpicklingError
 from threading import Lock
 from six import with_metaclass
@@ -23,6 +25,10 @@ CACHE_LOCATION = os.path.join(CURRENT_PATH, '../../../_cache')
 SIZE_LIMIT = 1000000000  # 1G bytes, max disk usage allowed by cache
 ENTRY_LIMIT = 1000000    # Max number of pickle files allowed in cache.
 DISABLE_CACHE_PARAM = "disable_cache"
+FINGERPRINT_KEY_SUFFIX = '.fingerprint'  # Fingerprint of facts <key> is cached as <key>.fingerprint in the same zone.
+LEDGER_FILE = '.ledger'  # Persistent record of total_size and total_entries of the cache.
+LOCK_DIR = '.locks'      # Folder holding the per-zone and ledger advisory lock files.
+RUN_FINGERPRINTS_KEY = 'fingerprints.run'  # Fingerprints of a host calculated in current run, shared by xdist workers.
 
 
 class Singleton(type):
@@ -53,22 +59,126 @@ class FactsCache(with_metaclass(Singleton, object)):
         self._cache_location = os.path.abspath(cache_location)
         self._cache = defaultdict(dict)
         self._write_lock = Lock()
+        self._fingerprints = {}
+        self._validated = set()
+        self.stats = defaultdict(Counter)
 
-    def _check_usage(self):
-        """Check cache usage, raise exception if usage exceeds the limitations.
+    @contextmanager
+    def _flock(self, name):
+        """Hold an exclusive fcntl advisory lock shared by all processes using the same cache location.
+
+        Args:
+            name (str): Name of the lock, usually a zone name.
+        """
+        lock_dir = os.path.join(self._cache_location, LOCK_DIR)
+        if not os.path.exists(lock_dir):
+            os.makedirs(lock_dir, exist_ok=True)
+        with open(os.path.join(lock_dir, '{}.lock'.format(name)), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _scan_usage(self):
+        """Walk the cache folder to get the actual usage, when the ledger is missing, corrupted or over the limits.
+
+        Returns:
+            tuple: (total_size, total_entries)
         """
         total_size = 0
         total_entries = 0
-        for root, _, files in os.walk(self._cache_location):
+        for root, dirs, files in os.walk(self._cache_location):
+            if LOCK_DIR in dirs:
+                dirs.remove(LOCK_DIR)
             for f in files:
-                fp = os.path.join(root, f)
-                total_size += os.path.getsize(fp)
-                total_entries += 1
+                if f.endswith('.pickle'):
+                    total_size += os.path.getsize(os.path.join(root, f))
+                    total_entries += 1
+        return total_size, total_entries
+
+    def _atomic_write(self, path, data):
+        """Write data to a temp file in the same folder, then rename it to path.
+
+        Readers either see the previous file or the new one, never a partially written file.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
-        if total_size > SIZE_LIMIT or total_entries > ENTRY_LIMIT:
-            msg = 'Cache usage exceeds limitations. total_size={}, SIZE_LIMIT={}, total_entries={}, ENTRY_LIMIT={}' \
-                .format(total_size, SIZE_LIMIT, total_entries, ENTRY_LIMIT)
-            raise Exception(msg)
+    def _read_ledger(self):
+        """Read the usage ledger, rebuilt from the cache folder if it is missing or corrupted.
+
+        Must be called with the ledger lock held.
+
+        Returns:
+            tuple: (total_size, total_entries, rebuilt), rebuilt is True if the usage was scanned from the folder.
+        """
+        ledger_file = os.path.join(self._cache_location, LEDGER_FILE)
+        try:
+            with open(ledger_file) as f:
+                ledger = json.load(f)
+            return int(ledger['total_size']), int(ledger['total_entries']), False
+        except (IOError, ValueError, KeyError, TypeError):
+            total_size, total_entries = self._scan_usage()
+            logger.info('[Cache] Rebuilt cache ledger, total_size={}, total_entries={}'
+                        .format(total_size, total_entries))
+            return total_size, total_entries, True
+
+    def _write_ledger(self, total_size, total_entries):
+        ledger = {'total_size': max(total_size, 0), 'total_entries': max(total_entries, 0)}
+        self._atomic_write(os.path.join(self._cache_location, LEDGER_FILE), json.dumps(ledger).encode())
+
+    def _check_usage(self, size_delta, entries_delta):
+        """Raise exception if the usage after applying a delta would exceed the limitations.
+
+        The ledger may be inflated by files removed outside of cleanup(), so the usage is scanned from the cache
+        folder and the ledger is corrected before raising.
+
+        Args:
+            size_delta (int): Change of total size in bytes.
+            entries_delta (int): Change of total number of cached entries.
+        """
+        def exceeds(total_size, total_entries):
+            return total_size + size_delta > SIZE_LIMIT or total_entries + entries_delta > ENTRY_LIMIT
+
+        with self._flock(LEDGER_FILE):
+            total_size, total_entries, _ = self._read_ledger()
+            if not exceeds(total_size, total_entries):
+                return
+            scanned = self._scan_usage()
+            if scanned != (total_size, total_entries):
+                logger.info('[Cache] Corrected cache ledger, total_size={}, total_entries={}'.format(*scanned))
+                self._write_ledger(*scanned)
+            if exceeds(*scanned):
+                msg = 'Cache usage exceeds limitations. total_size={}, SIZE_LIMIT={}, total_entries={}, ' \
+                      'ENTRY_LIMIT={}'.format(scanned[0] + size_delta, SIZE_LIMIT, scanned[1] + entries_delta,
+                                              ENTRY_LIMIT)
+                raise Exception(msg)
+
+    def _update_usage(self, size_delta, entries_delta):
+        """Apply a delta to the persistent usage ledger.
+
+        The ledger is protected by its own advisory lock, so updating it is O(1) regardless of how many files are
+        cached. Callers must apply the delta after the cache files were actually changed.
+
+        Args:
+            size_delta (int): Change of total size in bytes.
+            entries_delta (int): Change of total number of cached entries.
+        """
+        with self._flock(LEDGER_FILE):
+            total_size, total_entries, rebuilt = self._read_ledger()
+            if rebuilt:
+                # The scanned usage already includes the change
+                self._write_ledger(total_size, total_entries)
+            else:
+                self._write_ledger(total_size + size_delta, total_entries + entries_delta)
 
     def _read_facts_file(self, facts_file, z, k):
         with open(facts_file, 'rb') as f:
@@ -100,22 +210,8 @@ class FactsCache(with_metaclass(Singleton, object)):
                             .format(os.path.abspath(facts_file), repr(e)))
                 return self.NOTEXIST
             except (EOFError, UnpicklingError) as e:
-                # When parallel run is enabled, multiple processes may try to read/write the same cache file,
-                # so there will be a chance that
-                #   - a file is being written by process1 while process2 is reading it, causing EOFError in process2
-                #   - a file is being read by multiple processes at the same time, causing UnpicklingError in some of
-                #     the processes
-                # In these cases, we will retry to read the file after a short random sleep. If we still get the same
-                # error after retrying, we will return NOTEXIST to overwrite the file.
-                retry_attempts = 3
-                for attempt in range(retry_attempts):
-                    time.sleep(random.randint(3, 6))
-                    try:
-                        return self._read_facts_file(facts_file, zone, key)
-                    except (EOFError, UnpicklingError):
-                        logger.warning('[Cache] Retry {}/{} failed for file "{}"'
-                                       .format(attempt + 1, retry_attempts, facts_file))
-
+                # Cache files are replaced atomically by write(), so a reader never sees a partially written file.
+                # A broken file can only be left by an interrupted legacy writer. Return NOTEXIST to overwrite it.
                 logger.error('[Cache] Load cache file "{}" failed with EOFError or UnpicklingError: {}'
                              .format(facts_file, repr(e)))
                 return self.NOTEXIST
@@ -137,23 +233,67 @@ class FactsCache(with_metaclass(Singleton, object)):
             boolean: Caching facts is successful or not.
         """
         with self._write_lock:
-            self._check_usage()
             facts_file = os.path.join(self._cache_location, '{}/{}.pickle'.format(zone, key))
             try:
                 cache_subfolder = os.path.join(self._cache_location, zone)
                 if not os.path.exists(cache_subfolder):
                     logger.info('[Cache] Create cache dir {}'.format(cache_subfolder))
-                    os.makedirs(cache_subfolder)
+                    os.makedirs(cache_subfolder, exist_ok=True)
 
-                with open(facts_file, 'wb') as f:
-                    pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
-                    self._cache[zone][key] = value
-                    logger.info('[Cache] Cached facts "{}.{}" to {}'.format(zone, key, facts_file))
-                    return True
+                data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+                with self._flock(zone):
+                    try:
+                        old_size, old_entries = os.path.getsize(facts_file), 1
+                    except OSError:
+                        old_size, old_entries = 0, 0
+                    self._check_usage(len(data) - old_size, 1 - old_entries)
+                    self._atomic_write(facts_file, data)
+                    self._update_usage(len(data) - old_size, 1 - old_entries)
+                self._cache[zone][key] = value
+                logger.info('[Cache] Cached facts "{}.{}" to {}'.format(zone, key, facts_file))
+                return True
             except (IOError, ValueError) as e:
                 logger.error('[Cache] Dump cache file "{}" failed with exception: {}'.format(facts_file, repr(e)))
                 return False
 
+    def run_fingerprint(self, host, name, get_fingerprint):
+        """Get the fingerprint of a host calculated once per run.
+
+        With pytest-xdist, the fingerprint calculated by a worker is cached in the host zone with the id of the test
+        run, the other workers of the same run reuse it.
+
+        Args:
+            host (str): Hostname.
+            name (str): Name of the fingerprint, usually the name of the validator.
+            get_fingerprint (function): Function without argument calculating the fingerprint.
+        """
+        if (host, name) in self._fingerprints:
+            return self._fingerprints[(host, name)]
+        run_id = os.environ.get('PYTEST_XDIST_TESTRUNUID')
+        fingerprints = self.read(host, RUN_FINGERPRINTS_KEY) if run_id else self.NOTEXIST
+        if not isinstance(fingerprints, dict) or fingerprints.get('run') != run_id:
+            fingerprints = {'run': run_id}
+        if name not in fingerprints:
+            fingerprints[name] = get_fingerprint()
+            if run_id:
+                self.write(host, RUN_FINGERPRINTS_KEY, fingerprints)
+        self._fingerprints[(host, name)] = fingerprints[name]
+        return fingerprints[name]
+
+    def invalidate_fingerprints(self, host):
+        """Calculate the fingerprints of a host again, and validate its cached facts again.
+
+        Called after the host was rebooted or its config reloaded.
+
+        Args:
+            host (str): Hostname.
+        """
+        self._fingerprints = {k: v for k, v in self._fingerprints.items() if k[0] != host}
+        self._validated = {k for k in self._validated if k[0] != host and not k[0].startswith(host + '-')}
+        if RUN_FINGERPRINTS_KEY in self._cache.get(host, {}) or \
+                os.path.exists(os.path.join(self._cache_location, host, RUN_FINGERPRINTS_KEY + '.pickle')):
+            self.cleanup(host, RUN_FINGERPRINTS_KEY)
+
     def cleanup(self, zone=None, key=None):
         """Cleanup cached files.
 
@@ -170,7 +310,10 @@ class FactsCache(with_metaclass(Singleton, object)):
                     logger.debug('[Cache] Removed "{}.{}" from cache.'.format(zone, key))
                 try:
                     cache_file = os.path.join(self._cache_location, zone, '{}.pickle'.format(key))
-                    os.remove(cache_file)
+                    with self._flock(zone):
+                        size = os.path.getsize(cache_file)
+                        os.remove(cache_file)
+                        self._update_usage(-size, -1)
                     logger.debug('[Cache] Removed cache file "{}.pickle"'.format(cache_file))
                 except OSError as e:
                     logger.error('[Cache] Cleanup cache {}.{}.pickle failed with exception: {}'
@@ -179,14 +322,23 @@ class FactsCache(with_metaclass(Singleton, object)):
                 if zone in self._cache:
                     del self._cache[zone]
                     logger.debug('[Cache] Removed zone "{}" from cache'.format(zone))
+                self._fingerprints = {k: v for k, v in self._fingerprints.items() if k[0] != zone}
+                self._validated = {k for k in self._validated if k[0] != zone}
                 try:
                     cache_subfolder = os.path.join(self._cache_location, zone)
-                    shutil.rmtree(cache_subfolder)
+                    with self._flock(zone):
+                        pickles = [os.path.join(cache_subfolder, f) for f in os.listdir(cache_subfolder)
+                                   if f.endswith('.pickle')]
+                        size = sum(os.path.getsize(f) for f in pickles)
+                        shutil.rmtree(cache_subfolder)
+                        self._update_usage(-size, -len(pickles))
                     logger.debug('[Cache] Removed cache subfolder "{}"'.format(cache_subfolder))
                 except OSError as e:
                     logger.error('[Cache] Remove cache subfolder "{}" failed with exception: {}'.format(zone, repr(e)))
         else:
             self._cache = defaultdict(dict)
+            self._fingerprints = {}
+            self._validated = set()
             try:
                 shutil.rmtree(self._cache_location)
                 logger.debug('[Cache] Removed all cache files under "{}"'.format(self._cache_location))
@@ -241,7 +393,7 @@ def _get_disable_cache(target, args, kwargs):
     return bound_args.arguments.get(DISABLE_CACHE_PARAM, False)
 
 
-def cached(name, zone_getter=None, after_read=None, before_write=None):
+def cached(name, zone_getter=None, after_read=None, before_write=None, validator=None):
     """Decorator for enabling cache for facts.
 
     The cached facts are to be stored by <name>.pickle. Because the cached pickle files must be stored under subfolder
@@ -253,15 +405,32 @@ def cached(name, zone_getter=None, after_read=None, before_write=None):
     if the function is a bound method of class AnsibleHostBase and its derivatives, it will try to use its
     attribute 'hostname' as zone, or raises an error if 'hostname' doesn't exists or is not a string.
 
+    The optional validator function has the same signature as the zone getter and returns a cheap fingerprint of the
+    source of the facts, like DUT image version plus config file mtime/size. The fingerprint is cached as
+    <name>.fingerprint next to the facts. The first time facts of a zone are used in current process, the cached
+    fingerprint is compared with the current one and the facts are gathered again if they differ. The fingerprint
+    is of the host: it is calculated once per host and validator in a test run, shared by the zones of the host
+    and by the xdist workers, and calculated again after FactsCache().invalidate_fingerprints(host).
+
+    Hits, misses and stale entries are counted per facts name in FactsCache().stats.
+
     Args:
         name ([str]): Name of the cached facts.
         zone_getter ([function]): Function used to get hostname used as zone.
         after_read ([function]): Hook function used to process facts after read from cache.
         before_write ([function]): Hook function used to process facts before write into cache.
+        validator ([function]): Function used to get fingerprint for invalidating stale facts.
     Returns:
         [function]: Decorator function.
     """
     cache = FactsCache()
+    fingerprint_key = name + FINGERPRINT_KEY_SUFFIX
+
+    def get_fingerprint(zone, target, args, kargs):
+        host = getattr(args[0], "hostname", None) if args else None
+        if not isinstance(host, str):
+            host = zone
+        return cache.run_fingerprint(host, validator.__name__, lambda: validator(target, args, kargs))
 
     def decorator(target):
         def wrapper(*args, **kargs):
@@ -277,16 +446,30 @@ def cached(name, zone_getter=None, after_read=None, before_write=None):
             cached_facts = cache.read(zone, name)
             if after_read:
                 cached_facts = after_read(cached_facts, target, args, kargs)
+            stale = False
+            if cached_facts is not FactsCache.NOTEXIST and validator and (zone, name) not in cache._validated:
+                if cache.read(zone, fingerprint_key) != get_fingerprint(zone, target, args, kargs):
+                    logger.info("[Cache] Fingerprint changed for zone[{}], key[{}], gather facts again"
+                                .format(zone, name))
+                    cached_facts = FactsCache.NOTEXIST
+                    stale = True
+                else:
+                    cache._validated.add((zone, name))
             if cached_facts is not FactsCache.NOTEXIST:
+                cache.stats[name]["hit"] += 1
                 logger.debug(f"[Cache] Use cache for func[{target}], zone[{zone}], key[{name}]")
                 return cached_facts
             else:
+                cache.stats[name]["stale" if stale else "miss"] += 1
                 facts = target(*args, **kargs)
                 if before_write:
                     _facts = before_write(facts, target, args, kargs)
                     cache.write(zone, name, _facts)
                 else:
                     cache.write(zone, name, facts)
+                if validator:
+                    cache.write(zone, fingerprint_key, get_fingerprint(zone, target, args, kargs))
+                    cache._validated.add((zone, name))
                 return facts
         return wrapper
     return decorator
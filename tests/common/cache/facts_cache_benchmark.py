@@ -0,0 +1,60 @@
+"""Micro-benchmark of FactsCache read/write latency.
+
+Usage:
+    python facts_cache_benchmark.py [--entries 10000] [--zones 50] [--payload-size 2048]
+
+The cache is populated with the specified number of entries spread over the zones, then every entry is written once
+more (overwrite, the common case when facts are refreshed) and read back from file with an empty in-memory cache.
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+from facts_cache import FactsCache
+
+
+def _percentile(samples, percent):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+
+def _report(name, samples):
+    print('{:<10} count={:<7} avg={:.1f}us p50={:.1f}us p99={:.1f}us max={:.1f}us'.format(
+        name, len(samples), sum(samples) / len(samples) * 1e6, _percentile(samples, 50) * 1e6,
+        _percentile(samples, 99) * 1e6, max(samples) * 1e6))
+
+
+def run(entries, zones, payload_size):
+    cache_location = tempfile.mkdtemp(prefix='facts_cache_benchmark_')
+    try:
+        cache = FactsCache(cache_location=cache_location)
+        value = {'payload': 'x' * payload_size}
+        keys = [('zone{}'.format(i % zones), 'facts{}'.format(i)) for i in range(entries)]
+
+        for name in ('write', 'overwrite'):
+            samples = []
+            for zone, key in keys:
+                start = time.perf_counter()
+                cache.write(zone, key, value)
+                samples.append(time.perf_counter() - start)
+            _report(name, samples)
+
+        cache._cache.clear()
+        samples = []
+        for zone, key in keys:
+            start = time.perf_counter()
+            cache.read(zone, key)
+            samples.append(time.perf_counter() - start)
+        _report('read', samples)
+    finally:
+        shutil.rmtree(cache_location, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark FactsCache read/write latency.')
+    parser.add_argument('--entries', type=int, default=10000, help='Number of cached entries.')
+    parser.add_argument('--zones', type=int, default=50, help='Number of zones the entries are spread over.')
+    parser.add_argument('--payload-size', type=int, default=2048, help='Size of each cached value in bytes.')
+    args = parser.parse_args()
+    run(args.entries, args.zones, args.payload_size)
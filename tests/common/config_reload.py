@@ -2,6 +2,7 @@ import time
 import logging
 import os
 
+from tests.common.cache import FactsCache
 from tests.common.helpers.assertions import pytest_assert
 from _pytest.outcomes import OutcomeException
 from tests.common.helpers.parallel_utils import synchronized_config_reload
@@ -290,6 +291,8 @@ def config_reload(sonic_host, config_source='config_db', wait=120, start_bgp=Tru
         ))
 
     logger.info('reloading {}'.format(config_source))
+    # The config files may change, the cached facts are validated again by their new fingerprint
+    FactsCache().invalidate_fingerprints(sonic_host.hostname)
 
     if is_dut:
         # Extend ignore fabric port msgs for T2 chassis with DNX chipset on Linecards
@@ -9,6 +9,7 @@ from multiprocessing.pool import ThreadPool
 import ansible
 from pytest_ansible.results import AdHocResult, ModuleResult
 
+from tests.common.devices.ssh_channel import SshCommandChannelError
 from tests.common.errors import RunAnsibleModuleFail
 
 
@@ -120,6 +121,9 @@ class AnsibleHostBase(object):
         """
         return cls._ipv6_only_mgmt_mode
 
+    # SshCommandChannel used to run plain shell/command calls without ansible, set by subclasses
+    _ssh_channel = None
+
     class CustomEncoder(json.JSONEncoder):
         def default(self, obj):
             if isinstance(obj, bytes):
@@ -168,6 +172,12 @@ class AnsibleHostBase(object):
 
     def _run(self, module_name, *module_args, **complex_args):
 
+        if self._ssh_channel is not None and self._ssh_channel.supports(module_name, module_args, complex_args):
+            try:
+                return self._run_on_ssh_channel(module_name, module_args[0], **complex_args)
+            except SshCommandChannelError as e:
+                logger.warning("{}, run module {} with ansible".format(e, module_name))
+
         previous_frame = inspect.currentframe().f_back
         filename, line_number, function_name, lines, index = inspect.getframeinfo(previous_frame)
 
@@ -257,6 +267,25 @@ class AnsibleHostBase(object):
 
         return hostname_res
 
+    def _run_on_ssh_channel(self, module_name, cmd, module_ignore_errors=False, verbose=True):
+        """Run a shell/command call on the SSH command channel, the result is the same as the ansible module."""
+        if verbose:
+            logger.debug("[{}] SshCommandChannel::{}, cmd={}".format(self.hostname, module_name, cmd))
+
+        hostname_res = self._ssh_channel.run(module_name, cmd)
+        hostname_res.encoder = AnsibleHostBase.CustomEncoder
+
+        if verbose:
+            logger.debug("[{}] SshCommandChannel::{} Result => {}".format(
+                self.hostname, module_name, json.dumps(hostname_res, cls=AnsibleHostBase.CustomEncoder)))
+        else:
+            logger.debug("[{}] SshCommandChannel::{} done, is_failed={}, rc={}".format(
+                self.hostname, module_name, hostname_res.is_failed, hostname_res['rc']))
+
+        if hostname_res.is_failed and not module_ignore_errors:
+            raise RunAnsibleModuleFail("run module {} failed".format(module_name), hostname_res)
+        return hostname_res
+
 
 class NeighborDevice(dict):
     def __str__(self):
@@ -1,7 +1,9 @@
 import logging
 import sys
+import time
 
 from tests.common.devices.multi_asic import MultiAsicSonicHost
+from tests.common.helpers.multi_thread_utils import run_in_threads
 from tests.common.helpers.parallel_utils import is_initial_checks_active
 
 logger = logging.getLogger(__name__)
@@ -19,9 +21,26 @@ class DutHosts(object):
     """
     class _Nodes(list):
         """ Internal class representing a list of MultiAsicSonicHosts """
+        # Maximum number of nodes a call is delegated to concurrently, 1 means one node after another.
+        max_parallel = 1
+
+        def __init__(self, nodes=(), max_parallel=1):
+            list.__init__(self, nodes)
+            self.max_parallel = max_parallel
+
         def _run_on_nodes(self, module, *module_args, **complex_args):
             """ Delegate the call to each of the nodes, return the results in a dict."""
-            return {node.hostname: getattr(node, module)(*module_args, **complex_args) for node in self}
+            if self.max_parallel <= 1 or len(self) <= 1:
+                return {node.hostname: getattr(node, module)(*module_args, **complex_args) for node in self}
+
+            timings = {}
+            start = time.time()
+            results = run_in_threads(lambda node: getattr(node, module)(*module_args, **complex_args),
+                                     self, max_parallel=self.max_parallel, timings=timings)
+            slowest = max(timings, key=timings.get)
+            logger.debug("Ran '{}' on {} nodes in {:.2f} seconds, slowest node {} took {:.2f} seconds".format(
+                module, len(self), time.time() - start, slowest, timings[slowest]))
+            return {node.hostname: result for node, result in zip(self, results)}
 
         def __getattr__(self, attr):
             """ To support calling ansible modules on a list of MultiAsicSonicHost
@@ -48,7 +67,8 @@ class DutHosts(object):
             """ To support hash operator on the DUTs (nodes) in the testbed """
             return list.__hash__()
 
-    def __init__(self, ansible_adhoc, tbinfo, request, duts, target_hostname=None, is_parallel_leader=False):
+    def __init__(self, ansible_adhoc, tbinfo, request, duts, target_hostname=None, is_parallel_leader=False,
+                 max_parallel=None):
         """ Initialize a multi-dut testbed with all the DUT's defined in testbed info.
 
         Args:
@@ -56,12 +76,20 @@ class DutHosts(object):
             tbinfo - Testbed info whose "duts" holds the hostnames for the DUT's in the multi-dut testbed.
             duts - list of DUT hostnames from the `--host-pattern` CLI option. Can be specified if only a subset of
                    DUTs in the testbed should be used
+            max_parallel - maximum number of DUTs (or ASICs) a call on all of them is run on concurrently.
+                   Defaults to the value of the `--dut_max_parallel` CLI option, 1 if it is not available.
 
         """
         self.ansible_adhoc = ansible_adhoc
         self.tbinfo = tbinfo
         self.request = request
         self.duts = duts
+        if max_parallel is None:
+            try:
+                max_parallel = request.config.getoption("--dut_max_parallel")
+            except (AttributeError, ValueError):
+                max_parallel = None
+        self.max_parallel = max_parallel or 1
         self.is_parallel_run = target_hostname is not None
         # Initialize _nodes to None to avoid recursion in __getattr__
         self._nodes = None
@@ -80,7 +108,7 @@ class DutHosts(object):
 
     def __initialize_nodes_for_parallel(self):
         if self.is_parallel_leader:
-            self._nodes_for_parallel_initial_checks = self._Nodes([
+            self._nodes_for_parallel_initial_checks = self._nodes_list([
                 MultiAsicSonicHost(
                     self.ansible_adhoc,
                     hostname,
@@ -89,12 +117,12 @@ class DutHosts(object):
                 ) for hostname in self.tbinfo["duts"]
             ])
 
-            self._nodes_for_parallel_tests = self._Nodes([
+            self._nodes_for_parallel_tests = self._nodes_list([
                 node for node in self._nodes_for_parallel_initial_checks if node.hostname == self.target_hostname
             ])
         else:
             self._nodes_for_parallel_initial_checks = None
-            self._nodes_for_parallel_tests = self._Nodes([
+            self._nodes_for_parallel_tests = self._nodes_list([
                 MultiAsicSonicHost(
                     self.ansible_adhoc,
                     self.target_hostname,
@@ -107,16 +135,16 @@ class DutHosts(object):
             self._nodes_for_parallel_initial_checks if self.is_parallel_leader else self._nodes_for_parallel_tests
         )
 
-        self._supervisor_nodes = self._Nodes([
+        self._supervisor_nodes = self._nodes_list([
             node for node in self._nodes_for_parallel if node.is_supervisor_node()
         ])
 
-        self._frontend_nodes = self._Nodes([
+        self._frontend_nodes = self._nodes_list([
             node for node in self._nodes_for_parallel if node.is_frontend_node()
         ])
 
     def __initialize_nodes(self):
-        self._nodes = self._Nodes([
+        self._nodes = self._nodes_list([
             MultiAsicSonicHost(
                 self.ansible_adhoc,
                 hostname,
@@ -125,8 +153,8 @@ class DutHosts(object):
             ) for hostname in self.tbinfo["duts"] if hostname in self.duts
         ])
 
-        self._supervisor_nodes = self._Nodes([node for node in self._nodes if node.is_supervisor_node()])
-        self._frontend_nodes = self._Nodes([node for node in self._nodes if node.is_frontend_node()])
+        self._supervisor_nodes = self._nodes_list([node for node in self._nodes if node.is_supervisor_node()])
+        self._frontend_nodes = self._nodes_list([node for node in self._nodes if node.is_frontend_node()])
 
     def __should_reinit_when_parallel(self):
         return (
@@ -144,8 +172,13 @@ class DutHosts(object):
             self.parallel_run_stage = NON_INITIAL_CHECKS_STAGE
             self._nodes_for_parallel = self._nodes_for_parallel_tests
 
-        self._supervisor_nodes = self._Nodes([node for node in self._nodes_for_parallel if node.is_supervisor_node()])
-        self._frontend_nodes = self._Nodes([node for node in self._nodes_for_parallel if node.is_frontend_node()])
+        self._supervisor_nodes = self._nodes_list(
+            [node for node in self._nodes_for_parallel if node.is_supervisor_node()])
+        self._frontend_nodes = self._nodes_list(
+            [node for node in self._nodes_for_parallel if node.is_frontend_node()])
+
+    def _nodes_list(self, nodes):
+        return self._Nodes(nodes, max_parallel=self.max_parallel)
 
     @property
     def nodes(self):
@@ -3,6 +3,7 @@ from functools import lru_cache
 import ipaddress
 import json
 import logging
+import time
 
 from pytest_ansible.results import ModuleResult
 from tests.common.errors import RunAnsibleModuleFail
@@ -11,6 +12,7 @@ from tests.common.devices.sonic_asic import SonicAsic
 from tests.common.devices.sonic_docker import SonicDockerManager
 from tests.common.helpers.assertions import pytest_assert
 from tests.common.helpers.constants import DEFAULT_ASIC_ID, DEFAULT_NAMESPACE, ASICS_PRESENT
+from tests.common.helpers.multi_thread_utils import run_in_threads
 from tests.common.platform.interface_utils import get_dut_interfaces_status
 
 logger = logging.getLogger(__name__)
@@ -169,7 +171,18 @@ class MultiAsicSonicHost(object):
                 return getattr(self.asic_instance(asic_index), multi_asic_attr)(*module_args, **asic_complex_args)
             elif isinstance(asic_index, str) and asic_index.lower() == "all":
                 # All ASICs/namespace
-                return [getattr(asic, multi_asic_attr)(*module_args, **asic_complex_args) for asic in self.asics]
+                max_parallel = getattr(self.duthosts, "max_parallel", 1)
+                if max_parallel <= 1 or len(self.asics) <= 1:
+                    return [getattr(asic, multi_asic_attr)(*module_args, **asic_complex_args) for asic in self.asics]
+
+                timings = {}
+                start = time.time()
+                results = run_in_threads(lambda asic: getattr(asic, multi_asic_attr)(*module_args, **asic_complex_args),
+                                         self.asics, max_parallel=max_parallel, timings=timings)
+                slowest = max(timings, key=timings.get)
+                logger.debug("Ran '{}' on {} asics of {} in {:.2f} seconds, slowest {} took {:.2f} seconds".format(
+                    multi_asic_attr, len(self.asics), self.hostname, time.time() - start, slowest, timings[slowest]))
+                return results
             else:
                 raise ValueError("Argument 'asic_index' must be an int or string 'all'.")
 
@@ -1,3 +1,4 @@
+import hashlib
 import ipaddress
 import json
 import logging
@@ -15,11 +16,13 @@ from ansible.plugins.loader import connection_loader
 
 from tests.common.devices.base import AnsibleHostBase
 from tests.common.devices.constants import ACL_COUNTERS_UPDATE_INTERVAL_IN_SEC
+from tests.common.devices.ssh_channel import SshCommandChannelError, get_ssh_command_channel
 from tests.common.helpers.dut_utils import is_supervisor_node, is_macsec_capable_node
 from tests.common.utilities import get_host_visible_vars, wait_until
 from tests.common.cache import cached
 from tests.common.helpers.constants import DEFAULT_ASIC_ID, DEFAULT_NAMESPACE
 from tests.common.helpers.platform_api.chassis import is_inband_port
+from tests.common.helpers.show_parser import ParsedTable, ShowParser, parse_column_positions
 from tests.common.errors import RunAnsibleModuleFail
 from tests.common import constants
 from typing import Dict, Optional, TypedDict
@@ -64,6 +67,22 @@ COUNTER_TYPE_CLI_MAP = {
 }
 
 
+# Parser of show command outputs, the column layout of each command is cached
+_show_parser = ShowParser()
+
+
+def _sonic_config_fingerprint(function, func_args, func_kargs):
+    """
+    Validator of cached facts. Get a cheap fingerprint of the SONiC image version and the config files, the cached
+    facts are gathered again after reimage, config reload or minigraph deployment. The fingerprint is calculated once
+    per host and test run, and again after reboot() or config_reload().
+    """
+    res = func_args[0].shell("grep build_version /etc/sonic/sonic_version.yml; "
+                             "stat -c '%n %Y %s' /etc/sonic/config_db*.json /etc/sonic/minigraph.xml",
+                             module_ignore_errors=True)
+    return hashlib.md5(res["stdout"].encode()).hexdigest()
+
+
 class SonicHost(AnsibleHostBase):
     """
     A remote host running SONiC.
@@ -73,6 +92,22 @@ class SonicHost(AnsibleHostBase):
     """
     DEFAULT_ASIC_SERVICES = ["bgp", "database", "lldp", "swss", "syncd", "teamd"]
 
+    # Class-level flag for running plain shell/command calls on a persistent SSH channel.
+    # Set by the duthosts fixture in conftest.py
+    _ssh_fast_path = False
+    # SshCommandChannel of the command streams, when the fast path is disabled
+    _stream_channel = None
+
+    @classmethod
+    def set_ssh_fast_path(cls, enabled):
+        """Set whether plain shell/command calls of SonicHost objects created later bypass ansible.
+
+        Called by the duthosts fixture in conftest.py.
+        """
+        cls._ssh_fast_path = enabled
+        if enabled:
+            logger.info("SSH fast path for shell/command enabled")
+
     """
     setting either one of shell_user/shell_pw or ssh_user/ssh_passwd pair should yield the same result.
     """
@@ -113,6 +148,9 @@ class SonicHost(AnsibleHostBase):
             }
             self.host.options['variable_manager'].extra_vars.update(evars)
 
+        if self._ssh_fast_path:
+            self._ssh_channel = get_ssh_command_channel(self)
+
         _gathered_facts = self._gather_facts()
 
         self._facts = _gathered_facts.get('basic_facts', {})
@@ -233,7 +271,7 @@ class SonicHost(AnsibleHostBase):
 
         self.critical_services = service_list
 
-    @cached(name='basic_facts')
+    @cached(name='basic_facts', validator=_sonic_config_fingerprint)
     def _gather_facts(self):
         """
         Gather facts about the platform for this SONiC device.
@@ -1638,61 +1676,11 @@ Totals               6450                 6449
             Returns a list. Each item is a tuple with two elements. The first element is start position of a column.
             The second element is the end position of the column.
         """
-        prev = ' ',
-        positions = []
-        for pos, char in enumerate(sep_line + ' '):
-            if char == sep_char:
-                if char != prev:
-                    left = pos
-            else:
-                if char != prev:
-                    right = pos
-                    positions.append((left, right))
-            prev = char
-        return positions
+        return parse_column_positions(sep_line, sep_char)
 
     def _parse_show(self, output_lines, header_len=1):
-
-        result = []
-
-        sep_line_pattern = re.compile(r"^( *-+ *)+$")
-        sep_line_found = False
-        for idx, line in enumerate(output_lines):
-            if sep_line_pattern.match(line):
-                sep_line_found = True
-                header_lines = output_lines[idx - header_len:idx]
-                sep_line = output_lines[idx]
-                content_lines = output_lines[idx + 1:]
-                break
-
-        if not sep_line_found:
-            logging.error('Failed to find separation line in the show command output')
-            return result
-
-        try:
-            positions = self._parse_column_positions(sep_line)
-        except Exception as e:
-            logging.error('Possibly bad command output, exception: {}'.format(repr(e)))
-            return result
-
-        headers = []
-        for (left, right) in positions:
-            header = " ".join([header_line[left:right].strip().lower() for header_line in header_lines]).strip()
-            headers.append(header)
-
-        for content_line in content_lines:
-            # When an empty line is encountered while parsing the tabulate content, it is highly possible that the
-            # tabulate content has been drained. The empty line and rest of the lines should not be parsed.
-            if len(content_line) == 0:
-                break
-            item = {}
-            for idx, (left, right) in enumerate(positions):
-                k = headers[idx]
-                v = content_line[left:right].strip()
-                item[k] = v
-            result.append(item)
-
-        return result
+        table = _show_parser.parse(output_lines, header_len)
+        return table.to_list() if table is not None else []
 
     def show_and_parse(self, show_cmd, header_len=1, **kwargs):
         """Run a show command and parse the output using a generic pattern.
@@ -1756,8 +1744,15 @@ Totals               6450                 6449
               ...
             ]
 
+        The column layout is cached by command and reused while the header and separation lines don't change, so
+        polling a command with a large output in a loop mostly costs slicing its lines.
+
         Args:
             show_cmd: The show command that will be executed.
+            columnar: Return a ParsedTable instead of a list. Values are stored per column, in 'columns', and the
+                dict of a row is only built when the row is accessed. Defaults to False.
+            json_flag: Flag of the show command to get a JSON output, like '-j' or '--json'. If specified, the
+                command is run with this flag and the loaded JSON output is returned as is, without parsing columns.
 
         Returns:
             Return the parsed output of the show command in a list of dictionary. Each list item is a dictionary,
@@ -1766,14 +1761,22 @@ Totals               6450                 6449
         """
         start_line_index = kwargs.pop("start_line_index", 0)
         end_line_index = kwargs.pop("end_line_index", None)
+        columnar = kwargs.pop("columnar", False)
+        json_flag = kwargs.pop("json_flag", None)
+        if json_flag:
+            return json.loads(self.shell("{} {}".format(show_cmd, json_flag), **kwargs)["stdout"])
+
         output = self.shell(show_cmd, **kwargs)["stdout_lines"]
         if end_line_index is None:
             output = output[start_line_index:]
         else:
             output = output[start_line_index:end_line_index]
-        return self._parse_show(output, header_len)
+        table = _show_parser.parse(output, header_len, key=(show_cmd, header_len))
+        if table is None:
+            table = ParsedTable([], [])
+        return table if columnar else table.to_list()
 
-    @cached(name='mg_facts')
+    @cached(name='mg_facts', validator=_sonic_config_fingerprint)
     def get_extended_minigraph_facts(self, tbinfo, namespace=DEFAULT_NAMESPACE):
         mg_facts = self.minigraph_facts(host=self.hostname, namespace=namespace)['ansible_facts']
         mg_facts['minigraph_ptf_indices'] = {}
@@ -1818,6 +1821,46 @@ Totals               6450                 6449
         cmd = "/usr/bin/redis-cli {}".format(redis_cmd)
         return self.command(cmd, verbose=False)
 
+    def open_command_stream(self, cmd):
+        """Start a long running shell command on the DUT and return a SshCommandStream to read its output as it comes.
+
+        The command runs on the SSH transport of the fast path if it is enabled. Otherwise a persistent SSH transport
+        is opened for the streams of the host on first use.
+
+        Raises:
+            SshCommandChannelError: If no SSH transport can be opened to the DUT or the command can't be started.
+        """
+        channel = self._ssh_channel or self._stream_channel
+        if channel is None:
+            channel = get_ssh_command_channel(self)
+            if channel is None:
+                raise SshCommandChannelError("No SSH credential of {} in inventory".format(self.hostname))
+            self._stream_channel = channel
+        return channel.open_stream(cmd)
+
+    def run_batch(self, cmds, concurrency=8, timeout=0, module_ignore_errors=False, verbose=False):
+        """Run a list of shell commands on the DUT in one round trip.
+
+        The commands are sent in a single shell_cmds module call, up to 'concurrency' of them run at the same time
+        on the DUT. Use it instead of calling self.shell() in a loop, e.g. for a query per port.
+
+        Args:
+            cmds: List of shell commands.
+            concurrency: Maximum number of commands running at the same time. Defaults to 8.
+            timeout: Time limit in seconds of each command, 0 means no limit. Defaults to 0.
+            module_ignore_errors: Don't raise RunAnsibleModuleFail if any command failed. Defaults to False.
+            verbose: Log the output of the commands. Defaults to False.
+
+        Returns:
+            List of the results of the commands, in the order of 'cmds'. Each result is a dict with the same keys as
+            the result of self.shell(), like 'rc', 'stdout' and 'stdout_lines'.
+        """
+        if not cmds:
+            return []
+        res = self.shell_cmds(cmds=list(cmds), concurrency=concurrency, timeout=timeout, continue_on_fail=True,
+                              module_ignore_errors=module_ignore_errors, verbose=verbose)
+        return res["results"]
+
     def _try_get_brcm_asic_name(self, output):
         search_sets = {
             "td2": {"b85", "BCM5685"},
@@ -0,0 +1,280 @@
+"""
+Fast path for plain shell/command calls on SONiC hosts.
+
+Running the shell/command ansible modules builds a task, copies the module to the host and executes it in a new
+python interpreter for every call. SshCommandChannel keeps one authenticated SSH transport per host and opens a
+new channel on it for every command, so a command costs one round trip. The result has the same keys as the
+result of the ansible modules.
+
+Only calls with a single command string and no module options are sent to the channel. Multi-ASIC hosts share the
+transport of the host, the namespace is part of the command built by SonicAsic.
+
+The transport also runs long running commands whose output is read as it is written, see SshCommandStream.
+"""
+import datetime
+import logging
+import re
+import select
+import shlex
+import socket
+import threading
+import time
+
+import paramiko
+from pytest_ansible.results import ModuleResult
+
+logger = logging.getLogger(__name__)
+
+# Modules handled by the channel, and the keyword arguments they may be called with.
+SUPPORTED_MODULES = ("shell", "command")
+SUPPORTED_KWARGS = {"module_ignore_errors", "verbose"}
+# Ansible runs the modules of SONiC hosts with become, run the commands as root as well.
+BECOME_PREFIX = "sudo -H -n -u root"
+# Locale of the commands run by the ansible modules, so that the output of localized commands is the same.
+# sudo resets the environment, so it is set by env after sudo.
+COMMAND_ENV = "env LANG=C LC_ALL=C"
+# Error of sudo -n when the user may only run commands as root with a password. Nothing was run,
+# ansible provides the become password.
+SUDO_PASSWORD_REQUIRED_RE = re.compile(r"^sudo: (a password is required|a terminal is required|no tty present)")
+CONNECT_TIMEOUT = 10
+READ_SIZE = 65536
+
+
+class SshCommandChannelError(Exception):
+    """The command could not be run on the channel, the caller should fall back to ansible."""
+    pass
+
+
+class SshCommandChannel(object):
+    """
+    A persistent SSH transport to a host, used to run shell/command calls without ansible.
+
+    The transport is opened on first use and re-opened if it was closed. Commands run on separate channels
+    of the transport, so the object can be used from several threads.
+    """
+
+    def __init__(self, hostname, address, username, passwords, port=22):
+        self.hostname = hostname
+        self.address = address
+        self.username = username
+        self.passwords = [password for password in passwords if password]
+        self.port = port
+        self._client = None
+        self._lock = threading.Lock()
+        # Set to False when no password is accepted, the host is not tried again
+        self.usable = True
+
+    def supports(self, module_name, module_args, complex_args):
+        """Whether the module call can be run on the channel with the same result as ansible."""
+        return (self.usable and module_name in SUPPORTED_MODULES and len(module_args) == 1
+                and isinstance(module_args[0], str) and set(complex_args) <= SUPPORTED_KWARGS)
+
+    def _connect(self):
+        for password in self.passwords:
+            client = paramiko.SSHClient()
+            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            try:
+                client.connect(self.address, port=self.port, username=self.username, password=password,
+                               allow_agent=False, look_for_keys=False, timeout=CONNECT_TIMEOUT)
+            except paramiko.AuthenticationException:
+                client.close()
+                continue
+            # Keep using the password which worked first
+            self.passwords.remove(password)
+            self.passwords.insert(0, password)
+            return client
+        raise paramiko.AuthenticationException("No valid password for {}@{}".format(self.username, self.address))
+
+    def _transport(self):
+        with self._lock:
+            transport = self._client.get_transport() if self._client else None
+            # The transport is closed by the host on reboot or sshd restart, open a new one
+            if transport is None or not transport.is_active():
+                self.close()
+                logger.debug("Open SSH command channel to {} ({})".format(self.hostname, self.address))
+                self._client = self._connect()
+                transport = self._client.get_transport()
+            return transport
+
+    def _start(self, command_line, combine_stderr=False):
+        try:
+            channel = self._transport().open_session()
+            channel.set_combine_stderr(combine_stderr)
+            channel.exec_command(command_line)
+        except (paramiko.SSHException, EOFError, socket.error) as e:
+            # The command was not started, so it is safe to run it again with ansible
+            if isinstance(e, paramiko.AuthenticationException):
+                self.usable = False
+            raise SshCommandChannelError("Unable to run command on {}: {}".format(self.hostname, repr(e)))
+        channel.shutdown_write()
+        return channel
+
+    def _exec(self, command_line):
+        channel = self._start(command_line)
+        try:
+            # Drain stdout and stderr together, the command blocks if the window is filled by the one not read
+            stdout, stderr = [], []
+            while not channel.exit_status_ready() or channel.recv_ready() or channel.recv_stderr_ready():
+                select.select([channel], [], [], 1)
+                while channel.recv_ready():
+                    stdout.append(channel.recv(READ_SIZE))
+                while channel.recv_stderr_ready():
+                    stderr.append(channel.recv_stderr(READ_SIZE))
+            return channel.recv_exit_status(), b"".join(stdout), b"".join(stderr)
+        finally:
+            channel.close()
+
+    def run(self, module_name, cmd):
+        """
+        Run a command like the shell or command ansible module.
+
+        Args:
+            module_name: "shell" to run the command with /bin/sh, "command" to run it without shell.
+            cmd: The command string.
+
+        Raises:
+            SshCommandChannelError: If the transport could not be opened, the command could not be started or sudo
+                requires a password. The command can be run with ansible instead.
+
+        Returns:
+            ModuleResult: The result with the keys returned by the ansible module.
+        """
+        if module_name == "shell":
+            args = cmd
+            command_line = "{} {} /bin/sh -c {}".format(BECOME_PREFIX, COMMAND_ENV, shlex.quote(cmd))
+        else:
+            args = shlex.split(cmd)
+            command_line = "{} -- {} {}".format(BECOME_PREFIX, COMMAND_ENV, " ".join(shlex.quote(arg) for arg in args))
+
+        start = datetime.datetime.now()
+        rc, stdout, stderr = self._exec(command_line)
+        end = datetime.datetime.now()
+        if rc == 1 and SUDO_PASSWORD_REQUIRED_RE.match(stderr.decode("utf-8", "replace")):
+            # The user won't be allowed to run commands without password later either
+            self.usable = False
+            raise SshCommandChannelError("sudo requires a password on {}: {}".format(
+                self.hostname, stderr.decode("utf-8", "replace").strip()))
+
+        # Same post-processing as the command module: decode and strip the trailing new line
+        stdout = stdout.decode("utf-8", "replace").rstrip("\r\n")
+        stderr = stderr.decode("utf-8", "replace").rstrip("\r\n")
+        result = ModuleResult(
+            changed=True,
+            cmd=args,
+            rc=rc,
+            stdout=stdout,
+            stderr=stderr,
+            stdout_lines=stdout.splitlines(),
+            stderr_lines=stderr.splitlines(),
+            start=str(start),
+            end=str(end),
+            delta=str(end - start),
+            msg="non-zero return code" if rc != 0 else "",
+            failed=rc != 0,
+        )
+        return result
+
+    def open_stream(self, cmd):
+        """
+        Start a long running shell command, like redis-cli psubscribe, and return its output as it is written.
+
+        Args:
+            cmd: The command string, run with /bin/sh like the shell ansible module. The command is not killed when
+                the stream is closed, limit its duration with the timeout command.
+
+        Raises:
+            SshCommandChannelError: If the transport could not be opened or the command could not be started.
+
+        Returns:
+            SshCommandStream: The output of the command, stdout and stderr together.
+        """
+        if not self.usable:
+            raise SshCommandChannelError("No valid password for {}".format(self.hostname))
+        command_line = "{} {} /bin/sh -c {}".format(BECOME_PREFIX, COMMAND_ENV, shlex.quote(cmd))
+        return SshCommandStream(self._start(command_line, combine_stderr=True))
+
+    def close(self):
+        if self._client:
+            self._client.close()
+            self._client = None
+
+
+class SshCommandStream(object):
+    """The output of a command running on a channel, read line by line."""
+
+    def __init__(self, channel):
+        self._channel = channel
+        self._buffer = b""
+
+    def readline(self, timeout):
+        """
+        Read the next output line.
+
+        Args:
+            timeout: Maximum number of seconds to wait for the line. With 0, only the output already received is read.
+
+        Raises:
+            EOFError: If the command exited and all its output was read.
+
+        Returns:
+            str or None: The line without the new line characters, None if no complete line came before the timeout.
+        """
+        deadline = time.time() + timeout
+        while b"\n" not in self._buffer:
+            if not self._channel.recv_ready():
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._channel.settimeout(remaining)
+            try:
+                data = self._channel.recv(READ_SIZE)
+            except socket.timeout:
+                return None
+            if not data:
+                if not self._buffer:
+                    raise EOFError("Command exited")
+                # Last line of the output, without new line
+                self._buffer += b"\n"
+            self._buffer += data
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line.decode("utf-8", "replace").rstrip("\r")
+
+    def close(self):
+        self._channel.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+def get_ssh_command_channel(host):
+    """
+    Create a SshCommandChannel with the connection variables of an AnsibleHostBase host.
+
+    Returns:
+        SshCommandChannel or None: None if the user or password can't be found in the inventory.
+    """
+    from ansible.template import Templar
+
+    inventory_manager = host.host.options["inventory_manager"]
+    variable_manager = host.host.options["variable_manager"]
+    hostvars = variable_manager.get_vars(host=inventory_manager.get_host(host.hostname))
+    templar = Templar(loader=variable_manager._loader, variables=hostvars)
+
+    def _var(*names):
+        for name in names:
+            if hostvars.get(name):
+                return templar.template(hostvars[name])
+        return None
+
+    username = _var("ansible_ssh_user", "ansible_user")
+    passwords = [_var("ansible_ssh_pass", "ansible_password")]
+    passwords.extend(_var("ansible_altpasswords") or [])
+    passwords.append(_var("ansible_altpassword"))
+    if not username or not any(passwords):
+        logger.warning("No SSH credential of {} in inventory, SSH command channel not used".format(host.hostname))
+        return None
+    return SshCommandChannel(host.hostname, host.mgmt_ip, username, passwords, port=_var("ansible_port") or 22)
@@ -0,0 +1,73 @@
+"""Benchmark of shell/command calls on a DUT through ansible and through the SSH command channel.
+
+Usage, from the ansible directory so that host_vars and group_vars of the inventory are visible:
+    python ../tests/common/devices/ssh_channel_benchmark.py --inventory lab --host vlab-01 [--count 50]
+        [--cmd "show version"]
+
+The same command is run --count times with each executor, the outputs are compared and the latency of the calls
+is reported.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+
+from pytest_ansible.host_manager.utils import get_host_manager     # noqa: E402
+
+from tests.common.devices.base import AnsibleHostBase       # noqa: E402
+from tests.common.devices.ssh_channel import get_ssh_command_channel       # noqa: E402
+
+
+def _percentile(samples, percent):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+
+def _report(name, samples):
+    print('{:<8} count={:<5} avg={:.1f}ms p50={:.1f}ms p99={:.1f}ms max={:.1f}ms'.format(
+        name, len(samples), sum(samples) / len(samples) * 1e3, _percentile(samples, 50) * 1e3,
+        _percentile(samples, 99) * 1e3, max(samples) * 1e3))
+
+
+def _run(host, module_name, cmd, count):
+    samples = []
+    result = None
+    for _ in range(count):
+        start = time.perf_counter()
+        result = getattr(host, module_name)(cmd, module_ignore_errors=True)
+        samples.append(time.perf_counter() - start)
+    return samples, result
+
+
+def run(inventory, hostname, module_name, cmd, count):
+    def ansible_adhoc(**kwargs):
+        return get_host_manager(inventory=inventory, **kwargs)
+
+    host = AnsibleHostBase(ansible_adhoc, hostname)
+    ansible_samples, ansible_result = _run(host, module_name, cmd, count)
+
+    host._ssh_channel = get_ssh_command_channel(host)
+    if host._ssh_channel is None:
+        sys.exit("No SSH credential of {} in the inventory".format(hostname))
+    channel_samples, channel_result = _run(host, module_name, cmd, count)
+    host._ssh_channel.close()
+
+    _report('ansible', ansible_samples)
+    _report('channel', channel_samples)
+    for key in ('rc', 'stdout', 'stderr'):
+        if ansible_result[key] != channel_result[key]:
+            print('Different {}:\n  ansible: {!r}\n  channel: {!r}'.format(
+                key, ansible_result[key], channel_result[key]))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark shell/command calls with ansible and SSH channel.')
+    parser.add_argument('--inventory', required=True, help='Ansible inventory file.')
+    parser.add_argument('--host', required=True, help='Hostname of the DUT in the inventory.')
+    parser.add_argument('--module', default='shell', choices=['shell', 'command'], help='Module to run.')
+    parser.add_argument('--cmd', default='show version', help='Command to run.')
+    parser.add_argument('--count', type=int, default=50, help='Number of calls with each executor.')
+    args = parser.parse_args()
+    run(args.inventory, args.host, args.module, args.cmd, args.count)
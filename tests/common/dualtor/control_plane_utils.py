@@ -4,6 +4,7 @@ import logging
 
 from tests.common.dualtor.dual_tor_common import CableType
 from tests.common.helpers.assertions import pytest_assert
+from tests.common.helpers.db_wait import wait_for_db_condition
 from tests.common.utilities import wait_until
 from collections.abc import Iterable
 
@@ -69,12 +70,6 @@ EXPECTED_TUNNEL_ROUTE_MAP = {
 }
 
 
-def wait_until_with_final_check(timeout, interval, delay, condition, *args, **kwargs):
-    """Always allow for extra check after timeout."""
-    check_result = wait_until(timeout, interval, delay, condition, *args, **kwargs)
-    return check_result or condition(*args, **kwargs)
-
-
 class DBChecker:
 
     def __init__(self, duthost, state, health, intf_names='all',
@@ -111,9 +106,12 @@ class DBChecker:
         return db_dump
 
     def verify_db(self, db):
+        key_patterns = ["{}{}*".format(table, DB_SEPARATOR_MAP[db]) for table in DB_CHECK_FIELD_MAP[db]]
         pytest_assert(
-            wait_until_with_final_check(self.VERIFY_DB_TIMEOUT, 10, 0,
-                                        self.get_mismatched_ports, db),
+            wait_for_db_condition(self.duthost, db, key_patterns, self.VERIFY_DB_TIMEOUT, 10, 0,
+                                  self.get_mismatched_ports, db)
+            # Always allow for extra check after timeout
+            or self.get_mismatched_ports(db),
             "Database states don't match expected state {state},"
             "incorrect {db_name} values {db_states}"
             .format(state=self.state, db_name=DB_NAME_MAP[db],
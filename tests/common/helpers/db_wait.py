@@ -0,0 +1,213 @@
+"""
+Wait for a condition on the content of the SONiC databases, checked again as soon as the keys it reads change.
+
+wait_until() checks its condition every interval, so it returns up to an interval after the condition became True,
+and each check is a round trip to the DUT. wait_for_db_condition() subscribes to the redis keyspace notifications of
+the keys the condition reads, with redis-cli running on an SSH channel of the DUT, and checks the condition again when
+one of these keys changed. The condition is still checked every interval in case a change is missed, and
+wait_for_db_condition() falls back to wait_until() if the notifications can't be received.
+
+Example, wait for the oper status of a port, kept in the PORT_TABLE of APPL_DB:
+
+    wait_for_db_condition(duthost, "APPL_DB", "PORT_TABLE:Ethernet0", 60, 10, 0,
+                          duthost.check_intf_link_state, "Ethernet0")
+"""
+import csv
+import logging
+import shlex
+import sys
+import time
+import traceback
+
+import pytest
+
+from tests.common.devices.ssh_channel import SshCommandChannelError
+from tests.common.helpers.constants import DEFAULT_NAMESPACE
+from tests.common.utilities import wait_until
+
+logger = logging.getLogger(__name__)
+
+# Redis database numbers of the SONiC databases, see /var/run/redis/sonic-db/database_config.json
+DB_IDS = {
+    "APPL_DB": 0,
+    "APP_DB": 0,
+    "ASIC_DB": 1,
+    "COUNTERS_DB": 2,
+    "LOGLEVEL_DB": 3,
+    "CONFIG_DB": 4,
+    "FLEX_COUNTER_DB": 5,
+    "STATE_DB": 6,
+}
+# Extra seconds the subscriber runs on the DUT after the timeout of the wait, it is killed by the timeout command
+SUBSCRIBER_GRACE_TIME = 10
+# Maximum number of seconds to wait for the subscription to be confirmed
+SUBSCRIBE_TIMEOUT = 10
+
+
+class KeyspaceNotificationsUnavailable(Exception):
+    """The keyspace notifications of the database can't be received."""
+    pass
+
+
+class KeyspaceSubscriber(object):
+    """
+    Receive the keyspace notifications of the keys matching patterns, in a database of a DUT.
+
+    redis-cli runs on an SSH channel of the DUT until the subscriber is closed, or at most for the given duration.
+    """
+
+    def __init__(self, host, db, key_patterns, duration):
+        """
+        Subscribe to the notifications.
+
+        Args:
+            host: SonicHost, or SonicAsic to subscribe in the database of its namespace.
+            db: Database name, like "STATE_DB", or number.
+            key_patterns: List of redis patterns of the keys, like "MUX_CABLE_TABLE|*".
+            duration: Number of seconds the subscriber is needed.
+
+        Raises:
+            KeyspaceNotificationsUnavailable: If the notifications can't be received, because they are disabled in
+                the redis configuration or no SSH channel can be opened to the DUT.
+        """
+        sonichost = getattr(host, "sonichost", host)
+        namespace = getattr(host, "namespace", DEFAULT_NAMESPACE)
+        db_id = DB_IDS[db] if db in DB_IDS else int(db)
+        redis_cli = "redis-cli -n {}".format(db_id)
+        if namespace != DEFAULT_NAMESPACE:
+            redis_cli = "ip netns exec {} {}".format(namespace, redis_cli)
+        channels = ["__keyspace@{}__:{}".format(db_id, pattern) for pattern in key_patterns]
+        # Print the notify-keyspace-events setting first, psubscribe succeeds even if the notifications are disabled
+        cmd = "{redis_cli} config get notify-keyspace-events | tail -n 1; exec timeout {duration} {redis_cli} " \
+              "--csv psubscribe {channels}".format(redis_cli=redis_cli, duration=int(duration) + SUBSCRIBER_GRACE_TIME,
+                                                   channels=" ".join(shlex.quote(c) for c in channels))
+        self.hostname = sonichost.hostname
+        try:
+            self._stream = sonichost.open_command_stream(cmd)
+        except SshCommandChannelError as e:
+            raise KeyspaceNotificationsUnavailable(str(e))
+        # Set to False when redis-cli exited, the notifications are no longer received
+        self.active = True
+        try:
+            self._wait_subscribed(len(channels))
+        except BaseException:
+            self.close()
+            raise
+
+    def _wait_subscribed(self, count):
+        flags = self._readline(SUBSCRIBE_TIMEOUT)
+        # K enables the keyspace notifications, A or h the ones of the hash commands used by SONiC
+        if flags is None or "K" not in flags or ("A" not in flags and "h" not in flags):
+            raise KeyspaceNotificationsUnavailable(
+                "Keyspace notifications disabled on {}, notify-keyspace-events: {}".format(self.hostname, flags))
+        deadline = time.time() + SUBSCRIBE_TIMEOUT
+        while True:
+            line = self._readline(max(deadline - time.time(), 0))
+            if line is None:
+                raise KeyspaceNotificationsUnavailable("No subscription confirmed by redis on {}".format(self.hostname))
+            fields = next(csv.reader([line]), [])
+            if len(fields) == 3 and fields[0] == "psubscribe" and fields[2] == str(count):
+                return
+
+    def _readline(self, timeout):
+        try:
+            return self._stream.readline(timeout)
+        except EOFError:
+            if self.active:
+                logger.info("Keyspace notifications of {} no longer received".format(self.hostname))
+            self.active = False
+            raise KeyspaceNotificationsUnavailable("redis-cli exited on {}".format(self.hostname))
+
+    def wait_for_change(self, timeout):
+        """
+        Wait until one of the keys changed.
+
+        Args:
+            timeout: Maximum number of seconds to wait.
+
+        Returns:
+            list: The keys which changed, empty if none changed before the timeout or the notifications are no longer
+                received.
+        """
+        if not self.active:
+            time.sleep(timeout)
+            return []
+        keys = []
+        try:
+            line = self._readline(timeout)
+            # A command like hset of several fields notifies once per field, take the notifications already received
+            while line is not None:
+                fields = next(csv.reader([line]), [])
+                if len(fields) == 4 and fields[0] == "pmessage":
+                    keys.append(fields[2].split(":", 1)[1])
+                line = self._readline(0)
+        except KeyspaceNotificationsUnavailable:
+            pass
+        return keys
+
+    def close(self):
+        self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+def _check_condition(condition, *args, **kwargs):
+    try:
+        return condition(*args, **kwargs)
+    except (Exception, pytest.fail.Exception) as e:
+        details = traceback.format_exception(*sys.exc_info())
+        logger.error("Exception caught while checking {}:{}, error:{}".format(condition.__name__, "".join(details), e))
+        return False
+
+
+def wait_for_db_condition(host, db, key_patterns, timeout, interval, delay, condition, *args, **kwargs):
+    """
+    @summary: Wait until the specified condition on the content of a database is True or timeout. The condition is
+        checked when one of the keys it reads changed, and every interval. Same as wait_until() if the keyspace
+        notifications can't be received from the DUT.
+    @param host: SonicHost, or SonicAsic for the database of its namespace
+    @param db: Name of the database, like "STATE_DB", or its number
+    @param key_patterns: Redis pattern, or list of patterns, of the keys read by the condition, like "PORT_TABLE:*"
+    @param timeout: Maximum time to wait
+    @param interval: Maximum time between two checks
+    @param delay: Delay time
+    @param condition: A function that returns False or True
+    @param *args: Extra args required by the 'condition' function.
+    @param **kwargs: Extra args required by the 'condition' function.
+    @return: If the condition function returns True before timeout, return True. If the condition function raises an
+        exception, log the error and keep waiting.
+    """
+    if isinstance(key_patterns, str):
+        key_patterns = [key_patterns]
+    if delay > 0:
+        logger.debug("Delay for %s seconds first" % delay)
+        time.sleep(delay)
+
+    try:
+        subscriber = KeyspaceSubscriber(host, db, key_patterns, timeout)
+    except KeyspaceNotificationsUnavailable as e:
+        logger.info("Poll {} every {} seconds, keyspace notifications unavailable: {}".format(
+            condition.__name__, interval, e))
+        return wait_until(timeout, interval, 0, condition, *args, **kwargs)
+
+    logger.debug("Wait until %s is True on changes of %s in %s, timeout is %s seconds, checking interval is %s" %
+                 (condition.__name__, key_patterns, db, timeout, interval))
+    with subscriber:
+        start_time = time.time()
+        while True:
+            # Subscribed before the first check, no change after it is missed
+            if _check_condition(condition, *args, **kwargs):
+                logger.debug("%s is True, exit early with True" % condition.__name__)
+                return True
+            elapsed_time = time.time() - start_time
+            if elapsed_time >= timeout:
+                logger.debug("%s is still False after %d seconds, exit with False" % (condition.__name__, timeout))
+                return False
+            keys = subscriber.wait_for_change(min(interval, timeout - elapsed_time))
+            logger.debug("%s is False, check again after %s" % (
+                condition.__name__, "changes of {}".format(keys) if keys else "interval"))
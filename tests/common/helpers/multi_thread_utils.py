@@ -1,7 +1,12 @@
+import logging
 import multiprocessing.pool
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from multiprocessing.pool import ThreadPool
 from typing import List
 
+logger = logging.getLogger(__name__)
+
 
 class SafeThreadPoolExecutor:
     """
@@ -78,3 +83,93 @@ class SafeThreadPoolExecutor:
         self.shutdown(wait=True)
         # Returning False to ensure that any exception in the "with" statement is not suppressed.
         return False
+
+
+def _timed_call(func, item, timings):
+    start = time.time()
+    try:
+        return func(item)
+    finally:
+        if timings is not None:
+            timings[str(item)] = time.time() - start
+
+
+def run_in_threads(func, items, max_parallel=1, timings=None):
+    """
+    Call func(item) for each item, in up to `max_parallel` threads, and return the results in the order of items.
+
+    With max_parallel <= 1 the calls are made one after another in the calling thread. Otherwise all the calls
+    complete, then the exception of the first failed item, in the order of items, is re-raised unchanged. That is
+    the exception a serial loop would have raised.
+
+    Args:
+        func: function called with one item.
+        items: list of items.
+        max_parallel: maximum number of concurrent calls.
+        timings (dict, optional): If specified, it is filled with {<str(item)>: <seconds spent in func(item)>}.
+    """
+    items = list(items)
+    if max_parallel <= 1 or len(items) <= 1:
+        return [_timed_call(func, item, timings) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(items))) as executor:
+        futures = [executor.submit(_timed_call, func, item, timings) for item in items]
+    # Leaving the executor waits for all the calls
+    return [future.result() for future in futures]
+
+
+def run_with_dependencies(func, items, dependencies, max_parallel=1, timings=None):
+    """
+    Call func(item) for each item, in up to `max_parallel` threads, starting an item only when the items it depends on
+    are done, and return the results in the order of items.
+
+    With max_parallel <= 1 the calls are made one after another in the calling thread, in the order of items. Otherwise
+    each item is started as soon as its dependencies are done, and the items depending on a failed item are not called.
+    Once no more item can be started, the exception of the first failed item, in the order of items, is re-raised,
+    and ValueError is raised if some items were never started because their dependencies are circular.
+
+    With max_parallel > 1, func must not fork, like parallel_run() does: a process forked while another thread holds
+    a lock may deadlock on it.
+
+    Args:
+        func: function called with one item.
+        items: list of items.
+        dependencies (dict): {<item>: [<items to be done before it>]}. Dependencies not in items are ignored.
+        max_parallel: maximum number of concurrent calls.
+        timings (dict, optional): If specified, it is filled with {<str(item)>: <seconds spent in func(item)>}.
+    """
+    items = list(items)
+    if max_parallel <= 1 or len(items) <= 1:
+        return run_in_threads(func, items, max_parallel=1, timings=timings)
+
+    # Items waiting for their dependencies, the ones depending on a failed item are never started
+    pending = {item: set(dependencies.get(item, [])) & set(items) for item in items}
+    pending = {item: depends_on for item, depends_on in pending.items() if depends_on}
+    ready = [item for item in items if item not in pending]
+
+    futures = {}
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(items))) as executor:
+        running = {}
+        while ready or running:
+            for item in ready:
+                running[executor.submit(_timed_call, func, item, timings)] = item
+            ready = []
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                done_item = running.pop(future)
+                futures[done_item] = future
+                if future.exception() is not None:
+                    continue
+                for item in items:
+                    if item in pending and done_item in pending[item]:
+                        pending[item].discard(done_item)
+                        if not pending[item]:
+                            del pending[item]
+                            ready.append(item)
+
+    for item in items:
+        if item in futures and futures[item].exception() is not None:
+            raise futures[item].exception()
+    if pending:
+        raise ValueError("Circular dependencies between items {}".format(list(pending)))
+    return [futures[item].result() for item in items]
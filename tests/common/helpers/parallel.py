@@ -1,7 +1,6 @@
 import ansible
 import datetime
 import logging
-import math
 import os
 import shutil
 import signal
@@ -10,11 +9,10 @@ import threading
 import time
 import traceback
 from multiprocessing import Process, Manager, Pipe, TimeoutError
+from multiprocessing.connection import wait as connection_wait
 from multiprocessing.pool import ThreadPool
 from ansible.executor.process.worker import WorkerProcess
 
-from psutil import wait_procs
-
 from tests.common.helpers.assertions import pytest_assert as pt_assert
 
 logger = logging.getLogger(__name__)
@@ -128,10 +126,13 @@ class SonicProcess(Process):
 
 
 def parallel_run(
-    target, args, kwargs, nodes_list, timeout=None, concurrent_tasks=24, init_result=None
+    target, args, kwargs, nodes_list, timeout=None, concurrent_tasks=24, init_result=None, timings=None
 ):
     """Run target function on nodes in parallel
 
+    Up to 'concurrent_tasks' processes run at the same time. A new process is started as soon as any running
+    process exits.
+
     Args:
         target (function): The target function to be executed in parallel.
         args (list of tuple): List of arguments for the target function.
@@ -140,9 +141,11 @@ def parallel_run(
             multiprocessing.Manager().dict(). It is a proxy of the shared dict that will be used by each process for
             returning execution results.
         nodes (list of nodes): List of nodes to be used by the target function
-        timeout (int or float, optional): Total time allowed for the spawned multiple processes to run. Defaults to
-            None. When timeout is specified, this function will wait at most 'timeout' seconds for the processes to
-            run. When time is up, this function will try to terminate or even kill all the processes.
+        timeout (int or float, optional): Time allowed for the process of each node to run. Defaults to None.
+            When timeout is specified, a process still running 'timeout' seconds after it was started is killed.
+        timings (dict, optional): If specified, it is filled with the start/end timestamps of the process of each
+            node: {<node name>: {"start": <timestamp>, "end": <timestamp>, "duration": <seconds>,
+            "timed_out": <bool>}}.
 
     Raises:
         flag.: In case any of the spawned process cannot be terminated, fail the test.
@@ -153,66 +156,41 @@ def parallel_run(
     """
     nodes = [node for node in nodes_list]
 
-    # Callback API for wait_procs
-    def on_terminate(worker):
-        logger.info("process {} terminated with exit code {}".format(
-            worker.name, worker.exitcode)
-        )
+    def force_terminate(worker, node):
+        # The process exceeds its timeout. Try to kill it and raise flag.
+        logger.error('Process {} is still running after {} seconds, kill it.'.format(worker.name, timeout))
+        # If sanity check process is killed, it still has init results.
+        # set its failed to True.
+        if init_result:
+            results[node.hostname] = dict(init_result, host=node.hostname, failed=True)
+        else:
+            results[worker.name] = {'failed': True}
+        try:
+            os.kill(worker.pid, signal.SIGKILL)
+        except OSError as err:
+            logger.error("Unable to kill {}:{}, error:{}".format(
+                worker.pid, worker.name, err
+            ))
 
-    def force_terminate(workers, init_result):
-        # Some processes cannot be terminated. Try to kill them and raise flag.
-        running_processes = [worker for worker in workers if worker.is_alive()]
-        if len(running_processes) > 0:
-            logger.info(
-                'Found processes still running: {}. Try to kill them.'.format(str(running_processes))
+            pt_assert(
+                False,
+                """Processes running target "{}" could not be terminated.
+                Unable to kill {}:{}, error:{}""".format(target.__name__, worker.pid, worker.name, err)
             )
-            for p in running_processes:
-                # If sanity check process is killed, it still has init results.
-                # set its failed to True.
-                if init_result:
-                    init_result['failed'] = True
-                    results[list(results.keys())[0]] = init_result
-                else:
-                    results[p.name] = {'failed': True}
-                try:
-                    os.kill(p.pid, signal.SIGKILL)
-                except OSError as err:
-                    logger.error("Unable to kill {}:{}, error:{}".format(
-                        p.pid, p.name, err
-                    ))
-
-                    pt_assert(
-                        False,
-                        """Processes running target "{}" could not be terminated.
-                        Unable to kill {}:{}, error:{}""".format(target.__name__, p.pid, p.name, err)
-                    )
+        worker.join()
 
-    workers = []
     results = Manager().dict()
     start_time = datetime.datetime.now()
-    tasks_done = 0
-    total_tasks = len(nodes)
-    tasks_running = 0
-    total_timeout = timeout * math.ceil(
-        len(nodes)/float(concurrent_tasks)
-    ) if timeout else None
+    running = {}    # worker -> (node, start timestamp)
+    node_timings = {}
     failed_processes = {}
 
     # Before spawning the child process, ensure current thread is
     # holding the logging handler locks to avoid deadlock in child process.
     fix_logging_handler_fork_lock()
 
-    while tasks_done < total_tasks:
-        # If execution time of processes exceeds timeout, need to force
-        # terminate them all.
-        if total_timeout is not None:
-            if (datetime.datetime.now() - start_time).seconds > total_timeout:
-                logger.error('Process execution time exceeds {} seconds.'.format(
-                    str(total_timeout)
-                ))
-                break
-
-        while len(nodes) and tasks_running < concurrent_tasks:
+    while nodes or running:
+        while len(nodes) and len(running) < concurrent_tasks:
             node = nodes.pop(0)
             # For sanity check process, initial results in case of timeout.
             if init_result:
@@ -226,63 +204,54 @@ def parallel_run(
                         kwargs=kwargs
                     )
             worker.start()
-            tasks_running += 1
+            running[worker] = (node, time.time())
             logger.debug('Started process {} running target "{}"'.format(
                 worker.pid, process_name
             ))
-            workers.append(worker)
-
-        gone, alive = wait_procs(workers, timeout=timeout, callback=on_terminate)
-        workers = alive
 
-        logger.debug("task completed {}, running {}".format(
-            len(gone), len(alive)
+        # Wait until any process exits, sends its exception or reaches its deadline.
+        # Child processes may hang on send() if parent doesn't read from the pipe, so the pipes are waited as well.
+        wait_timeout = None
+        if timeout is not None:
+            wait_timeout = max(0, min(started + timeout for _, started in running.values()) - time.time())
+        wait_objects = [worker.sentinel for worker in running]
+        wait_objects.extend(worker._pconn for worker in running if not worker._exception_read)
+        connection_wait(wait_objects, timeout=wait_timeout)
+
+        now = time.time()
+        for worker, (node, started) in list(running.items()):
+            if not worker._exception_read and worker._pconn.poll():
+                worker_exception = worker.exception
+                if worker_exception is not None:
+                    logger.info(f"Process {worker.name} has exception, is_alive={worker.is_running()}, "
+                                f"record the error.")
+                    failed_processes[worker.name] = {'exit_code': None, 'exception': worker_exception}
+
+            timed_out = timeout is not None and now - started >= timeout and worker.is_alive()
+            if timed_out:
+                force_terminate(worker, node)
+            elif worker.is_alive():
+                continue
+
+            worker.join()
+            logger.info("process {} terminated with exit code {}".format(worker.name, worker.exitcode))
+            # Explicitly check the process exception to prevent any error miss.
+            worker_exception = worker.exception
+            if worker.name in failed_processes:
+                failed_processes[worker.name]['exit_code'] = worker.exitcode
+            elif worker_exception is not None:
+                failed_processes[worker.name] = {'exit_code': worker.exitcode, 'exception': worker_exception}
+            node_timings[str(node)] = {"start": started, "end": now, "duration": now - started,
+                                       "timed_out": timed_out}
+            del running[worker]
+
+        logger.debug("task completed {}, running {}, pending {}".format(
+            len(node_timings), len(running), len(nodes)
         ))
 
-        # Sometimes the child processes finished run but still alive, causing exception hidden.
-        # It mainly caused by child processes hang on send() if parent doesn't read from the pipe.
-        # Therefore, explicitly check the processes exception to prevent any error miss.
-        logger.info("Force read exception regardless of whether the process exited normally.")
-        for worker in gone + alive:
-            worker_exception = worker.exception  # Force-read to prevent pipe hangs
-            if worker_exception is not None:
-                logger.info(f"Process {worker.name} has exception, is_alive={worker.is_running()}, record the error.")
-                failed_processes[worker.name] = {
-                    'exit_code': worker.exitcode,
-                    'exception': worker_exception
-                }
-
-        if len(gone) == 0:
-            logger.debug("all processes have timedout")
-            tasks_running -= len(workers)
-            tasks_done += len(workers)
-            force_terminate(workers, init_result)
-            del workers[:]
-        else:
-            tasks_running -= len(gone)
-            tasks_done += len(gone)
-
-    # In case of timeout force terminate spawned processes
-    for worker in workers:
-        if worker.is_alive():
-            logger.error('Process {} is alive, force terminate it.'.format(
-                worker.name
-            ))
-            worker.terminate()
-            # If sanity check process is killed, it still has init results.
-            # set its failed to True.
-            if init_result:
-                init_result['failed'] = True
-                results[list(results.keys())[0]] = init_result
-            else:
-                results[worker.name] = {'failed': True}
-
     end_time = datetime.datetime.now()
     delta_time = end_time - start_time
 
-    # force terminate any workers still running
-    force_terminate(workers, init_result)
-
     # if we have failed processes, we should log the exception and exit code
     # of each Process and fail
     if len(list(failed_processes.keys())):
@@ -304,6 +273,13 @@ def parallel_run(
                     list(failed_processes.keys()), p_exitcode, p_exception, p_traceback)
             pt_assert(False, failure_message)
 
+    if node_timings:
+        slowest = max(node_timings, key=lambda name: node_timings[name]["duration"])
+        logger.info('Slowest node of target "{}" is {}, it took {:.2f} seconds'.format(
+            target.__name__, slowest, node_timings[slowest]["duration"]))
+    if timings is not None:
+        timings.update(node_timings)
+
     logger.info(
         'Completed running processes for target "{}" in {} seconds'.format(
             target.__name__, str(delta_time)
@@ -0,0 +1,145 @@
+"""
+Parser of the tabulated output of SONiC show commands, used by SonicHost.show_and_parse().
+
+The output looks like:
+
+      Interface            Lanes    Speed
+    -----------  ---------------  -------
+      Ethernet0          0,1,2,3      40G
+
+The layout of the columns (headers and positions) is computed from the header lines and the separation line. It is
+cached by command, and reused as long as the header and separation lines of the output are the same, so a command
+polled in a loop only pays for slicing the content lines.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def is_separation_line(line, sep_char='-'):
+    """Whether the line only has separation chars and spaces, like r'^( *-+ *)+$' without regex backtracking."""
+    return sep_char in line and not line.strip(' ' + sep_char)
+
+
+def parse_column_positions(sep_line, sep_char='-'):
+    """Parse the position of each column from the separation line.
+
+    Returns:
+        A list of tuples (start position, end position) of each column.
+    """
+    positions = []
+    left = None
+    for pos, char in enumerate(sep_line + ' '):
+        if char == sep_char:
+            if left is None:
+                left = pos
+        elif left is not None:
+            positions.append((left, pos))
+            left = None
+    return positions
+
+
+class ColumnLayout(object):
+    """Headers and positions of the columns of a tabulated output."""
+
+    def __init__(self, header_lines, sep_line, sep_char='-'):
+        self.header_lines = tuple(header_lines)
+        self.sep_line = sep_line
+        positions = parse_column_positions(sep_line, sep_char)
+        self.slices = [slice(left, right) for left, right in positions]
+        self.headers = [
+            " ".join([header_line[column].strip().lower() for header_line in header_lines]).strip()
+            for column in self.slices
+        ]
+
+    def matches(self, header_lines, sep_line):
+        return self.sep_line == sep_line and self.header_lines == tuple(header_lines)
+
+    def parse_columns(self, content_lines):
+        """Slice the content lines into columns.
+
+        Returns:
+            A list of lists, one list of values per column.
+        """
+        # When an empty line is encountered while parsing the tabulate content, it is highly possible that the
+        # tabulate content has been drained. The empty line and rest of the lines should not be parsed.
+        try:
+            content_lines = content_lines[:content_lines.index('')]
+        except ValueError:
+            pass
+        return [[line[column].strip() for line in content_lines] for column in self.slices]
+
+
+class ParsedTable(object):
+    """Columnar result of a tabulated output.
+
+    Values are stored per column in 'columns', {header: [value of each row]}. Rows are built as dicts only when they
+    are accessed, by index or by iteration. As for the dicts returned by show_and_parse(), a header appearing twice
+    is mapped to the values of its last column.
+    """
+
+    def __init__(self, headers, columns):
+        self.headers = headers
+        self._columns = columns
+        self.columns = dict(zip(headers, columns))
+
+    def __len__(self):
+        return len(self._columns[0]) if self._columns else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return dict(zip(self.headers, [values[index] for values in self._columns]))
+
+    def __iter__(self):
+        for row in zip(*self._columns):
+            yield dict(zip(self.headers, row))
+
+    def column(self, header):
+        """Get the list of values of a column."""
+        return self.columns[header]
+
+    def to_list(self):
+        """Get the rows as a list of dicts, the format returned by show_and_parse()."""
+        headers = self.headers
+        return [dict(zip(headers, row)) for row in zip(*self._columns)]
+
+
+class ShowParser(object):
+    """Parse tabulated show outputs, with the column layout cached by command."""
+
+    def __init__(self):
+        self._layouts = {}
+
+    def parse(self, output_lines, header_len=1, key=None):
+        """Parse the tabulated output.
+
+        Args:
+            output_lines: Lines of the output.
+            header_len: Number of header lines above the separation line.
+            key: Key of the cached layout, usually the command. The layout is not cached if None.
+
+        Returns:
+            ParsedTable or None: None if no separation line is found or the output is malformed.
+        """
+        for sep_index, line in enumerate(output_lines):
+            if is_separation_line(line):
+                break
+        else:
+            logger.error('Failed to find separation line in the show command output')
+            return None
+
+        header_lines = output_lines[sep_index - header_len:sep_index]
+        sep_line = output_lines[sep_index]
+        layout = self._layouts.get(key) if key is not None else None
+        if layout is None or not layout.matches(header_lines, sep_line):
+            try:
+                layout = ColumnLayout(header_lines, sep_line)
+            except Exception as e:
+                logger.error('Possibly bad command output, exception: {}'.format(repr(e)))
+                return None
+            if key is not None:
+                self._layouts[key] = layout
+
+        columns = layout.parse_columns(output_lines[sep_index + 1:])
+        return ParsedTable(layout.headers, columns)
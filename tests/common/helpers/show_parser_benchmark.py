@@ -0,0 +1,107 @@
+"""Benchmark of ShowParser on large show outputs, compared with the previous per-line regex and dict parsing.
+
+Usage:
+    python show_parser_benchmark.py [--ports 512] [--queues 20] [--iterations 20] [--output recorded_output.txt]
+
+Without --output, 'show interfaces counters' and 'show queue counters' outputs of a chassis with the specified
+number of ports are generated. With --output, a recorded output is parsed instead.
+"""
+import argparse
+import re
+import time
+
+from show_parser import ShowParser
+
+
+def legacy_parse(output_lines, header_len=1):
+    """The parsing done by SonicHost._parse_show() before the column layout was cached."""
+    result = []
+    sep_line_pattern = re.compile(r"^( *-+ *)+$")
+    for idx, line in enumerate(output_lines):
+        if sep_line_pattern.match(line):
+            header_lines = output_lines[idx - header_len:idx]
+            sep_line = output_lines[idx]
+            content_lines = output_lines[idx + 1:]
+            break
+    else:
+        return result
+
+    prev = ' ',
+    positions = []
+    for pos, char in enumerate(sep_line + ' '):
+        if char == '-':
+            if char != prev:
+                left = pos
+        else:
+            if char != prev:
+                right = pos
+                positions.append((left, right))
+        prev = char
+
+    headers = []
+    for (left, right) in positions:
+        headers.append(" ".join([header_line[left:right].strip().lower() for header_line in header_lines]).strip())
+
+    for content_line in content_lines:
+        if len(content_line) == 0:
+            break
+        item = {}
+        for idx, (left, right) in enumerate(positions):
+            item[headers[idx]] = content_line[left:right].strip()
+        result.append(item)
+    return result
+
+
+def _table(headers, rows):
+    widths = [max(len(header), *(len(row[i]) for row in rows)) for i, header in enumerate(headers)]
+    lines = ["  ".join(header.rjust(width) for header, width in zip(headers, widths)),
+             "  ".join("-" * width for width in widths)]
+    lines.extend("  ".join(value.rjust(width) for value, width in zip(row, widths)) for row in rows)
+    return lines
+
+
+def interfaces_counters(ports):
+    headers = ["IFACE", "STATE", "RX_OK", "RX_BPS", "RX_UTIL", "RX_ERR", "RX_DRP", "RX_OVR",
+               "TX_OK", "TX_BPS", "TX_UTIL", "TX_ERR", "TX_DRP", "TX_OVR"]
+    rows = [["Ethernet{}".format(port * 4), "U", "{:,}".format(port * 123457), "1.23 MB/s", "0.01%", "0", "0", "0",
+             "{:,}".format(port * 654321), "3.21 MB/s", "0.03%", "0", "0", "0"] for port in range(ports)]
+    return _table(headers, rows)
+
+
+def queue_counters(ports, queues):
+    headers = ["Port", "TxQ", "Counter/pkts", "Counter/bytes", "Drop/pkts", "Drop/bytes"]
+    rows = [["Ethernet{}".format(port * 4), "UC{}".format(queue), "{:,}".format(port * queue * 17),
+             "{:,}".format(port * queue * 1500), "0", "0"] for port in range(ports) for queue in range(queues)]
+    return _table(headers, rows)
+
+
+def _measure(name, func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    print("  {:<18} {:.2f}ms per parse".format(name, (time.perf_counter() - start) / iterations * 1e3))
+
+
+def run(name, output_lines, iterations):
+    parser = ShowParser()
+    assert parser.parse(output_lines, key=name).to_list() == legacy_parse(output_lines)
+    print("{} ({} lines)".format(name, len(output_lines)))
+    _measure("legacy", lambda: legacy_parse(output_lines), iterations)
+    _measure("cached rows", lambda: parser.parse(output_lines, key=name).to_list(), iterations)
+    _measure("cached columnar", lambda: parser.parse(output_lines, key=name), iterations)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark ShowParser on large show outputs.")
+    arg_parser.add_argument("--ports", type=int, default=512, help="Number of ports of the generated outputs.")
+    arg_parser.add_argument("--queues", type=int, default=20, help="Number of queues per port.")
+    arg_parser.add_argument("--iterations", type=int, default=20, help="Number of parses of each output.")
+    arg_parser.add_argument("--output", help="File of a recorded show output to parse instead.")
+    args = arg_parser.parse_args()
+
+    if args.output:
+        with open(args.output) as f:
+            run(args.output, f.read().splitlines(), args.iterations)
+    else:
+        run("show interfaces counters", interfaces_counters(args.ports), args.iterations)
+        run("show queue counters", queue_counters(args.ports, args.queues), args.iterations)
@@ -3,17 +3,19 @@
 This plugin supports adding any mark to specified test cases based on conditions. All the information of test cases,
 marks, and conditions can be specified in a centralized file.
 """
+import functools
 import json
 import logging
 import os
 import re
 import subprocess
+import weakref
 import yaml
 import glob
 import pytest
 
 from tests.common.testbed import TestbedInfo
-from .issue import check_issues
+from .issue import check_issues, IssueStatusCache
 from tests.common.utilities import get_duts_from_host_pattern
 from tests.common.cisco_data import (
     CISCO_8122_PREFIX,
@@ -24,6 +26,8 @@ from tests.common.cisco_data import (
 logger = logging.getLogger(__name__)
 
 DEFAULT_CONDITIONS_FILE = 'common/plugins/conditional_mark/tests_mark_conditions*.yaml'
+DEFAULT_ISSUE_CACHE_TTL = 3600
+ISSUE_URL_PATTERN = re.compile('https?://[^ )]+')
 ASIC_NAME_PATH = '/../../../../ansible/group_vars/sonic/variables'
 ANSIBLE_LIBRARY_PATH = os.path.realpath(os.path.join(os.path.dirname(__file__), '../../../../ansible/library'))
 MARK_CONDITIONS_CONSTANTS = {
@@ -45,6 +49,9 @@ MARK_CONDITIONS_CONSTANTS = {
                      'urh_min', 'lrh_min', 'lt2-o224', 'lt2-o32', 'lt2-o256-u32d224']
 }
 
+# Values of the pytest cache used for every condition, like the issue states, kept in memory for each session
+_session_caches = weakref.WeakKeyDictionary()
+
 
 def pytest_addoption(parser):
     """Add options for the conditional mark plugin.
@@ -79,6 +86,23 @@ def pytest_addoption(parser):
         help="Dynamically update the skip reason based on the conditions, "
              "by default it will not use the static reason specified in the mark conditions file")
 
+    parser.addoption(
+        '--issue-cache-ttl',
+        action='store',
+        dest='issue_cache_ttl',
+        type=int,
+        default=DEFAULT_ISSUE_CACHE_TTL,
+        help="Number of seconds for which the states of the issues in the conditions are cached on disk. "
+             "The issues are checked in every session if it is 0.")
+
+    parser.addoption(
+        '--issue-cache-file',
+        action='store',
+        dest='issue_cache_file',
+        default=None,
+        help="Location of the file caching the states of the issues, shared by the sessions and xdist workers. "
+             "If it is not specified, 'conditional_mark/issue_status.json' in the pytest cache directory is used.")
+
 
 def load_conditions(session):
     """Load the content from mark conditions file
@@ -197,13 +221,43 @@ def get_dut_name(session):
     return dut_name
 
 
-def get_basic_facts(session):
-    dut_name = get_dut_name(session)
+def get_basic_facts(session, dut_name):
     cached_facts_name = f'BASIC_FACTS_{dut_name}'
-    basic_facts_cached = session.config.cache.get(cached_facts_name, None)
-    if not basic_facts_cached:
+    basic_facts = session.config.cache.get(cached_facts_name, None)
+    if not basic_facts:
         basic_facts = load_basic_facts(dut_name, session)
         session.config.cache.set(cached_facts_name, basic_facts)
+        basic_facts = session.config.cache.get(cached_facts_name, None)
+    return basic_facts
+
+
+def get_session_cache(session, key, default):
+    """Get a value of the pytest cache, read only once for the session.
+
+    Args:
+        session (obj): Pytest session object.
+        key (str): Key of the value in the pytest cache.
+        default (obj): Value returned if the key is not in the pytest cache.
+
+    Returns:
+        obj: The value, shared by all the calls for the session.
+    """
+    session_cache = _session_caches.setdefault(session, {})
+    if key not in session_cache:
+        session_cache[key] = session.config.cache.get(key, default)
+    return session_cache[key]
+
+
+def set_session_cache(session, key, value):
+    """Set a value in the pytest cache and in the values kept in memory for the session.
+
+    Args:
+        session (obj): Pytest session object.
+        key (str): Key of the value in the pytest cache.
+        value (obj): The value.
+    """
+    _session_caches.setdefault(session, {})[key] = value
+    session.config.cache.set(key, value)
 
 
 def get_http_proxies(inv_name):
@@ -422,7 +476,7 @@ def load_basic_facts(dut_name, session):
     else:
         inv_name = 'lab'
     proxies = get_http_proxies(inv_name)
-    session.config.cache.set('PROXIES', proxies)
+    set_session_cache(session, 'PROXIES', proxies)
 
     # Since internal repo add vendor test support, add check to see if it's sonic-os, other wise skip load facts.
     vendor = session.config.getoption("--dut_vendor", "sonic")
@@ -460,45 +514,166 @@ def load_basic_facts(dut_name, session):
     return results
 
 
+def find_issues(conditions):
+    """Find the issue URLs in all the condition strings of the conditions list.
+
+    Args:
+        conditions (list): List of conditions
+
+    Returns:
+        list: The issue URLs, sorted.
+    """
+    issues = set()
+    for condition in conditions:
+        for mark, mark_details in list(condition.values())[0].items():
+            if mark in ["regex", "use_longest"] or not isinstance(mark_details, dict):
+                continue
+            mark_conditions = mark_details.get('conditions')
+            if not isinstance(mark_conditions, list):
+                mark_conditions = [mark_conditions]
+            for condition_str in mark_conditions:
+                if isinstance(condition_str, str):
+                    issues.update(ISSUE_URL_PATTERN.findall(condition_str))
+    return sorted(issues)
+
+
+def prefetch_issue_status(session, conditions):
+    """Get the states of all the issues in the conditions before evaluating them.
+
+    The states are read from the issue cache file, and only the issues which are not in it or expired are checked,
+    all at once. The states are then kept in memory for update_issue_status(). The issues which could not be checked
+    keep their last known state from the issue cache file, or are considered as active for the session if they were
+    never checked successfully. Their states are not saved in the issue cache file.
+
+    Args:
+        session (obj): Pytest session object.
+        conditions (list): List of conditions, usually only the ones matching the collected test cases
+    """
+    issues = find_issues(conditions)
+    if not issues:
+        return
+
+    proxies = get_session_cache(session, 'PROXIES', {})
+    ttl = session.config.option.issue_cache_ttl
+    if ttl > 0:
+        cache_file = session.config.option.issue_cache_file
+        if not cache_file:
+            cache_file = os.path.join(str(session.config.cache.mkdir('conditional_mark')), 'issue_status.json')
+        issue_status = IssueStatusCache(cache_file, ttl).get_states(issues, proxies=proxies)
+    else:
+        issue_status = check_issues(issues, proxies=proxies)
+    # Not checked again by update_issue_status() when the conditions are evaluated
+    for issue in issues:
+        issue_status.setdefault(issue, True)
+    _session_caches.setdefault(session, {})['ISSUE_STATUS'] = issue_status
+
+
+class ConditionsIndex(object):
+    """Index of the mark conditions list, for finding the entries matching a test case without scanning all of them.
+
+    The entries are test case name prefixes, kept in a trie of the characters of the prefixes, except the entries with
+    'regex: True' which are regular expressions searched in the test case name one by one. The matching entries are
+    returned in the order of the conditions list, like scanning the list does.
+    """
+
+    def __init__(self, conditions):
+        """Build the index.
+
+        Args:
+            conditions (list): List of conditions
+        """
+        self.conditions = conditions
+        self.trie = {}
+        self.regexes = []
+
+        for index, condition in enumerate(conditions):
+            # condition is a dict which has only one item, so we use condition.keys()[0] to get its key.
+            condition_entry = list(condition.keys())[0]
+            condition_items = condition[condition_entry]
+            if "regex" in condition_items.keys():
+                assert isinstance(condition_items["regex"], bool), \
+                    "The value of 'regex' in the mark conditions yaml should be bool type."
+                if condition_items["regex"] is True:
+                    self.regexes.append((index, re.compile(condition_entry)))
+                continue
+
+            use_longest = False
+            if "use_longest" in condition_items.keys():
+                assert isinstance(condition_items["use_longest"], bool), \
+                    "The value of 'use_longest' in the mark conditions yaml should be bool type."
+                use_longest = condition_items["use_longest"]
+
+            node = self.trie
+            for char in condition_entry:
+                node = node.setdefault(char, {})
+            # The entries ending at a node are kept under the None key
+            node.setdefault(None, []).append((index, use_longest))
+
+    def find(self, nodeid):
+        """Find the entries matching a test case.
+
+        Args:
+            nodeid (str): Full test case name
+
+        Returns:
+            list: The matching entries of the conditions list, in the order of the list. If an entry with
+                'use_longest: True' matches, the matching entries before it are dropped.
+        """
+        found = []
+        node = self.trie
+        for char in nodeid:
+            found.extend(node.get(None, []))
+            node = node.get(char)
+            if node is None:
+                break
+        else:
+            found.extend(node.get(None, []))
+
+        for index, regex in self.regexes:
+            if regex.search(nodeid):
+                found.append((index, False))
+
+        found.sort()
+        start = 0
+        for position, (index, use_longest) in enumerate(found):
+            if use_longest:
+                start = position
+        return [self.conditions[index] for index, _ in found[start:]]
+
+    def find_all(self, nodeids):
+        """Find the entries matching any of the test cases.
+
+        Args:
+            nodeids (list): Full test case names
+
+        Returns:
+            list: The matching entries of the conditions list, in the order of the list.
+        """
+        found = {}
+        for nodeid in nodeids:
+            for condition in self.find(nodeid):
+                found[id(condition)] = condition
+        return [condition for condition in self.conditions if id(condition) in found]
+
+
 def find_all_matches(nodeid, conditions, session, dynamic_update_skip_reason, basic_facts):
     """Find all matches of the given test case name in the conditions list.
 
     Args:
         nodeid (str): Full test case name
-        conditions (list): List of conditions
+        conditions (list or ConditionsIndex): List of conditions, or its index for finding the matches of many test
+            cases
 
     Returns:
         list: All match test case name or None if not found
     """
-    all_matches = []
     max_length = -1
     conditional_marks = {}
     matches = []
 
-    for condition in conditions:
-        # condition is a dict which has only one item, so we use condition.keys()[0] to get its key.
-        condition_entry = list(condition.keys())[0]
-        condition_items = condition[condition_entry]
-        if "regex" in condition_items.keys():
-            assert isinstance(condition_items["regex"], bool), \
-                "The value of 'regex' in the mark conditions yaml should be bool type."
-            if condition_items["regex"] is True:
-                match = re.search(condition_entry, nodeid)
-            else:
-                match = None
-
-        elif "use_longest" in condition_items.keys():
-            assert isinstance(condition_items["use_longest"], bool), \
-                "The value of 'use_longest' in the mark conditions yaml should be bool type."
-            if nodeid.startswith(condition_entry) and condition_items["use_longest"] is True:
-                all_matches = []
-
-            match = nodeid.startswith(condition_entry)
-        else:
-            match = nodeid.startswith(condition_entry)
-
-        if match:
-            all_matches.append(condition)
+    if not isinstance(conditions, ConditionsIndex):
+        conditions = ConditionsIndex(conditions)
+    all_matches = conditions.find(nodeid)
 
     for match in all_matches:
         case_starting_substring = list(match.keys())[0]
@@ -554,31 +729,41 @@ def update_issue_status(condition_str, session):
     Returns:
         str: New condition string with issue URLs already replaced with 'True' or 'False'.
     """
-    issues = re.findall('https?://[^ )]+', condition_str)
+    issues = ISSUE_URL_PATTERN.findall(condition_str)
     if not issues:
         logger.debug('No issue specified in condition')
         return condition_str
 
-    issue_status_cache = session.config.cache.get('ISSUE_STATUS', {})
-    proxies = session.config.cache.get('PROXIES', {})
+    # The states of the issues are usually all prefetched by prefetch_issue_status()
+    issue_status_cache = _session_caches.setdefault(session, {}).setdefault('ISSUE_STATUS', {})
 
     unknown_issues = [issue_url for issue_url in issues if issue_url not in issue_status_cache]
     if unknown_issues:
+        proxies = get_session_cache(session, 'PROXIES', {})
         results = check_issues(unknown_issues, proxies=proxies)
-        issue_status_cache.update(results)
-        session.config.cache.set('ISSUE_STATUS', issue_status_cache)
-
-    for issue_url in issues:
-        if issue_url in issue_status_cache:
-            replace_str = str(issue_status_cache[issue_url])
-        else:
+        for issue_url in unknown_issues:
             # Consider the issue as active anyway if unable to get issue state
-            replace_str = 'True'
+            issue_status_cache[issue_url] = results.get(issue_url, True)
 
-        condition_str = condition_str.replace(issue_url, replace_str)
+    for issue_url in issues:
+        condition_str = condition_str.replace(issue_url, str(issue_status_cache[issue_url]))
     return condition_str
 
 
+@functools.lru_cache(maxsize=None)
+def compile_condition(condition_str):
+    """Compile a condition string once, for evaluating it for every test case.
+
+    Args:
+        condition_str (str): A condition string with issue URLs already replaced.
+
+    Returns:
+        code: The code object to evaluate.
+    """
+    # Like eval() does, ignore the leading and trailing spaces and tabs
+    return compile(condition_str.strip(' \t'), '<condition>', 'eval')
+
+
 def evaluate_condition(dynamic_update_skip_reason, mark_details, condition, basic_facts, session):
     """Evaluate a condition string based on supplied basic facts.
 
@@ -609,7 +794,7 @@ def evaluate_condition(dynamic_update_skip_reason, mark_details, condition, basi
                 logger.warning("Variable %s not found in basic_facts, defaulting to None", var)
                 safe_globals[var] = None
 
-        condition_result = bool(eval(condition_str, safe_globals))
+        condition_result = bool(eval(compile_condition(condition_str), safe_globals))
 
         if condition_result and dynamic_update_skip_reason:
             mark_details['reason'].append(condition)
@@ -709,11 +894,7 @@ def pytest_collection_modifyitems(session, config, items):
         return
 
     # Lazily load DUT facts now that we know they are actually needed.
-    get_basic_facts(session)
-
-    dut_name = get_dut_name(session)
-    cached_facts_name = f'BASIC_FACTS_{dut_name}'
-    basic_facts = config.cache.get(cached_facts_name, None)
+    basic_facts = get_basic_facts(session, get_dut_name(session))
     if not basic_facts:
         logger.debug('No basic facts')
         return
@@ -725,13 +906,19 @@ def pytest_collection_modifyitems(session, config, items):
     # float above tests/ (e.g. --inventory ../ansible/veos_vtb), so strip both
     # basename(rootpath) and a leading "tests/" or all conditional skips no-op.
     root_prefix = os.path.basename(str(session.config.rootpath)) + "/"
+    nodeids = []
     for item in items:
         nodeid = item.nodeid
         if nodeid.startswith(root_prefix):
             nodeid = nodeid[len(root_prefix):]
         if nodeid.startswith("tests/"):
             nodeid = nodeid[len("tests/"):]
-        all_matches = find_all_matches(nodeid, conditions, session, dynamic_update_skip_reason, basic_facts)
+        nodeids.append(nodeid)
+    conditions_index = ConditionsIndex(conditions)
+    # Only the issues of the conditions which may be evaluated for the collected test cases are checked
+    prefetch_issue_status(session, conditions_index.find_all(nodeids))
+    for item, nodeid in zip(items, nodeids):
+        all_matches = find_all_matches(nodeid, conditions_index, session, dynamic_update_skip_reason, basic_facts)
 
         if all_matches:
             logger.debug('Found match "{}" for test case "{}"'.format(all_matches, item.nodeid))
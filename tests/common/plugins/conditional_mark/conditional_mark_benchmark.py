@@ -0,0 +1,191 @@
+"""Benchmark of the conditional mark plugin adding the marks to the test cases collected from the tree.
+
+Usage, from the tests directory:
+    python common/plugins/conditional_mark/conditional_mark_benchmark.py [--iterations 3] [--dump marks.json]
+
+The test cases are found by scanning the test files for test functions, without importing them. The basic facts are
+the facts of a virtual t0 testbed, and the state of every issue of the conditions files is put in the issue cache file
+beforehand, so the benchmark neither runs ansible nor accesses the issue trackers. Each iteration runs the
+pytest_collection and pytest_collection_modifyitems hooks of the plugin on a new session. With --dump, the marks added
+to the test cases are written to a file, to compare them between two versions of the plugin.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '../../../..')))
+
+from tests.common.plugins import conditional_mark     # noqa: E402
+
+DUT_NAME = 'vlab-01'
+BASIC_FACTS = {
+    'asic_type': 'vs',
+    'asic_subtype': '',
+    'asic_gen': 'unknown',
+    'platform': 'x86_64-kvm_x86_64-r0',
+    'hwsku': 'Force10-S6000',
+    'topo_type': 't0',
+    'topo_name': 't0',
+    'testbed': 'vms-kvm-t0',
+    'release': 'master',
+    'branch': 'master',
+    'build_version': 'master.0-dirty-20250101.000000',
+    'is_multi_asic': False,
+    'num_asic': 1,
+    'is_smartswitch': False,
+    'is_chassis': False,
+    'is_chassis_config_absent': True,
+    'is_mgmt_ipv6_only': False,
+    'eth_mgmt_ctrl_available': True,
+    'switch_type': '',
+    'type': 'ToRRouter',
+    'feature_status': {'bgp': 'enabled', 'lldp': 'enabled'},
+    'minigraph_interfaces': [],
+    'minigraph_portchannels': {'PortChannel101': {'members': ['Ethernet112']}},
+    'minigraph_portchannel_interfaces': [],
+    'minigraph_neighbors': {},
+    'switch': {},
+    'macsec_en': False,
+}
+TEST_FUNCTION = re.compile(r'^(    )?def (test_\w+)|^class (Test\w+)', re.MULTILINE)
+
+
+class DirCache(object):
+    """Cache storing every value in a JSON file, like the pytest cache does."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _file(self, key):
+        return os.path.join(self.path, key.replace('/', '_'))
+
+    def get(self, key, default):
+        try:
+            with open(self._file(key)) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return default
+
+    def set(self, key, value):
+        with open(self._file(key), 'w') as f:
+            json.dump(value, f)
+
+    def mkdir(self, name):
+        path = os.path.join(self.path, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+
+class Option(object):
+    def __init__(self):
+        self.mark_conditions_files = []
+        self.ignore_conditional_mark = False
+        self.dynamic_update_skip_reason = False
+        self.ansible_host_pattern = DUT_NAME
+        self.issue_cache_ttl = conditional_mark.DEFAULT_ISSUE_CACHE_TTL
+        self.issue_cache_file = None
+
+
+class Config(object):
+    def __init__(self, cache):
+        self.option = Option()
+        self.cache = cache
+        self.rootpath = os.getcwd()
+
+    def getoption(self, name, default=None):
+        return default
+
+
+class Session(object):
+    def __init__(self, cache):
+        self.config = Config(cache)
+
+
+class Item(object):
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+        self.marks = []
+        self.user_properties = []
+
+    def get_closest_marker(self, name):
+        for mark in self.marks:
+            if mark.name == name:
+                return mark
+        return None
+
+    def add_marker(self, mark):
+        self.marks.append(mark)
+
+
+def find_test_cases():
+    nodeids = []
+    for path in sorted(glob.glob('**/test_*.py', recursive=True)):
+        with open(path) as f:
+            content = f.read()
+        test_class = None
+        for indent, function, class_name in TEST_FUNCTION.findall(content):
+            if class_name:
+                test_class = class_name
+            elif indent and test_class:
+                nodeids.append('{}::{}::{}'.format(path, test_class, function))
+            elif not indent:
+                test_class = None
+                nodeids.append('{}::{}'.format(path, function))
+    return nodeids
+
+
+def find_issues():
+    issues = set()
+    for path in glob.glob(conditional_mark.DEFAULT_CONDITIONS_FILE):
+        with open(path) as f:
+            issues.update(re.findall(r'https?://[^\s)\'"]+', f.read()))
+    return issues
+
+
+def run(nodeids, iterations, dump):
+    issue_states = {issue: {'active': index % 2 == 0, 'time': time.time()}
+                    for index, issue in enumerate(sorted(find_issues()))}
+    samples = []
+    for _ in range(iterations):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            cache = DirCache(cache_dir)
+            cache.set('BASIC_FACTS_{}'.format(DUT_NAME), BASIC_FACTS)
+            cache.set('PROXIES', {})
+            with open(os.path.join(cache.mkdir('conditional_mark'), 'issue_status.json'), 'w') as f:
+                json.dump(issue_states, f)
+            session = Session(cache)
+            conditional_mark.pytest_collection(session)
+            items = [Item(nodeid) for nodeid in nodeids]
+            start = time.perf_counter()
+            conditional_mark.pytest_collection_modifyitems(session, session.config, items)
+            samples.append(time.perf_counter() - start)
+        finally:
+            shutil.rmtree(cache_dir)
+
+    marked = sum(1 for item in items if item.marks)
+    print('{} test cases, {} marked: first={:.3f}s min={:.3f}s'.format(
+        len(items), marked, samples[0], min(samples)))
+    if dump:
+        with open(dump, 'w') as f:
+            json.dump({item.nodeid: [[mark.name, mark.kwargs] for mark in item.marks] for item in items}, f,
+                      indent=1, sort_keys=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the conditional mark plugin on the test cases of the tree.')
+    parser.add_argument('--iterations', type=int, default=3, help='Number of collections.')
+    parser.add_argument('--limit', type=int, default=0, help='Maximum number of test cases, all of them if 0.')
+    parser.add_argument('--dump', help='File to write the marks of the test cases to.')
+    args = parser.parse_args()
+
+    test_cases = find_test_cases()
+    if args.limit:
+        test_cases = test_cases[:args.limit]
+    run(test_cases, args.iterations, args.dump)
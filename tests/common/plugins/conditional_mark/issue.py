@@ -1,9 +1,13 @@
 """For checking issue state based on supplied issue URL.
 """
+import concurrent.futures
+import fcntl
+import json
 import logging
-import multiprocessing
 import os
 import re
+import threading
+import time
 from abc import ABCMeta, abstractmethod
 from urllib.parse import urlencode
 
@@ -12,6 +16,19 @@ import six
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of issues checked at the same time
+MAX_CHECK_WORKERS = 16
+
+# HTTP session of each thread checking issues, keeping the connections to the issue websites alive
+_thread_local = threading.local()
+
+
+def _http_session():
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = _thread_local.session = requests.Session()
+    return session
+
 
 class IssueCheckerBase(six.with_metaclass(ABCMeta, object)):
     """Base class for issue checker
@@ -43,14 +60,14 @@ class GitHubIssueChecker(IssueCheckerBase):
         """Check if the GitHub issue is still active.
 
         Attempt to fetch issue details via proxy if configured. If proxy fails, retry with direct GitHub API URL.
-        If unable to retrieve issue state, assume the issue is active (safe default).
 
         Returns:
-            bool: False if the issue is closed else True.
+            bool or None: False if the issue is closed else True. None if unable to retrieve the issue state, the
+                callers then consider the issue as active without keeping its state.
         """
 
         def fetch_issue(url):
-            response = requests.get(url, proxies=self.proxies, timeout=10)
+            response = _http_session().get(url, proxies=self.proxies, timeout=10)
             response.raise_for_status()
             return response.json()
 
@@ -78,8 +95,7 @@ class GitHubIssueChecker(IssueCheckerBase):
                 issue_data = fetch_issue(direct_url)
             except Exception as direct_err:
                 logger.error(f"Access GitHub API directly failed for {direct_url}: {direct_err}")
-                logger.debug(f"Issue {direct_url} is considered active due to API access failure.")
-                return True
+                return None
 
         # Check issue state
         if issue_data.get('state') == 'closed':
@@ -115,35 +131,104 @@ def issue_checker_factory(url, proxies):
     return None
 
 
-def check_issues(issues, proxies=None):
+def check_issues(issues, proxies=None, max_workers=MAX_CHECK_WORKERS):
     """Check state of the specified issues.
 
-    Because issue state checking may involve sending HTTP request. This function uses parallel run to speed up
-    issue status checking.
+    Because issue state checking may involve sending HTTP request. This function uses a pool of threads to speed up
+    issue status checking, each thread keeping its connections to the issue websites alive.
 
     Args:
         issues (list of str): List of issue URLs.
+        max_workers (int): Maximum number of issues checked at the same time.
 
     Returns:
-        dict: Issue state check result. Key is issue URL, value is either True or False based on issue state.
+        dict: Issue state check result. Key is issue URL, value is either True or False based on issue state. The
+            issues which could not be checked are not in the dict.
     """
     checkers = [c for c in [issue_checker_factory(issue, proxies) for issue in issues] if c is not None]
     if not checkers:
         logger.error('No checker created for issues: {}'.format(issues))
         return {}
 
-    check_results = multiprocessing.Manager().dict()
-    check_procs = []
+    check_results = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(checkers))) as executor:
+        futures = {executor.submit(checker.is_active): checker for checker in checkers}
+        for future in concurrent.futures.as_completed(futures):
+            checker = futures[future]
+            try:
+                active = future.result()
+            except Exception as e:
+                logger.error('Failed to check issue {}, exception: {}'.format(checker.url, repr(e)))
+                continue
+            if active is None:
+                logger.warning('Unable to get the state of issue {}'.format(checker.url))
+                continue
+            check_results[checker.url] = active
+
+    return check_results
+
+
+class IssueStatusCache(object):
+    """Issue states cached in a file, shared by the pytest sessions and the xdist workers.
+
+    The state of an issue is used until it is older than the TTL. The file is locked while the issues are checked,
+    so the xdist workers collecting the test cases at the same time check the issues only once. Only the states
+    returned by check_issues() are saved: an issue which could not be checked is checked again by the next session,
+    and its last known state, even if expired, is used meanwhile.
+    """
+
+    def __init__(self, path, ttl):
+        """Initialize the cache.
+
+        Args:
+            path (str): Path of the cache file.
+            ttl (int): Number of seconds for which the state of an issue is used.
+        """
+        self.path = path
+        self.ttl = ttl
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                states = json.load(f)
+        except (IOError, ValueError):
+            return {}
+        return states if isinstance(states, dict) else {}
 
-    def _check_issue(checker, results):
-        results[checker.url] = checker.is_active()
+    def _save(self, states):
+        tmp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+        with open(tmp_path, 'w') as f:
+            json.dump(states, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
 
-    for checker in checkers:
-        check_procs.append(multiprocessing.Process(target=_check_issue, args=(checker, check_results,)))
+    def _is_known(self, state):
+        return isinstance(state, dict) and isinstance(state.get('active'), bool)
 
-    for proc in check_procs:
-        proc.start()
-    for proc in check_procs:
-        proc.join(timeout=60)
+    def _is_fresh(self, state, now):
+        return self._is_known(state) and now - state.get('time', 0) < self.ttl
 
-    return dict(check_results)
+    def get_states(self, issues, proxies=None):
+        """Get the states of issues, checking the issues which are not in the cache or expired.
+
+        Args:
+            issues (list of str): List of issue URLs.
+
+        Returns:
+            dict: Key is issue URL, value is either True or False based on issue state. The expired state of an
+                issue which could not be checked again is used, the issues which were never checked successfully
+                are not in the dict.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            states = self._load()
+            now = time.time()
+            expired = sorted(set(issue for issue in issues if not self._is_fresh(states.get(issue), now)))
+            if expired:
+                logger.info('Checking {} issues out of {}'.format(len(expired), len(set(issues))))
+                for issue, active in check_issues(expired, proxies=proxies).items():
+                    if isinstance(active, bool):
+                        states[issue] = {'active': active, 'time': now}
+                self._save(states)
+
+        return {issue: states[issue]['active'] for issue in issues if self._is_known(states.get(issue))}
@@ -1,7 +1,8 @@
 import logging
 import unittest
 from unittest.mock import MagicMock
-from tests.common.plugins.conditional_mark import find_all_matches, load_conditions
+from tests.common.plugins.conditional_mark import ConditionsIndex, evaluate_condition, find_all_matches, \
+    load_conditions
 
 logger = logging.getLogger(__name__)
 
@@ -293,5 +294,56 @@ class TestFindAllMatches(unittest.TestCase):
         self.assertIn('xfail', marks_found)
 
 
+class TestConditionsIndex(unittest.TestCase):
+    """Test cases for the index of the conditions list."""
+
+    CONDITIONS = [
+        {"test_a.py": {"skip": {"reason": "module"}}},
+        {"test_a.py::test_.*_ipv6": {"regex": True, "skip": {"reason": "regex"}}},
+        {"test_a.py::test_1": {"xfail": {"reason": "case"}}},
+        {"test_a.py::test_1": {"regex": False, "skip": {"reason": "not a regex"}}},
+        {"test_a": {"skip": {"reason": "prefix"}}},
+        {"test_b.py::test_2": {"use_longest": True, "skip": {"reason": "longest"}}},
+        {"test_b.py": {"skip": {"reason": "module after longest"}}},
+        {"": {"skip": {"reason": "all"}}},
+    ]
+
+    def find(self, nodeid):
+        reasons = []
+        for match in ConditionsIndex(self.CONDITIONS).find(nodeid):
+            marks = list(match.values())[0]
+            reasons.extend(mark["reason"] for name, mark in marks.items() if name not in ["regex", "use_longest"])
+        return reasons
+
+    # Prefixes and regexes are matched in the order of the conditions list
+    def test_matches_in_conditions_order(self):
+        self.assertEqual(self.find("test_a.py::test_1_ipv6"), ["module", "regex", "case", "prefix", "all"])
+        self.assertEqual(self.find("test_a.py::test_2"), ["module", "prefix", "all"])
+        self.assertEqual(self.find("test_c.py::test_1"), ["all"])
+
+    # The matches before an entry with 'use_longest: True' are dropped, the matches after it are kept
+    def test_use_longest_drops_previous_matches(self):
+        self.assertEqual(self.find("test_b.py::test_2"), ["longest", "module after longest", "all"])
+        self.assertEqual(self.find("test_b.py::test_3"), ["module after longest", "all"])
+
+    # The entries matching any of the test cases, each once and in the order of the conditions list
+    def test_find_all(self):
+        found = ConditionsIndex(self.CONDITIONS).find_all(["test_b.py::test_2", "test_a.py::test_2", "test_c.py"])
+        self.assertEqual(found, [self.CONDITIONS[index] for index in [0, 4, 5, 6, 7]])
+        self.assertEqual(ConditionsIndex(self.CONDITIONS).find_all([]), [])
+
+    def test_invalid_regex_value(self):
+        with self.assertRaises(AssertionError):
+            ConditionsIndex([{"test_a.py": {"regex": "yes"}}])
+
+    # The compiled condition is evaluated like eval() evaluates the condition string
+    def test_evaluate_condition_with_spaces(self):
+        session_mock = MagicMock()
+        self.assertTrue(evaluate_condition(False, {}, "  asic_type in ['vs']\t", CUSTOM_BASIC_FACTS, session_mock))
+        self.assertFalse(evaluate_condition(False, {}, "topo_type == 't1'", CUSTOM_BASIC_FACTS, session_mock))
+        with self.assertRaises(RuntimeError):
+            evaluate_condition(False, {}, "topo_type ==", CUSTOM_BASIC_FACTS, session_mock)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,187 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests.common.plugins.conditional_mark import ConditionsIndex, find_issues, prefetch_issue_status, \
+    update_issue_status
+from tests.common.plugins.conditional_mark.issue import check_issues, GitHubIssueChecker, IssueStatusCache
+
+ISSUE_1 = "https://github.com/sonic-net/sonic-mgmt/issues/1"
+ISSUE_2 = "https://github.com/sonic-net/sonic-mgmt/issues/2"
+ISSUE_3 = "https://github.com/sonic-net/sonic-buildimage/issues/3"
+CHECK_ISSUES = "tests.common.plugins.conditional_mark.issue.check_issues"
+PREFETCH_CHECK_ISSUES = "tests.common.plugins.conditional_mark.check_issues"
+
+
+class TestFindIssues(unittest.TestCase):
+    """Test cases for finding the issue URLs in the conditions."""
+
+    def test_find_issues(self):
+        conditions = [
+            {"test_a.py": {"skip": {"conditions": ISSUE_1 + " and asic_type in ['vs']"}}},
+            {"test_b.py": {"regex": False, "xfail": {"conditions": [ISSUE_2, "(" + ISSUE_1 + ")"]}}},
+            {"test_c.py": {"skip": {"reason": "no conditions"}, "xfail": None}},
+            {"test_d.py": {"use_longest": True, "skip": {"conditions": ["topo_type == 't0'", ISSUE_3]}}},
+        ]
+
+        self.assertEqual(find_issues(conditions), [ISSUE_3, ISSUE_1, ISSUE_2])
+
+
+class TestCheckIssues(unittest.TestCase):
+    """Test cases for checking the issues with a pool of threads."""
+
+    def test_check_issues(self):
+        def is_active(checker):
+            if checker.url == ISSUE_3:
+                raise RuntimeError("unexpected error")
+            return checker.url == ISSUE_1
+
+        with patch.object(GitHubIssueChecker, "is_active", autospec=True, side_effect=is_active):
+            results = check_issues([ISSUE_1, ISSUE_2, ISSUE_3, "https://unknown.com/issues/4"], max_workers=2)
+
+        self.assertEqual(results, {ISSUE_1: True, ISSUE_2: False})
+
+    # The issues whose state could not be retrieved are not in the results
+    def test_check_issues_unable_to_get_state(self):
+        with patch("tests.common.plugins.conditional_mark.issue._http_session") as session_mock:
+            session_mock.return_value.get.side_effect = IOError("connection refused")
+            self.assertIsNone(GitHubIssueChecker(ISSUE_1, None).is_active())
+            results = check_issues([ISSUE_1, ISSUE_2])
+
+        self.assertEqual(results, {})
+
+
+class TestIssueStatusCache(unittest.TestCase):
+    """Test cases for the issue states cached on disk."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.cache_dir, "conditional_mark", "issue_status.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    # Only the issues which are not in the cache are checked, and the cache is shared by the cache objects
+    def test_check_missing_issues_only(self):
+        with patch(CHECK_ISSUES, return_value={ISSUE_1: True, ISSUE_2: False}) as check_mock:
+            states = IssueStatusCache(self.cache_file, 3600).get_states([ISSUE_1, ISSUE_2])
+        self.assertEqual(states, {ISSUE_1: True, ISSUE_2: False})
+        check_mock.assert_called_once_with([ISSUE_1, ISSUE_2], proxies=None)
+
+        with patch(CHECK_ISSUES, return_value={ISSUE_3: True}) as check_mock:
+            states = IssueStatusCache(self.cache_file, 3600).get_states([ISSUE_2, ISSUE_3])
+        self.assertEqual(states, {ISSUE_2: False, ISSUE_3: True})
+        check_mock.assert_called_once_with([ISSUE_3], proxies=None)
+
+        with patch(CHECK_ISSUES) as check_mock:
+            states = IssueStatusCache(self.cache_file, 3600).get_states([ISSUE_1, ISSUE_2, ISSUE_3])
+        self.assertEqual(states, {ISSUE_1: True, ISSUE_2: False, ISSUE_3: True})
+        check_mock.assert_not_called()
+
+    # The issues whose state is older than the TTL are checked again
+    def test_check_expired_issues(self):
+        os.makedirs(os.path.dirname(self.cache_file))
+        with open(self.cache_file, "w") as f:
+            json.dump({ISSUE_1: {"active": True, "time": time.time() - 7200},
+                       ISSUE_2: {"active": True, "time": time.time() - 60}}, f)
+
+        with patch(CHECK_ISSUES, return_value={ISSUE_1: False}) as check_mock:
+            states = IssueStatusCache(self.cache_file, 3600).get_states([ISSUE_1, ISSUE_2])
+
+        self.assertEqual(states, {ISSUE_1: False, ISSUE_2: True})
+        check_mock.assert_called_once_with([ISSUE_1], proxies=None)
+
+    # The issues which could not be checked are not cached
+    def test_failed_check_not_cached(self):
+        with patch(CHECK_ISSUES, return_value={}):
+            states = IssueStatusCache(self.cache_file, 3600).get_states([ISSUE_1])
+        self.assertEqual(states, {})
+
+        with patch(CHECK_ISSUES, return_value={ISSUE_1: True}) as check_mock:
+            states = IssueStatusCache(self.cache_file, 3600).get_states([ISSUE_1])
+        self.assertEqual(states, {ISSUE_1: True})
+        check_mock.assert_called_once_with([ISSUE_1], proxies=None)
+
+    # The expired state of an issue which could not be checked again is used, and the issue is checked again later
+    def test_failed_check_keeps_expired_state(self):
+        os.makedirs(os.path.dirname(self.cache_file))
+        checked = time.time() - 7200
+        with open(self.cache_file, "w") as f:
+            json.dump({ISSUE_1: {"active": False, "time": checked}}, f)
+
+        with patch(CHECK_ISSUES, return_value={}):
+            states = IssueStatusCache(self.cache_file, 3600).get_states([ISSUE_1, ISSUE_2])
+        self.assertEqual(states, {ISSUE_1: False})
+        with open(self.cache_file) as f:
+            self.assertEqual(json.load(f), {ISSUE_1: {"active": False, "time": checked}})
+
+        with patch(CHECK_ISSUES, return_value={ISSUE_1: True, ISSUE_2: True}) as check_mock:
+            states = IssueStatusCache(self.cache_file, 3600).get_states([ISSUE_1, ISSUE_2])
+        self.assertEqual(states, {ISSUE_1: True, ISSUE_2: True})
+        check_mock.assert_called_once_with([ISSUE_1, ISSUE_2], proxies=None)
+
+    # The issues whose state could not be retrieved are not saved in the cache file
+    def test_unknown_state_not_cached(self):
+        def is_active(checker):
+            return None if checker.url == ISSUE_2 else True
+
+        with patch.object(GitHubIssueChecker, "is_active", autospec=True, side_effect=is_active):
+            states = IssueStatusCache(self.cache_file, 3600).get_states([ISSUE_1, ISSUE_2])
+        self.assertEqual(states, {ISSUE_1: True})
+        with open(self.cache_file) as f:
+            self.assertEqual(list(json.load(f)), [ISSUE_1])
+
+    def test_invalid_cache_file(self):
+        os.makedirs(os.path.dirname(self.cache_file))
+        with open(self.cache_file, "w") as f:
+            f.write("not json")
+
+        with patch(CHECK_ISSUES, return_value={ISSUE_1: True}):
+            states = IssueStatusCache(self.cache_file, 3600).get_states([ISSUE_1])
+        self.assertEqual(states, {ISSUE_1: True})
+
+
+class TestPrefetchIssueStatus(unittest.TestCase):
+    """Test cases for getting the states of the issues before evaluating the conditions."""
+
+    CONDITIONS = [
+        {"test_a.py": {"skip": {"conditions": ISSUE_1}}},
+        {"test_b.py": {"xfail": {"conditions": [ISSUE_2, "asic_type in ['vs']"]}}},
+        {"test_c.py": {"skip": {"conditions": ISSUE_3}}},
+    ]
+
+    def setUp(self):
+        self.session = MagicMock()
+        self.session.config.option.issue_cache_ttl = 0
+        self.session.config.cache.get.return_value = {}
+
+    # Only the issues of the conditions matching the collected test cases are checked
+    def test_prefetch_issues_of_matching_conditions(self):
+        conditions = ConditionsIndex(self.CONDITIONS).find_all(["test_a.py::test_1", "test_c.py::test_2"])
+        with patch(PREFETCH_CHECK_ISSUES, return_value={ISSUE_1: False, ISSUE_3: True}) as check_mock:
+            prefetch_issue_status(self.session, conditions)
+        check_mock.assert_called_once_with([ISSUE_3, ISSUE_1], proxies={})
+
+        with patch(PREFETCH_CHECK_ISSUES) as check_mock:
+            self.assertEqual(update_issue_status(ISSUE_1, self.session), "False")
+            self.assertEqual(update_issue_status(ISSUE_3, self.session), "True")
+        check_mock.assert_not_called()
+
+    # The issues which could not be checked are considered as active, without checking them again
+    def test_prefetch_unable_to_get_state(self):
+        with patch(PREFETCH_CHECK_ISSUES, return_value={ISSUE_1: False}):
+            prefetch_issue_status(self.session, self.CONDITIONS[:2])
+
+        with patch(PREFETCH_CHECK_ISSUES, return_value={}) as check_mock:
+            self.assertEqual(update_issue_status(ISSUE_1 + " and " + ISSUE_2, self.session), "False and True")
+            self.assertEqual(update_issue_status(ISSUE_3, self.session), "True")
+            self.assertEqual(update_issue_status(ISSUE_3, self.session), "True")
+        check_mock.assert_called_once_with([ISSUE_3], proxies={})
+
+
+if __name__ == "__main__":
+    unittest.main()
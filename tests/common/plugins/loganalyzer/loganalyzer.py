@@ -4,12 +4,14 @@ import os
 import re
 import time
 import pprint
+import shlex
 import shutil
 
 from . import system_msg_handler
 from .bug_handler_helper import get_bughandler_instance, BugHandler
 
 from .system_msg_handler import AnsibleLogAnalyzer as ansible_loganalyzer
+from .system_msg_handler import RegexSet
 from os.path import join, split
 
 ANSIBLE_LOGANALYZER_MODULE = system_msg_handler.__file__.replace(r".pyc", ".py")
@@ -174,6 +176,7 @@ class LogAnalyzer:
         self._markers = []
         self.fail = True
         self.store_la_logs = False
+        self.analyze_on_dut = True
 
         self.additional_files = list(additional_files.keys())
         self.additional_start_str = list(additional_files.values())
@@ -182,6 +185,7 @@ class LogAnalyzer:
             # override the fail and store_la_logs if they are set in the request config options
             self.fail = not (self.request.config.getoption("--ignore_la_failure"))
             self.store_la_logs = self.request.config.getoption("--store_la_logs")
+            self.analyze_on_dut = not self.request.config.getoption("--la_download_logs", default=False)
 
         self._la_logs_dir = "/tmp/loganalyzer/{}".format(self.ansible_host.hostname)
         self.bughandler = bughandler
@@ -428,10 +432,85 @@ class LogAnalyzer:
         self.ansible_host.command(cmd)
         return start_marker
 
+    def _analyze_on_dut(self, marker, extracted_files, maximum_log_length=None):
+        """
+        @summary: Analyze the extracted files by the loganalyzer script on the DUT based on defined regular
+                  expressions. Only the matching and expected lines are transferred back.
+
+        @param marker: Marker obtained from "init" method.
+        @param extracted_files: Map of extracted file on the DUT to the name used in the analysis result.
+        @param maximum_log_length: The long message (length > maximum_log_length) will be skipped.
+        @return: Tuple of map <file_name, [matching lines, expected lines]> and map <"match"|"ignore"|"expect",
+                 map <regex, number of hit lines>>, None if the analysis failed on the DUT.
+        """
+        regex_file = os.path.join(self.dut_run_dir, "loganalyzer_regex.json")
+        self.ansible_host.copy(content=json.dumps({"match": self.match_regex,
+                                                   "ignore": self.ignore_regex,
+                                                   "expect": self.expect_regex}),
+                               dest=regex_file)
+        cmd = "python {run_dir}/loganalyzer.py --action filter --run_id {marker} --logs {logs} " \
+              "--regex_file {regex_file}".format(run_dir=self.dut_run_dir, marker=marker,
+                                                 logs=",".join(extracted_files), regex_file=regex_file)
+        if self.ansible_loganalyzer.start_marker:
+            cmd += " --start_marker {}".format(shlex.quote(self.ansible_loganalyzer.start_marker))
+        if maximum_log_length is not None:
+            cmd += " --maximum_log_length {}".format(maximum_log_length)
+
+        logging.debug("Analyze files {} on DUT".format(list(extracted_files)))
+        result = self.ansible_host.command(cmd, module_ignore_errors=True)
+        if result["rc"] != 0:
+            logging.warning("Failed to analyze logs on DUT, fall back to analyzing downloaded logs. "
+                            "rc: {}, stdout: {}, stderr: {}".format(result["rc"], result["stdout"], result["stderr"]))
+            return None
+        try:
+            dut_result = json.loads(result["stdout"])
+        except ValueError:
+            logging.warning("Failed to parse log analysis result from DUT, fall back to analyzing downloaded logs. "
+                            "stdout: {}".format(result["stdout"]))
+            return None
+        return ({extracted_files[dut_file]: lines for dut_file, lines in dut_result["result"].items()},
+                dut_result["hit_counts"])
+
+    def _download_and_analyze(self, extracted_files, maximum_log_length=None):
+        """
+        @summary: Download the extracted files, analyze them based on defined regular expressions.
+
+        @param extracted_files: Map of extracted file on the DUT to the temporal file it is downloaded to.
+        @param maximum_log_length: The long message (length > maximum_log_length) will be skipped.
+        @return: Tuple of map <file_name, [matching lines, expected lines]> and map <"match"|"ignore"|"expect",
+                 map <regex, number of hit lines>>
+        """
+        # Download extracted logs from the DUT to the temporal folder defined in SYSLOG_TMP_FOLDER
+        for src, dest in extracted_files.items():
+            self.save_extracted_file(dest=dest, src=src)
+        file_list = list(extracted_files.values())
+
+        match_messages_regex = RegexSet(self.match_regex) if len(self.match_regex) else None
+        ignore_messages_regex = RegexSet(self.ignore_regex) if len(self.ignore_regex) else None
+        expect_messages_regex = RegexSet(self.expect_regex) if len(self.expect_regex) else None
+
+        logging.debug("Analyze files {}".format(file_list))
+        logging.debug('    match_regex="{}"'.format(match_messages_regex.pattern if match_messages_regex else ''))
+        logging.debug('    ignore_regex="{}"'.format(ignore_messages_regex.pattern if ignore_messages_regex else ''))
+        logging.debug('    expect_regex="{}"'.format(expect_messages_regex.pattern if expect_messages_regex else ''))
+        analyzer_parse_result = self.ansible_loganalyzer.analyze_file_list(
+            file_list, match_messages_regex, ignore_messages_regex, expect_messages_regex,
+            maximum_log_length=maximum_log_length)
+        # Print file content and remove the file
+        for folder in file_list:
+            with open(folder) as fo:
+                logging.debug("{} file content:\n\n{}".format(folder, fo.read()))
+            os.remove(folder)
+        hit_counts = {"match": match_messages_regex.hit_counts() if match_messages_regex else {},
+                      "ignore": ignore_messages_regex.hit_counts() if ignore_messages_regex else {},
+                      "expect": expect_messages_regex.hit_counts() if expect_messages_regex else {}}
+        return analyzer_parse_result, hit_counts
+
     def analyze(self, marker, fail=None, maximum_log_length=None, store_la_logs=None):
         """
         @summary: Extract syslog logs based on the start/stop markers and compose one file.
-                  Download composed file, analyze file based on defined regular expressions.
+                  Analyze the composed file on the DUT based on defined regular expressions. If it fails or
+                  "--la_download_logs" is specified, download composed file and analyze it locally.
 
         @param marker: Marker obtained from "init" method.
         @param fail: Flag to enable/disable raising exception when loganalyzer find error messages.
@@ -477,36 +556,19 @@ class LogAnalyzer:
                 self.ansible_host.extract_log(directory=file_dir, file_prefix=file_name, start_string=start_str,
                                               target_filename=extracted_file_name)
 
-        # Download extracted logs from the DUT to the temporal folder defined in SYSLOG_TMP_FOLDER
-        self.save_extracted_log(dest=tmp_folder)
-        file_list = [tmp_folder]
-
+        # Map extracted files on the DUT to the temporal files they are downloaded to
+        extracted_files = {self.extracted_syslog: tmp_folder}
         for path in self.additional_files:
             file_dir, file_name = split(path)
             extracted_file_name = os.path.join(self.dut_run_dir, file_name)
-            tmp_folder = ".".join((extracted_file_name, timestamp))
-            self.save_extracted_file(dest=tmp_folder, src=extracted_file_name)
-            file_list.append(tmp_folder)
+            extracted_files[extracted_file_name] = ".".join((extracted_file_name, timestamp))
 
-        match_messages_regex = re.compile('|'.join(self.match_regex)) if len(self.match_regex) else None
-        ignore_messages_regex = re.compile('|'.join(self.ignore_regex)) if len(self.ignore_regex) else None
-        expect_messages_regex = re.compile('|'.join(self.expect_regex)) if len(self.expect_regex) else None
-
-        logging.debug("Analyze files {}".format(file_list))
-        logging.debug('    match_regex="{}"'.format(match_messages_regex.pattern if match_messages_regex else ''))
-        logging.debug('    ignore_regex="{}"'.format(ignore_messages_regex.pattern if ignore_messages_regex else ''))
-        logging.debug('    expect_regex="{}"'.format(expect_messages_regex.pattern if expect_messages_regex else ''))
-        analyzer_parse_result = self.ansible_loganalyzer.analyze_file_list(
-            file_list, match_messages_regex, ignore_messages_regex, expect_messages_regex,
-            maximum_log_length=maximum_log_length)
-        # Print file content and remove the file
-        for folder in file_list:
-            with open(folder) as fo:
-                logging.debug("{} file content:\n\n{}".format(folder, fo.read()))
-            os.remove(folder)
-
-        expected_lines_total = []
-        unused_regex_messages = []
+        analysis = None
+        if self.analyze_on_dut:
+            analysis = self._analyze_on_dut(marker, extracted_files, maximum_log_length)
+        if analysis is None:
+            analysis = self._download_and_analyze(extracted_files, maximum_log_length)
+        analyzer_parse_result, hit_counts = analysis
 
         for key, value in list(analyzer_parse_result.items()):
             matching_lines, expecting_lines = value
@@ -516,18 +578,16 @@ class LogAnalyzer:
                                                     "expected_match": len(expecting_lines)}
             analyzer_summary["match_messages"][key] = matching_lines
             analyzer_summary["expect_messages"][key] = expecting_lines
-            expected_lines_total.extend(expecting_lines)
 
-        # Find unused regex matches
-        for regex in self.expect_regex:
-            for line in expected_lines_total:
-                if re.search(regex, line):
-                    break
-            else:
-                unused_regex_messages.append(regex)
+        # Expected regexes which were not hit by any expected line
+        unused_regex_messages = [regex for regex in self.expect_regex if not hit_counts["expect"].get(regex)]
         analyzer_summary["total"]["expected_missing_match"] = len(unused_regex_messages)
         analyzer_summary["unused_expected_regexp"] = unused_regex_messages
         logging.debug("Analyzer summary: {}".format(pprint.pformat(analyzer_summary)))
+        logging.debug("Ignore regexes not hit by any matched line: {}".format(
+            [regex for regex, hits in hit_counts["ignore"].items() if hits == 0]))
+        # Number of lines hit by each match/ignore/expect regex, e.g. for pruning ignore regexes never hit
+        analyzer_summary["regex_hit_counts"] = hit_counts
         try:
             shutil.rmtree(self._la_logs_dir)
         except FileNotFoundError:
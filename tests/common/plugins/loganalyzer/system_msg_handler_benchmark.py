@@ -0,0 +1,89 @@
+"""Benchmark of AnsibleLogAnalyzer.analyze_file() on a synthetic syslog.
+
+Compare peak RSS and wall time of the streaming mode (file read backwards block by block) with the legacy mode
+(whole file loaded by readlines()).
+
+Usage:
+    python system_msg_handler_benchmark.py [--size-mb 1024] [--range-mb 16] [--log /tmp/syslog.benchmark]
+
+Each mode runs in a separate process, so the peak RSS of one mode is not affected by the other one.
+"""
+import argparse
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import time
+
+from system_msg_handler import AnsibleLogAnalyzer
+
+RUN_ID = "benchmark"
+LINE_TEMPLATES = [
+    "Jan  1 00:00:00.{:06d} dut INFO swss#orchagent: :- doTask: Port Ethernet{} oper state set from up to up\n",
+    "Jan  1 00:00:00.{:06d} dut NOTICE syncd#syncd: :- processEvent: event {} processed\n",
+    "Jan  1 00:00:00.{:06d} dut ERR swss#orchagent: :- addNeighbor: Failed to create neighbor {}\n",
+    "Jan  1 00:00:00.{:06d} dut WARNING bgp#bgpd[42]: [EC 100663299] neighbor {} is down\n",
+]
+
+
+def _write_lines(f, size):
+    written = 0
+    index = 0
+    while written < size:
+        line = LINE_TEMPLATES[index % len(LINE_TEMPLATES)].format(index % 1000000, index)
+        f.write(line)
+        written += len(line)
+        index += 1
+
+
+def generate_syslog(path, size_mb, range_mb):
+    """Generate a syslog with the start/end markers around the last range_mb megabytes."""
+    with open(path, "w") as f:
+        _write_lines(f, (size_mb - range_mb) * 1024 * 1024)
+        f.write("Jan  1 00:00:01 dut INFO start-LogAnalyzer-{}\n".format(RUN_ID))
+        _write_lines(f, range_mb * 1024 * 1024)
+        f.write("Jan  1 00:00:02 dut INFO end-LogAnalyzer-{}\n".format(RUN_ID))
+
+
+def run_mode(path, mode):
+    analyzer = AnsibleLogAnalyzer(RUN_ID, False)
+    start = time.time()
+    matching_lines, expected_lines = analyzer.analyze_file(
+        path, re.compile(r".*ERR.*"), re.compile(r".*Failed to create neighbor \d*7\n"),
+        re.compile(r".*neighbor \d*3 is down.*"), streaming=(mode == "streaming"))
+    print(json.dumps({
+        "mode": mode,
+        "seconds": time.time() - start,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        "matches": len(matching_lines),
+        "expected": len(expected_lines),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AnsibleLogAnalyzer.analyze_file().")
+    parser.add_argument("--size-mb", type=int, default=1024, help="Size of the synthetic syslog in MB.")
+    parser.add_argument("--range-mb", type=int, default=16, help="Size of the log between the markers in MB.")
+    parser.add_argument("--log", default="/tmp/syslog.benchmark", help="Path of the synthetic syslog.")
+    parser.add_argument("--mode", choices=["streaming", "readlines"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.log, args.mode)
+        return
+
+    generate_syslog(args.log, args.size_mb, args.range_mb)
+    try:
+        for mode in ("streaming", "readlines"):
+            output = subprocess.check_output([sys.executable, __file__, "--log", args.log, "--mode", mode])
+            result = json.loads(output)
+            print("{mode:<10} time={seconds:.2f}s peak_rss={peak_rss_mb:.1f}MB matches={matches} "
+                  "expected={expected}".format(**result))
+    finally:
+        os.remove(args.log)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,11 @@ from typing import Any, Dict, List, Optional, Set, Tuple, Union
 import pytest
 
 from tests.common.plugins.proc_mem_cpu_monitor.constants import MEM_LEAK_EVENT
+from tests.common.plugins.proc_mem_cpu_monitor.resident_sampler import (
+    RESIDENT_FETCH_INTERVAL,
+    ResidentSampler,
+    ResidentTick,
+)
 from tests.common.plugins.proc_mem_cpu_monitor.tcmalloc_parser import parse_tcmalloc_stats
 from tests.common.plugins.proc_mem_cpu_monitor.top_parser import (
     SYSTEM_CPU_IDLE_PROCESS,
@@ -309,6 +314,8 @@ class ProcMemCpuMonitor(object):
         self._tcmalloc_raw_log_path: Optional[str] = None
         self._output_basename_style: str = "full"
         self._host_top_num_cores: Optional[int] = None
+        self._resident_samplers: List[ResidentSampler] = []
+        self._resident_current: Dict[Tuple[str, str, str], float] = {}
 
     def _next_seq(self) -> int:
         self._seq += 1
@@ -385,10 +392,11 @@ class ProcMemCpuMonitor(object):
 
     def _probe_host_num_cores_once(self) -> None:
         """Set ``_host_top_num_cores`` from ``/proc/cpuinfo`` on the first DUT (per ``_targets`` order)."""
-        if self._host_top_num_cores is not None or not self._targets:
+        duthosts = [t[0] for t in self._targets] + [r.duthost for r in self._resident_samplers]
+        if self._host_top_num_cores is not None or not duthosts:
             return
         seen: Set[str] = set()
-        for duthost, _scope, _cmd, _kind in self._targets:
+        for duthost in duthosts:
             hn = getattr(duthost, "hostname", None) or str(duthost)
             if hn in seen:
                 continue
@@ -413,6 +421,96 @@ class ProcMemCpuMonitor(object):
                     self._host_top_num_cores = n
                     return
 
+    def _append_free_sample(
+        self, hostname: str, scope: str, data: Dict[str, float], now: datetime, mono: float,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        with self._lock:
+            rec = {
+                "kind": "sample",
+                "dut": hostname,
+                "scope": scope,
+                "process": "free_used",
+                "cpu_pct": None,
+                "mem_pct": data["used_pct"],
+                "mem_mib_used": data["used_mib"],
+                "mem_total_mib": data.get("total_mib"),
+                "mem_res_mib": round(data["used_mib"], 2),
+                "mem_unit": "%",
+                "probe_transport": "free",
+                "t_wall": now,
+                "t_mono": mono,
+                "seq": self._next_seq(),
+            }
+            if extra:
+                rec.update(extra)
+            self._samples.append(rec)
+            key = (hostname, scope, "free_used")
+            if key not in self._baseline_mem:
+                self._baseline_mem[key] = data["used_pct"]
+
+    def _append_cpu_summary_sample(
+        self, hostname: str, scope: str, cpu_summary: Dict[str, float], now: datetime, mono: float,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        with self._lock:
+            rec = {
+                "kind": "sample",
+                "dut": hostname,
+                "scope": scope,
+                "process": SYSTEM_CPU_IDLE_PROCESS,
+                "cpu_pct": cpu_summary["idle_pct"],
+                "mem_pct": None,
+                "mem_res_mib": None,
+                "mem_unit": "%",
+                "probe_transport": "top_summary",
+                "system_cpu_idle_pct": cpu_summary["idle_pct"],
+                "system_cpu_busy_pct": cpu_summary.get("busy_pct"),
+                "system_cpu_us_pct": cpu_summary["us_pct"],
+                "system_cpu_sy_pct": cpu_summary["sy_pct"],
+                "t_wall": now,
+                "t_mono": mono,
+                "seq": self._next_seq(),
+            }
+            if extra:
+                rec.update(extra)
+            self._samples.append(rec)
+
+    def _captured_top_rows(self, kind: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Rows of a ``top_all`` probe that are stored (see ``_host_top_capture_names``); all rows otherwise."""
+        if kind != "top_all":
+            return rows
+        cap = _host_top_capture_names(rows, self._proc_list, self._jumper_top_n)
+        return [r for r in rows if r["process"] in cap]
+
+    def _append_top_samples(
+        self, hostname: str, scope: str, rows: List[Dict[str, Any]], now: datetime, mono: float,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        with self._lock:
+            for row in rows:
+                rec = {
+                    "kind": "sample",
+                    "dut": hostname,
+                    "scope": scope,
+                    "process": row["process"],
+                    "cpu_pct": row["cpu_pct"],
+                    "mem_pct": row["mem_pct"],
+                    "mem_res_mib": row.get("mem_res_mib"),
+                    "mem_unit": "%",
+                    "probe_transport": "top",
+                    "pid": row.get("pid"),
+                    "t_wall": now,
+                    "t_mono": mono,
+                    "seq": self._next_seq(),
+                }
+                if extra:
+                    rec.update(extra)
+                self._samples.append(rec)
+                key = (hostname, scope, row["process"])
+                if key not in self._baseline_mem and self._should_set_mem_baseline(row["process"]):
+                    self._baseline_mem[key] = row["mem_pct"]
+
     def _poll_tick(self) -> None:
         proc_list = self._proc_list
         for duthost, scope, cmd, kind in self._targets:
@@ -423,29 +521,8 @@ class ProcMemCpuMonitor(object):
                 mono = time.monotonic()
                 if kind == "free":
                     data = parse_free_m_used(stdout)
-                    if not data:
-                        continue
-                    with self._lock:
-                        rec = {
-                            "kind": "sample",
-                            "dut": hostname,
-                            "scope": scope,
-                            "process": "free_used",
-                            "cpu_pct": None,
-                            "mem_pct": data["used_pct"],
-                            "mem_mib_used": data["used_mib"],
-                            "mem_total_mib": data.get("total_mib"),
-                            "mem_res_mib": round(data["used_mib"], 2),
-                            "mem_unit": "%",
-                            "probe_transport": "free",
-                            "t_wall": now,
-                            "t_mono": mono,
-                            "seq": self._next_seq(),
-                        }
-                        self._samples.append(rec)
-                        key = (hostname, scope, "free_used")
-                        if key not in self._baseline_mem:
-                            self._baseline_mem[key] = data["used_pct"]
+                    if data:
+                        self._append_free_sample(hostname, scope, data, now, mono)
                     continue
 
                 if kind == "tcmalloc":
@@ -476,53 +553,13 @@ class ProcMemCpuMonitor(object):
                 if kind in ("top", "top_all") and scope == "host":
                     cpu_summary = parse_top_cpu_summary(stdout)
                     if cpu_summary:
-                        with self._lock:
-                            self._samples.append({
-                                "kind": "sample",
-                                "dut": hostname,
-                                "scope": scope,
-                                "process": SYSTEM_CPU_IDLE_PROCESS,
-                                "cpu_pct": cpu_summary["idle_pct"],
-                                "mem_pct": None,
-                                "mem_res_mib": None,
-                                "mem_unit": "%",
-                                "probe_transport": "top_summary",
-                                "system_cpu_idle_pct": cpu_summary["idle_pct"],
-                                "system_cpu_busy_pct": cpu_summary.get("busy_pct"),
-                                "system_cpu_us_pct": cpu_summary["us_pct"],
-                                "system_cpu_sy_pct": cpu_summary["sy_pct"],
-                                "t_wall": now,
-                                "t_mono": mono,
-                                "seq": self._next_seq(),
-                            })
+                        self._append_cpu_summary_sample(hostname, scope, cpu_summary, now, mono)
 
                 if kind == "top_all":
                     rows = parse_top_host_all(stdout)
-                    cap = _host_top_capture_names(rows, proc_list, self._jumper_top_n)
-                    rows = [r for r in rows if r["process"] in cap]
                 else:
                     rows = parse_top(stdout, proc_list)
-                with self._lock:
-                    for row in rows:
-                        rec = {
-                            "kind": "sample",
-                            "dut": hostname,
-                            "scope": scope,
-                            "process": row["process"],
-                            "cpu_pct": row["cpu_pct"],
-                            "mem_pct": row["mem_pct"],
-                            "mem_res_mib": row.get("mem_res_mib"),
-                            "mem_unit": "%",
-                            "probe_transport": "top",
-                            "pid": row.get("pid"),
-                            "t_wall": now,
-                            "t_mono": mono,
-                            "seq": self._next_seq(),
-                        }
-                        self._samples.append(rec)
-                        key = (hostname, scope, row["process"])
-                        if key not in self._baseline_mem and self._should_set_mem_baseline(row["process"]):
-                            self._baseline_mem[key] = row["mem_pct"]
+                self._append_top_samples(hostname, scope, self._captured_top_rows(kind, rows), now, mono)
             except Exception as ex:  # noqa: BLE001  one bad target must not stop the sampler
                 hn = getattr(duthost, "hostname", None) or str(duthost)
                 logger.warning(
@@ -534,6 +571,89 @@ class ProcMemCpuMonitor(object):
                     ex,
                     exc_info=True,
                 )
+        self._fetch_resident()
+
+    def _start_resident_samplers(self, dut_list: List[Any], docker_service: str) -> None:
+        """
+        Start a ``ResidentSampler`` per DUT for its host/docker ``top`` and ``free`` targets, which are then
+        removed from ``_targets``. A DUT whose sampler can't be started keeps its per-tick commands.
+        """
+        for duthost in dut_list:
+            covered = [
+                t for t in self._targets if t[0] is duthost and t[3] in ("top", "top_all", "free")
+            ]
+            if not covered:
+                continue
+            scopes: List[Tuple[str, str, Optional[str]]] = []
+            for _d, scope, _cmd, kind in covered:
+                if scope == "host":
+                    scopes.append((scope, kind, None))
+                elif scope.startswith("docker:"):
+                    asic = duthost.asic_instance(int(scope.rsplit(":", 1)[1]))
+                    scopes.append((scope, kind, asic.get_docker_name(docker_service)))
+            sampler = ResidentSampler(
+                duthost,
+                scopes,
+                include_free=any(kind == "free" for _d, _s, _c, kind in covered),
+                proc_list=self._proc_list,
+                top_n=self._jumper_top_n,
+                interval=self._interval,
+            )
+            try:
+                with self._dut_ssh_lock:
+                    with _suppress_devices_base_debug():
+                        sampler.start()
+            except Exception as ex:  # noqa: BLE001  fall back to the per-tick commands
+                logger.warning(
+                    "mem_cpu_monitor: resident sampler not started on %s, running the commands each tick: %s",
+                    duthost.hostname,
+                    ex,
+                )
+                continue
+            self._resident_samplers.append(sampler)
+            self._targets = [t for t in self._targets if t not in covered]
+
+    def _append_resident_tick(self, sampler: ResidentSampler, tick: ResidentTick) -> Dict[Tuple[str, str, str], float]:
+        """Store the samples of one resident sampler tick; return their mem_pct per (dut, scope, process)."""
+        hostname = sampler.hostname
+        now = datetime.fromtimestamp(tick.t, timezone.utc)
+        mono = time.monotonic() - (time.time() - tick.t)
+        extra = {"sampler": "resident"}
+        current: Dict[Tuple[str, str, str], float] = {}
+        if tick.free:
+            self._append_free_sample(hostname, "host:free", tick.free, now, mono, extra)
+            current[(hostname, "host:free", "free_used")] = tick.free["used_pct"]
+        if tick.cpu_summary:
+            self._append_cpu_summary_sample(hostname, "host", tick.cpu_summary, now, mono, extra)
+        for scope, kind, _container in sampler.scopes:
+            rows = self._captured_top_rows(kind, tick.rows.get(scope, []))
+            self._append_top_samples(hostname, scope, rows, now, mono, extra)
+            for row in rows:
+                current[(hostname, scope, row["process"])] = row["mem_pct"]
+        return current
+
+    def _fetch_resident(self, force: bool = False) -> None:
+        """Fetch the records of the resident samplers, at most every ``RESIDENT_FETCH_INTERVAL`` unless forced."""
+        for sampler in self._resident_samplers:
+            if not force and time.monotonic() - sampler.last_fetch < RESIDENT_FETCH_INTERVAL:
+                continue
+            try:
+                with self._dut_ssh_lock:
+                    with _suppress_devices_base_debug():
+                        ticks = sampler.fetch()
+            except Exception as ex:  # noqa: BLE001  DUT command failures should not kill sampler
+                logger.warning("mem_cpu_monitor: resident sampler fetch failed on %s: %s", sampler.hostname, ex)
+                continue
+            current: Dict[Tuple[str, str, str], float] = {}
+            for tick in ticks:
+                current = self._append_resident_tick(sampler, tick)
+            if ticks:
+                with self._lock:
+                    # Memory of the last tick, for the MEM_LEAK_EVENT check
+                    self._resident_current = {
+                        k: v for k, v in self._resident_current.items() if k[0] != sampler.hostname
+                    }
+                    self._resident_current.update(current)
 
     def _loop(self) -> None:
         try:
@@ -542,7 +662,8 @@ class ProcMemCpuMonitor(object):
                     if not self._running:
                         break
                 self._poll_tick()
-                self._stop_event.wait(self._interval)
+                # Only the resident samplers left: wake up to fetch their records
+                self._stop_event.wait(self._interval if self._targets else RESIDENT_FETCH_INTERVAL)
         except Exception as ex:  # noqa: BLE001  surface sampler failures on stop(), not BaseException
             logger.exception("mem_cpu_monitor sampler thread died")
             self._thread_exc = ex
@@ -565,6 +686,7 @@ class ProcMemCpuMonitor(object):
         include_tcmalloc_stats: bool = False,
         tcmalloc_raw_log_path: Optional[str] = None,
         output_basename_style: str = "full",
+        resident_sampler: bool = False,
     ) -> None:
         """
         Begin background sampling.
@@ -606,6 +728,11 @@ class ProcMemCpuMonitor(object):
                 ``<tmp_path>/mem_cpu_monitor_tcmalloc_raw.log`` when ``include_tcmalloc_stats`` is True.
             output_basename_style: how to build PNG/JSON/CSV basename  ``full`` (default, long
                 ``nodeid``), ``short_node`` (``node.name`` only), or ``dut_ts_hash`` (DUT + time + hash).
+            resident_sampler: if True, the host/docker ``top`` and ``free`` probes of each DUT are replaced by a
+                sampler process copied to the DUT (``dut_sampler.py``), reading ``/proc`` every ``interval``
+                into a ring file. Its records are fetched in bulk by ``snapshot()``, ``stop()`` and every
+                ``RESIDENT_FETCH_INTERVAL`` seconds, so ``interval`` can be below one second. ``tcmalloc``
+                probes still run their command each tick. Falls back to the commands if the sampler can't start.
         """
         if output_basename_style not in OUTPUT_BASENAME_STYLES:
             raise ValueError(
@@ -686,6 +813,11 @@ class ProcMemCpuMonitor(object):
             if not self._targets:
                 raise ValueError("mem_cpu_monitor.start(): no probe targets configured")
 
+            self._resident_samplers = []
+            self._resident_current = {}
+            if resident_sampler:
+                self._start_resident_samplers(dut_list, docker_service)
+
             if any(k in ("top", "top_all") for _d, _s, _c, k in self._targets):
                 log_dir = self._resolve_out_dir(None)
                 os.makedirs(log_dir, exist_ok=True)
@@ -734,6 +866,7 @@ class ProcMemCpuMonitor(object):
                     "tcmalloc_raw_log_path": self._tcmalloc_raw_log_path,
                     "output_basename_style": output_basename_style,
                     "num_cores": self._host_top_num_cores,
+                    "resident_sampler_duts": [r.hostname for r in self._resident_samplers],
                 },
             )
             self._poll_tick()
@@ -746,6 +879,7 @@ class ProcMemCpuMonitor(object):
         run an immediate memory check vs the first-seen baseline per (dut, scope, process).
         """
         name = event or "snapshot"
+        self._fetch_resident(force=True)
         extra: Dict[str, Any] = {}
         if threshold is not None and name == MEM_LEAK_EVENT:
             failures, skipped = self._run_mem_leak_compare(threshold)
@@ -789,6 +923,8 @@ class ProcMemCpuMonitor(object):
             for row in rows:
                 key = (hostname, scope, row["process"])
                 current[key] = row["mem_pct"]
+        with self._lock:
+            current.update(self._resident_current)
 
         failures: List[str] = []
         with self._lock:
@@ -819,6 +955,14 @@ class ProcMemCpuMonitor(object):
         if self._thread is not None:
             self._thread.join(timeout=30.0)
             self._thread = None
+        self._fetch_resident(force=True)
+        for sampler in self._resident_samplers:
+            try:
+                with self._dut_ssh_lock:
+                    with _suppress_devices_base_debug():
+                        sampler.stop()
+            except Exception as ex:  # noqa: BLE001  it exits by itself once its files are no longer fetched
+                logger.warning("mem_cpu_monitor: resident sampler not stopped on %s: %s", sampler.hostname, ex)
         self._append_event("stop")
 
         with self._lock:
@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+Resident CPU/MEM sampler, copied to the DUT and run there by ``start(..., resident_sampler=True)``.
+
+``run`` reads ``/proc`` every interval and writes fixed-size binary records to a ring file; ``dump`` prints the
+records written since a given count, so the controller fetches them in bulk with one DUT command.
+The controller imports this module for the record layout; it only uses the python3 standard library.
+
+Ring file: ``HEADER`` (magic, version, clock ticks per second, record size, capacity, records written) followed by
+``capacity`` slots of ``RECORD``. Record ``n`` is in slot ``n % capacity``.
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import heapq
+import json
+import os
+import struct
+import subprocess
+import sys
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+MAGIC = b"PMCS"
+VERSION = 1
+# magic, version, clock ticks per second, record size, capacity, records written
+HEADER = struct.Struct("<4sHHIIQ")
+COUNT_OFFSET = HEADER.size - 8
+# wall time, tick, scope index, kind, pid, process name (comm), three values depending on kind
+RECORD = struct.Struct("<dIHBxI16sQQQ")
+
+# Process of a scope: cpu % * 100 since the previous tick, RSS KiB
+KIND_PROC = 0
+# Host CPU: idle, user and system % * 100 since the previous tick
+KIND_CPU = 1
+# Host memory: total KiB, used KiB (``free`` used: total - free - buffers - cache)
+KIND_MEM = 2
+
+# Scope index of the host processes; the container scopes follow
+HOST_SCOPE = 0
+
+# Minimum seconds between two lookups of the id of a container without any process found, e.g. restarted
+CONTAINER_RESOLVE_INTERVAL = 10.0
+
+
+def decode_records(data: bytes) -> Iterator[Tuple[float, int, int, int, int, str, int, int, int]]:
+    """Yield ``(t, tick, scope, kind, pid, name, v1, v2, v3)`` for each record of ``data``."""
+    for t, tick, scope, kind, pid, name, v1, v2, v3 in RECORD.iter_unpack(data):
+        yield t, tick, scope, kind, pid, name.rstrip(b"\0").decode("utf-8", "replace"), v1, v2, v3
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r") as fh:
+            return fh.read()
+    except (IOError, OSError):
+        return None
+
+
+def _read_cpu() -> Optional[Tuple[int, int, int, int]]:
+    """Return (total, idle, user, system) jiffies of ``/proc/stat``."""
+    data = _read("/proc/stat")
+    if not data or not data.startswith("cpu "):
+        return None
+    vals = [int(v) for v in data.split("\n", 1)[0].split()[1:]]
+    # guest and guest_nice are already counted in user and nice
+    return sum(vals[:8]), vals[3], vals[0], vals[2]
+
+
+def _read_mem() -> Optional[Tuple[int, int]]:
+    """Return (total, used) KiB of ``/proc/meminfo``, ``used`` computed like ``free``."""
+    data = _read("/proc/meminfo")
+    if not data:
+        return None
+    info = {}
+    for line in data.splitlines():
+        parts = line.split()
+        if len(parts) >= 2:
+            info[parts[0].rstrip(":")] = int(parts[1])
+    total = info.get("MemTotal", 0)
+    cache = info.get("Cached", 0) + info.get("SReclaimable", 0)
+    used = total - info.get("MemFree", 0) - info.get("Buffers", 0) - cache
+    return total, max(used, 0)
+
+
+def _read_proc(pid: str, page_kib: int) -> Optional[Tuple[str, int, int, int]]:
+    """Return (comm, utime + stime ticks, start time ticks, RSS KiB) of ``/proc/<pid>/stat``."""
+    data = _read("/proc/{}/stat".format(pid))
+    if not data:
+        return None
+    # comm may contain spaces and parentheses, it ends at the last ')'
+    lpar, rpar = data.find("("), data.rfind(")")
+    fields = data[rpar + 2:].split()
+    if lpar < 0 or len(fields) < 22:
+        return None
+    return data[lpar + 1:rpar], int(fields[11]) + int(fields[12]), int(fields[19]), int(fields[21]) * page_kib
+
+
+def _resolve_container(name: str) -> Optional[str]:
+    """Return the id of the running container ``name``, None if it is not running or docker can't be queried."""
+    try:
+        out = subprocess.run(["sudo", "-n", "docker", "inspect", "-f", "{{.Id}}", name],
+                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    cid = out.stdout.decode("utf-8", "replace").strip()
+    return cid if out.returncode == 0 and cid else None
+
+
+def _is_sampler(pidfile: str, ring: str) -> bool:
+    """True if the process of the pid file is running and is the sampler of the ring file."""
+    pid = (_read(pidfile) or "").strip()
+    if not pid.isdigit():
+        return False
+    try:
+        with open("/proc/{}/cmdline".format(pid), "rb") as fh:
+            cmdline = fh.read().split(b"\0")
+    except (IOError, OSError):
+        return False
+    return ring.encode("utf-8") in cmdline
+
+
+def _container_scope(pid: str, containers: Dict[str, int]) -> Optional[int]:
+    data = _read("/proc/{}/cgroup".format(pid))
+    if not data:
+        return None
+    for cid, scope in containers.items():
+        if cid in data:
+            return scope
+    return None
+
+
+class Sampler(object):
+    """Read ``/proc`` every interval and write the records to the ring file."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.clk_tck = os.sysconf("SC_CLK_TCK")
+        self.page_kib = os.sysconf("SC_PAGE_SIZE") // 1024
+        self.containers: Dict[str, int] = {}
+        # Name of the container of a scope, to look up its new id when it is restarted
+        self.container_names: Dict[int, str] = {}
+        for spec in args.container:
+            scope, cid, name = (spec.split("=", 2) + [""])[:3]
+            self.containers[cid] = int(scope)
+            if name:
+                self.container_names[int(scope)] = name
+        self.resolve_time: Dict[int, float] = dict.fromkeys(self.container_names, time.time())
+        self.prev_cpu: Optional[Tuple[int, int, int, int]] = None
+        # CPU ticks of each process by (pid, start time), a pid may be reused by a new process
+        self.prev_ticks: Dict[Tuple[int, int], int] = {}
+        self.prev_time = 0.0
+        self.count = 0
+        self.fh = None
+
+    def _open_ring(self) -> None:
+        self.fh = open(self.args.ring, "w+b")
+        self.fh.write(HEADER.pack(MAGIC, VERSION, self.clk_tck, RECORD.size, self.args.capacity, 0))
+        self.fh.truncate(HEADER.size + RECORD.size * self.args.capacity)
+        self.fh.flush()
+
+    def _write(self, records: List[bytes]) -> None:
+        for rec in records:
+            self.fh.seek(HEADER.size + (self.count % self.args.capacity) * RECORD.size)
+            self.fh.write(rec)
+            self.count += 1
+        # The count is written after the records, a reader never sees a record being written
+        self.fh.flush()
+        self.fh.seek(COUNT_OFFSET)
+        self.fh.write(struct.pack("<Q", self.count))
+        self.fh.flush()
+
+    def _matches(self, comm: str) -> bool:
+        return any(m in comm for m in self.args.match)
+
+    def _resolve_containers(self, found: Set[int], now: float) -> None:
+        """Look up again the id of the containers without any process found, which may have been restarted."""
+        for scope, name in self.container_names.items():
+            if scope in found or now - self.resolve_time[scope] < CONTAINER_RESOLVE_INTERVAL:
+                continue
+            self.resolve_time[scope] = now
+            cid = _resolve_container(name)
+            if cid and cid not in self.containers:
+                self.containers = {c: s for c, s in self.containers.items() if s != scope}
+                self.containers[cid] = scope
+
+    def tick(self, tick: int) -> List[bytes]:
+        now = time.time()
+        elapsed = now - self.prev_time if self.prev_time else 0.0
+        uptime = float((_read("/proc/uptime") or "0").split()[0])
+        records = []
+
+        cpu = _read_cpu()
+        if cpu and self.prev_cpu:
+            delta = [c - p for c, p in zip(cpu, self.prev_cpu)]
+            if delta[0] > 0:
+                idle, user, system = [round(10000.0 * d / delta[0]) for d in delta[1:]]
+                records.append(RECORD.pack(now, tick, HOST_SCOPE, KIND_CPU, 0, b"", idle, user, system))
+        self.prev_cpu = cpu
+        mem = _read_mem()
+        if mem:
+            records.append(RECORD.pack(now, tick, HOST_SCOPE, KIND_MEM, 0, b"", mem[0], mem[1], 0))
+
+        procs = []
+        ticks: Dict[Tuple[int, int], int] = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            stat = _read_proc(entry, self.page_kib)
+            if stat is None:
+                continue
+            comm, cpu_ticks, start, rss = stat
+            pid = int(entry)
+            ticks[(pid, start)] = cpu_ticks
+            # A process started since the previous tick is measured since its start
+            prev = self.prev_ticks.get((pid, start))
+            span = elapsed if prev is not None else min(elapsed, uptime - float(start) / self.clk_tck)
+            if span > 0:
+                cpu_pct = max(0, round(10000.0 * (cpu_ticks - (prev or 0)) / self.clk_tck / span))
+            else:
+                cpu_pct = 0
+            procs.append((entry, pid, comm, cpu_pct, rss))
+        self.prev_ticks = ticks
+        self.prev_time = now
+
+        top_comms = set()
+        if self.args.top_n > 0:
+            rss_by_comm: Dict[str, int] = {}
+            for _entry, _pid, comm, _cpu, rss in procs:
+                rss_by_comm[comm] = max(rss, rss_by_comm.get(comm, 0))
+            top_comms = set(heapq.nlargest(self.args.top_n, rss_by_comm, key=rss_by_comm.get))
+        found: Set[int] = set()
+        for entry, pid, comm, cpu_pct, rss in procs:
+            name = comm.encode("utf-8", "replace")[:16]
+            matched = self._matches(comm)
+            if self.args.host and (matched or comm in top_comms):
+                records.append(RECORD.pack(now, tick, HOST_SCOPE, KIND_PROC, pid, name, cpu_pct, rss, 0))
+            if matched and self.containers:
+                scope = _container_scope(entry, self.containers)
+                if scope is not None:
+                    found.add(scope)
+                    records.append(RECORD.pack(now, tick, scope, KIND_PROC, pid, name, cpu_pct, rss, 0))
+        self._resolve_containers(found, now)
+        return records
+
+    def _orphaned(self) -> bool:
+        """True if the pid file was removed, or not touched by a dump for ``orphan_timeout`` seconds."""
+        try:
+            return time.time() - os.stat(self.args.pidfile).st_mtime > self.args.orphan_timeout
+        except OSError:
+            return True
+
+    def run(self) -> None:
+        self._open_ring()
+        with open(self.args.pidfile, "w") as fh:
+            fh.write(str(os.getpid()))
+        # The first tick only sets the previous counters of the CPU % of the next one
+        self.tick(0)
+        tick = 0
+        deadline = time.monotonic()
+        while not self._orphaned():
+            deadline += self.args.interval
+            time.sleep(max(0.0, deadline - time.monotonic()))
+            tick += 1
+            self._write(self.tick(tick))
+        # Nobody fetches the records any more, don't leave them in /tmp
+        self.fh.close()
+        for path in (self.args.ring, self.args.pidfile):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def dump(args: argparse.Namespace) -> Dict[str, Any]:
+    """Return the records written since record ``args.start`` and whether the sampler runs, and touch the pid file."""
+    try:
+        os.utime(args.pidfile, None)
+    except OSError:
+        pass
+    with open(args.ring, "rb") as fh:
+        magic, version, clk_tck, size, capacity, count = HEADER.unpack(fh.read(HEADER.size))
+        if magic != MAGIC or version != VERSION or size != RECORD.size:
+            raise ValueError("{} is not a ring file of this sampler".format(args.ring))
+        first = max(args.start, count - capacity)
+        chunks = []
+        for n in range(first, count):
+            fh.seek(HEADER.size + (n % capacity) * size)
+            chunks.append(fh.read(size))
+        fh.seek(COUNT_OFFSET)
+        end = struct.unpack("<Q", fh.read(8))[0]
+    # Drop the oldest records if they were overwritten while being read
+    overwritten = max(0, end - capacity - first)
+    data = b"".join(chunks[overwritten:])
+    return {
+        "now": time.time(),
+        "clk_tck": clk_tck,
+        "first": first + overwritten,
+        "count": count,
+        "alive": _is_sampler(args.pidfile, args.ring),
+        "records": base64.b64encode(zlib.compress(data)).decode("ascii"),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Resident CPU/MEM sampler of proc_mem_cpu_monitor")
+    sub = parser.add_subparsers(dest="command")
+    run_parser = sub.add_parser("run", help="sample /proc into the ring file until the pid file is removed")
+    run_parser.add_argument("--interval", type=float, default=1.0)
+    run_parser.add_argument("--capacity", type=int, default=65536, help="number of records of the ring")
+    run_parser.add_argument("--match", action="append", default=[], help="process name substring")
+    run_parser.add_argument("--top-n", type=int, default=0, help="also record the N host processes with most RSS")
+    run_parser.add_argument("--host", action="store_true", help="record the host processes")
+    run_parser.add_argument("--container", action="append", default=[],
+                            help="SCOPE=ID[=NAME] of a container, its id is looked up by NAME once restarted")
+    run_parser.add_argument("--orphan-timeout", type=float, default=600.0)
+    dump_parser = sub.add_parser("dump", help="print the records written since --from as JSON")
+    dump_parser.add_argument("--from", dest="start", type=int, default=0)
+    for p in (run_parser, dump_parser):
+        p.add_argument("--ring", required=True)
+        p.add_argument("--pidfile", required=True)
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        Sampler(args).run()
+    elif args.command == "dump":
+        json.dump(dump(args), sys.stdout)
+    else:
+        parser.print_help()
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""Run ``dut_sampler.py`` on a DUT and turn its records into the rows of the ``top`` / ``free`` parsers."""
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import os
+import shlex
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from tests.common.plugins.proc_mem_cpu_monitor.dut_sampler import (
+    HOST_SCOPE,
+    KIND_CPU,
+    KIND_MEM,
+    KIND_PROC,
+    decode_records,
+)
+
+logger = logging.getLogger(__name__)
+
+SAMPLER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dut_sampler.py")
+DUT_SAMPLER_SCRIPT = "/tmp/proc_mem_cpu_monitor_sampler.py"
+# Maximum seconds between two fetches of the records while the monitor runs
+RESIDENT_FETCH_INTERVAL = 30.0
+# Records of the ring file on the DUT, 60 bytes each
+RESIDENT_RING_CAPACITY = 65536
+
+
+@dataclass
+class ResidentTick:
+    """One sampler tick, with the same rows as ``parse_free_m_used`` / ``parse_top_cpu_summary`` / ``parse_top``."""
+
+    t: float
+    free: Optional[Dict[str, float]] = None
+    cpu_summary: Optional[Dict[str, float]] = None
+    rows: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+
+
+class ResidentSampler(object):
+    """
+    Sampler process resident on one DUT, replacing the host/docker ``top`` and ``free -m`` commands of each tick.
+
+    ``scopes`` lists ``(scope, kind, container)`` of the ``top`` probes: kind ``top`` or ``top_all`` for the host
+    (container None), ``top`` for a docker scope, whose processes are found by the cgroup of the container.
+    """
+
+    def __init__(
+        self,
+        duthost: Any,
+        scopes: List[Tuple[str, str, Optional[str]]],
+        include_free: bool,
+        proc_list: List[str],
+        top_n: int,
+        interval: float,
+    ):
+        self.duthost = duthost
+        self.hostname = duthost.hostname
+        self.scopes = scopes
+        self.include_free = include_free
+        self.proc_list = list(proc_list)
+        self.top_n = top_n
+        self.interval = interval
+        base = "/tmp/proc_mem_cpu_monitor_{}".format(uuid.uuid4().hex[:8])
+        self.ring_path = base + ".ring"
+        self.pid_path = base + ".pid"
+        self.log_path = base + ".log"
+        self.count = 0
+        self.last_fetch = 0.0
+        self._running = False
+        self._dead_reported = False
+
+    def _scope_args(self) -> List[str]:
+        args: List[str] = []
+        containers = [(index, c) for index, (_s, _k, c) in enumerate(self.scopes, HOST_SCOPE + 1) if c]
+        if containers:
+            # Braces escaped from the ansible templating, like in test_container_autorestart.py
+            cmd = r"sudo docker inspect -f \{{\{{.Id\}}\}} {}".format(" ".join(c for _i, c in containers))
+            ids = self.duthost.shell(cmd)["stdout"].split()
+            if len(ids) != len(containers):
+                raise RuntimeError("{}: no id for containers {}".format(self.hostname, containers))
+            # The sampler looks up the new id of a container by its name after it is restarted
+            for (index, container), cid in zip(containers, ids):
+                args += ["--container", "{}={}={}".format(index, cid, container)]
+        host_kind = self._host_kind()
+        if host_kind:
+            args.append("--host")
+            if host_kind == "top_all":
+                args += ["--top-n", str(self.top_n)]
+        for name in self.proc_list:
+            args += ["--match", name]
+        return args
+
+    def _host_kind(self) -> Optional[str]:
+        for _scope, kind, container in self.scopes:
+            if container is None:
+                return kind
+        return None
+
+    def start(self) -> None:
+        """Copy the sampler to the DUT and start it in the background."""
+        self.duthost.copy(src=SAMPLER_SCRIPT, dest=DUT_SAMPLER_SCRIPT)
+        args = [
+            "python3", DUT_SAMPLER_SCRIPT, "run", "--ring", self.ring_path, "--pidfile", self.pid_path,
+            "--interval", str(self.interval), "--capacity", str(RESIDENT_RING_CAPACITY),
+        ] + self._scope_args()
+        cmd = (
+            "nohup {run} > {log} 2>&1 &\n"
+            "for i in $(seq 40); do [ -s {pid} ] && exit 0; sleep 0.25; done; cat {log}; exit 1"
+        ).format(run=" ".join(shlex.quote(a) for a in args), log=self.log_path, pid=self.pid_path)
+        out = self.duthost.shell(cmd, module_ignore_errors=True)
+        if out.get("rc") != 0:
+            raise RuntimeError("{}: resident sampler did not start: {}".format(self.hostname, out.get("stdout")))
+        self._running = True
+        self.last_fetch = time.monotonic()
+        logger.info("mem_cpu_monitor resident sampler started on %s, ring %s", self.hostname, self.ring_path)
+
+    def fetch(self) -> List[ResidentTick]:
+        """Return the ticks recorded since the previous fetch."""
+        cmd = "python3 {} dump --ring {} --pidfile {} --from {}".format(
+            DUT_SAMPLER_SCRIPT, self.ring_path, self.pid_path, self.count)
+        before = time.time()
+        out = self.duthost.command(cmd, module_ignore_errors=True)
+        after = time.time()
+        self.last_fetch = time.monotonic()
+        if out.get("rc") != 0:
+            raise RuntimeError("{}: resident sampler dump failed: {}".format(
+                self.hostname, out.get("stderr") or out.get("stdout")))
+        data = json.loads(out["stdout"])
+        if data["first"] > self.count:
+            logger.warning("mem_cpu_monitor resident sampler on %s: %d records overwritten before being fetched",
+                           self.hostname, data["first"] - self.count)
+        self.count = data["count"]
+        if not data.get("alive", True) and not self._dead_reported:
+            self._dead_reported = True
+            logger.warning("mem_cpu_monitor resident sampler on %s is not running any more, no new samples after "
+                           "record %d; see %s on the DUT", self.hostname, self.count, self.log_path)
+        records = decode_records(zlib.decompress(base64.b64decode(data["records"])))
+        # DUT clock minus local clock, the dump ran about halfway through the command
+        clock_offset = data["now"] - (before + after) / 2.0
+        return self.to_ticks(records, clock_offset)
+
+    def stop(self) -> None:
+        """Stop the sampler and remove its files from the DUT."""
+        if not self._running:
+            return
+        self._running = False
+        cmd = "kill $(cat {pid}) 2>/dev/null; rm -f {pid} {ring} {log}".format(
+            pid=self.pid_path, ring=self.ring_path, log=self.log_path)
+        self.duthost.shell(cmd, module_ignore_errors=True)
+
+    def _process_name(self, kind: str, comm: str) -> Optional[str]:
+        if kind == "top_all":
+            return comm
+        for name in self.proc_list:
+            if name in comm:
+                return name
+        return None
+
+    def to_ticks(self, records: Any, clock_offset: float = 0.0) -> List[ResidentTick]:
+        """Group the decoded records by tick, converted like the ``top`` and ``free -m`` output of that time."""
+        by_tick: "OrderedDict[int, List[Tuple]]" = OrderedDict()
+        for rec in records:
+            by_tick.setdefault(rec[1], []).append(rec)
+        host_kind = self._host_kind()
+
+        ticks: List[ResidentTick] = []
+        for recs in by_tick.values():
+            tick = ResidentTick(t=recs[0][0] - clock_offset)
+            total_kib = 0
+            for _t, _n, _scope, kind, _pid, _name, v1, v2, v3 in recs:
+                if kind == KIND_MEM and v1:
+                    total_kib = v1
+                    if self.include_free:
+                        tick.free = {
+                            "used_mib": round(v2 / 1024.0, 2),
+                            "total_mib": round(v1 / 1024.0, 2),
+                            "used_pct": round(100.0 * v2 / v1, 2),
+                        }
+                elif kind == KIND_CPU and host_kind:
+                    idle = v1 / 100.0
+                    tick.cpu_summary = {
+                        "idle_pct": round(idle, 2),
+                        "busy_pct": round(100.0 - idle, 2),
+                        "us_pct": round(v2 / 100.0, 2),
+                        "sy_pct": round(v3 / 100.0, 2),
+                    }
+
+            for index, (scope, kind, container) in enumerate(self.scopes, HOST_SCOPE + 1):
+                scope_index = HOST_SCOPE if container is None else index
+                rows: List[Dict[str, Any]] = []
+                for _t, _n, rec_scope, rec_kind, pid, comm, cpu, rss, _v3 in recs:
+                    if rec_kind != KIND_PROC or rec_scope != scope_index:
+                        continue
+                    process = self._process_name(kind, comm)
+                    if process is None:
+                        continue
+                    rows.append({
+                        "process": process,
+                        "cpu_pct": round(cpu / 100.0, 2),
+                        "mem_pct": round(100.0 * rss / total_kib, 2) if total_kib else 0.0,
+                        "mem_res_mib": round(rss / 1024.0, 2),
+                        "raw_command": comm,
+                        "pid": pid,
+                    })
+                if kind == "top_all":
+                    # Same as parse_top_host_all: one row per name, the one with most RSS
+                    merged: Dict[str, Dict[str, Any]] = {}
+                    for row in rows:
+                        prev = merged.get(row["process"])
+                        if prev is None or row["mem_res_mib"] > prev["mem_res_mib"]:
+                            merged[row["process"]] = row
+                    rows = list(merged.values())
+                tick.rows[scope] = rows
+            ticks.append(tick)
+        return ticks
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+import argparse
+import base64
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+import zlib
+
+import pytest
+from tests.common.plugins.proc_mem_cpu_monitor import dut_sampler
+from tests.common.plugins.proc_mem_cpu_monitor.controller import ProcMemCpuMonitor
+from tests.common.plugins.proc_mem_cpu_monitor.dut_sampler import (
+    HOST_SCOPE,
+    KIND_CPU,
+    KIND_MEM,
+    KIND_PROC,
+    RECORD,
+    Sampler,
+    decode_records,
+)
+from tests.common.plugins.proc_mem_cpu_monitor.resident_sampler import ResidentSampler
+from tests.common.plugins.proc_mem_cpu_monitor.top_parser import SYSTEM_CPU_IDLE_PROCESS
+
+pytestmark = [
+    pytest.mark.topology('t0', 't1', 'any')
+]
+
+MEM_TOTAL_KIB = 4 * 1024 * 1024
+
+
+class _FakeDut(object):
+    hostname = "dut1"
+
+
+class _FakeProc(object):
+    """``/proc`` of the DUT read by ``Sampler.tick``: uptime and the processes by pid."""
+
+    def __init__(self, monkeypatch):
+        self.uptime = 1000.0
+        # pid -> (comm, cpu ticks, start time ticks, cgroup)
+        self.procs = {}
+        monkeypatch.setattr(dut_sampler, "_read", self.read)
+        monkeypatch.setattr(dut_sampler.os, "listdir", lambda path: [str(pid) for pid in self.procs])
+
+    def read(self, path):
+        if path == "/proc/uptime":
+            return "{} 0".format(self.uptime)
+        parts = path.split("/")
+        if len(parts) == 4 and parts[2].isdigit() and int(parts[2]) in self.procs:
+            comm, cpu_ticks, start, cgroup = self.procs[int(parts[2])]
+            if parts[3] == "cgroup":
+                return cgroup
+            fields = ["S"] + ["0"] * 21
+            fields[11], fields[19], fields[21] = str(cpu_ticks), str(start), "100"
+            return "{} ({}) {}".format(parts[2], comm, " ".join(fields))
+        return None
+
+
+def _sampler_args(tmp_path, **kwargs):
+    args = dict(ring=str(tmp_path / "ring"), pidfile=str(tmp_path / "pid"), interval=0.1, capacity=4,
+                match=[], top_n=0, host=False, container=[], orphan_timeout=600.0)
+    args.update(kwargs)
+    return argparse.Namespace(**args)
+
+
+def _tick_records(tick, t):
+    return [
+        (t, tick, HOST_SCOPE, KIND_MEM, 0, "", MEM_TOTAL_KIB, MEM_TOTAL_KIB // 4, 0),
+        (t, tick, HOST_SCOPE, KIND_CPU, 0, "", 9000, 600, 300),
+        (t, tick, HOST_SCOPE, KIND_PROC, 10, "bgpd", 550, 81920, 0),
+        (t, tick, HOST_SCOPE, KIND_PROC, 11, "redis-server", 120, 409600, 0),
+        (t, tick, HOST_SCOPE, KIND_PROC, 12, "redis-server", 0, 40960, 0),
+        (t, tick, 2, KIND_PROC, 10, "bgpd", 550, 81920, 0),
+    ]
+
+
+def test_ring_dump_returns_new_records(tmp_path):
+    sampler = Sampler(_sampler_args(tmp_path))
+    sampler._open_ring()
+    (tmp_path / "pid").write_text("1")
+    records = [RECORD.pack(100.0 + n, n, HOST_SCOPE, KIND_MEM, 0, b"", n, 0, 0) for n in range(6)]
+    sampler._write(records[:3])
+
+    out = dut_sampler.dump(_sampler_args(tmp_path, start=1))
+    assert (out["first"], out["count"]) == (1, 3)
+    data = zlib.decompress(base64.b64decode(out["records"]))
+    assert [r[1] for r in decode_records(data)] == [1, 2]
+
+    # Records 0 and 1 are overwritten in the 4 slots of the ring
+    sampler._write(records[3:])
+    out = dut_sampler.dump(_sampler_args(tmp_path, start=1))
+    assert (out["first"], out["count"]) == (2, 6)
+    data = zlib.decompress(base64.b64decode(out["records"]))
+    assert [r[1] for r in decode_records(data)] == [2, 3, 4, 5]
+
+
+def test_to_ticks_like_top_and_free():
+    sampler = ResidentSampler(_FakeDut(), [("host", "top_all", None), ("docker:bgp:0", "top", "bgp")],
+                              include_free=True, proc_list=["bgp"], top_n=5, interval=0.1)
+    ticks = sampler.to_ticks(_tick_records(1, 100.0) + _tick_records(2, 100.5), clock_offset=0.5)
+
+    assert [t.t for t in ticks] == [99.5, 100.0]
+    tick = ticks[0]
+    assert tick.free == {"used_mib": 1024.0, "total_mib": 4096.0, "used_pct": 25.0}
+    assert tick.cpu_summary == {"idle_pct": 90.0, "busy_pct": 10.0, "us_pct": 6.0, "sy_pct": 3.0}
+    host = {r["process"]: r for r in tick.rows["host"]}
+    assert sorted(host) == ["bgpd", "redis-server"]
+    assert host["redis-server"]["pid"] == 11
+    assert host["bgpd"]["cpu_pct"] == 5.5
+    assert host["bgpd"]["mem_res_mib"] == 80.0
+    assert host["bgpd"]["mem_pct"] == round(100.0 * 81920 / MEM_TOTAL_KIB, 2)
+    assert [(r["process"], r["raw_command"]) for r in tick.rows["docker:bgp:0"]] == [("bgp", "bgpd")]
+
+
+def test_resident_tick_samples():
+    monitor = ProcMemCpuMonitor(request=None)
+    monitor._proc_list = ["bgpd"]
+    monitor._host_top_all_procs = True
+    monitor._jumper_top_n = 1
+    sampler = ResidentSampler(_FakeDut(), [("host", "top_all", None)],
+                              include_free=True, proc_list=["bgpd"], top_n=1, interval=0.1)
+    tick = sampler.to_ticks(_tick_records(1, 100.0))[0]
+
+    current = monitor._append_resident_tick(sampler, tick)
+
+    by_process = {s["process"]: s for s in monitor._samples}
+    assert sorted(by_process) == ["bgpd", "free_used", "redis-server", SYSTEM_CPU_IDLE_PROCESS]
+    assert all(s["sampler"] == "resident" for s in monitor._samples)
+    assert by_process["bgpd"]["probe_transport"] == "top"
+    assert by_process[SYSTEM_CPU_IDLE_PROCESS]["probe_transport"] == "top_summary"
+    assert by_process["free_used"]["scope"] == "host:free"
+    assert current[("dut1", "host:free", "free_used")] == 25.0
+    # Only the processes of proc_list get a mem-leak baseline in host-wide mode
+    assert sorted(monitor._baseline_mem) == [("dut1", "host", "bgpd"), ("dut1", "host:free", "free_used")]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def test_sampler_tick_reads_proc(tmp_path):
+    comm = open("/proc/self/comm").read().strip()
+    sampler = Sampler(_sampler_args(tmp_path, host=True, match=[comm], top_n=1))
+    sampler.tick(0)
+    time.sleep(0.1)
+
+    records = list(decode_records(b"".join(sampler.tick(1))))
+
+    kinds = [r[3] for r in records]
+    assert KIND_CPU in kinds and KIND_MEM in kinds
+    own = [r for r in records if r[3] == KIND_PROC and r[4] == os.getpid()]
+    assert len(own) == 1 and own[0][5] == comm[:15]
+    assert own[0][7] > 0
+
+
+def _proc_records(records, kind=KIND_PROC):
+    return [(r[2], r[4], r[5], r[6]) for r in decode_records(b"".join(records)) if r[3] == kind]
+
+
+def test_sampler_tick_pid_reused(tmp_path, monkeypatch):
+    proc = _FakeProc(monkeypatch)
+    sampler = Sampler(_sampler_args(tmp_path, host=True, match=["bgpd", "zebra"]))
+    clk_tck = sampler.clk_tck
+    proc.procs[100] = ("bgpd", 50 * clk_tck, 10 * clk_tck, "")
+    sampler.tick(0)
+    sampler.prev_time = time.time() - 10.0
+
+    # pid 100 is reused by a process started 5 seconds ago, with fewer CPU ticks than the previous one
+    proc.procs[100] = ("zebra", clk_tck, int((proc.uptime - 5.0) * clk_tck), "")
+    records = _proc_records(sampler.tick(1))
+
+    assert len(records) == 1
+    scope, pid, name, cpu_pct = records[0]
+    assert (scope, pid, name) == (HOST_SCOPE, 100, "zebra")
+    # Measured since its start: 1 second of CPU in 5 seconds
+    assert 1900 <= cpu_pct <= 2000
+
+
+def test_sampler_tick_cpu_never_negative(tmp_path, monkeypatch):
+    proc = _FakeProc(monkeypatch)
+    sampler = Sampler(_sampler_args(tmp_path, host=True, match=["bgpd"]))
+    proc.procs[100] = ("bgpd", 500, 10, "")
+    sampler.tick(0)
+    sampler.prev_time = time.time() - 1.0
+    proc.procs[100] = ("bgpd", 400, 10, "")
+
+    assert _proc_records(sampler.tick(1)) == [(HOST_SCOPE, 100, "bgpd", 0)]
+
+
+def test_sampler_resolves_restarted_container(tmp_path, monkeypatch):
+    proc = _FakeProc(monkeypatch)
+    resolved = []
+
+    def resolve_container(name):
+        resolved.append(name)
+        return "newid"
+
+    monkeypatch.setattr(dut_sampler, "_resolve_container", resolve_container)
+    monkeypatch.setattr(dut_sampler, "CONTAINER_RESOLVE_INTERVAL", 0.0)
+    sampler = Sampler(_sampler_args(tmp_path, match=["bgpd"], container=["1=oldid=bgp"]))
+    proc.procs[100] = ("bgpd", 0, 10, "0::/docker/oldid")
+    assert [r[0] for r in _proc_records(sampler.tick(0))] == [1]
+    assert resolved == []
+
+    # The container is restarted with a new id: no process is found, its id is looked up by name
+    proc.procs = {200: ("bgpd", 0, 20, "0::/docker/newid")}
+    assert _proc_records(sampler.tick(1)) == []
+    assert resolved == ["bgp"]
+    assert [r[:2] for r in _proc_records(sampler.tick(2))] == [(1, 200)]
+    assert sampler.containers == {"newid": 1}
+
+
+def test_scope_args_pass_container_names():
+    class _Dut(_FakeDut):
+        def shell(self, cmd):
+            assert cmd.endswith("bgp swss")
+            return {"stdout": "bgpid\nswssid\n"}
+
+    sampler = ResidentSampler(_Dut(), [("docker:bgp", "top", "bgp"), ("docker:swss", "top", "swss")],
+                              include_free=False, proc_list=["bgpd"], top_n=0, interval=1.0)
+    assert sampler._scope_args() == ["--container", "1=bgpid=bgp", "--container", "2=swssid=swss",
+                                     "--match", "bgpd"]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def test_dump_reports_whether_sampler_runs(tmp_path):
+    sampler = Sampler(_sampler_args(tmp_path))
+    sampler._open_ring()
+    ring = str(tmp_path / "ring")
+    # A process with the ring file in its command line, like the sampler
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)", "--ring", ring])
+    try:
+        (tmp_path / "pid").write_text(str(proc.pid))
+        # The command line of the process is empty until it is executed
+        deadline = time.time() + 10
+        while b"--ring" not in open("/proc/{}/cmdline".format(proc.pid), "rb").read() and time.time() < deadline:
+            time.sleep(0.01)
+        assert dut_sampler.dump(_sampler_args(tmp_path, start=0))["alive"] is True
+    finally:
+        proc.kill()
+        proc.wait()
+    # The pid is not running, or is another process
+    assert dut_sampler.dump(_sampler_args(tmp_path, start=0))["alive"] is False
+    (tmp_path / "pid").write_text(str(os.getpid()))
+    assert dut_sampler.dump(_sampler_args(tmp_path, start=0))["alive"] is False
+
+
+def test_fetch_warns_once_when_sampler_not_running(tmp_path, caplog):
+    sampler = Sampler(_sampler_args(tmp_path))
+    sampler._open_ring()
+    sampler._write([RECORD.pack(100.0, 1, HOST_SCOPE, KIND_MEM, 0, b"", MEM_TOTAL_KIB, 0, 0)])
+
+    class _Dut(_FakeDut):
+        def command(self, cmd, module_ignore_errors=False):
+            out = dut_sampler.dump(_sampler_args(tmp_path, start=int(cmd.split()[-1])))
+            return {"rc": 0, "stdout": json.dumps(out)}
+
+    resident = ResidentSampler(_Dut(), [("host", "top", None)], include_free=True, proc_list=[], top_n=0,
+                               interval=0.1)
+    with caplog.at_level(logging.WARNING):
+        assert len(resident.fetch()) == 1
+        assert resident.fetch() == []
+    assert [r.getMessage() for r in caplog.records if "not running" in r.getMessage()] == [
+        "mem_cpu_monitor resident sampler on dut1 is not running any more, no new samples after record 1; "
+        "see {} on the DUT".format(resident.log_path)]
@@ -33,29 +33,37 @@ def override_ptf_functions():
     # Below code is to override the 'send' function in the ptf.testutils module. Purpose of this change is to insert
     # code for updating the packet pattern before send it out. Generally we want to make the payload part of injected
     # packet to have string of current test module and case name. While inspecting the captured packets, it is easier
-    # to fiture out which packets are injected by which test case.
+    # to fiture out which packets are injected by which test case. The updated packet is cached by the test adapter,
+    # so sending the same packet again does not update and build it again.
     origin_send_packet = ptf.testutils.send_packet
 
     def _send(test, port_id, pkt, count=1):
-        update_payload = getattr(test, "update_payload", None)
-        if update_payload and callable(update_payload):
-            pkt = test.update_payload(pkt)
+        stamp_packet = getattr(test, "stamp_packet", None)
+        if stamp_packet and callable(stamp_packet):
+            pkt = test.stamp_packet(pkt)
 
         return origin_send_packet(test, port_id, pkt, count=count)
     setattr(ptf.testutils, "send", _send)
 
     # Below code is to override the 'dp_poll' function in the ptf.testutils module. This function is called by all
     # the other functions for receiving packets in the ptf.testutils module. Purpose of this overriding is to update
-    # the payload of received packet using the same method to match the updated injected packets.
+    # the payload of received packet using the same method to match the updated injected packets. The received packets
+    # are matched with a mask over the raw bytes of the updated expected packet, cached by the test adapter, instead
+    # of building the expected packet for every poll and every received packet.
     origin_dp_poll = ptf.testutils.dp_poll
 
     def _dp_poll(test, device_number=0, port_number=None, timeout=-1, exp_pkt=None):
-        update_payload = getattr(test, "update_payload", None)
-        if update_payload and callable(update_payload):
-            exp_pkt = test.update_payload(exp_pkt)
-
-        return origin_dp_poll(test, device_number=device_number, port_number=port_number,
-                              timeout=timeout, exp_pkt=exp_pkt)
+        stamp_exp_pkt = getattr(test, "stamp_exp_pkt", None)
+        match_pkt = exp_pkt
+        if exp_pkt is not None and stamp_exp_pkt and callable(stamp_exp_pkt):
+            match_pkt = test.stamp_exp_pkt(exp_pkt)
+
+        result = origin_dp_poll(test, device_number=device_number, port_number=port_number,
+                                timeout=timeout, exp_pkt=match_pkt)
+        if match_pkt is not exp_pkt:
+            # Report the expected packet of the caller in the logs of failed verifications
+            result.expected_packet = exp_pkt
+        return result
     setattr(ptf.testutils, "dp_poll", _dp_poll)
 
 
@@ -0,0 +1,161 @@
+"""Cache of the packets updated by PtfTestAdapter.update_payload() before they are sent or matched.
+
+The 'send' and 'dp_poll' functions of ptf.testutils are overridden by the ptfadapter plugin to update the payload of
+every sent packet and of every expected packet. Updating the payload marks the scapy packet as modified, so it has
+to be built again, and a masked packet is built again for every received packet it is compared with. The cache keeps
+the raw bytes of an updated packet, and a mask over the raw bytes of an updated expected packet, for as long as the
+packet object is alive and the fields of its layers are unchanged.
+"""
+import copy
+import weakref
+
+import ptf.mask as mask
+import ptf.packet as scapy
+
+# Expected packets shorter than the minimum Ethernet frame size are matched ignoring the padding of received packets
+MIN_ETHERNET_FRAME_SIZE = 60
+
+# Field values copied as is in the state of a packet, the others (lists of options, packets...) are deep copied
+IMMUTABLE_FIELD_TYPES = (int, float, str, bytes, bool, type(None))
+
+
+def packet_state(pkt):
+    """Get the fields of all the layers of a scapy packet, to find out whether the packet was modified.
+
+    Args:
+        pkt [scapy packet]: The packet.
+
+    Returns:
+        [list]: The class and a copy of the fields of each layer. Mutable values like the options of the IP and TCP
+            layers are deep copied, so that they are not modified in place with the packet.
+    """
+    state = []
+    while pkt:
+        fields = pkt.fields
+        if all(isinstance(value, IMMUTABLE_FIELD_TYPES) for value in fields.values()):
+            fields = dict(fields)
+        else:
+            fields = copy.deepcopy(fields)
+        state.append((pkt.__class__, fields))
+        pkt = pkt.payload
+    return state
+
+
+class StampedMask(mask.Mask):
+    """Mask over the raw bytes of an expected packet.
+
+    The expected bytes and the mask are converted to integers once, so matching a received packet does not build the
+    expected packet again and does not compare it byte by byte.
+    """
+
+    def __init__(self, exp_pkt, raw, care, ignore_extra_bytes=False, valid=True):
+        """Initialize the mask, without building exp_pkt like mask.Mask does.
+
+        Args:
+            exp_pkt [scapy packet]: The expected packet, used by the logs of failed verifications.
+            raw [bytes]: The raw bytes of the expected packet.
+            care [list or bytes]: The mask, 0xff for the bytes to compare and 0 for the bytes to ignore.
+            ignore_extra_bytes [bool]: Match received packets longer than the expected packet.
+            valid [bool]: Validity of the original mask.
+        """
+        self.exp_pkt = exp_pkt
+        self.size = len(raw)
+        self.valid = valid
+        self.mask = list(care)
+        self.ignore_extra_bytes = ignore_extra_bytes
+        self._mask_int = int.from_bytes(bytes(bytearray(care)), "big")
+        self._exp_int = int.from_bytes(raw, "big") & self._mask_int
+
+    def pkt_match(self, pkt):
+        pkt = bytes(pkt)
+        if (not self.ignore_extra_bytes and len(pkt) != self.size) or len(pkt) < self.size:
+            return False
+        return int.from_bytes(pkt[:self.size], "big") & self._mask_int == self._exp_int
+
+
+class PayloadCache(object):
+    """Packets and masked packets with their payload updated, cached per packet object."""
+
+    def __init__(self, update_payload):
+        """Initialize the cache.
+
+        Args:
+            update_payload [function]: Function updating the payload of a scapy packet or of a masked packet in place,
+                like PtfTestAdapter.update_payload().
+        """
+        self.update_payload = update_payload
+        self._entries = {}
+
+    def _get(self, kind, obj, state):
+        entry = self._entries.get((kind, id(obj)))
+        if entry is not None and entry[0]() is obj and entry[1] == state:
+            return entry[2]
+        return None
+
+    def _put(self, kind, obj, state, value):
+        key = (kind, id(obj))
+        entries = self._entries
+        entries[key] = (weakref.ref(obj, lambda _: entries.pop(key, None)), state, value)
+
+    def _mask_state(self, masked_pkt, pattern):
+        return (pattern, packet_state(masked_pkt.exp_pkt), bytes(bytearray(masked_pkt.mask)), masked_pkt.size,
+                masked_pkt.ignore_extra_bytes, masked_pkt.valid)
+
+    def raw_packet(self, pkt, pattern):
+        """Update the payload of a packet to send and get its raw bytes.
+
+        Args:
+            pkt [scapy packet or bytes]: The packet to send.
+            pattern [string]: The payload pattern, the cached packets are updated again when it changes.
+
+        Returns:
+            [bytes or object]: The raw bytes of the updated packet, or pkt if it is not a scapy packet.
+        """
+        if not isinstance(pkt, scapy.Packet):
+            return pkt
+        raw = self._get("raw", pkt, (pattern, packet_state(pkt)))
+        if raw is None:
+            raw = bytes(self.update_payload(pkt))
+            self._put("raw", pkt, (pattern, packet_state(pkt)), raw)
+        return raw
+
+    def expected_packet(self, exp_pkt, pattern):
+        """Update the payload of an expected packet and get a mask over its raw bytes.
+
+        A scapy packet is matched like ptf does: exactly, or ignoring the padding of the received packets when it is
+        shorter than the minimum Ethernet frame size.
+
+        Args:
+            exp_pkt [scapy packet or masked packet]: The expected packet.
+            pattern [string]: The payload pattern, the cached packets are updated again when it changes.
+
+        Returns:
+            [masked packet or object]: The mask to match the received packets with, or exp_pkt if it is neither a scapy
+                packet nor a masked packet.
+        """
+        if isinstance(exp_pkt, mask.Mask):
+            if not isinstance(exp_pkt.exp_pkt, scapy.Packet):
+                return exp_pkt
+            matcher = self._get("mask", exp_pkt, self._mask_state(exp_pkt, pattern))
+            if matcher is None:
+                self.update_payload(exp_pkt)
+                raw = bytes(exp_pkt.exp_pkt)
+                if len(raw) < exp_pkt.size:
+                    # Let ptf report the expected packet being shorter than its mask
+                    matcher = exp_pkt
+                else:
+                    matcher = StampedMask(exp_pkt.exp_pkt, raw[:exp_pkt.size], exp_pkt.mask,
+                                          exp_pkt.ignore_extra_bytes, exp_pkt.valid)
+                self._put("mask", exp_pkt, self._mask_state(exp_pkt, pattern), matcher)
+            return matcher
+
+        if isinstance(exp_pkt, scapy.Packet):
+            matcher = self._get("mask", exp_pkt, (pattern, packet_state(exp_pkt)))
+            if matcher is None:
+                raw = bytes(self.update_payload(exp_pkt))
+                matcher = StampedMask(exp_pkt, raw, b"\xff" * len(raw),
+                                      ignore_extra_bytes=len(raw) < MIN_ETHERNET_FRAME_SIZE)
+                self._put("mask", exp_pkt, (pattern, packet_state(exp_pkt)), matcher)
+            return matcher
+
+        return exp_pkt
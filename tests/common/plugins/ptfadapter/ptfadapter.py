@@ -7,6 +7,7 @@ import ptf.mask as mask
 
 from ptf.base_tests import BaseTest
 from ptf.dataplane import DataPlane, DataPlanePortNN
+from .payload_cache import PayloadCache
 from tests.common.utilities import wait_until
 import logging
 
@@ -45,6 +46,7 @@ class PtfTestAdapter(BaseTest):
         self.runTest = lambda: None    # set a no op runTest attribute to satisfy BaseTest interface
         super(PtfTestAdapter, self).__init__()
         self.payload_pattern = ""
+        self.payload_cache = PayloadCache(self.update_payload)
         self.connected = False
         self.ptfhosts = ptfhosts
         self.ptfagents = ptfagents
@@ -217,6 +219,34 @@ class PtfTestAdapter(BaseTest):
                     pkt.exp_pkt[proto].load = self._update_payload(pkt.exp_pkt[proto].load)
         return pkt
 
+    def stamp_packet(self, pkt):
+        """Update the payload of a packet to send like update_payload() and get its raw bytes.
+
+        The raw bytes are cached for the packet object, so sending the same packet again does not update and build it
+        again unless it was modified.
+
+        Args:
+            pkt [scapy packet]: The packet to be updated.
+
+        Returns:
+            [bytes]: The raw bytes of the updated packet.
+        """
+        return self.payload_cache.raw_packet(pkt, self.payload_pattern)
+
+    def stamp_exp_pkt(self, exp_pkt):
+        """Update the payload of an expected packet like update_payload() and get a mask to match received packets.
+
+        The mask is built over the raw bytes of the updated packet and cached for the packet object, so polling for
+        the same expected packet again does not update and build it again unless it was modified.
+
+        Args:
+            exp_pkt [scapy packet or masked packet]: The expected packet to be updated.
+
+        Returns:
+            [masked packet]: The mask matching the updated expected packet.
+        """
+        return self.payload_cache.expected_packet(exp_pkt, self.payload_pattern)
+
     def _update_payload(self, payload):
         """Update payload to the default_pattern if default_pattern is set.
 
@@ -1,18 +1,20 @@
 import logging
 import copy
 import json
+import time
 from contextlib import contextmanager
 
 import pytest
 
 from collections import defaultdict
 
-from tests.common.helpers.multi_thread_utils import SafeThreadPoolExecutor
+from tests.common.helpers.multi_thread_utils import SafeThreadPoolExecutor, run_with_dependencies
 from tests.common.helpers.parallel_utils import ParallelCoordinator, ParallelStatus
 from tests.common.plugins.sanity_check import constants
 from tests.common.plugins.sanity_check import checks
 from tests.common.plugins.sanity_check.checks import *      # noqa: F401, F403
 from tests.common.plugins.sanity_check.recover import recover, recover_chassis
+from tests.common.plugins.sanity_check.snapshot import gather_snapshots, get_snapshot_facts
 from tests.common.plugins.sanity_check.constants import STAGE_PRE_TEST, STAGE_POST_TEST
 from tests.common.helpers.assertions import pytest_assert as pt_assert
 from tests.common.helpers.custom_msg_utils import add_custom_msg
@@ -149,10 +151,37 @@ def filter_check_items(tbinfo, duthosts, check_items):
 
 
 def do_checks(request, check_items, *args, **kwargs):
+    check_items = list(check_items)
+    max_parallel = request.config.getoption("--sanity_check_max_parallel", default=1)
+    if max_parallel > 1:
+        # The check items fork processes with parallel_run(), a fork while another thread holds a lock which is not
+        # reinitialized in the child, like a lock of the ansible connections, hangs the child.
+        logger.warning("--sanity_check_max_parallel {} is unsafe: the check items fork processes from concurrent "
+                       "threads, which may deadlock".format(max_parallel))
+    # The fixtures are requested in the main thread, the check functions they return can run in any thread
+    check_fixtures = {item: request.getfixturevalue(item) for item in check_items}
+
+    timings = {}
+    start = time.time()
+    # The facts checked by the items are gathered on all the DUTs in one round before the items are run,
+    # an item polls a DUT again only when the sample of the snapshot fails its check.
+    snapshot_facts = get_snapshot_facts(check_items)
+    if snapshot_facts:
+        snapshots = gather_snapshots(request.getfixturevalue("duthosts"), snapshot_facts,
+                                     request.getfixturevalue("tbinfo"))
+        timings["snapshot"] = time.time() - start
+        kwargs = dict(kwargs, snapshots=snapshots)
+    try:
+        items_results = run_with_dependencies(lambda item: check_fixtures[item](*args, **kwargs), check_items,
+                                              constants.CHECK_ITEM_DEPENDENCIES, max_parallel=max_parallel,
+                                              timings=timings)
+    finally:
+        durations = ["{} {:.2f}s".format(item, timings[item]) for item in ["snapshot"] + check_items
+                     if item in timings]
+        logger.info("Sanity check items done in {:.2f} seconds: {}".format(time.time() - start, ", ".join(durations)))
+
     check_results = []
-    for item in check_items:
-        check_fixture = request.getfixturevalue(item)
-        results = check_fixture(*args, **kwargs)
+    for results in items_results:
         logger.debug("check results of each item {}".format(results))
         if results and isinstance(results, list):
             check_results.extend(results)
@@ -15,6 +15,8 @@ from tests.common.dualtor.constants import UPPER_TOR, LOWER_TOR, NIC
 from tests.common.dualtor.dual_tor_common import CableType, active_standby_ports                # noqa: F401
 from tests.common.cache import FactsCache
 from tests.common.plugins.sanity_check.constants import STAGE_PRE_TEST, STAGE_POST_TEST
+from tests.common.plugins.sanity_check.snapshot import get_config_facts, get_ip_intf_status, \
+    get_phy_intf_status, get_snapshot, use_ipv6_interfaces
 from tests.common.helpers.parallel import parallel_run, reset_ansible_local_tmp
 from tests.common.dualtor.mux_simulator_control import _probe_mux_ports
 from tests.common.fixtures.duthost_utils import check_bgp_router_id
@@ -47,15 +49,9 @@ CHECK_ITEMS = [
 __all__ = CHECK_ITEMS
 
 
-def _find_down_phy_ports(dut, phy_interfaces):
+def _find_down_phy_ports(dut, phy_interfaces, snapshot):
     down_phy_ports = []
-    include_inband_intfs = True if dut.sonichost.get_facts().get(
-        'switch_type', None) == 'voq' else False
-    intf_facts = dut.show_interface(command='status',
-                                    include_internal_intfs=(
-                                        '201811' not in dut.os_version),
-                                    include_inband_intfs=include_inband_intfs)[
-                                        'ansible_facts']['int_status']
+    intf_facts = snapshot.sample(('phy_intf_status', dut.asic_index), get_phy_intf_status, dut)
     for intf in phy_interfaces:
         try:
             if intf_facts[intf]['oper_state'] == 'down':
@@ -65,12 +61,9 @@ def _find_down_phy_ports(dut, phy_interfaces):
     return down_phy_ports
 
 
-def _find_down_ip_ports(dut, ip_interfaces, use_ipv6=False):
+def _find_down_ip_ports(dut, ip_interfaces, use_ipv6, snapshot):
     down_ip_ports = []
-    if use_ipv6:
-        ip_intf_facts = dut.show_ipv6_interface()['ansible_facts']['ipv6_interfaces']
-    else:
-        ip_intf_facts = dut.show_ip_interface()['ansible_facts']['ip_interfaces']
+    ip_intf_facts = snapshot.sample(('ip_intf_status', dut.asic_index), get_ip_intf_status, dut, use_ipv6)
 
     for intf in ip_interfaces:
         try:
@@ -81,7 +74,7 @@ def _find_down_ip_ports(dut, ip_interfaces, use_ipv6=False):
     return down_ip_ports
 
 
-def _find_down_ports(dut, phy_interfaces, ip_interfaces, use_ipv6=False):
+def _find_down_ports(dut, phy_interfaces, ip_interfaces, use_ipv6, snapshot):
     """Finds the ports which are operationally down
 
     Args:
@@ -89,13 +82,14 @@ def _find_down_ports(dut, phy_interfaces, ip_interfaces, use_ipv6=False):
         phy_interfaces (list): List of all phyiscal operation in 'admin_up'
         ip_interfaces (list): List of the L3 interfaces
         use_ipv6 (bool): Whether to use IPv6 interface check instead of IPv4
+        snapshot (DutSnapshot): Snapshot of the DUT, giving the interface status of the first call
 
     Returns:
         [list]: list of the down ports
     """
     down_ports = []
-    down_ports = _find_down_ip_ports(dut, ip_interfaces, use_ipv6) + \
-        _find_down_phy_ports(dut, phy_interfaces)
+    down_ports = _find_down_ip_ports(dut, ip_interfaces, use_ipv6, snapshot) + \
+        _find_down_phy_ports(dut, phy_interfaces, snapshot)
 
     return down_ports
 
@@ -113,9 +107,10 @@ def check_interfaces(duthosts, tbinfo):
     def _check_interfaces_on_dut(*args, **kwargs):
         dut = kwargs['node']
         results = kwargs['results']
+        snapshot = get_snapshot(kwargs, dut)
         logger.info("Checking interfaces status on %s..." % dut.hostname)
 
-        networking_uptime = dut.get_networking_uptime().seconds
+        networking_uptime = snapshot.networking_uptime(dut).seconds
         timeout = max((SYSTEM_STABILIZE_MAX_TIME - networking_uptime), MIN_PROCESS_CHECK_TIMEOUT)
         if dut.get_facts().get("modular_chassis"):
             timeout = max(timeout, 600)
@@ -127,16 +122,11 @@ def check_interfaces(duthosts, tbinfo):
         check_result = {"failed": True, "check_item": "interfaces", "host": dut.hostname}
 
         # Determine if we should use IPv6 interface checking
-        use_ipv6 = (
-            "-v6-" in tbinfo["topo"]["name"]
-            if tbinfo and "topo" in tbinfo and "name" in tbinfo["topo"]
-            else False
-        )
+        use_ipv6 = use_ipv6_interfaces(tbinfo)
 
         for asic in dut.asics:
             ip_interfaces = []
-            cfg_facts = asic.config_facts(host=dut.hostname,
-                                          source="persistent", verbose=False)['ansible_facts']
+            cfg_facts = snapshot.sample(('config_facts', asic.asic_index), get_config_facts, asic)
             phy_interfaces = [k for k, v in list(cfg_facts["PORT"].items()) if
                               "admin_status" in v and v["admin_status"] == "up"]
             if "PORTCHANNEL_INTERFACE" in cfg_facts:
@@ -158,14 +148,14 @@ def check_interfaces(duthosts, tbinfo):
                 logger.info("Using IPv6 interface checking for topology: %s" % tbinfo["topo"]["name"])
 
             if timeout == 0:  # Check interfaces status, do not retry.
-                down_ports += _find_down_ports(asic, phy_interfaces, ip_interfaces, use_ipv6)
+                down_ports += _find_down_ports(asic, phy_interfaces, ip_interfaces, use_ipv6, snapshot)
                 check_result["failed"] = True if len(down_ports) > 0 else False
                 check_result["down_ports"] = down_ports
             else:  # Retry checking interface status
                 start = time.time()
                 elapsed = 0
                 while elapsed < timeout:
-                    down_ports = _find_down_ports(asic, phy_interfaces, ip_interfaces, use_ipv6)
+                    down_ports = _find_down_ports(asic, phy_interfaces, ip_interfaces, use_ipv6, snapshot)
                     check_result["failed"] = True if len(down_ports) > 0 else False
                     check_result["down_ports"] = down_ports
 
@@ -308,7 +298,7 @@ def check_bgp(duthosts, tbinfo):
             results[dut.hostname] = check_result
             return
 
-        networking_uptime = dut.get_networking_uptime().seconds
+        networking_uptime = get_snapshot(kwargs, dut).networking_uptime(dut).seconds
         if SYSTEM_STABILIZE_MAX_TIME - networking_uptime + 480 > 500:
             # If max_timeout is higher than 600, it will exceed parallel_run's timeout
             # the check will be killed by parallel_run, we can't get expected results.
@@ -851,8 +841,9 @@ def check_monit(duthosts):
         dut = kwargs['node']
         results = kwargs['results']
 
+        snapshot = get_snapshot(kwargs, dut)
         logger.info("Checking status of each Monit service...")
-        networking_uptime = dut.get_networking_uptime().seconds
+        networking_uptime = snapshot.networking_uptime(dut).seconds
         timeout = max((MONIT_STABILIZE_MAX_TIME - networking_uptime), 0)
         interval = 20
         logger.info("networking_uptime = {} seconds, timeout = {} seconds, interval = {} seconds"
@@ -861,7 +852,7 @@ def check_monit(duthosts):
         check_result = {"failed": False, "check_item": "monit", "host": dut.hostname}
 
         if timeout == 0:
-            monit_services_status = dut.get_monit_services_status()
+            monit_services_status = snapshot.sample('monit_services_status', dut.get_monit_services_status)
             if not monit_services_status:
                 logger.info("Monit was not running.")
                 check_result["failed"] = True
@@ -877,7 +868,7 @@ def check_monit(duthosts):
             is_monit_running = False
             while elapsed < timeout:
                 check_result["failed"] = False
-                monit_services_status = dut.get_monit_services_status()
+                monit_services_status = snapshot.sample('monit_services_status', dut.get_monit_services_status)
                 if not monit_services_status:
                     wait(interval, msg="Monit was not started and wait {} seconds to retry. Remaining time: {}."
                          .format(interval, timeout - elapsed))
@@ -922,9 +913,10 @@ def check_processes(duthosts):
     def _check_processes_on_dut(*args, **kwargs):
         dut = kwargs['node']
         results = kwargs['results']
+        snapshot = get_snapshot(kwargs, dut)
         logger.info("Checking process status on %s..." % dut.hostname)
 
-        networking_uptime = dut.get_networking_uptime().seconds
+        networking_uptime = snapshot.networking_uptime(dut).seconds
         timeout = max((SYSTEM_STABILIZE_MAX_TIME - networking_uptime), MIN_PROCESS_CHECK_TIMEOUT)
         interval = 20
         logger.info("networking_uptime=%d seconds, timeout=%d seconds, interval=%d seconds" %
@@ -932,7 +924,7 @@ def check_processes(duthosts):
 
         check_result = {"failed": False, "check_item": "processes", "host": dut.hostname}
         if timeout == 0:  # Check processes status, do not retry.
-            processes_status = dut.all_critical_process_status()
+            processes_status = snapshot.sample('critical_process_status', dut.all_critical_process_status)
             check_result["processes_status"] = processes_status
             check_result["services_status"] = {}
             for container_name, processes in list(processes_status.items()):
@@ -948,7 +940,7 @@ def check_processes(duthosts):
             elapsed = 0
             while elapsed < timeout:
                 check_result["failed"] = False
-                processes_status = dut.all_critical_process_status()
+                processes_status = snapshot.sample('critical_process_status', dut.all_critical_process_status)
                 check_result["processes_status"] = processes_status
                 check_result["services_status"] = {}
                 for container_name, processes in list(processes_status.items()):
@@ -27,6 +27,27 @@ INFRA_CHECK_ITEMS = [
     "mux_simulator"
 ]
 
+# Check items which must be done before a check item is started, when both are checked.
+# check_bgp restarts the bgp service and check_mux_simulator restarts linkmgrd when their check fails,
+# so they are not run while the processes, the monit services or the BFD sessions are checked.
+CHECK_ITEM_DEPENDENCIES = {
+    "check_bgp": ["check_processes"],
+    "check_monit": ["check_bgp"],
+    "check_bfd_up_count": ["check_bgp"],
+    "check_mux_simulator": ["check_processes", "check_monit"],
+}
+
+# Facts of the DUTs gathered once before the check items are run, see snapshot.py.
+SNAPSHOT_FACTS = {
+    "check_interfaces": ["networking_uptime", "config_facts", "phy_intf_status", "ip_intf_status"],
+    "check_bgp": ["networking_uptime"],
+    "check_monit": ["networking_uptime", "monit_services_status"],
+    "check_processes": ["networking_uptime", "critical_process_status"],
+}
+
+# Facts of the snapshot which change when a service is restarted, not used by the items waiting for other items
+SNAPSHOT_SAMPLES = ["phy_intf_status", "ip_intf_status", "monit_services_status", "critical_process_status"]
+
 # Recover related definitions
 RECOVER_METHODS = {
     "config_reload": {
@@ -0,0 +1,151 @@
+"""Facts of the DUTs gathered once per sanity check round and shared by the check items.
+
+The facts needed by the selected check items are gathered on all the DUTs in a single round before the items are
+checked. Each check item takes its first sample of a fact from the snapshot of the DUT, and polls the DUT again only
+when it has to retry because the sample failed the check.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from tests.common.helpers.parallel import parallel_run, reset_ansible_local_tmp
+from tests.common.plugins.sanity_check.constants import CHECK_ITEM_DEPENDENCIES, SNAPSHOT_FACTS, SNAPSHOT_SAMPLES
+
+logger = logging.getLogger(__name__)
+
+# Facts gathered for each asic of a DUT, keyed by (fact name, asic index) in the snapshot. They are used by
+# check_interfaces only, so they are gathered on the frontend nodes only.
+ASIC_FACTS = ["config_facts", "phy_intf_status", "ip_intf_status"]
+
+
+def use_ipv6_interfaces(tbinfo):
+    """Whether the L3 interfaces are checked by their IPv6 state for the topology."""
+    if tbinfo and "topo" in tbinfo and "name" in tbinfo["topo"]:
+        return "-v6-" in tbinfo["topo"]["name"]
+    return False
+
+
+def get_config_facts(asic):
+    return asic.config_facts(host=asic.sonichost.hostname, source="persistent", verbose=False)['ansible_facts']
+
+
+def get_phy_intf_status(asic):
+    include_inband_intfs = True if asic.sonichost.get_facts().get('switch_type', None) == 'voq' else False
+    return asic.show_interface(command='status',
+                               include_internal_intfs=('201811' not in asic.os_version),
+                               include_inband_intfs=include_inband_intfs)['ansible_facts']['int_status']
+
+
+def get_ip_intf_status(asic, use_ipv6=False):
+    if use_ipv6:
+        return asic.show_ipv6_interface()['ansible_facts']['ipv6_interfaces']
+    return asic.show_ip_interface()['ansible_facts']['ip_interfaces']
+
+
+class DutSnapshot(object):
+    """Facts of a DUT gathered before the check items are run.
+
+    A fact is returned by sample() only the first time it is asked for, later calls poll the DUT. The snapshot of a
+    DUT without facts polls the DUT every time, so the check items work the same without a snapshot.
+    """
+
+    def __init__(self, hostname, facts=None, gathered=None):
+        self.hostname = hostname
+        self.facts = facts or {}
+        self.gathered = gathered if gathered is not None else time.time()
+        self._sampled = set()
+
+    def networking_uptime(self, dut):
+        """Return the uptime of the networking service of the DUT, as dut.get_networking_uptime() does."""
+        uptime = self.facts.get("networking_uptime")
+        if uptime is None:
+            return dut.get_networking_uptime()
+        return uptime + timedelta(seconds=time.time() - self.gathered)
+
+    def sample(self, key, poll, *args, **kwargs):
+        """Return the fact of the snapshot the first time, the result of poll(*args, **kwargs) afterwards.
+
+        Args:
+            key (str or tuple): Name of the fact, or (name, asic index) for the facts of an asic.
+            poll (function): Function getting the fact from the DUT.
+        """
+        if key in self.facts and key not in self._sampled:
+            self._sampled.add(key)
+            return self.facts[key]
+        return poll(*args, **kwargs)
+
+
+def get_snapshot(kwargs, dut):
+    """Return the snapshot of a DUT passed to a check item by do_checks(), or an empty one."""
+    snapshots = kwargs.get("snapshots") or {}
+    return snapshots.get(dut.hostname) or DutSnapshot(dut.hostname)
+
+
+def get_snapshot_facts(check_items):
+    """Return the names of the facts to gather for the check items.
+
+    The samples are not gathered for an item waiting for other check items, which may restart services.
+    """
+    facts = set()
+    for item in check_items:
+        waits = any(dependency in check_items for dependency in CHECK_ITEM_DEPENDENCIES.get(item, []))
+        facts.update(fact for fact in SNAPSHOT_FACTS.get(item, []) if not (waits and fact in SNAPSHOT_SAMPLES))
+    return sorted(facts)
+
+
+@reset_ansible_local_tmp
+def _gather_on_dut(*args, **kwargs):
+    dut = kwargs['node']
+    results = kwargs['results']
+    use_ipv6 = kwargs['use_ipv6']
+    getters = {
+        "networking_uptime": dut.get_networking_uptime,
+        "critical_process_status": dut.all_critical_process_status,
+        "monit_services_status": dut.get_monit_services_status,
+        "config_facts": get_config_facts,
+        "phy_intf_status": get_phy_intf_status,
+        "ip_intf_status": lambda asic: get_ip_intf_status(asic, use_ipv6),
+    }
+
+    gathered = time.time()
+    facts = {}
+    # The networking uptime is gathered first, it is then computed from the time the snapshot was gathered
+    for name in sorted(kwargs['node_facts'][dut.hostname], key=lambda name: name != "networking_uptime"):
+        # A fact which could not be gathered is polled by the check items
+        try:
+            if name in ASIC_FACTS:
+                for asic in dut.asics:
+                    facts[(name, asic.asic_index)] = getters[name](asic)
+            else:
+                facts[name] = getters[name]()
+        except Exception as e:
+            logger.warning("Failed to gather {} on {}: {}".format(name, dut.hostname, repr(e)))
+    results[dut.hostname] = {"facts": facts, "gathered": gathered}
+
+
+def gather_snapshots(duthosts, facts, tbinfo):
+    """Gather the facts on all the DUTs in parallel.
+
+    Args:
+        duthosts (DutHosts): The DUTs.
+        facts (list): Names of the facts to gather.
+        tbinfo (dict): Testbed info.
+
+    Returns:
+        dict: Key is the DUT hostname, value is its DutSnapshot.
+    """
+    frontend_nodes = [node.hostname for node in duthosts.frontend_nodes]
+    node_facts = {}
+    for node in duthosts:
+        node_facts[node.hostname] = [name for name in facts
+                                     if name not in ASIC_FACTS or node.hostname in frontend_nodes]
+    nodes = [node for node in duthosts if node_facts[node.hostname]]
+    if not nodes:
+        return {}
+
+    start = time.time()
+    results = parallel_run(_gather_on_dut, (), {"node_facts": node_facts, "use_ipv6": use_ipv6_interfaces(tbinfo)},
+                           nodes, timeout=600)
+    logger.info("Gathered the facts {} of {} DUTs in {:.2f} seconds".format(facts, len(nodes), time.time() - start))
+    return {hostname: DutSnapshot(hostname, result["facts"], result["gathered"])
+            for hostname, result in results.items() if "facts" in result}
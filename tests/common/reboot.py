@@ -16,6 +16,7 @@ from .plugins.loganalyzer.utils import support_ignore_loganalyzer
 from .utilities import wait_until, get_plt_reboot_ctrl, is_ipv6_address
 from tests.common.helpers.dut_utils import ignore_t2_syslog_msgs, create_duthost_console, creds_on_dut
 from tests.common.fixtures.conn_graph_facts import get_graph_facts
+from tests.common.cache import FactsCache
 
 logger = logging.getLogger(__name__)
 
@@ -353,6 +354,8 @@ def reboot(duthost, localhost, reboot_type='cold', delay=10,
     assert not (safe_reboot and return_after_reconnect)
     pool = ThreadPool()
     hostname = duthost.hostname
+    # The image or config may change, the cached facts are validated again by their new fingerprint
+    FactsCache().invalidate_fingerprints(hostname)
     try:
         tc_name = os.environ.get('PYTEST_CURRENT_TEST').split(' ')[0]
         plt_reboot_ctrl = get_plt_reboot_ctrl(duthost, tc_name, reboot_type)
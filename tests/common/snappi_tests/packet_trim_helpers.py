@@ -372,9 +372,9 @@ def collect_trim_counters(duthost, ports, trim_queue_index):
     """Collect total drops (non-trim queues) and total packets on trim queue."""
     total_drops = 0
     trim_pkts = 0
-    for port in ports:
-        counters_raw = duthost.shell(f"show queue counters {port} --all -j")["stdout"]
-        data = json.loads(counters_raw)
+    results = duthost.run_batch([f"show queue counters {port} --all -j" for port in ports])
+    for port, result in zip(ports, results):
+        data = json.loads(result["stdout"])
         port_data = data.get(port, {})
         pytest_assert(port_data, f"Missing queue data for {port}")
         for qname, qstats in port_data.items():
@@ -425,9 +425,9 @@ def get_trim_length_bucket_count(duthost, port, trim_size):
 def validate_expected_queue_presence(duthost, ports, expected_queues, trim_queue_index):
     """Assert each expected queue (excluding trim queue) has >0 packets on at least one port."""
     queue_presence = {q: False for q in expected_queues.values()}
-    for port in ports:
-        counters_raw = duthost.shell(f"show queue counters {port} --all -j")["stdout"]
-        port_data = json.loads(counters_raw).get(port, {})
+    results = duthost.run_batch([f"show queue counters {port} --all -j" for port in ports])
+    for port, result in zip(ports, results):
+        port_data = json.loads(result["stdout"]).get(port, {})
         for qname, qstats in port_data.items():
             if not qname.startswith("UC"):
                 continue
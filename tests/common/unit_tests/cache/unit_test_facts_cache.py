@@ -0,0 +1,190 @@
+import importlib.util
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+
+MODULE_PATH = (Path(__file__).resolve().parents[2] /
+               "cache/facts_cache.py")
+
+
+def _load_target_module():
+    """Load the target module without importing the tests.common package."""
+    spec = importlib.util.spec_from_file_location(
+        "unit_target_facts_cache", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def facts_cache_module():
+    """Load a fresh copy of the module, so the singleton is not shared."""
+    return _load_target_module()
+
+
+@pytest.fixture
+def cache(facts_cache_module, tmp_path):
+    """Create a FactsCache instance using a temporary cache location."""
+    return facts_cache_module.FactsCache(cache_location=str(tmp_path))
+
+
+def _ledger(tmp_path):
+    with open(os.path.join(str(tmp_path), ".ledger")) as f:
+        return json.load(f)
+
+
+def test_write_and_read(cache, tmp_path):
+    assert cache.write("dut1", "basic_facts", {"hwsku": "sku1"})
+    cache._cache.clear()
+    assert cache.read("dut1", "basic_facts") == {"hwsku": "sku1"}
+    assert cache.read("dut1", "missing") is cache.NOTEXIST
+    assert not [f for f in os.listdir(str(tmp_path / "dut1")) if f.endswith(".tmp")]
+
+
+def test_ledger_tracks_usage(cache, tmp_path):
+    cache.write("dut1", "a", {"k": "v"})
+    cache.write("dut1", "b", {"k": "v"})
+    cache.write("dut2", "a", {"k": "v"})
+    cache.write("dut1", "a", {"k": "v" * 100})
+    assert _ledger(tmp_path) == {"total_size": cache._scan_usage()[0], "total_entries": 3}
+
+    cache.cleanup("dut1", "b")
+    assert _ledger(tmp_path) == {"total_size": cache._scan_usage()[0], "total_entries": 2}
+
+    cache.cleanup("dut1")
+    assert _ledger(tmp_path) == {"total_size": cache._scan_usage()[0], "total_entries": 1}
+
+
+def test_ledger_rebuilt_when_missing(cache, tmp_path):
+    cache.write("dut1", "a", {"k": "v"})
+    os.remove(os.path.join(str(tmp_path), ".ledger"))
+    cache.write("dut1", "b", {"k": "v"})
+    assert _ledger(tmp_path) == {"total_size": cache._scan_usage()[0], "total_entries": 2}
+
+
+def test_write_exceeds_entry_limit(facts_cache_module, cache, monkeypatch):
+    monkeypatch.setattr(facts_cache_module, "ENTRY_LIMIT", 1)
+    cache.write("dut1", "a", {"k": "v"})
+    cache.write("dut1", "a", {"k": "w"})
+    with pytest.raises(Exception, match="Cache usage exceeds limitations"):
+        cache.write("dut1", "b", {"k": "v"})
+    assert cache.read("dut1", "b") is cache.NOTEXIST
+
+
+def test_failed_write_not_charged(cache, tmp_path, monkeypatch):
+    cache.write("dut1", "a", {"k": "v"})
+
+    def fail(path, data):
+        raise IOError("disk full")
+
+    monkeypatch.setattr(cache, "_atomic_write", fail)
+    assert not cache.write("dut1", "b", {"k": "v"})
+    monkeypatch.undo()
+    assert _ledger(tmp_path) == {"total_size": cache._scan_usage()[0], "total_entries": 1}
+
+
+def test_limit_check_rescans_usage(facts_cache_module, cache, tmp_path, monkeypatch):
+    monkeypatch.setattr(facts_cache_module, "ENTRY_LIMIT", 1)
+    cache.write("dut1", "a", {"k": "v"})
+    # Removed outside of cleanup(), the ledger still counts it
+    os.remove(str(tmp_path / "dut1" / "a.pickle"))
+
+    assert cache.write("dut1", "b", {"k": "v"})
+    assert _ledger(tmp_path) == {"total_size": cache._scan_usage()[0], "total_entries": 1}
+
+
+class _Host(object):
+    """Fake host with facts and fingerprint that can be changed by tests."""
+
+    def __init__(self, hostname):
+        self.hostname = hostname
+        self.version = "v1"
+        self.gather_count = 0
+
+
+def _make_validator(validations):
+    def validator(function, func_args, func_kargs):
+        validations.append(func_args[0].hostname)
+        return func_args[0].version
+
+    return validator
+
+
+def _make_gather(facts_cache_module, validator):
+    @facts_cache_module.cached(name="basic_facts", validator=validator)
+    def gather(host):
+        host.gather_count += 1
+        return {"version": host.version}
+
+    return gather
+
+
+def test_validator_invalidates_stale_facts(facts_cache_module, cache):
+    host = _Host("dut1")
+    validations = []
+    validator = _make_validator(validations)
+    assert _make_gather(facts_cache_module, validator)(host) == {"version": "v1"}
+    assert _make_gather(facts_cache_module, validator)(host) == {"version": "v1"}
+    assert host.gather_count == 1
+    assert cache.read("dut1", "basic_facts.fingerprint") == "v1"
+
+    # Simulate next session after reimage
+    cache._cache.clear()
+    cache._fingerprints.clear()
+    cache._validated.clear()
+    host.version = "v2"
+    gather = _make_gather(facts_cache_module, validator)
+    assert gather(host) == {"version": "v2"}
+    assert gather(host) == {"version": "v2"}
+    assert host.gather_count == 2
+    assert validations == ["dut1", "dut1"]
+    assert dict(cache.stats["basic_facts"]) == {"miss": 1, "hit": 2, "stale": 1}
+
+
+def test_fingerprint_once_per_host(facts_cache_module, cache):
+    validations = []
+    validator = _make_validator(validations)
+
+    @facts_cache_module.cached(name="asic_facts", validator=validator)
+    def gather_asic(host, namespace):
+        host.gather_count += 1
+        return {"namespace": namespace}
+
+    host = _Host("dut1")
+    gather = _make_gather(facts_cache_module, validator)
+    gather(host)
+    gather_asic(host, "asic0")
+    gather_asic(host, "asic1")
+    assert validations == ["dut1"]
+
+    # After a reboot or config reload, the fingerprint is calculated again and the facts validated again
+    host.version = "v2"
+    cache.invalidate_fingerprints("dut1")
+    assert gather(host) == {"version": "v2"}
+    assert validations == ["dut1", "dut1"]
+
+
+def test_fingerprint_shared_by_xdist_workers(facts_cache_module, cache, monkeypatch):
+    monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", "run1")
+    validations = []
+    validator = _make_validator(validations)
+    host = _Host("dut1")
+    _make_gather(facts_cache_module, validator)(host)
+
+    # Another worker of the same run
+    cache._cache.clear()
+    cache._fingerprints.clear()
+    cache._validated.clear()
+    assert _make_gather(facts_cache_module, validator)(host) == {"version": "v1"}
+    assert validations == ["dut1"]
+
+    # Next run
+    monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", "run2")
+    cache._cache.clear()
+    cache._fingerprints.clear()
+    cache._validated.clear()
+    _make_gather(facts_cache_module, validator)(host)
+    assert validations == ["dut1", "dut1"]
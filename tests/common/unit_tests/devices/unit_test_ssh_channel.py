@@ -0,0 +1,189 @@
+"""
+Unit tests for tests/common/devices/ssh_channel.py (SshCommandChannel) and its use by AnsibleHostBase._run().
+
+SSH is mocked at SshCommandChannel._exec(), so the tests cover the command lines sent to the host, the
+ModuleResult-shaped result and the routing/fallback between the channel and ansible. The streams of long running
+commands are read from a fake paramiko channel.
+"""
+
+import logging
+import os
+import socket
+import sys
+from unittest.mock import MagicMock, patch
+
+import paramiko
+import pytest
+from pytest_ansible.results import ModuleResult
+
+_TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(_TEST_DIR)))
+)
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from tests.common.devices.base import AnsibleHostBase  # noqa: E402
+from tests.common.devices.ssh_channel import SshCommandChannel, SshCommandChannelError  # noqa: E402
+from tests.common.errors import RunAnsibleModuleFail  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _bypass_repo_log_format(monkeypatch):
+    """The fallback to ansible is logged, and the %(funcNamewithModule)s field of the log format in
+    tests/pytest.ini is only injected by the log_section_start plugin, which isn't loaded with --noconftest."""
+    import _pytest.logging as _pylog
+    plain = logging.Formatter("%(message)s")
+    monkeypatch.setattr(_pylog.PercentStyleMultiline, "format", lambda self, record: plain.format(record))
+
+
+def make_channel():
+    return SshCommandChannel("dut1", "10.0.0.1", "admin", ["password"])
+
+
+def make_host(channel):
+    """An AnsibleHostBase whose ansible modules are mocks."""
+    host = AnsibleHostBase.__new__(AnsibleHostBase)
+    host.hostname = "dut1"
+    host.host = MagicMock()
+    host._ssh_channel = channel
+    return host
+
+
+@pytest.mark.parametrize("module_name,module_args,complex_args,expected", [
+    ("shell", ("show version",), {}, True),
+    ("command", ("show version",), {"module_ignore_errors": True, "verbose": False}, True),
+    ("shell", ("show version",), {"chdir": "/tmp"}, False),
+    ("shell", (), {"cmd": "show version"}, False),
+    ("copy", ("src=a dest=b",), {}, False),
+])
+def test_supports(module_name, module_args, complex_args, expected):
+    assert make_channel().supports(module_name, module_args, complex_args) == expected
+
+
+def test_run_shell_result():
+    channel = make_channel()
+    with patch.object(channel, "_exec", return_value=(0, b"line1\nline2\n", b"")) as exec_mock:
+        result = channel.run("shell", "show ip bgp summary | grep -c Established")
+
+    exec_mock.assert_called_once_with(
+        "sudo -H -n -u root env LANG=C LC_ALL=C /bin/sh -c 'show ip bgp summary | grep -c Established'")
+    assert result["stdout"] == "line1\nline2"
+    assert result["stdout_lines"] == ["line1", "line2"]
+    assert result["rc"] == 0
+    assert not result.is_failed
+
+
+def test_run_command_is_not_interpreted_by_shell():
+    channel = make_channel()
+    with patch.object(channel, "_exec", return_value=(1, b"", b"error\n")) as exec_mock:
+        result = channel.run("command", "echo 'a b' $HOME")
+
+    exec_mock.assert_called_once_with("sudo -H -n -u root -- env LANG=C LC_ALL=C echo 'a b' '$HOME'")
+    assert result["cmd"] == ["echo", "a b", "$HOME"]
+    assert result["stderr_lines"] == ["error"]
+    assert result.is_failed
+    assert result["msg"] == "non-zero return code"
+
+
+def test_host_run_uses_channel():
+    channel = make_channel()
+    host = make_host(channel)
+    with patch.object(channel, "_exec", return_value=(0, b"ok\n", b"")):
+        result = host._run("shell", "true")
+    assert result["stdout"] == "ok"
+    host.host.shell.assert_not_called()
+
+
+def test_host_run_raises_on_failure_unless_ignored():
+    channel = make_channel()
+    host = make_host(channel)
+    with patch.object(channel, "_exec", return_value=(2, b"", b"")):
+        with pytest.raises(RunAnsibleModuleFail):
+            host._run("shell", "false")
+        assert host._run("shell", "false", module_ignore_errors=True)["rc"] == 2
+
+
+def test_host_run_falls_back_to_ansible_when_channel_is_unusable():
+    channel = make_channel()
+    host = make_host(channel)
+    host.host.shell.return_value = {"dut1": ModuleResult(rc=0, stdout="from ansible", failed=False)}
+    with patch.object(channel, "_transport", side_effect=paramiko.AuthenticationException("denied")):
+        with pytest.raises(SshCommandChannelError):
+            channel.run("shell", "true")
+        assert not channel.usable
+        assert host._run("shell", "true")["stdout"] == "from ansible"
+    assert host.host.shell.call_count == 1
+
+
+def test_host_run_falls_back_to_ansible_when_command_is_not_started():
+    channel = make_channel()
+    host = make_host(channel)
+    host.host.shell.return_value = {"dut1": ModuleResult(rc=0, stdout="from ansible", failed=False)}
+    with patch.object(channel, "_transport", side_effect=paramiko.SSHException("connection reset")):
+        assert host._run("shell", "true")["stdout"] == "from ansible"
+    assert channel.usable
+
+
+def test_host_run_falls_back_to_ansible_when_sudo_requires_password():
+    channel = make_channel()
+    host = make_host(channel)
+    host.host.shell.return_value = {"dut1": ModuleResult(rc=0, stdout="from ansible", failed=False)}
+    with patch.object(channel, "_exec", return_value=(1, b"", b"sudo: a password is required\n")) as exec_mock:
+        assert host._run("shell", "true")["stdout"] == "from ansible"
+        assert not channel.usable
+        assert host._run("shell", "true")["stdout"] == "from ansible"
+    assert exec_mock.call_count == 1
+    assert host.host.shell.call_count == 2
+
+
+class FakeParamikoChannel(object):
+    """Channel returning the given chunks of output, then the end of file."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.closed = False
+
+    def recv_ready(self):
+        return bool(self.chunks) and self.chunks[0] is not None
+
+    def settimeout(self, timeout):
+        pass
+
+    def recv(self, size):
+        if not self.chunks:
+            return b""
+        chunk = self.chunks.pop(0)
+        if chunk is None:
+            # No output before the timeout
+            raise socket.timeout()
+        return chunk
+
+    def close(self):
+        self.closed = True
+
+
+def test_open_stream_reads_lines():
+    channel = make_channel()
+    paramiko_channel = FakeParamikoChannel([b"AKE\n\"psub", b"scribe\",\"a\",1\r\n", None, b"last"])
+    with patch.object(channel, "_start", return_value=paramiko_channel) as start_mock:
+        with channel.open_stream("redis-cli psubscribe 'a'") as stream:
+            assert stream.readline(1) == "AKE"
+            assert stream.readline(1) == '"psubscribe","a",1'
+            assert stream.readline(1) is None
+            assert stream.readline(0) is None
+            assert stream.readline(1) == "last"
+            with pytest.raises(EOFError):
+                stream.readline(1)
+
+    start_mock.assert_called_once_with(
+        "sudo -H -n -u root env LANG=C LC_ALL=C /bin/sh -c 'redis-cli psubscribe '\"'\"'a'\"'\"''",
+        combine_stderr=True)
+    assert paramiko_channel.closed
+
+
+def test_open_stream_raises_when_channel_is_unusable():
+    channel = make_channel()
+    channel.usable = False
+    with pytest.raises(SshCommandChannelError):
+        channel.open_stream("true")
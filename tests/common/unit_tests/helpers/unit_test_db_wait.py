@@ -0,0 +1,155 @@
+"""
+Unit tests for wait_for_db_condition() in tests/common/helpers/db_wait.py.
+
+The SSH stream of redis-cli is replaced by a queue of output lines, so the tests cover the command run on the DUT,
+the checks of the condition on the keyspace notifications and the fallback to polling.
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+
+import pytest
+
+_TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(_TEST_DIR)))
+)
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from tests.common.devices.ssh_channel import SshCommandChannelError  # noqa: E402
+from tests.common.helpers.db_wait import wait_for_db_condition  # noqa: E402
+
+SUBSCRIBED = ['AKE', '"psubscribe","__keyspace@6__:MUX_CABLE_TABLE|*",1']
+
+
+class FakeStream(object):
+    """Output lines of redis-cli, put in a queue by the test."""
+
+    def __init__(self, lines):
+        self.lines = queue.Queue()
+        self.closed = False
+        for line in lines:
+            self.lines.put(line)
+
+    def readline(self, timeout):
+        try:
+            line = self.lines.get(timeout=timeout) if timeout > 0 else self.lines.get_nowait()
+        except queue.Empty:
+            return None
+        if line is EOFError:
+            raise EOFError("Command exited")
+        return line
+
+    def notify(self, key, delay=0):
+        """Put the notification of a change of key after delay seconds."""
+        line = '"pmessage","__keyspace@6__:MUX_CABLE_TABLE|*","__keyspace@6__:{}","hset"'.format(key)
+        threading.Timer(delay, self.lines.put, [line]).start()
+
+    def close(self):
+        self.closed = True
+
+
+class FakeHost(object):
+    hostname = "dut1"
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.cmds = []
+
+    def open_command_stream(self, cmd):
+        self.cmds.append(cmd)
+        if isinstance(self.stream, Exception):
+            raise self.stream
+        return self.stream
+
+
+class FakeAsic(object):
+    namespace = "asic0"
+
+    def __init__(self, sonichost):
+        self.sonichost = sonichost
+
+
+class Condition(object):
+    """Condition becoming True once the state is set, counting its checks."""
+
+    __name__ = "condition"
+
+    def __init__(self):
+        self.state = None
+        self.checks = 0
+
+    def __call__(self, expected):
+        self.checks += 1
+        return self.state == expected
+
+    def set_after(self, state, delay):
+        threading.Timer(delay, setattr, [self, "state", state]).start()
+
+
+def test_condition_checked_on_change():
+    stream = FakeStream(SUBSCRIBED)
+    host = FakeHost(stream)
+    condition = Condition()
+    condition.set_after("active", 0.1)
+    stream.notify("MUX_CABLE_TABLE|Ethernet0", 0.2)
+
+    start = time.time()
+    assert wait_for_db_condition(host, "STATE_DB", "MUX_CABLE_TABLE|*", 60, 30, 0, condition, "active")
+
+    assert time.time() - start < 5
+    assert condition.checks == 2
+    assert stream.closed
+    assert host.cmds == ["redis-cli -n 6 config get notify-keyspace-events | tail -n 1; exec timeout 70 "
+                         "redis-cli -n 6 --csv psubscribe '__keyspace@6__:MUX_CABLE_TABLE|*'"]
+
+
+def test_condition_checked_every_interval_until_timeout():
+    stream = FakeStream(SUBSCRIBED)
+    condition = Condition()
+
+    start = time.time()
+    assert not wait_for_db_condition(FakeHost(stream), "STATE_DB", "MUX_CABLE_TABLE|*", 0.5, 0.1, 0,
+                                     condition, "active")
+
+    assert 0.5 <= time.time() - start < 5
+    assert condition.checks >= 5
+
+
+def test_subscribed_in_namespace_of_asic():
+    host = FakeHost(FakeStream(['AKE', '"psubscribe","__keyspace@0__:PORT_TABLE:*",1',
+                                '"psubscribe","__keyspace@0__:LAG_TABLE:*",2']))
+    condition = Condition()
+    condition.state = "up"
+
+    assert wait_for_db_condition(FakeAsic(host), 0, ["PORT_TABLE:*", "LAG_TABLE:*"], 10, 1, 0, condition, "up")
+    assert host.cmds[0].startswith("ip netns exec asic0 redis-cli -n 0 config get notify-keyspace-events")
+    assert host.cmds[0].endswith("--csv psubscribe '__keyspace@0__:PORT_TABLE:*' '__keyspace@0__:LAG_TABLE:*'")
+
+
+@pytest.mark.parametrize("stream", [
+    FakeStream(['""', '"psubscribe","__keyspace@6__:MUX_CABLE_TABLE|*",1']),
+    FakeStream(["Could not connect to Redis at 127.0.0.1:6379: Connection refused", EOFError]),
+    SshCommandChannelError("No SSH credential of dut1 in inventory"),
+], ids=["notifications_disabled", "redis_unavailable", "no_ssh_channel"])
+def test_fallback_to_polling(stream):
+    condition = Condition()
+    condition.set_after("active", 0.2)
+
+    assert wait_for_db_condition(FakeHost(stream), "STATE_DB", "MUX_CABLE_TABLE|*", 10, 0.05, 0, condition, "active")
+    assert condition.checks > 2
+    if isinstance(stream, FakeStream):
+        assert stream.closed
+
+
+def test_polling_after_redis_cli_exited():
+    stream = FakeStream(SUBSCRIBED + [EOFError])
+    condition = Condition()
+    condition.set_after("active", 0.2)
+
+    assert wait_for_db_condition(FakeHost(stream), "STATE_DB", "MUX_CABLE_TABLE|*", 10, 0.05, 0, condition, "active")
+    assert condition.checks > 2
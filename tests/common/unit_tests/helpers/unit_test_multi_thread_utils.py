@@ -0,0 +1,111 @@
+"""
+Unit tests for run_in_threads() and run_with_dependencies() in tests/common/helpers/multi_thread_utils.py.
+
+run_in_threads() is used to fan out duthosts.<module>() and asic_index="all" calls, so results must keep the
+order of the items and errors must be the ones a serial loop would raise. run_with_dependencies() runs the sanity
+check items, an item must not start before the items it depends on are done.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+_TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(_TEST_DIR)))
+)
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from tests.common.helpers.multi_thread_utils import run_in_threads, run_with_dependencies  # noqa: E402
+
+
+@pytest.mark.parametrize("max_parallel", [1, 4])
+def test_results_keep_order_of_items(max_parallel):
+    def _call(item):
+        time.sleep(0.01 * (5 - item))
+        return item * 10
+
+    timings = {}
+    assert run_in_threads(_call, range(5), max_parallel=max_parallel, timings=timings) == [0, 10, 20, 30, 40]
+    assert sorted(timings) == ["0", "1", "2", "3", "4"]
+
+
+def test_calls_run_concurrently_up_to_max_parallel():
+    lock = threading.Lock()
+    running = [0, 0]    # current, peak
+
+    def _call(item):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(0.1)
+        with lock:
+            running[0] -= 1
+
+    run_in_threads(_call, range(8), max_parallel=3)
+    assert running[1] == 3
+
+
+def test_first_failed_item_exception_is_raised():
+    calls = []
+
+    def _call(item):
+        calls.append(item)
+        if item in (1, 3):
+            time.sleep(0.05 * (3 - item))
+            pytest.fail("failed on {}".format(item))
+        return item
+
+    with pytest.raises(pytest.fail.Exception, match="failed on 1"):
+        run_in_threads(_call, range(4), max_parallel=4)
+    assert sorted(calls) == [0, 1, 2, 3]
+
+
+def test_items_start_after_their_dependencies():
+    done = []
+    started = {}
+
+    def _call(item):
+        started[item] = list(done)
+        time.sleep(0.1 if item == "slow" else 0.01)
+        done.append(item)
+        return item.upper()
+
+    dependencies = {"after_fast": ["fast"], "after_both": ["fast", "slow"], "fast": ["not_checked"]}
+    timings = {}
+    results = run_with_dependencies(_call, ["slow", "after_both", "fast", "after_fast"], dependencies,
+                                    max_parallel=4, timings=timings)
+
+    assert results == ["SLOW", "AFTER_BOTH", "FAST", "AFTER_FAST"]
+    assert sorted(timings) == ["after_both", "after_fast", "fast", "slow"]
+    assert "fast" in started["after_fast"] and "slow" not in started["after_fast"]
+    assert {"fast", "slow"} <= set(started["after_both"])
+
+
+def test_items_depending_on_failed_item_are_not_called():
+    calls = []
+
+    def _call(item):
+        calls.append(item)
+        if item == "b":
+            pytest.fail("failed on b")
+        return item
+
+    with pytest.raises(pytest.fail.Exception, match="failed on b"):
+        run_with_dependencies(_call, ["a", "b", "c", "d"], {"c": ["b"], "d": ["c"]}, max_parallel=4)
+    assert sorted(calls) == ["a", "b"]
+
+
+def test_serial_calls_keep_order_of_items():
+    calls = []
+    assert run_with_dependencies(calls.append, ["b", "a"], {"b": ["a"]}) == [None, None]
+    assert calls == ["b", "a"]
+
+
+def test_circular_dependencies_are_rejected():
+    with pytest.raises(ValueError, match="Circular"):
+        run_with_dependencies(lambda item: item, ["a", "b", "c"], {"a": ["b"], "b": ["a"]}, max_parallel=2)
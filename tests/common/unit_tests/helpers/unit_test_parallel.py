@@ -0,0 +1,82 @@
+"""
+Unit tests for the scheduler of parallel_run() in tests/common/helpers/parallel.py.
+
+The target functions only sleep, so the tests check that a slot is refilled as soon as any process exits,
+that the timeout applies to each node separately and that exceptions of the processes are still reported.
+"""
+
+import logging
+import os
+import sys
+import time
+
+import pytest
+
+_TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(_TEST_DIR)))
+)
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from tests.common.helpers.parallel import parallel_run  # noqa: E402
+
+
+class FakeNode(object):
+    def __init__(self, hostname, duration):
+        self.hostname = hostname
+        self.duration = duration
+
+    def __str__(self):
+        return self.hostname
+
+
+def sleep_target(node=None, results=None):
+    time.sleep(node.duration)
+    results[node.hostname] = {"host": node.hostname, "failed": False}
+
+
+def failing_target(node=None, results=None):
+    raise RuntimeError("failure on {}".format(node.hostname))
+
+
+@pytest.fixture(autouse=True)
+def _bypass_repo_log_format(monkeypatch):
+    """Processes killed on timeout are logged, and the %(funcNamewithModule)s field of the log format in
+    tests/pytest.ini is only injected by the log_section_start plugin, which isn't loaded with --noconftest."""
+    import _pytest.logging as _pylog
+    plain = logging.Formatter("%(message)s")
+    monkeypatch.setattr(_pylog.PercentStyleMultiline, "format", lambda self, record: plain.format(record))
+
+
+def test_slot_is_refilled_when_any_process_exits():
+    nodes = [FakeNode("dut0", 1.0), FakeNode("dut1", 0.1), FakeNode("dut2", 0.1), FakeNode("dut3", 0.1)]
+    timings = {}
+
+    results = parallel_run(sleep_target, (), {}, nodes, concurrent_tasks=2, timings=timings)
+
+    assert sorted(results) == ["dut0", "dut1", "dut2", "dut3"]
+    # dut2 and dut3 don't wait for the slow dut0 of the first "wave"
+    assert timings["dut3"]["end"] < timings["dut0"]["end"]
+    assert not any(timing["timed_out"] for timing in timings.values())
+
+
+def test_timeout_applies_to_each_node():
+    nodes = [FakeNode("dut0", 30), FakeNode("dut1", 0.1), FakeNode("dut2", 0.1)]
+    timings = {}
+    start = time.time()
+
+    results = parallel_run(sleep_target, (), {}, nodes, timeout=1, concurrent_tasks=2,
+                           init_result={"failed": False, "check_items": []}, timings=timings)
+
+    assert time.time() - start < 10
+    assert results["dut0"] == {"host": "dut0", "failed": True, "check_items": []}
+    assert results["dut1"] == {"host": "dut1", "failed": False}
+    assert results["dut2"] == {"host": "dut2", "failed": False}
+    assert timings["dut0"]["timed_out"]
+    assert not timings["dut2"]["timed_out"]
+
+
+def test_exception_of_process_fails_the_run():
+    with pytest.raises(pytest.fail.Exception, match="failure on dut0"):
+        parallel_run(failing_target, (), {}, [FakeNode("dut0", 0)])
@@ -0,0 +1,93 @@
+"""
+Unit tests for tests/common/helpers/show_parser.py, the parser used by SonicHost.show_and_parse().
+"""
+
+import logging
+import os
+import sys
+
+import pytest
+
+_TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(_TEST_DIR)))
+)
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from tests.common.helpers.show_parser import ShowParser, is_separation_line  # noqa: E402
+
+INTERFACE_STATUS = [
+    "  Interface            Lanes    Speed    MTU  Alias             Vlan    Oper    Admin",
+    "-----------  ---------------  -------  -----  -------  ---------------  ------  -------",
+    "  Ethernet0          0,1,2,3      40G   9100     etp1  PortChannel0002      up       up",
+    "  Ethernet4          4,5,6,7      40G   9100     etp2  PortChannel0002    down       up",
+    "",
+    "Some trailing message",
+]
+
+QUEUE_COUNTERS = [
+    "                Counter/   Counter/",
+    "     Port  TxQ      pkts      bytes",
+    "---------  ---  --------  ---------",
+    "Ethernet0  UC0        10       1500",
+]
+
+
+@pytest.fixture(autouse=True)
+def _bypass_repo_log_format(monkeypatch):
+    """Parse errors are logged, and the %(funcNamewithModule)s field of the log format in tests/pytest.ini is only
+    injected by the log_section_start plugin, which isn't loaded with --noconftest."""
+    import _pytest.logging as _pylog
+    plain = logging.Formatter("%(message)s")
+    monkeypatch.setattr(_pylog.PercentStyleMultiline, "format", lambda self, record: plain.format(record))
+
+
+def test_parse_rows():
+    table = ShowParser().parse(INTERFACE_STATUS)
+    assert table.to_list() == [
+        {"interface": "Ethernet0", "lanes": "0,1,2,3", "speed": "40G", "mtu": "9100", "alias": "etp1",
+         "vlan": "PortChannel0002", "oper": "up", "admin": "up"},
+        {"interface": "Ethernet4", "lanes": "4,5,6,7", "speed": "40G", "mtu": "9100", "alias": "etp2",
+         "vlan": "PortChannel0002", "oper": "down", "admin": "up"},
+    ]
+    assert list(table) == table.to_list()
+    assert table[1]["oper"] == "down"
+    assert len(table) == 2
+
+
+def test_parse_columns():
+    table = ShowParser().parse(INTERFACE_STATUS)
+    assert table.column("interface") == ["Ethernet0", "Ethernet4"]
+    assert table.columns["oper"] == ["up", "down"]
+
+
+def test_multi_line_headers():
+    table = ShowParser().parse(QUEUE_COUNTERS, header_len=2)
+    assert table.to_list() == [{"port": "Ethernet0", "txq": "UC0", "counter/ pkts": "10", "counter/ bytes": "1500"}]
+
+
+def test_layout_is_cached_by_key_and_invalidated_on_header_change():
+    parser = ShowParser()
+    parser.parse(INTERFACE_STATUS, key="show interface status")
+    layout = parser._layouts["show interface status"]
+
+    parser.parse(INTERFACE_STATUS[:3], key="show interface status")
+    assert parser._layouts["show interface status"] is layout
+
+    width = len(INTERFACE_STATUS[1])
+    wider = [line.ljust(width) + suffix for line, suffix in zip(INTERFACE_STATUS, ["  Type", "  ----", "  QSFP"])]
+    table = parser.parse(wider, key="show interface status")
+    assert parser._layouts["show interface status"] is not layout
+    assert table[0]["type"] == "QSFP"
+
+
+def test_no_separation_line():
+    assert ShowParser().parse(["No data"]) is None
+
+
+def test_is_separation_line():
+    assert is_separation_line("---  ----")
+    assert is_separation_line("  ---  ")
+    assert not is_separation_line("   ")
+    assert not is_separation_line("--- a")
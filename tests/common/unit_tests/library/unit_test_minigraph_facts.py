@@ -0,0 +1,250 @@
+"""
+Unit tests for ansible/library/minigraph_facts.py.
+
+minigraph_facts_expected.json holds the facts returned by parse_xml() before the single-pass parsing and the cached
+facts were introduced, for minigraph/SONIC01DPU.xml and for every namespace of the multi-asic minigraph generated by
+generate_minigraph(path, 2, 3, 4). The minigraph_as_xml fact, the path of the minigraph, is left out. The ansible
+library directory is the module search path of ansible, so the unit tests of its modules are kept here.
+"""
+import contextlib
+import copy
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("ansible.module_utils.basic")
+pytest.importorskip("lxml")
+
+ANSIBLE_DIR = Path(__file__).resolve().parents[4] / "ansible"
+MODULE_PATH = ANSIBLE_DIR / "library/minigraph_facts.py"
+SAMPLE_MINIGRAPH = str(ANSIBLE_DIR / "minigraph/SONIC01DPU.xml")
+EXPECTED_FACTS_FILE = str(Path(__file__).resolve().parent / "minigraph_facts_expected.json")
+HOSTNAME = "SONIC01DPU"
+
+
+def _load_target_module():
+    """Load the target module, with module_utils imported from the ansible directory as outside of ansible."""
+    if str(ANSIBLE_DIR) not in sys.path:
+        sys.path.insert(0, str(ANSIBLE_DIR))
+    spec = importlib.util.spec_from_file_location("unit_target_minigraph_facts", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+minigraph_facts = _load_target_module()
+
+
+def _text(parent, tag, text):
+    minigraph_facts.ET.SubElement(parent, tag).text = text
+
+
+def generate_minigraph(path, asics, neighbors, ports):
+    """
+    Write a minigraph generated from minigraph/SONIC01DPU.xml, with the data plane of the host copied for asics
+    asics, neighbors BGP neighbors linked to the host and ports ports in the device infos.
+
+    Returns:
+        tuple: The hostname and the names of the asics of the minigraph.
+    """
+    TAG, TAG1 = minigraph_facts.TAG, minigraph_facts.TAG1
+    tree = minigraph_facts.ET.parse(SAMPLE_MINIGRAPH)
+    root = tree.getroot()
+    hostname = root.find(TAG["Hostname"]).text
+
+    dpg = root.find(TAG["DpgDec"])
+    host_dpg = dpg.find(TAG["DeviceDataPlaneInfo"])
+    for asic in range(asics):
+        asic_dpg = copy.deepcopy(host_dpg)
+        asic_dpg.find(TAG["Hostname"]).text = "ASIC{}".format(asic)
+        dpg.append(asic_dpg)
+
+    cpg = root.find(TAG["CpgDec"])
+    sessions = cpg.find(TAG["PeeringSessions"])
+    routers = cpg.find(TAG["Routers"])
+    png = root.find(TAG["PngDec"])
+    links = png.find(TAG["DeviceInterfaceLinks"])
+    devices = png.find(TAG["Devices"])
+    for neighbor in range(neighbors):
+        name = "ARISTA{:04d}T1".format(neighbor)
+        session = minigraph_facts.ET.SubElement(sessions, TAG["BGPSession"])
+        _text(session, TAG["StartRouter"], hostname)
+        _text(session, TAG["StartPeer"], "10.{}.{}.0".format(neighbor // 128, neighbor % 128 * 2))
+        _text(session, TAG["EndRouter"], name)
+        _text(session, TAG["EndPeer"], "10.{}.{}.1".format(neighbor // 128, neighbor % 128 * 2))
+        router = minigraph_facts.ET.SubElement(routers, TAG1["BGPRouterDeclaration"])
+        _text(router, TAG1["ASN"], str(64600 + neighbor))
+        _text(router, TAG1["Hostname"], name)
+        link = minigraph_facts.ET.SubElement(links, TAG["DeviceLinkBase"])
+        _text(link, TAG["ElementType"], "DeviceInterfaceLink")
+        _text(link, TAG["EndDevice"], name)
+        _text(link, TAG["EndPort"], "Ethernet1")
+        _text(link, TAG["StartDevice"], hostname)
+        _text(link, TAG["StartPort"], "fortyGigE0/{}".format(neighbor % 32 * 4))
+        _text(link, TAG["ChassisInternal"], "false")
+        device = minigraph_facts.ET.SubElement(devices, TAG["Device"])
+        _text(device, TAG["Hostname"], name)
+        _text(device, TAG["HwSku"], "Arista-VM")
+        _text(device, TAG["ElementType"], "LeafRouter")
+
+    interfaces = root.find(TAG["DeviceInfos"]).find(TAG["DeviceInfo"]).find(TAG["EthernetInterfaces"])
+    interface = interfaces[0]
+    for port in range(ports):
+        interface = copy.deepcopy(interface)
+        interface.find(TAG["InterfaceName"]).text = "Ethernet{}".format(port)
+        interfaces.append(interface)
+
+    tree.write(path)
+    return hostname, ["asic{}".format(asic) for asic in range(asics)]
+
+
+@pytest.fixture(scope="module")
+def expected_facts():
+    with open(EXPECTED_FACTS_FILE) as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def minigraphs(tmp_path_factory):
+    path = tmp_path_factory.mktemp("minigraph")
+    multi_asic = str(path / "multi_asic.xml")
+    assert generate_minigraph(multi_asic, 2, 3, 4) == (HOSTNAME, ["asic0", "asic1"])
+    return {"SONIC01DPU.xml": SAMPLE_MINIGRAPH, "multi_asic.xml": multi_asic}
+
+
+def _cases(expected_facts):
+    for key in sorted(expected_facts):
+        minigraph, namespace = key.split("|")
+        yield key, minigraph, namespace or None
+
+
+def _without_path(facts, path):
+    facts = dict(facts)
+    assert facts.pop("minigraph_as_xml") == path
+    return facts
+
+
+@pytest.mark.parametrize("cache", [False, True], ids=["parse", "cached"])
+def test_facts_match_former_parse_xml(expected_facts, minigraphs, tmp_path, cache):
+    cache_dir = str(tmp_path / "facts") if cache else None
+    for key, minigraph, namespace in _cases(expected_facts):
+        path = minigraphs[minigraph]
+        if not cache:
+            facts = json.loads(json.dumps(minigraph_facts.parse_xml(path, HOSTNAME, namespace),
+                                          cls=minigraph_facts.minigraph_encoder))
+            assert _without_path(facts, path) == expected_facts[key], key
+        # Twice with the cache: parsed and saved, then loaded
+        for _ in range(2 if cache else 1):
+            facts = minigraph_facts.get_minigraph_facts(path, HOSTNAME, namespace, cache_dir)
+            assert _without_path(facts, path) == expected_facts[key], key
+
+
+@pytest.fixture
+def minigraph_copy(minigraphs, tmp_path):
+    path = str(tmp_path / "minigraph.xml")
+    shutil.copy(minigraphs["multi_asic.xml"], path)
+    return path
+
+
+def _get_facts(path, namespace, cache_dir):
+    """Return the facts and whether the minigraph was read."""
+    with patch.object(minigraph_facts, "read_minigraph_sections",
+                      side_effect=minigraph_facts.read_minigraph_sections) as read_mock:
+        facts = minigraph_facts.get_minigraph_facts(path, HOSTNAME, namespace, cache_dir)
+    return facts, read_mock.called
+
+
+def test_namespaces_cached_by_first_call(minigraph_copy, tmp_path):
+    cache_dir = str(tmp_path / "facts")
+    assert _get_facts(minigraph_copy, "asic1", cache_dir)[1]
+    for namespace in (None, "asic0", "asic1"):
+        assert not _get_facts(minigraph_copy, namespace, cache_dir)[1], namespace
+
+
+def test_cache_invalidated_when_minigraph_changes(minigraph_copy, tmp_path):
+    cache_dir = str(tmp_path / "facts")
+    facts, _ = _get_facts(minigraph_copy, "asic0", cache_dir)
+    mtime = os.path.getmtime(minigraph_copy)
+    with open(minigraph_copy) as f:
+        content = f.read()
+    # Same size and modification time, only the sha1 of the content changes
+    with open(minigraph_copy, "w") as f:
+        f.write(content.replace("ARISTA0000T1", "ARISTA9999T1"))
+    os.utime(minigraph_copy, (mtime, mtime))
+
+    new_facts, parsed = _get_facts(minigraph_copy, "asic0", cache_dir)
+    assert parsed
+    assert "ARISTA9999T1" in new_facts["minigraph_devices"]
+    assert "ARISTA0000T1" in facts["minigraph_devices"]
+    assert not _get_facts(minigraph_copy, None, cache_dir)[1]
+
+
+def test_cache_invalidated_when_port_maps_change(minigraph_copy, tmp_path):
+    cache_dir = str(tmp_path / "facts")
+    facts, _ = _get_facts(minigraph_copy, None, cache_dir)
+    get_port_maps = minigraph_facts.get_port_alias_to_name_map
+
+    def renamed_port_maps(hwsku, asic_name=None):
+        port_alias_to_name_map, port_alias_asic_map, port_name_to_index_map = get_port_maps(hwsku, asic_name)
+        port_alias_to_name_map = {alias: name.replace("Ethernet", "Eth") for alias, name in
+                                  port_alias_to_name_map.items()}
+        return port_alias_to_name_map, port_alias_asic_map, port_name_to_index_map
+
+    with patch.object(minigraph_facts, "get_port_alias_to_name_map", side_effect=renamed_port_maps):
+        new_facts, parsed = _get_facts(minigraph_copy, None, cache_dir)
+        assert parsed
+        assert new_facts != facts
+        assert not _get_facts(minigraph_copy, None, cache_dir)[1]
+    # Back to the former port maps, the facts are parsed again
+    assert _get_facts(minigraph_copy, None, cache_dir) == (facts, True)
+
+
+def _other_port_indices(asic_id, port_name_list_sorted):
+    return {name: index for index, name in enumerate(port_name_list_sorted)}
+
+
+@contextlib.contextmanager
+def _port_utils_changed():
+    """Change the code of a port_utils function, as if port_utils was updated."""
+    function = minigraph_facts.get_port_indices_for_asic
+    code = function.__code__
+    function.__code__ = _other_port_indices.__code__
+    try:
+        yield
+    finally:
+        function.__code__ = code
+
+
+@pytest.mark.parametrize("change", ["constant", "port_utils"])
+def test_cache_invalidated_when_code_changes(minigraph_copy, tmp_path, change):
+    cache_dir = str(tmp_path / "facts")
+    _get_facts(minigraph_copy, None, cache_dir)
+    if change == "constant":
+        changed = patch.object(minigraph_facts, "VLAN_SUB_INTERFACE_VLAN_ID", "20")
+    else:
+        changed = _port_utils_changed()
+    # The code fingerprint is computed again with the change, and again after it
+    with patch.object(minigraph_facts, "_code_fingerprints", []), changed:
+        assert _get_facts(minigraph_copy, None, cache_dir)[1]
+    with patch.object(minigraph_facts, "_code_fingerprints", []):
+        assert _get_facts(minigraph_copy, None, cache_dir)[1]
+
+
+def test_cache_inputs_same_in_every_run():
+    script = ("import importlib.util, sys; sys.path.insert(0, sys.argv[1]);"
+              "spec = importlib.util.spec_from_file_location('minigraph_facts', sys.argv[2]);"
+              "module = importlib.util.module_from_spec(spec); spec.loader.exec_module(module);"
+              "print(module._facts_inputs('Force10-S6000', None))")
+    inputs = set()
+    for seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        inputs.add(subprocess.check_output([sys.executable, "-c", script, str(ANSIBLE_DIR), str(MODULE_PATH)],
+                                           env=env))
+    assert len(inputs) == 1
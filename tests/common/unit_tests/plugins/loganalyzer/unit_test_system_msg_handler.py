@@ -0,0 +1,184 @@
+import importlib.util
+import json
+import random
+import re
+from pathlib import Path
+
+import pytest
+
+
+MODULE_PATH = (Path(__file__).resolve().parents[3] /
+               "plugins/loganalyzer/system_msg_handler.py")
+
+
+def _load_target_module():
+    """Load the target module without importing the tests.common package."""
+    spec = importlib.util.spec_from_file_location(
+        "unit_target_system_msg_handler", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def handler_module():
+    """Load and return the system_msg_handler target module."""
+    return _load_target_module()
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "\n",
+    "single line without new line",
+    "line1\nline2\n",
+    "line1\nline2",
+    "\n\nline3\n\n",
+    "aéb\ncd\n" * 7,
+    "line1\r\nline2\r\n",
+    "line1\rline2\r",
+    "\r\n\r\n\r\r\n\n",
+    "a\r\nb\rc\nd",
+    "ab\r\r\ncd\n\r",
+])
+@pytest.mark.parametrize("block_size", [1, 2, 3, 5, 1024])
+def test_reverse_readlines_matches_readlines(handler_module, tmp_path, content, block_size):
+    log_file = tmp_path / "syslog"
+    log_file.write_bytes(content.encode("utf-8"))
+    with open(str(log_file), "r", encoding="utf-8") as f:
+        expected = list(reversed(f.readlines()))
+    assert list(handler_module.reverse_readlines(str(log_file), block_size=block_size)) == expected
+
+
+def test_reverse_readlines_random_content(handler_module, tmp_path):
+    rand = random.Random(1)
+    lines = ["x" * rand.randint(0, 40) + "\n" for _ in range(500)]
+    log_file = tmp_path / "syslog"
+    log_file.write_text("".join(lines))
+    for block_size in (7, 64, 4096):
+        assert list(handler_module.reverse_readlines(str(log_file), block_size=block_size)) == lines[::-1]
+
+
+def test_reverse_readlines_random_line_ends(handler_module, tmp_path):
+    rand = random.Random(2)
+    content = "".join(rand.choice(["x", "y", "\r", "\n", "\r\n"]) for _ in range(2000))
+    log_file = tmp_path / "syslog"
+    log_file.write_bytes(content.encode("utf-8"))
+    with open(str(log_file), "r", encoding="utf-8") as f:
+        expected = list(reversed(f.readlines()))
+    for block_size in (1, 2, 3, 7, 64):
+        assert list(handler_module.reverse_readlines(str(log_file), block_size=block_size)) == expected
+
+
+def _write_syslog(path, run_id):
+    lines = ["Jan  1 00:00:00 dut ERR before start marker {}\n".format(i) for i in range(50)]
+    lines.append("Jan  1 00:00:01 dut INFO start-LogAnalyzer-{}\n".format(run_id))
+    for i in range(200):
+        if i % 10 == 0:
+            lines.append("Jan  1 00:00:02 dut ERR swss#orchagent: failure {}\n".format(i))
+        elif i % 15 == 0:
+            lines.append("Jan  1 00:00:02 dut ERR ignored failure {}\n".format(i))
+        elif i % 21 == 0:
+            lines.append("Jan  1 00:00:02 dut NOTICE expected message {}\n".format(i))
+        else:
+            lines.append("Jan  1 00:00:02 dut INFO normal message {}\n".format(i))
+    lines.append("Jan  1 00:00:03 dut INFO end-LogAnalyzer-{}\n".format(run_id))
+    lines.extend("Jan  1 00:00:04 dut ERR after end marker {}\n".format(i) for i in range(50))
+    path.write_text("".join(lines))
+
+
+def test_analyze_file_streaming_matches_readlines(handler_module, tmp_path):
+    run_id = "test_run"
+    log_file = tmp_path / "syslog"
+    _write_syslog(log_file, run_id)
+    analyzer = handler_module.AnsibleLogAnalyzer(run_id, False)
+    regexes = (re.compile(r".*ERR.*"), re.compile(r".*ignored failure.*"), re.compile(r".*expected message.*"))
+
+    streaming = analyzer.analyze_file(str(log_file), *regexes)
+    legacy = analyzer.analyze_file(str(log_file), *regexes, streaming=False)
+    assert streaming == legacy
+    assert len(streaming[0]) == 20
+    assert len(streaming[1]) == 8
+
+
+def test_filter_action_prints_matching_lines(handler_module, tmp_path, capsys):
+    run_id = "test_run"
+    log_file = tmp_path / "syslog"
+    _write_syslog(log_file, run_id)
+    regex_file = tmp_path / "regex.json"
+    regex_file.write_text(json.dumps({"match": [r".*ERR.*"], "ignore": [r".*ignored failure.*"],
+                                      "expect": [r".*expected message.*"]}))
+
+    assert handler_module.main(["--action", "filter", "--run_id", run_id, "--logs", str(log_file),
+                                "--regex_file", str(regex_file)]) == 0
+    output = json.loads(capsys.readouterr().out)
+    result = output["result"]
+
+    analyzer = handler_module.AnsibleLogAnalyzer(run_id, False)
+    regexes = (re.compile(r".*ERR.*"), re.compile(r".*ignored failure.*"), re.compile(r".*expected message.*"))
+    matching_lines, expected_lines = analyzer.analyze_file(str(log_file), *regexes)
+    assert result == {str(log_file): [matching_lines[::-1], expected_lines[::-1]]}
+    assert output["hit_counts"] == {"match": {r".*ERR.*": 27}, "ignore": {r".*ignored failure.*": 7},
+                                    "expect": {r".*expected message.*": 8}}
+
+
+@pytest.mark.parametrize("pattern, literal", [
+    (r".*ERR swss#orchagent:.*", "ERR swss#orchagent:"),
+    (r"abc\d+defgh", "defgh"),
+    (r"(foo|bar) bazz", " bazz"),
+    (r"(?:prefix-)\s+x", "prefix-"),
+    (r"(?i)case insensitive", "case insensitive"),
+    (r"a|bcd", ""),
+    (r"(?=lookahead)x", "x"),
+    (r"(abc)?d", "d"),
+])
+def test_required_literal(handler_module, pattern, literal):
+    assert handler_module.required_literal(handler_module.sre_parse.parse(pattern)) == literal
+
+
+def test_regex_set_matches_alternation_and_counts_hits(handler_module):
+    ignore_file = MODULE_PATH.parent / "loganalyzer_common_ignore.txt"
+    analyzer = handler_module.AnsibleLogAnalyzer("test_run", False)
+    regex_set, patterns = analyzer.create_msg_regex([str(ignore_file)])
+    alternation = re.compile("|".join(patterns))
+
+    lines = ["Jan  1 00:00:00 dut ERR random error {}\n".format(i) for i in range(20)]
+    for pattern in patterns:
+        literal = handler_module.required_literal(handler_module.sre_parse.parse(pattern))
+        lines.append("Jan  1 00:00:00 dut ERR {}\n".format(literal))
+        lines.append("Jan  1 00:00:00 dut ERR swss#orchagent: {} trailing\n".format(literal))
+    for line in lines:
+        assert bool(regex_set.search(line)) == bool(alternation.search(line)), line
+
+    compiled = [re.compile(pattern) for pattern in patterns]
+    expected_hits = [sum(1 for line in lines if regex.search(line)) for regex in compiled]
+    assert regex_set.hits == expected_hits
+    assert regex_set.unused_patterns() == [p for p, hits in zip(patterns, expected_hits) if hits == 0]
+
+
+def test_regex_set_ignore_case_disables_prefilter(handler_module):
+    regex_set = handler_module.RegexSet([r"(?i)error occurred", r"warning"])
+    assert regex_set.search("ERROR OCCURRED")
+    assert not regex_set.search("nothing")
+    assert regex_set.hit_counts() == {r"(?i)error occurred": 1, r"warning": 0}
+
+
+def test_place_marker_to_file_records_marker_index(handler_module, tmp_path, monkeypatch):
+    index_file = tmp_path / "extract_log_index.json"
+    monkeypatch.setattr(handler_module, "MARKER_INDEX_FILE", str(index_file))
+    monkeypatch.setattr(handler_module, "MARKER_INDEX_SIZE", 3)
+    log_file = tmp_path / "syslog"
+    log_file.write_text("Jan  1 00:00:00 dut INFO before markers\n")
+    analyzer = handler_module.AnsibleLogAnalyzer("test_run", False)
+
+    offsets = {}
+    for i in range(5):
+        offsets["start-LogAnalyzer-{}".format(i)] = log_file.stat().st_size
+        analyzer.place_marker_to_file(str(log_file), "start-LogAnalyzer-{}".format(i))
+
+    markers = json.loads(index_file.read_text())[str(log_file)]
+    assert list(markers) == ["start-LogAnalyzer-2", "start-LogAnalyzer-3", "start-LogAnalyzer-4"]
+    content = log_file.read_bytes()
+    for marker, (inode, offset) in markers.items():
+        assert inode == log_file.stat().st_ino
+        assert offset == offsets[marker]
+        assert content[offset:].split(b"\n", 1)[0].endswith(marker.encode())
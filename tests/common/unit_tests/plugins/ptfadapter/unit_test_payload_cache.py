@@ -0,0 +1,170 @@
+import gc
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+ptf_mask = pytest.importorskip("ptf.mask")
+scapy = pytest.importorskip("ptf.packet")
+testutils = pytest.importorskip("ptf.testutils")
+match_exp_pkt = pytest.importorskip("ptf.dataplane").match_exp_pkt
+
+
+MODULE_PATH = (Path(__file__).resolve().parents[3] /
+               "plugins/ptfadapter/payload_cache.py")
+PATTERN = "test_module "
+
+
+def _load_target_module():
+    """Load the target module without importing the tests.common package."""
+    spec = importlib.util.spec_from_file_location(
+        "unit_target_payload_cache", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def cache_module():
+    """Load and return the payload_cache target module."""
+    return _load_target_module()
+
+
+class PayloadUpdater(object):
+    """Update the payload like PtfTestAdapter.update_payload() does, counting the updates."""
+
+    def __init__(self):
+        self.pattern = PATTERN
+        self.updates = 0
+
+    def __call__(self, pkt):
+        self.updates += 1
+        exp_pkt = pkt.exp_pkt if isinstance(pkt, ptf_mask.Mask) else pkt
+        for proto in (scapy.UDP, scapy.TCP):
+            if proto in exp_pkt:
+                load = exp_pkt[proto].load
+                exp_pkt[proto].load = (self.pattern * (len(load) // len(self.pattern) + 1))[:len(load)]
+        return pkt
+
+
+@pytest.fixture
+def cache(cache_module):
+    return cache_module.PayloadCache(PayloadUpdater())
+
+
+def _masked(pkt):
+    masked = ptf_mask.Mask(pkt)
+    masked.set_do_not_care_packet(scapy.Ether, "dst")
+    masked.set_do_not_care_packet(scapy.IP, "ttl")
+    masked.set_do_not_care_packet(scapy.IP, "chksum")
+    return masked
+
+
+def _received(pkt, ttl=63):
+    rcvd = pkt.copy()
+    rcvd[scapy.Ether].dst = "00:11:22:33:44:55"
+    rcvd[scapy.IP].ttl = ttl
+    return bytes(rcvd)
+
+
+def test_raw_packet_is_updated_once(cache):
+    pkt = testutils.simple_tcp_packet(pktlen=200)
+
+    raw = cache.raw_packet(pkt, PATTERN)
+
+    assert raw == bytes(pkt)
+    assert PATTERN.encode() in raw
+    assert cache.raw_packet(pkt, PATTERN) is raw
+    assert cache.update_payload.updates == 1
+
+
+def test_raw_packet_is_updated_again_when_modified(cache):
+    pkt = testutils.simple_udp_packet(pktlen=200)
+    cache.raw_packet(pkt, PATTERN)
+
+    pkt[scapy.IP].dst = "10.0.0.2"
+    raw = cache.raw_packet(pkt, PATTERN)
+
+    assert raw == bytes(pkt)
+    assert scapy.Ether(raw)[scapy.IP].dst == "10.0.0.2"
+    assert cache.update_payload.updates == 2
+
+    cache.update_payload.pattern = "other_module "
+    raw = cache.raw_packet(pkt, "other_module ")
+    assert b"other_module " in raw
+    assert cache.update_payload.updates == 3
+
+
+def test_raw_packet_is_updated_again_when_options_are_modified_in_place(cache):
+    pkt = testutils.simple_tcp_packet(pktlen=200, tcp_flags="S")
+    pkt[scapy.TCP].options = [("MSS", 1460)]
+    cache.raw_packet(pkt, PATTERN)
+
+    pkt[scapy.TCP].options.append(("NOP", None))
+    raw = cache.raw_packet(pkt, PATTERN)
+
+    assert raw == bytes(pkt)
+    assert ("NOP", None) in scapy.Ether(raw)[scapy.TCP].options
+    assert cache.update_payload.updates == 2
+
+
+def test_raw_packet_keeps_raw_bytes(cache):
+    assert cache.raw_packet(b"\x00" * 64, PATTERN) == b"\x00" * 64
+    assert cache.update_payload.updates == 0
+
+
+@pytest.mark.parametrize("ttl", [63, 1])
+def test_expected_mask_matches_like_ptf(cache, ttl):
+    pkt = testutils.simple_tcp_packet(pktlen=200)
+    masked = _masked(pkt.copy())
+    reference = _masked(pkt.copy())
+    cache.update_payload(reference)
+
+    matcher = cache.expected_packet(masked, PATTERN)
+
+    for rcvd in (_received(reference.exp_pkt, ttl), _received(pkt, ttl), bytes(reference.exp_pkt) + b"\x00",
+                 bytes(reference.exp_pkt)[:-1]):
+        assert match_exp_pkt(matcher, rcvd) == match_exp_pkt(reference, rcvd)
+    assert match_exp_pkt(matcher, _received(reference.exp_pkt, ttl))
+    assert cache.expected_packet(masked, PATTERN) is matcher
+    assert cache.update_payload.updates == 2
+
+
+def test_expected_mask_is_rebuilt_when_modified(cache):
+    masked = _masked(testutils.simple_tcp_packet(pktlen=200))
+    matcher = cache.expected_packet(masked, PATTERN)
+
+    masked.set_do_not_care_packet(scapy.Ether, "src")
+    assert cache.expected_packet(masked, PATTERN) is not matcher
+
+    masked.exp_pkt[scapy.TCP].dport = 8080
+    matcher = cache.expected_packet(masked, PATTERN)
+    rcvd = masked.exp_pkt.copy()
+    rcvd[scapy.Ether].src = "00:aa:bb:cc:dd:ee"
+    assert matcher.pkt_match(bytes(rcvd))
+    assert not matcher.pkt_match(_received(testutils.simple_tcp_packet(pktlen=200)))
+
+
+@pytest.mark.parametrize("pktlen", [42, 100])
+def test_expected_packet_matches_like_ptf(cache, pktlen):
+    pkt = testutils.simple_udp_packet(pktlen=pktlen)
+    reference = cache.update_payload(pkt.copy())
+
+    matcher = cache.expected_packet(pkt, PATTERN)
+
+    padded = bytes(reference) + b"\x00" * 18
+    for rcvd in (bytes(reference), padded, bytes(reference)[:-1], _received(reference)):
+        assert match_exp_pkt(matcher, rcvd) == match_exp_pkt(reference, rcvd)
+    assert match_exp_pkt(matcher, bytes(reference))
+
+
+def test_entries_are_dropped_with_their_packet(cache):
+    pkt = testutils.simple_tcp_packet()
+    cache.raw_packet(pkt, PATTERN)
+    cache.expected_packet(_masked(pkt.copy()), PATTERN)
+    gc.collect()
+    assert len(cache._entries) == 1
+
+    del pkt
+    gc.collect()
+    assert not cache._entries
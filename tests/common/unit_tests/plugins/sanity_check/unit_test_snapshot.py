@@ -0,0 +1,137 @@
+"""
+Unit tests for tests/common/plugins/sanity_check/snapshot.py.
+
+The facts are gathered on fake DUTs, so the tests check which facts are gathered on which DUTs and that the check
+items get each fact of the snapshot once before polling the DUT.
+"""
+
+import logging
+import os
+import sys
+import time
+from datetime import timedelta
+
+import pytest
+
+_TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(_TEST_DIR))))
+)
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+# The sanity_check package imports the check items, which need the dualtor dependencies
+pytest.importorskip("grpc")
+
+from tests.common.plugins.sanity_check.snapshot import DutSnapshot, gather_snapshots, get_snapshot, \
+    get_snapshot_facts  # noqa: E402
+
+
+class FakeAsic(object):
+    def __init__(self, sonichost, asic_index):
+        self.sonichost = sonichost
+        self.asic_index = asic_index
+        self.os_version = "202405"
+
+    def config_facts(self, host, source, verbose):
+        return {"ansible_facts": {"PORT": {"Ethernet{}".format(self.asic_index): {"admin_status": "up"}}}}
+
+    def show_interface(self, command, include_internal_intfs, include_inband_intfs):
+        return {"ansible_facts": {"int_status": {"Ethernet{}".format(self.asic_index): {"oper_state": "up"}}}}
+
+    def show_ip_interface(self):
+        return {"ansible_facts": {"ip_interfaces": {"PortChannel101": {"oper_state": "up"}}}}
+
+    def show_ipv6_interface(self):
+        raise AssertionError("IPv6 interfaces are not checked on this topology")
+
+
+class FakeDut(object):
+    def __init__(self, hostname, num_asics=1, monit_fails=False):
+        self.hostname = hostname
+        self.monit_fails = monit_fails
+        self.asics = [FakeAsic(self, index if num_asics > 1 else None) for index in range(num_asics)]
+
+    def get_facts(self):
+        return {"switch_type": "npu"}
+
+    def get_networking_uptime(self):
+        return timedelta(seconds=100)
+
+    def all_critical_process_status(self):
+        return {"swss": {"status": True, "exited_critical_process": []}}
+
+    def get_monit_services_status(self):
+        if self.monit_fails:
+            raise RuntimeError("monit is not running")
+        return {"root-overlay": {"service_status": "Accessible", "service_type": "Filesystem"}}
+
+
+class FakeDutHosts(object):
+    def __init__(self, nodes, frontend_nodes):
+        self.nodes = nodes
+        self.frontend_nodes = frontend_nodes
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+
+@pytest.fixture(autouse=True)
+def _bypass_repo_log_format(monkeypatch):
+    """The %(funcNamewithModule)s field of the log format in tests/pytest.ini is only injected by the
+    log_section_start plugin, which isn't loaded with --noconftest."""
+    import _pytest.logging as _pylog
+    plain = logging.Formatter("%(message)s")
+    monkeypatch.setattr(_pylog.PercentStyleMultiline, "format", lambda self, record: plain.format(record))
+
+
+def test_samples_not_gathered_for_items_waiting_for_other_items():
+    assert get_snapshot_facts(["check_monit"]) == ["monit_services_status", "networking_uptime"]
+    # check_monit waits for check_bgp, which may restart bgp
+    assert get_snapshot_facts(["check_processes", "check_bgp", "check_monit"]) == \
+        ["critical_process_status", "networking_uptime"]
+    assert get_snapshot_facts(["check_dbmemory", "check_disk_usage"]) == []
+
+
+def test_sample_is_returned_once_then_dut_is_polled():
+    snapshot = DutSnapshot("dut1", {"monit_services_status": {"from": "snapshot"}, ("config_facts", 0): {}})
+    polls = []
+
+    def poll(value):
+        polls.append(value)
+        return {"from": value}
+
+    assert snapshot.sample("monit_services_status", poll, "dut") == {"from": "snapshot"}
+    assert snapshot.sample("monit_services_status", poll, "dut") == {"from": "dut"}
+    assert snapshot.sample(("config_facts", 0), poll, "dut") == {}
+    assert snapshot.sample(("config_facts", 1), poll, "asic1") == {"from": "asic1"}
+    assert polls == ["dut", "asic1"]
+
+
+def test_networking_uptime_grows_from_snapshot():
+    dut = FakeDut("dut1")
+    snapshot = DutSnapshot("dut1", {"networking_uptime": timedelta(seconds=30)}, time.time() - 20)
+    assert 50 <= snapshot.networking_uptime(dut).seconds <= 51
+    # Without a snapshot, the uptime is read from the DUT
+    assert get_snapshot({}, dut).networking_uptime(dut) == timedelta(seconds=100)
+    assert get_snapshot({"snapshots": {"dut2": snapshot}}, dut).networking_uptime(dut) == timedelta(seconds=100)
+
+
+def test_gather_snapshots():
+    linecard = FakeDut("lc1", num_asics=2, monit_fails=True)
+    supervisor = FakeDut("sup")
+    duthosts = FakeDutHosts([linecard, supervisor], [linecard])
+    facts = get_snapshot_facts(["check_interfaces", "check_processes", "check_monit"])
+
+    snapshots = gather_snapshots(duthosts, facts, {"topo": {"name": "t2"}})
+
+    assert sorted(snapshots) == ["lc1", "sup"]
+    # The facts of the interfaces are gathered for each asic of the frontend nodes, a fact which could not be
+    # gathered is left out
+    assert sorted(snapshots["lc1"].facts, key=str) == sorted(
+        [("config_facts", 0), ("config_facts", 1), ("ip_intf_status", 0), ("ip_intf_status", 1),
+         ("phy_intf_status", 0), ("phy_intf_status", 1), "critical_process_status", "networking_uptime"], key=str)
+    assert snapshots["lc1"].facts[("phy_intf_status", 1)] == {"Ethernet1": {"oper_state": "up"}}
+    assert sorted(snapshots["sup"].facts) == ["critical_process_status", "monit_services_status",
+                                              "networking_uptime"]
+    assert 100 <= snapshots["sup"].networking_uptime(supervisor).seconds <= 110
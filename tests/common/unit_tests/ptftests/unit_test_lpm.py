@@ -0,0 +1,160 @@
+"""
+Unit tests for ansible/roles/test/files/ptftests/lpm.py (LpmDict).
+
+The ranges and the longest prefix matches of LpmDict are compared with a reference built from scratch with the
+ipaddress module after every change, for random IPv4 and IPv6 prefixes set one by one, in bulk with update() and
+deleted. The PTF test directory is loaded by ptf, so the unit tests of its helpers are kept here.
+"""
+import functools
+import importlib.util
+import random
+from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network, ip_address, ip_network
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("SubnetTree")
+
+MODULE_PATH = (Path(__file__).resolve().parents[4] /
+               "ansible/roles/test/files/ptftests/lpm.py")
+
+
+def _load_target_module():
+    """Load the target module from the PTF test directory."""
+    spec = importlib.util.spec_from_file_location("unit_target_lpm", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def lpm_module():
+    """Load and return the lpm target module."""
+    return _load_target_module()
+
+
+@functools.lru_cache(maxsize=None)
+def _network(prefix):
+    return ip_network(prefix)
+
+
+class ReferenceLpm(object):
+    """The prefixes of an LpmDict, with the ranges and matches computed from all of them on each call."""
+
+    def __init__(self, version):
+        self.version = version
+        self.address = IPv4Address if version == 4 else IPv6Address
+        self.max_address = self.address(2 ** (32 if version == 4 else 128) - 1)
+        self.prefixes = {}
+
+    def ranges(self):
+        # The first range starts at the unspecified address, the default route does not split the ranges
+        boundaries = {0}
+        for prefix in self.prefixes:
+            network = _network(prefix)
+            if network.prefixlen == 0:
+                continue
+            boundaries.add(int(network[0]))
+            if network[-1] != self.max_address:
+                boundaries.add(int(network[-1]) + 1)
+        boundaries = sorted(boundaries)
+        ends = [boundary - 1 for boundary in boundaries[1:]] + [int(self.max_address)]
+        return [(str(self.address(start)), str(self.address(end))) for start, end in zip(boundaries, ends)]
+
+    def lookup(self, address):
+        address = ip_address(address)
+        matches = [(network.prefixlen, value) for network, value in
+                   ((_network(prefix), value) for prefix, value in self.prefixes.items()) if address in network]
+        return max(matches, key=lambda match: match[0])[1] if matches else None
+
+
+def _random_prefix(rand, version):
+    """A random prefix of a few address blocks, so that the prefixes often overlap or share boundaries."""
+    bits = 32 if version == 4 else 128
+    prefixlen = rand.choice([0, 1, bits // 4, bits // 2, bits // 2 + 1, bits - 2, bits - 1, bits,
+                             rand.randint(1, bits)])
+    # Addresses from a handful of blocks, at the start, the middle and the end of the address space
+    base = rand.choice([0, 1 << (bits - 1), (1 << bits) - (1 << (bits // 2))])
+    address = base + rand.getrandbits(bits // 2 + 2)
+    address &= ((1 << bits) - 1) ^ ((1 << (bits - prefixlen)) - 1)
+    return str((IPv4Network if version == 4 else IPv6Network)((address, prefixlen)))
+
+
+def _random_address(rand, version, prefixes):
+    bits = 32 if version == 4 else 128
+    if prefixes and rand.random() < 0.7:
+        network = ip_network(rand.choice(sorted(prefixes)))
+        return str(network[0] + rand.randint(0, network.num_addresses - 1))
+    return str((IPv4Address if version == 4 else IPv6Address)(rand.getrandbits(bits)))
+
+
+def _range_bounds(lpm):
+    return [(interval.get_first_ip(), interval.get_last_ip()) for interval in lpm.ranges()]
+
+
+def _assert_same(lpm, reference, rand):
+    expected = reference.ranges()
+    ranges = lpm.ranges()
+    assert _range_bounds(lpm) == expected
+    assert len(ranges) == len(expected)
+    assert [(r.get_first_ip(), r.get_last_ip()) for r in ranges[-3:]] == expected[-3:]
+    assert (ranges[-1].get_first_ip(), ranges[-1].get_last_ip()) == expected[-1]
+    for interval, (first, last) in zip(ranges, expected):
+        assert interval.length() == int(ip_address(last)) - int(ip_address(first))
+        assert interval.contains(first) and interval.contains(last)
+    for _ in range(20):
+        address = _random_address(rand, reference.version, reference.prefixes)
+        if reference.lookup(address) is None:
+            assert not lpm.contains(address)
+        else:
+            assert lpm[address] == reference.lookup(address)
+
+
+@pytest.mark.parametrize("version", [4, 6])
+@pytest.mark.parametrize("seed", range(5))
+def test_ranges_and_matches_like_reference(lpm_module, version, seed):
+    rand = random.Random(seed * 10 + version)
+    lpm = lpm_module.LpmDict(ipv4=version == 4)
+    reference = ReferenceLpm(version)
+    _assert_same(lpm, reference, rand)
+    for step in range(150):
+        op = rand.random()
+        if op < 0.4:
+            prefix, value = _random_prefix(rand, version), "nh{}".format(step)
+            lpm[prefix] = value
+            reference.prefixes[prefix] = value
+        elif op < 0.6:
+            # Bulk update with duplicates, and prefixes already set
+            items = [(_random_prefix(rand, version), "bulk{}_{}".format(step, i)) for i in range(rand.randint(1, 8))]
+            items += rand.sample(sorted(reference.prefixes.items()), min(2, len(reference.prefixes)))
+            items.append(items[0])
+            lpm.update(items)
+            reference.prefixes.update(items)
+        elif reference.prefixes:
+            prefix = rand.choice(sorted(reference.prefixes))
+            del lpm[prefix]
+            del reference.prefixes[prefix]
+        _assert_same(lpm, reference, rand)
+
+
+@pytest.mark.parametrize("version,prefix", [(4, "0.0.0.0/0"), (6, "::/0"), (4, "255.255.255.254/31"),
+                                            (6, "ffff::/16"), (4, "0.0.0.0/8"), (6, "::/127")])
+def test_ranges_of_edge_prefixes(lpm_module, version, prefix):
+    rand = random.Random(0)
+    lpm = lpm_module.LpmDict(ipv4=version == 4)
+    reference = ReferenceLpm(version)
+    lpm[prefix] = "nh"
+    reference.prefixes[prefix] = "nh"
+    _assert_same(lpm, reference, rand)
+    del lpm[prefix]
+    del reference.prefixes[prefix]
+    _assert_same(lpm, reference, rand)
+
+
+def test_rejects_prefix_of_other_version(lpm_module):
+    with pytest.raises(ValueError):
+        lpm_module.LpmDict(ipv4=True)["fc00::/64"] = "nh"
+    with pytest.raises(ValueError):
+        lpm_module.LpmDict(ipv4=False)["10.0.0.0/8"] = "nh"
+    with pytest.raises(ValueError):
+        lpm_module.LpmDict(ipv4=True)["10.0.0.1/8"] = "nh"
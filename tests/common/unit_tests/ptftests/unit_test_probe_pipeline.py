@@ -0,0 +1,190 @@
+"""
+Unit tests for ansible/roles/test/files/ptftests/probe_pipeline.py (ProbePipeline).
+
+The probes are sent to a fake dataplane standing for the DUT: it forwards each packet to one of the ports of the
+probe, picked by the L4 source port, rewrites the fields a router rewrites (MACs, TTL, checksum) and may drop
+packets or add unexpected ones.
+"""
+import importlib.util
+from collections import deque
+from pathlib import Path
+
+import pytest
+
+ptf_mask = pytest.importorskip("ptf.mask")
+testutils = pytest.importorskip("ptf.testutils")
+scapy = pytest.importorskip("ptf.packet")
+
+MODULE_PATH = (Path(__file__).resolve().parents[4] /
+               "ansible/roles/test/files/ptftests/probe_pipeline.py")
+
+ROUTER_MAC = "00:aa:bb:cc:dd:ee"
+DST_PORTS = [10, 11, 12, 13]
+
+
+def _load_target_module():
+    """Load the target module from the PTF test directory."""
+    spec = importlib.util.spec_from_file_location("unit_target_probe_pipeline", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def pipeline_module():
+    """Load and return the probe_pipeline target module."""
+    return _load_target_module()
+
+
+class FakeDataplane(object):
+    """Dataplane of a fake PTF test, forwarding the sent packets like a DUT."""
+
+    class PollSuccess(object):
+        def __init__(self, port, packet):
+            self.port = port
+            self.packet = packet
+
+    class PollFailure(object):
+        pass
+
+    def __init__(self, drops=None, noise=None, wrong_port=None):
+        # sport of the probes to drop -> number of times they are dropped
+        self.drops = dict(drops or {})
+        # (port, packet) not sent by a probe, received after the flush
+        self.noise = list(noise or [])
+        self.received = deque()
+        self.wrong_port = wrong_port
+        self.sent = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def flush(self):
+        self.received = deque(self.noise)
+
+    def egress_port(self, sport):
+        if sport == self.wrong_port:
+            return 99
+        return DST_PORTS[sport % len(DST_PORTS)]
+
+    def send(self, port, pkt):
+        pkt = scapy.Ether(pkt)
+        sport = pkt[scapy.TCP].sport
+        self.sent.append(sport)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        if self.drops.get(sport):
+            self.drops[sport] -= 1
+            return
+        # Routed: new MACs, TTL decremented, checksum updated
+        pkt[scapy.Ether].src = ROUTER_MAC
+        pkt[scapy.Ether].dst = "00:11:22:33:44:{:02x}".format(self.egress_port(sport) % 256)
+        pkt[scapy.IP].ttl -= 1
+        del pkt[scapy.IP].chksum
+        self.received.append((self.egress_port(sport), bytes(pkt)))
+
+    def poll(self):
+        if not self.received:
+            # Nothing more will be received, the probes in flight are lost
+            self.in_flight = 0
+            return self.PollFailure()
+        port, pkt = self.received.popleft()
+        self.in_flight = max(0, self.in_flight - 1)
+        return self.PollSuccess(port, pkt)
+
+
+class FakeTest(object):
+    def __init__(self, dataplane):
+        self.dataplane = dataplane
+
+
+@pytest.fixture
+def fake_ptf(pipeline_module, monkeypatch):
+    """Route send_packet() and dp_poll() of the target module to the fake dataplane of the test."""
+    monkeypatch.setattr(pipeline_module, "send_packet", lambda test, port, pkt: test.dataplane.send(port, bytes(pkt)))
+    monkeypatch.setattr(pipeline_module, "dp_poll", lambda test, timeout=None: test.dataplane.poll())
+    return pipeline_module
+
+
+def make_probe(pipeline_module, sport, src_mac="00:01:02:03:04:05", dst_ports=DST_PORTS):
+    pkt = testutils.simple_tcp_packet(eth_src=src_mac, eth_dst=ROUTER_MAC, ip_src="10.0.0.1",
+                                      ip_dst="192.168.0.1", tcp_sport=sport, tcp_dport=80, ip_ttl=64)
+    exp_pkt = testutils.simple_tcp_packet(eth_src=ROUTER_MAC, ip_src="10.0.0.1", ip_dst="192.168.0.1",
+                                          tcp_sport=sport, tcp_dport=80, ip_ttl=63)
+    masked_exp_pkt = ptf_mask.Mask(exp_pkt)
+    masked_exp_pkt.set_do_not_care_packet(scapy.Ether, "dst")
+    masked_exp_pkt.set_do_not_care_packet(scapy.IP, "chksum")
+    return pipeline_module.Probe(0, pkt, masked_exp_pkt, list(dst_ports), sport)
+
+
+def expected_hit_count_map(sports):
+    hit_count_map = {}
+    for sport in sports:
+        port = DST_PORTS[sport % len(DST_PORTS)]
+        hit_count_map[port] = hit_count_map.get(port, 0) + 1
+    return hit_count_map
+
+
+@pytest.mark.parametrize("window", [1, 7, 64, 1000])
+def test_matches_and_counts_per_port(fake_ptf, window):
+    sports = list(range(1000, 1064))
+    dataplane = FakeDataplane()
+    validated = []
+
+    def validate(probe, rcvd_port, rcvd_pkt):
+        assert scapy.Ether(rcvd_pkt)[scapy.TCP].sport == probe.context
+        assert rcvd_port == DST_PORTS[probe.context % len(DST_PORTS)]
+        validated.append(probe.context)
+
+    results = fake_ptf.ProbePipeline(FakeTest(dataplane), window=window, timeout=0).run(
+        [make_probe(fake_ptf, sport) for sport in sports], validate)
+
+    assert results.hit_count_map == expected_hit_count_map(sports)
+    assert sorted(validated) == sports
+    assert (results.sent, results.received, results.missing, results.unexpected) == (64, 64, [], 0)
+    # No more probes in flight than the window
+    assert dataplane.max_in_flight == min(window, len(sports))
+
+
+def test_probes_in_flight_are_sent_again_once(fake_ptf):
+    sports = list(range(2000, 2050))
+    # 2000-2004 are dropped once and received when sent again, 2005-2006 are dropped twice and missing
+    drops = dict([(sport, 1) for sport in range(2000, 2005)] + [(2005, 2), (2006, 2)])
+    dataplane = FakeDataplane(drops=drops)
+
+    results = fake_ptf.ProbePipeline(FakeTest(dataplane), window=8, timeout=0).run(
+        [make_probe(fake_ptf, sport) for sport in sports])
+
+    assert sorted(probe.context for probe in results.missing) == [2005, 2006]
+    assert results.hit_count_map == expected_hit_count_map(sorted(set(sports) - {2005, 2006}))
+    assert results.received == 48
+    assert results.sent == 50 + 7
+    assert sorted(sport for sport in dataplane.sent if dataplane.sent.count(sport) > 1) == \
+        sorted([sport for sport in range(2000, 2007)] * 2)
+
+
+def test_unexpected_packets_are_not_matched(fake_ptf):
+    sports = list(range(3000, 3020))
+    noise = bytes(make_probe(fake_ptf, 9999).masked_exp_pkt.exp_pkt)
+    dataplane = FakeDataplane(noise=[(DST_PORTS[0], noise)], wrong_port=3005)
+
+    results = fake_ptf.ProbePipeline(FakeTest(dataplane), window=4, timeout=0).run(
+        [make_probe(fake_ptf, sport) for sport in sports])
+
+    # The probe received on a port it is not expected on is sent again, then reported missing
+    assert [probe.context for probe in results.missing] == [3005]
+    assert results.unexpected == 1 + 2
+    assert results.received == 19
+
+
+def test_probes_differing_by_masked_fields_share_a_signature(fake_ptf):
+    # Same packet but the source MAC, rewritten by the DUT: any of the probes matches the received packets
+    probes = [make_probe(fake_ptf, 4000, src_mac="00:01:02:03:04:{:02x}".format(i)) for i in range(10)]
+    results = fake_ptf.ProbePipeline(FakeTest(FakeDataplane()), window=3, timeout=0).run(probes)
+
+    assert results.hit_count_map == {DST_PORTS[4000 % len(DST_PORTS)]: 10}
+    assert (results.received, results.missing, results.unexpected) == (10, [], 0)
+
+
+def test_no_probes(fake_ptf):
+    results = fake_ptf.ProbePipeline(FakeTest(FakeDataplane()), window=3, timeout=0).run([])
+    assert (results.sent, results.received, results.hit_count_map) == (0, 0, {})
@@ -148,6 +148,11 @@ def pytest_addoption(parser):
     parser.addoption("--npu_dpu_startup", action="store_true", help="Startup NPU and DPUs and install configurations")
     parser.addoption("--l47_trafficgen", action="store_true", help="Enable L47 trafficgen config")
     parser.addoption("--save_l47_trafficgen", action="store_true", help="Save L47 trafficgen config")
+    parser.addoption("--ssh_fast_path", action="store_true", default=False,
+                     help="Run plain shell/command calls on DUTs on a persistent SSH connection instead of ansible")
+    parser.addoption("--dut_max_parallel", action="store", default=1, type=int,
+                     help="Maximum number of DUTs or ASICs a module called on all of them, like duthosts.shell() "
+                          "or duthost.command(..., asic_index='all'), is run on concurrently. 1 means serially")
 
     # test_vrf options
     parser.addoption("--vrf_capacity", action="store", default=None, type=int, help="vrf capacity of dut (4-1000)")
@@ -238,6 +243,10 @@ def pytest_addoption(parser):
                      help="Skip post-test sanity check (override default enable)")
     parser.addoption("--post_check_items", action="store", default=False,
                      help="Change (add|remove) post test check items based on pre test check items")
+    parser.addoption("--sanity_check_max_parallel", action="store", default=1, type=int,
+                     help="Maximum number of sanity check items run concurrently, an item being started once the "
+                          "items it depends on are done. 1 means serially. Unsafe: the check items fork processes "
+                          "from concurrent threads, which may deadlock")
     parser.addoption("--recover_method", action="store", default="adaptive",
                      help="Set method to use for recover if sanity failed")
 
@@ -726,6 +735,9 @@ def pytest_sessionstart(session):
 
 
 def pytest_sessionfinish(session, exitstatus):
+    if hasattr(session.config, "workeroutput"):
+        # Sent to the xdist controller, see pytest_testnodedown
+        session.config.workeroutput["facts_cache_stats"] = {name: dict(c) for name, c in cache.stats.items()}
     if (session.config.cache.get("duthosts_fixture_failed", None) or
             session.config.cache.get("ptfhost_exception", None)):
         session.config.cache.set("duthosts_fixture_failed", None)
@@ -745,6 +757,24 @@ def pytest_sessionfinish(session, exitstatus):
             logger.error(f"Failed to restore topo file: {e}")
 
 
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Add the facts cache counters of a finished xdist worker to the counters of the controller."""
+    for name, counters in getattr(node, "workeroutput", {}).get("facts_cache_stats", {}).items():
+        cache.stats[name].update(counters)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Print hit/miss/stale counters of the facts cache per facts name, of all the xdist workers."""
+    if not cache.stats:
+        return
+    terminalreporter.section("Facts Cache Summary")
+    for name, counters in sorted(cache.stats.items()):
+        terminalreporter.write_line(
+            "  {}: hit={} miss={} stale={}".format(name, counters["hit"], counters["miss"], counters["stale"])
+        )
+
+
 @pytest.fixture(name="duthosts", scope="session")
 def fixture_duthosts(enhance_inventory, ansible_adhoc, tbinfo, request, ipv6_only_mgmt_enabled):
     """
@@ -757,6 +787,7 @@ def fixture_duthosts(enhance_inventory, ansible_adhoc, tbinfo, request, ipv6_onl
     @param request: pytest request object
     @param ipv6_only_mgmt_enabled: fixture to configure IPv6-only management mode before DUT initialization
     """
+    SonicHost.set_ssh_fast_path(request.config.getoption("--ssh_fast_path"))
     try:
         host = DutHosts(ansible_adhoc, tbinfo, request, get_specified_duts(request),
                         target_hostname=get_target_hostname(request), is_parallel_leader=is_parallel_leader(request))
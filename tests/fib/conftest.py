@@ -0,0 +1,21 @@
+"""
+    Pytest configuration used by the fib and hash tests.
+"""
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption("--probe_pipeline", action="store_true", default=False,
+                     help="Send the balancing probes of the FibTest and HashTest PTF tests back-to-back, "
+                          "instead of waiting for each packet before sending the next one")
+    parser.addoption("--probe_window", action="store", type=int, default=64,
+                     help="Maximum number of probes in flight with --probe_pipeline")
+
+
+@pytest.fixture(scope="module")
+def probe_pipeline_params(request):
+    """PTF test params of the balancing probes of FibTest and HashTest, from the command line options."""
+    return {
+        "probe_pipeline": request.config.getoption("probe_pipeline"),
+        "probe_window": request.config.getoption("probe_window"),
+    }
@@ -292,7 +292,7 @@ def test_basic_fib(duthosts, ptfhost, tbinfo, ipv4, ipv6, mtu,
                    ignore_ttl, single_fib_for_duts,                     # noqa: F401, F811
                    duts_running_config_facts, duts_minigraph_facts,
                    validate_active_active_dualtor_setup,                # noqa: F401, F811
-                   request):                                            # noqa: F811
+                   probe_pipeline_params, request):                     # noqa: F811
 
     if 'dualtor' in updated_tbinfo['topo']['name']:
         wait(30, 'Wait some time for mux active/standby state to be stable after toggled mux state')
@@ -335,7 +335,8 @@ def test_basic_fib(duthosts, ptfhost, tbinfo, ipv4, ipv6, mtu,
             "single_fib_for_duts": single_fib_for_duts,
             "switch_type": switch_type,
             "asic_type": asic_type,
-            "topo_type": updated_tbinfo['topo']['type']
+            "topo_type": updated_tbinfo['topo']['type'],
+            **probe_pipeline_params,
         },
         log_file=log_file,
         qlen=PTF_QLEN,
@@ -542,7 +543,7 @@ def test_hash(add_default_route_to_dut, duthosts, tbinfo, setup_vlan,      # noq
               hash_keys, ptfhost, ipver, toggle_all_simulator_ports_to_rand_selected_tor_m,     # noqa: F811
               updated_tbinfo, mux_server_url, mux_status_from_nic_simulator, ignore_ttl,        # noqa: F811
               single_fib_for_duts, duts_running_config_facts, duts_minigraph_facts,             # noqa: F811
-              setup_active_active_ports, active_active_ports, request):                         # noqa: F811
+              setup_active_active_ports, active_active_ports, probe_pipeline_params, request):  # noqa: F811
 
     if 'dualtor' in updated_tbinfo['topo']['name']:
         wait(30, 'Wait some time for mux active/standby state to be stable after toggled mux state')
@@ -589,6 +590,7 @@ def test_hash(add_default_route_to_dut, duthosts, tbinfo, setup_vlan,      # noq
             "topo_name": updated_tbinfo['topo']['name'],
             "topo_type": updated_tbinfo['topo']['type'],
             "is_v6_topo": is_ipv6_only_topology(updated_tbinfo),
+            **probe_pipeline_params,
         },
         log_file=log_file,
         qlen=PTF_QLEN,
@@ -833,7 +835,7 @@ def test_ecmp_group_member_flap(
     mux_status_from_nic_simulator, ignore_ttl,
     single_fib_for_duts,  # noqa: F401, F811
     duts_running_config_facts, duts_minigraph_facts,
-    validate_active_active_dualtor_setup, request  # noqa: F401, F811
+    validate_active_active_dualtor_setup, probe_pipeline_params, request  # noqa: F401, F811
 ):
     """Test ECMP group member flap handling."""
 
@@ -904,6 +906,7 @@ def test_ecmp_group_member_flap(
             "skip_src_ports": filtered_ports,
             "topo_name": updated_tbinfo['topo']['name'],
             "topo_type": updated_tbinfo['topo']['type'],
+            **probe_pipeline_params,
         },
         log_file=log_file,
         qlen=PTF_QLEN,
@@ -962,6 +965,7 @@ def test_ecmp_group_member_flap(
             "skip_src_ports": filtered_ports,
             "topo_name": updated_tbinfo['topo']['name'],
             "topo_type": updated_tbinfo['topo']['type'],
+            **probe_pipeline_params,
         },
         log_file=member_down_log_file,
         qlen=PTF_QLEN,
@@ -1014,6 +1018,7 @@ def test_ecmp_group_member_flap(
             "skip_src_ports": filtered_ports,
             "topo_name": updated_tbinfo['topo']['name'],
             "topo_type": updated_tbinfo['topo']['type'],
+            **probe_pipeline_params,
         },
         log_file=member_up_log_file,
         qlen=PTF_QLEN,
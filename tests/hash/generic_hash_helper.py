@@ -7,6 +7,7 @@ import ipaddress
 import re
 
 from tests.common.helpers.assertions import pytest_assert
+from tests.common.helpers.db_wait import wait_for_db_condition
 from tests.common.utilities import wait_until
 from tests.common import config_reload
 from tests.conftest import get_testbed_metadata
@@ -223,7 +224,8 @@ def restore_interfaces(rand_selected_dut):
         rand_selected_dut.no_shutdown_multiple(interfaces_to_startup)
     try:
         for interface in interfaces_to_startup:
-            pytest_assert(wait_until(30, 5, 0, rand_selected_dut.check_intf_link_state, interface),
+            pytest_assert(wait_for_db_condition(rand_selected_dut, "APPL_DB", "PORT_TABLE:{}".format(interface),
+                                                30, 5, 0, rand_selected_dut.check_intf_link_state, interface),
                           "Not all interfaces are restored to up after the flap test.")
     finally:
         del interfaces_to_startup[:]
@@ -3,6 +3,7 @@ import random
 
 from tests.common.plugins.allure_wrapper import allure_step_wrapper as allure
 from tests.common.helpers.assertions import pytest_assert
+from tests.common.helpers.db_wait import wait_for_db_condition
 from tests.common.utilities import wait_until, configure_packet_aging
 from tests.common.mellanox_data import is_mellanox_device
 from tests.packet_trimming.constants import (
@@ -268,7 +269,8 @@ class BasePacketTrimming:
                     logger.info(f"Ports admin status toggle test iteration {i+1}")
                     duthost.shutdown(egress_port['name'])
                     duthost.no_shutdown(egress_port['name'])
-            pytest_assert(wait_until(30, 5, 0, duthost.check_intf_link_state, egress_port['name']),
+            pytest_assert(wait_for_db_condition(duthost, "APPL_DB", "PORT_TABLE:{}".format(egress_port['name']),
+                                                30, 5, 0, duthost.check_intf_link_state, egress_port['name']),
                           "Interfaces are not restored to up after the flap")
 
         with allure.step("Verify connected route is ready after port toggles"):